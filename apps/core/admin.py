@@ -0,0 +1,115 @@
+"""Shared admin utilities for large tables."""
+
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.utils import get_fields_from_path
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.pagination import EstimatedCountPaginator
+
+
+class AutocompleteListFilter(admin.SimpleListFilter):
+    """
+    List filter for related fields backed by the admin autocomplete view.
+
+    ``RelatedFieldListFilter`` loads every related object into the sidebar;
+    this filter only renders the selected object and searches the rest on
+    demand, using the ``search_fields`` of the related model admin.
+
+    Subclasses set ``field_path`` (e.g. ``"component__type"``) and
+    ``title``, or use ``AutocompleteListFilter.for_field``.
+    """
+
+    template = "admin/autocomplete_filter.html"
+    field_path = None
+
+    def __init__(self, request, params, model, model_admin):
+        self.parameter_name = f"{self.field_path}__id__exact"
+        super().__init__(request, params, model, model_admin)
+
+        field = get_fields_from_path(model, self.field_path)[-1]
+        self.form_field = forms.ModelChoiceField(
+            queryset=field.remote_field.model._default_manager.all(),
+            widget=AutocompleteSelect(field, model_admin.admin_site),
+            required=False,
+        )
+        self.preserved_params = [
+            (key, value)
+            for key, values in request.GET.lists()
+            if key not in (self.parameter_name, "p")
+            for value in values
+        ]
+
+    @classmethod
+    def for_field(cls, field_path: str, title: str) -> type:
+        """
+        Build a filter class for a related field path.
+
+        Args:
+            field_path: Lookup path to a foreign key, e.g. ``"organization"``.
+            title: Title displayed in the sidebar.
+
+        Returns:
+            AutocompleteListFilter subclass.
+        """
+        return type(
+            f"{field_path.title().replace('__', '')}AutocompleteFilter",
+            (cls,),
+            {"field_path": field_path, "title": title},
+        )
+
+    def has_output(self) -> bool:
+        return True
+
+    def lookups(self, request, model_admin):
+        # Choices are loaded by the autocomplete widget
+        return ()
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.parameter_name: self.value()})
+        return queryset
+
+    def choices(self, changelist):
+        yield {
+            "selected": self.value() is None,
+            "query_string": changelist.get_query_string(
+                remove=[self.parameter_name]
+            ),
+            "display": _("All"),
+        }
+
+    def rendered_widget(self) -> str:
+        """Render the autocomplete select with the current value."""
+        return self.form_field.widget.render(
+            self.parameter_name,
+            self.value(),
+            attrs={"onchange": "this.form.submit()", "style": "width: 100%"},
+        )
+
+
+class ScalableAdminMixin:
+    """
+    ModelAdmin mixin for changelists over very large tables.
+
+    Uses an estimated-count paginator, skips the unfiltered full count and
+    adds the media required by ``AutocompleteListFilter`` filters.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+    @property
+    def media(self) -> forms.Media:
+        media = super().media
+        for list_filter in self.list_filter:
+            if isinstance(list_filter, type) and issubclass(
+                list_filter, AutocompleteListFilter
+            ):
+                field = get_fields_from_path(
+                    self.model, list_filter.field_path
+                )[-1]
+                return media + AutocompleteSelect(field, self.admin_site).media
+        return media
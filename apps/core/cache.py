@@ -0,0 +1,385 @@
+"""
+Two-tier cache with tag-based invalidation.
+
+A short-TTL in-process L1 (per gunicorn/Celery process) sits in front of
+the shared Django cache (L2, Redis in production, file-based locally and
+in tests). Entries can be tagged (e.g. ``"org:42"``, ``"component:17"``)
+and invalidated by tag; tag versions live in L2 so invalidations are seen
+by every process once their L1 entries expire. Concurrent misses for the
+same key are collapsed with a lock in L2 to avoid cache stampedes.
+
+Values are stored with the tag versions read before computing them, so a
+value computed while its tags are invalidated is never served. Replicas
+may not have applied the writes behind an invalidation yet: for
+``replica_lag`` seconds after one, the recompute reads from the primary.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.core.middleware import record_cache_access
+from apps.core.routers import pin_to_primary
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LocalCache:
+    """Thread-safe in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1000) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, Any, Tuple[str, ...]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = _MISSING) -> Any:
+        """Return a non-expired value, or ``default``."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value, _ = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(
+        self, key: str, value: Any, ttl: float, tags: Iterable[str] = ()
+    ) -> None:
+        """Store a value for ``ttl`` seconds, evicting the oldest entries."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value, tuple(tags))
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def delete_tagged(self, tags: Iterable[str]) -> None:
+        """Drop every entry carrying one of ``tags``."""
+        tags = set(tags)
+        with self._lock:
+            for key in [
+                key
+                for key, (_, _, entry_tags) in self._data.items()
+                if tags.intersection(entry_tags)
+            ]:
+                del self._data[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class TieredCache:
+    """
+    In-process L1 in front of a shared Django cache (L2).
+
+    Settings:
+        TIERED_CACHE_ALIAS: Django cache alias used as L2.
+        TIERED_CACHE_PREFIX: Prefix for every L2 key.
+        TIERED_CACHE_L1_TTL: Seconds values stay in the in-process cache.
+        TIERED_CACHE_L1_MAX_ENTRIES: Maximum in-process entries.
+        TIERED_CACHE_LOCK_TIMEOUT: Seconds a recompute lock is held.
+        TIERED_CACHE_LOCK_WAIT: Seconds to wait for another process to
+            finish recomputing before computing anyway.
+        REPLICA_STICKY_SECONDS: Seconds after an invalidation during which
+            recomputes read from the primary.
+    """
+
+    def __init__(
+        self,
+        alias: Optional[str] = None,
+        prefix: Optional[str] = None,
+        l1_ttl: Optional[float] = None,
+        l1_max_entries: Optional[int] = None,
+        lock_timeout: Optional[int] = None,
+        lock_wait: Optional[float] = None,
+        replica_lag: Optional[float] = None,
+    ) -> None:
+        """
+        Initialize the cache, falling back to the ``TIERED_CACHE_*`` settings.
+
+        Args:
+            alias: Django cache alias used as L2.
+            prefix: Prefix for every L2 key.
+            l1_ttl: In-process TTL in seconds (0 disables L1).
+            l1_max_entries: Maximum in-process entries.
+            lock_timeout: Stampede lock timeout in seconds.
+            lock_wait: Maximum seconds to wait on another recompute.
+            replica_lag: Seconds after an invalidation during which
+                recomputes read from the primary.
+        """
+        self.alias = alias or getattr(
+            settings, "TIERED_CACHE_ALIAS", "default"
+        )
+        self.prefix = prefix or getattr(settings, "TIERED_CACHE_PREFIX", "tc")
+        self.l1_ttl = (
+            l1_ttl
+            if l1_ttl is not None
+            else getattr(settings, "TIERED_CACHE_L1_TTL", 5)
+        )
+        self.lock_timeout = lock_timeout or getattr(
+            settings, "TIERED_CACHE_LOCK_TIMEOUT", 30
+        )
+        self.lock_wait = (
+            lock_wait
+            if lock_wait is not None
+            else getattr(settings, "TIERED_CACHE_LOCK_WAIT", 5)
+        )
+        self.replica_lag = (
+            replica_lag
+            if replica_lag is not None
+            else getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+        )
+        self.local = LocalCache(
+            l1_max_entries
+            or getattr(settings, "TIERED_CACHE_L1_MAX_ENTRIES", 1000)
+        )
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+
+    @property
+    def backend(self):
+        """Return the L2 Django cache."""
+        return caches[self.alias]
+
+    # ------------------------------------------------------------------
+    # Keys and tags
+    # ------------------------------------------------------------------
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:v:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:t:{tag}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.prefix}:l:{key}"
+
+    def _tag_versions(self, tags: Iterable[str]) -> Dict[str, int]:
+        """Return the current version of each tag, creating missing ones."""
+        tags = list(tags)
+        if not tags:
+            return {}
+
+        stored = self.backend.get_many([self._tag_key(tag) for tag in tags])
+        versions = {}
+        for tag in tags:
+            version = stored.get(self._tag_key(tag))
+            if version is None:
+                version = time.time_ns()
+                # add() keeps a version created concurrently by another process
+                if not self.backend.add(self._tag_key(tag), version, None):
+                    version = self.backend.get(self._tag_key(tag), version)
+            versions[tag] = version
+        return versions
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _record(self, outcome: str) -> None:
+        with self._stats_lock:
+            self._stats[outcome] += 1
+        record_cache_access(hit=outcome != "misses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the hit ratio of this process."""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = sum(stats.values())
+        hits = stats["l1_hits"] + stats["l2_hits"]
+        stats["hit_ratio"] = round(hits / lookups, 4) if lookups else 0.0
+        return stats
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            for key in self._stats:
+                self._stats[key] = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Return a cached value, checking L1 first and then L2.
+
+        L2 values whose tags were invalidated since they were stored are
+        treated as misses.
+        """
+        value = self._get(key)
+        return default if value is _MISSING else value
+
+    def _get(self, key: str) -> Any:
+        value = self.local.get(key)
+        if value is not _MISSING:
+            self._record("l1_hits")
+            return value
+
+        envelope = self.backend.get(self._key(key))
+        if envelope is not None:
+            value, tag_versions = envelope
+            if self._tag_versions(tag_versions) == tag_versions:
+                if self.l1_ttl:
+                    self.local.set(key, value, self.l1_ttl, tag_versions)
+                self._record("l2_hits")
+                return value
+
+        self._record("misses")
+        return _MISSING
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        timeout: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """
+        Store a value in both tiers.
+
+        Args:
+            key: Cache key.
+            value: Picklable value.
+            timeout: L2 timeout in seconds (backend default when None).
+            tags: Tags the value depends on.
+        """
+        self._set(key, value, timeout, self._tag_versions(tags))
+
+    def _set(
+        self,
+        key: str,
+        value: Any,
+        timeout: Optional[int],
+        tag_versions: Dict[str, int],
+    ) -> None:
+        if timeout is None:
+            self.backend.set(self._key(key), (value, tag_versions))
+        else:
+            self.backend.set(self._key(key), (value, tag_versions), timeout)
+        if self.l1_ttl:
+            self.local.set(key, value, self.l1_ttl, tag_versions)
+
+    def delete(self, key: str) -> None:
+        """Remove a key from both tiers."""
+        self.local.delete(key)
+        self.backend.delete(self._key(key))
+
+    def get_or_set(
+        self,
+        key: str,
+        default: Callable[[], Any],
+        timeout: Optional[int] = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Return the cached value or compute, store and return it.
+
+        Only one process recomputes a missing key at a time: the others
+        wait up to ``lock_wait`` seconds for the value to appear in L2.
+
+        Args:
+            key: Cache key.
+            default: Callable computing the value on a miss.
+            timeout: L2 timeout in seconds.
+            tags: Tags the value depends on.
+
+        Returns:
+            Cached or freshly computed value.
+        """
+        value = self._get(key)
+        if value is not _MISSING:
+            return value
+
+        lock_key = self._lock_key(key)
+        if not self.backend.add(lock_key, 1, self.lock_timeout):
+            deadline = time.monotonic() + self.lock_wait
+            while time.monotonic() < deadline:
+                time.sleep(0.05)
+                envelope = self.backend.get(self._key(key))
+                if envelope is not None:
+                    value, tag_versions = envelope
+                    if self._tag_versions(tag_versions) == tag_versions:
+                        return value
+            logger.warning(f"Timed out waiting for cache key {key}")
+            return default()
+
+        try:
+            tag_versions = self._tag_versions(tags)
+            invalidated = max(tag_versions.values(), default=0)
+            if time.time_ns() - invalidated < self.replica_lag * 1e9:
+                with pin_to_primary():
+                    value = default()
+            else:
+                value = default()
+            self._set(key, value, timeout, tag_versions)
+            return value
+        finally:
+            self.backend.delete(lock_key)
+
+    def invalidate_tags(self, *tags: str) -> None:
+        """
+        Invalidate every entry tagged with any of ``tags``.
+
+        Bumps the tag versions in L2, so other processes drop stale
+        entries on their next L2 read, and clears matching L1 entries of
+        this process immediately.
+        """
+        tags = [tag for tag in tags if tag]
+        if not tags:
+            return
+
+        version = time.time_ns()
+        self.backend.set_many(
+            {self._tag_key(tag): version for tag in tags}, None
+        )
+        self.local.delete_tagged(tags)
+        logger.debug(f"Invalidated cache tags: {', '.join(tags)}")
+
+    def current_versions(self, *tags: str) -> Dict[str, Optional[int]]:
+        """
+        Return the current L2 version of each tag, without creating any.
+
+        Versions change on every invalidation, so polling them is a cheap
+        way (one L2 round trip) to watch for data changes.
+
+        Args:
+            tags: Tags to read.
+
+        Returns:
+            Version of each tag, None for tags never used.
+        """
+        stored = self.backend.get_many([self._tag_key(tag) for tag in tags])
+        return {tag: stored.get(self._tag_key(tag)) for tag in tags}
+
+    def clear_local(self) -> None:
+        """Drop every in-process entry."""
+        self.local.clear()
+
+
+def org_tag(organization_id: Any) -> str:
+    """Return the cache tag of an organization."""
+    return f"org:{organization_id}"
+
+
+def component_tag(component_id: Any) -> str:
+    """Return the cache tag of a component."""
+    return f"component:{component_id}"
+
+
+tiered_cache = TieredCache()
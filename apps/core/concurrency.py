@@ -0,0 +1,127 @@
+"""
+Bounded thread pool for independent database queries.
+
+Django database connections are per thread, so querysets evaluated in the
+pool run on their own connections, concurrently, and a view issuing
+several independent aggregates waits for the slowest one instead of
+their sum. Unlike the async ORM, which runs every query in the same
+thread, this gives real concurrency under both WSGI and ASGI.
+
+Each pool thread keeps its connections open between tasks, whatever
+``CONN_MAX_AGE`` is: they are only closed when broken or older than
+``QUERY_POOL_CONN_MAX_AGE``, so every process holds at most
+``QUERY_POOL_WORKERS`` extra connections per database and tasks do not
+pay for a new connection each. Tasks run inline when the caller is inside a
+transaction, whose uncommitted rows other connections cannot see, and
+when called from the pool itself.
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import connections
+
+from apps.core.middleware import get_current_metrics
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_pool_thread = threading.local()
+
+
+def get_executor() -> Optional[ThreadPoolExecutor]:
+    """Return the process-wide query pool, None when disabled."""
+    global _executor
+    workers = getattr(settings, "QUERY_POOL_WORKERS", 0)
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="query-pool"
+            )
+    return _executor
+
+
+def _recycle_connections() -> None:
+    """
+    Close this pool thread's connections that are broken or too old.
+
+    Unlike close_old_connections(), healthy connections stay open even
+    when ``CONN_MAX_AGE`` is 0: the age is counted from when the pool
+    first saw the connection open, up to ``QUERY_POOL_CONN_MAX_AGE``.
+    """
+    opened = _pool_thread.__dict__.setdefault("opened", {})
+    max_age = getattr(settings, "QUERY_POOL_CONN_MAX_AGE", 600)
+    now = time.monotonic()
+    for connection in connections.all(initialized_only=True):
+        if connection.connection is None:
+            opened.pop(connection.alias, None)
+            continue
+        age = now - opened.setdefault(connection.alias, now)
+        if (
+            age >= max_age
+            or connection.get_autocommit()
+            != connection.settings_dict["AUTOCOMMIT"]
+            or (connection.errors_occurred and not connection.is_usable())
+        ):
+            connection.close()
+            opened.pop(connection.alias)
+        else:
+            connection.errors_occurred = False
+
+
+def _run_task(task: Callable[[], Any]) -> Any:
+    """Run a task on this pool thread's connections."""
+    _pool_thread.active = True
+    _recycle_connections()
+    try:
+        with ExitStack() as stack:
+            metrics = get_current_metrics()
+            if metrics is not None:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+            return task()
+    finally:
+        _recycle_connections()
+        _pool_thread.active = False
+
+
+def run_concurrently(tasks: Dict[str, Callable[[], Any]]) -> Dict[str, Any]:
+    """
+    Run independent database tasks concurrently in the query pool.
+
+    Args:
+        tasks: Callables (e.g. evaluating a queryset) by name. They must
+            not depend on each other's results.
+
+    Returns:
+        Result of every task by name. The first exception raised by a
+        task is re-raised once every task finished.
+    """
+    executor = get_executor()
+    if (
+        executor is None
+        or len(tasks) < 2
+        or getattr(_pool_thread, "active", False)
+        or any(connection.in_atomic_block for connection in connections.all())
+    ):
+        return {name: task() for name, task in tasks.items()}
+
+    # Each task gets a copy of the context, for the request metrics
+    futures = {
+        name: executor.submit(contextvars.copy_context().run, _run_task, task)
+        for name, task in tasks.items()
+    }
+    errors = [future.exception() for future in futures.values()]
+    for error in errors:
+        if error is not None:
+            raise error
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,215 @@
+"""
+Request instrumentation middleware.
+
+Collects per-request SQL query counts, database time, duplicated query
+fingerprints (the signature of N+1 patterns), cache hits/misses and wall time.
+Metrics are exposed as ``Server-Timing`` headers and structured log lines.
+"""
+
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_current_metrics: ContextVar[Optional["RequestMetrics"]] = ContextVar(
+    "request_metrics", default=None
+)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_IN_CLAUSE_RE = re.compile(r"IN \((?:%s, )*%s\)")
+
+
+def fingerprint_sql(sql: str) -> str:
+    """
+    Normalize a SQL statement so repeated executions share a fingerprint.
+
+    Parameters are already placeholders at the cursor level, so only
+    whitespace and variable-length ``IN (...)`` lists need collapsing.
+
+    Args:
+        sql: SQL statement as passed to the cursor.
+
+    Returns:
+        Normalized SQL statement.
+    """
+    sql = _WHITESPACE_RE.sub(" ", sql).strip()
+    return _IN_CLAUSE_RE.sub("IN (...)", sql)
+
+
+class RequestMetrics:
+    """Mutable metrics collected during a single request."""
+
+    def __init__(self) -> None:
+        self.query_count = 0
+        self.db_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.fingerprints: Counter = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper recording count, time and fingerprint."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.query_count += 1
+            self.fingerprints[fingerprint_sql(sql)] += 1
+
+    def duplicated_queries(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Return the most repeated query fingerprints."""
+        return [
+            {
+                "fingerprint": hashlib.md5(sql.encode()).hexdigest()[:12],
+                "count": count,
+                "sql": sql[:200],
+            }
+            for sql, count in self.fingerprints.most_common(limit)
+            if count > 1
+        ]
+
+
+def get_current_metrics() -> Optional[RequestMetrics]:
+    """Return the metrics of the request being processed, if any."""
+    return _current_metrics.get()
+
+
+def record_cache_access(hit: bool, count: int = 1) -> None:
+    """
+    Record cache hits or misses for the current request.
+
+    Args:
+        hit: True for a cache hit, False for a miss.
+        count: Number of accesses to record.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return
+
+    if hit:
+        metrics.cache_hits += count
+    else:
+        metrics.cache_misses += count
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Middleware that instruments every request with query and cache metrics.
+
+    Settings:
+        INSTRUMENTATION_ENABLED: Toggle the middleware.
+        INSTRUMENTATION_SAMPLE_RATE: Fraction of requests logged (0.0-1.0).
+        INSTRUMENTATION_SERVER_TIMING: Emit ``Server-Timing`` headers.
+        INSTRUMENTATION_SLOW_REQUEST_MS: Default slow request threshold.
+        INSTRUMENTATION_VIEW_THRESHOLDS: Per-view thresholds keyed by
+            view name (e.g. ``"apps.dashboard:export_download"``).
+
+    Slow requests are always logged, regardless of sampling.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.enabled = getattr(settings, "INSTRUMENTATION_ENABLED", True)
+        self.sample_rate = getattr(
+            settings, "INSTRUMENTATION_SAMPLE_RATE", 1.0
+        )
+        self.server_timing = getattr(
+            settings, "INSTRUMENTATION_SERVER_TIMING", settings.DEBUG
+        )
+        self.slow_request_ms = getattr(
+            settings, "INSTRUMENTATION_SLOW_REQUEST_MS", 1000
+        )
+        self.view_thresholds = getattr(
+            settings, "INSTRUMENTATION_VIEW_THRESHOLDS", {}
+        )
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        started = time.perf_counter()
+
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current_metrics.reset(token)
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        view_name = self._get_view_name(request)
+
+        if self.server_timing:
+            response["Server-Timing"] = self._build_server_timing(
+                metrics, duration_ms
+            )
+
+        self._log_metrics(request, response, metrics, duration_ms, view_name)
+        return response
+
+    def _get_view_name(self, request) -> str:
+        """Return the resolved view name of the request."""
+        match = getattr(request, "resolver_match", None)
+        return match.view_name if match else ""
+
+    def _build_server_timing(
+        self, metrics: RequestMetrics, duration_ms: float
+    ) -> str:
+        """Build the ``Server-Timing`` header value."""
+        return ", ".join(
+            [
+                f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.query_count} queries"',
+                f'dup;desc="{len(metrics.duplicated_queries())} duplicated"',
+                f'cache;desc="hits={metrics.cache_hits} misses={metrics.cache_misses}"',
+                f"total;dur={duration_ms:.1f}",
+            ]
+        )
+
+    def _log_metrics(
+        self,
+        request,
+        response,
+        metrics: RequestMetrics,
+        duration_ms: float,
+        view_name: str,
+    ) -> None:
+        """Emit a structured log line for sampled or slow requests."""
+        threshold = self.view_thresholds.get(view_name, self.slow_request_ms)
+        is_slow = duration_ms >= threshold
+
+        if not is_slow and random.random() >= self.sample_rate:
+            return
+
+        payload = {
+            "method": request.method,
+            "path": request.path,
+            "view": view_name,
+            "status": response.status_code,
+            "duration_ms": round(duration_ms, 2),
+            "db_queries": metrics.query_count,
+            "db_time_ms": round(metrics.db_time * 1000, 2),
+            "duplicated_queries": metrics.duplicated_queries(),
+            "cache_hits": metrics.cache_hits,
+            "cache_misses": metrics.cache_misses,
+            "slow": is_slow,
+        }
+        message = f"request_metrics {json.dumps(payload)}"
+
+        if is_slow:
+            logger.warning(message)
+        else:
+            logger.info(message)
@@ -6,6 +6,8 @@ from django.views import View
 from django.views.decorators.cache import cache_page
 
 from apps.core import choices
+from apps.core.middleware import record_cache_access
+from apps.core.routers import read_from_replica
 
 
 class AjaxDeleteViewMixin(LoginRequiredMixin, View):
@@ -18,7 +20,9 @@ class AjaxDeleteViewMixin(LoginRequiredMixin, View):
             return JsonResponse(
                 {
                     "status": "success",
-                    "message": _(f"The {entity_name} was successfully deleted."),
+                    "message": _(
+                        f"The {entity_name} was successfully deleted."
+                    ),
                 }
             )
         except self.model.DoesNotExist:
@@ -27,13 +31,17 @@ class AjaxDeleteViewMixin(LoginRequiredMixin, View):
                 status=404,
             )
         except Exception as e:
-            return JsonResponse({"status": "error", "message": str(e)}, status=500)
+            return JsonResponse(
+                {"status": "error", "message": str(e)}, status=500
+            )
 
     def handle_no_permission(self):
         return JsonResponse(
             {
                 "status": "error",
-                "message": _("You do not have permission to delete this account."),
+                "message": _(
+                    "You do not have permission to delete this account."
+                ),
             },
             status=403,
         )
@@ -49,7 +57,9 @@ class CacheMixin(LoginRequiredMixin):
         """
         Genera un prefijo único basado en el usuario autenticado.
         """
-        user_id = request.user.id if request.user.is_authenticated else "anonymous"
+        user_id = (
+            request.user.id if request.user.is_authenticated else "anonymous"
+        )
         return f"user_{user_id}"
 
     def dispatch(self, request, *args, **kwargs):
@@ -65,4 +75,31 @@ class CacheMixin(LoginRequiredMixin):
             key_prefix=cache_key_prefix,
         )(super().dispatch)
 
-        return view(request, *args, **kwargs)
+        response = view(request, *args, **kwargs)
+
+        # `cache_page` flags misses that should update the cache
+        if request.method in ("GET", "HEAD"):
+            record_cache_access(
+                hit=not getattr(request, "_cache_update_cache", False)
+            )
+
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    Send the reads of a read-only view to the database replica.
+
+    Only reads made while dispatching are routed: the body of a streaming
+    response is read after dispatch returns, without the routing or the
+    stickiness of the request, so streaming views set ``replica_reads``
+    to False and read from the primary.
+    """
+
+    replica_reads = True
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.replica_reads:
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replica():
+            return super().dispatch(request, *args, **kwargs)
@@ -251,3 +251,47 @@ class StatusHistory(BaseUserTracked, TimeStampedModel):
             created_by=user,
             modified_by=user,
         )
+
+    @classmethod
+    def bulk_create_status_changes(
+        cls,
+        model,
+        changes,
+        new_status: str,
+        user,
+        note: str = "",
+        batch_size: int = 1000,
+    ):
+        """
+        Create status history entries for many objects of one model.
+
+        The content type is resolved once for the whole batch and rows are
+        written with ``bulk_create``.
+
+        Args:
+            model: Model class (or instance) whose objects changed status.
+            changes: Iterable of ``(object_id, previous_status)`` tuples.
+            new_status: Status the objects transitioned to.
+            user: User performing the change.
+            note: Optional note stored on every entry.
+            batch_size: Rows per insert batch.
+
+        Returns:
+            List of created StatusHistory instances.
+        """
+        content_type = ContentType.objects.get_for_model(model)
+        return cls.objects.bulk_create(
+            [
+                cls(
+                    content_type=content_type,
+                    object_id=object_id,
+                    status=new_status,
+                    previous_status=previous_status or "",
+                    note=note,
+                    created_by=user,
+                    modified_by=user,
+                )
+                for object_id, previous_status in changes
+            ],
+            batch_size=batch_size,
+        )
@@ -1,5 +1,15 @@
+import json
+import logging
+from typing import Optional
+
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections, transaction
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 
+logger = logging.getLogger(__name__)
+
 
 class LargeResultsSetPagination(PageNumberPagination):
     page_size = 1000
@@ -11,3 +21,60 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size = 100
     page_size_query_param = "page_size"
     max_page_size = 1000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids ``COUNT(*)`` on large PostgreSQL tables.
+
+    Unfiltered querysets use the table statistics kept by the planner
+    (``pg_class.reltuples``) and filtered ones the row estimate of
+    ``EXPLAIN``. Exact counts are still used for small results and on
+    other database backends.
+    """
+
+    # Estimates below this value are replaced with an exact count
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self) -> int:
+        """Return the estimated (or exact) number of objects."""
+        estimate = self._estimate_count()
+        if estimate is None or estimate < self.exact_count_threshold:
+            return super().count
+        return estimate
+
+    def _estimate_count(self) -> Optional[int]:
+        """Return the planner estimate of the queryset size, if available."""
+        queryset = self.object_list
+        if not isinstance(queryset, QuerySet):
+            return None
+
+        connection = connections[queryset.db]
+        if connection.vendor != "postgresql":
+            return None
+
+        try:
+            # Savepoint so a failed estimate does not abort the transaction
+            with (
+                transaction.atomic(using=queryset.db),
+                connection.cursor() as cursor,
+            ):
+                if not queryset.query.where:
+                    cursor.execute(
+                        "SELECT reltuples::bigint FROM pg_class "
+                        "WHERE oid = %s::regclass",
+                        [queryset.model._meta.db_table],
+                    )
+                    row = cursor.fetchone()
+                    return int(row[0]) if row and row[0] >= 0 else None
+
+                sql, params = queryset.order_by().query.sql_with_params()
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                return int(plan[0]["Plan"]["Plan Rows"])
+        except DatabaseError as e:
+            logger.warning(f"Could not estimate queryset count: {e}")
+            return None
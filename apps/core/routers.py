@@ -0,0 +1,136 @@
+"""
+Read-replica database routing.
+
+Reads made inside :func:`read_from_replica` (dashboard, analysis and
+export views through ReplicaReadMixin) go to the
+``REPLICA_DATABASE_ALIAS`` database when it is configured. Every other
+read, and every write, uses ``default``, so ETL inserts and analytics
+scans hit different servers.
+
+Replicas lag behind the primary: after a user writes (an unsafe request,
+or any ORM write while handling it) ReplicaStickinessMiddleware sets a
+short-lived cookie keeping that user's reads on the primary for
+``REPLICA_STICKY_SECONDS`` (read-your-writes).
+
+The state lives in context variables, so it follows threads started with
+a copy of the context (e.g. the query pool of apps.core.concurrency). It
+is reset once the view returns: streamed response bodies read from the
+primary.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+_pinned: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+_request_writes: ContextVar[Optional["RequestWrites"]] = ContextVar(
+    "request_writes", default=None
+)
+
+
+class RequestWrites:
+    """Whether the ORM wrote to the database during a request."""
+
+    def __init__(self) -> None:
+        self.wrote = False
+
+
+def replica_alias() -> Optional[str]:
+    """Return the replica alias, None when no replica is configured."""
+    alias = getattr(settings, "REPLICA_DATABASE_ALIAS", None)
+    return alias if alias and alias in settings.DATABASES else None
+
+
+@contextmanager
+def read_from_replica() -> Iterator[None]:
+    """
+    Send the reads of the block to the replica.
+
+    Usable as a decorator. Reads stay on the primary while the current
+    user is pinned to it (see ReplicaStickinessMiddleware).
+    """
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+@contextmanager
+def pin_to_primary() -> Iterator[None]:
+    """Keep every read of the block on the primary."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaRouter:
+    """Routes replica reads to the replica and everything else to default."""
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        if not _replica_reads.get() or _pinned.get():
+            return None
+        # Reads following a write of the same request see it
+        writes = _request_writes.get()
+        if writes is not None and writes.wrote:
+            return None
+        return replica_alias()
+
+    def db_for_write(self, model, **hints) -> str:
+        writes = _request_writes.get()
+        if writes is not None:
+            writes.wrote = True
+        # Objects read from the replica are saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> Optional[bool]:
+        databases = {DEFAULT_DB_ALIAS, replica_alias()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Keeps the reads of users who just wrote on the primary.
+
+    Settings:
+        REPLICA_STICKY_SECONDS: Seconds reads stay on the primary after
+            a write.
+        REPLICA_STICKY_COOKIE: Name of the cookie marking pinned users.
+    """
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+        self.sticky_seconds = getattr(settings, "REPLICA_STICKY_SECONDS", 10)
+        self.cookie = getattr(settings, "REPLICA_STICKY_COOKIE", "db_primary")
+
+    def __call__(self, request):
+        writes = RequestWrites()
+        pinned_token = _pinned.set(self.cookie in request.COOKIES)
+        writes_token = _request_writes.set(writes)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_writes.reset(writes_token)
+            _pinned.reset(pinned_token)
+
+        if replica_alias() and (
+            writes.wrote or request.method not in SAFE_METHODS
+        ):
+            response.set_cookie(
+                self.cookie,
+                "1",
+                max_age=self.sticky_seconds,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
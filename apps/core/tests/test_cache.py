@@ -0,0 +1,128 @@
+"""Tests for the two-tier cache."""
+
+import threading
+import time
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from apps.core.cache import LocalCache, TieredCache
+
+
+class LocalCacheTest(SimpleTestCase):
+    """Test cases for the in-process LRU cache."""
+
+    def test_expired_entries_are_missing(self) -> None:
+        """Test that entries expire after their TTL."""
+        local = LocalCache()
+        local.set("a", 1, ttl=10)
+        later = time.monotonic() + 11
+
+        with mock.patch("apps.core.cache.time.monotonic", return_value=later):
+            self.assertIsNone(local.get("a", None))
+
+    def test_least_recently_used_is_evicted(self) -> None:
+        """Test that the oldest entry is evicted when full."""
+        local = LocalCache(max_entries=2)
+        local.set("a", 1, ttl=10)
+        local.set("b", 2, ttl=10)
+        local.get("a")
+        local.set("c", 3, ttl=10)
+
+        self.assertEqual(local.get("a"), 1)
+        self.assertIsNone(local.get("b", None))
+        self.assertEqual(local.get("c"), 3)
+
+
+class TieredCacheTest(SimpleTestCase):
+    """Test cases for TieredCache."""
+
+    def setUp(self) -> None:
+        self.prefix = f"test-{uuid.uuid4().hex}"
+        self.cache = self._make_cache()
+
+    def _make_cache(self, **kwargs) -> TieredCache:
+        """Return a cache sharing L2 with ``self.cache``."""
+        options = {"prefix": self.prefix, "l1_ttl": 60, "lock_wait": 1}
+        options.update(kwargs)
+        return TieredCache(**options)
+
+    def test_l1_then_l2_hits(self) -> None:
+        """Test that values are served from L1, then from L2."""
+        self.cache.set("key", {"value": 1}, timeout=60)
+
+        self.assertEqual(self.cache.get("key"), {"value": 1})
+        self.cache.clear_local()
+        self.assertEqual(self.cache.get("key"), {"value": 1})
+        self.assertIsNone(self.cache.get("missing"))
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["l1_hits"], 1)
+        self.assertEqual(stats["l2_hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertAlmostEqual(stats["hit_ratio"], 2 / 3, places=3)
+
+    def test_values_are_shared_between_processes(self) -> None:
+        """Test that another process reads values through L2."""
+        other = self._make_cache()
+        self.cache.set("key", "shared", timeout=60)
+
+        self.assertEqual(other.get("key"), "shared")
+
+    def test_tag_invalidation(self) -> None:
+        """Test that invalidating a tag drops entries in every process."""
+        other = self._make_cache(l1_ttl=0)
+        self.cache.set("a", 1, timeout=60, tags=["org:1"])
+        self.cache.set("b", 2, timeout=60, tags=["org:2"])
+        self.assertEqual(other.get("a"), 1)
+
+        self.cache.invalidate_tags("org:1")
+
+        self.assertIsNone(self.cache.get("a"))
+        self.assertIsNone(other.get("a"))
+        self.assertEqual(other.get("b"), 2)
+
+    def test_get_or_set_computes_once(self) -> None:
+        """Test that the default is only called on a miss."""
+        compute = mock.Mock(return_value=[1, 2, 3])
+
+        first = self.cache.get_or_set("key", compute, timeout=60)
+        second = self.cache.get_or_set("key", compute, timeout=60)
+
+        self.assertEqual(first, second)
+        compute.assert_called_once()
+
+    def test_get_or_set_caches_falsy_values(self) -> None:
+        """Test that None and empty values are cached too."""
+        compute = mock.Mock(return_value=None)
+
+        self.cache.get_or_set("key", compute, timeout=60)
+        self.cache.get_or_set("key", compute, timeout=60)
+
+        compute.assert_called_once()
+
+    def test_get_or_set_waits_for_concurrent_recompute(self) -> None:
+        """Test that a locked key waits for the value instead of computing."""
+        self.cache.backend.add(self.cache._lock_key("key"), 1, 30)
+        producer = self._make_cache()
+        timer = threading.Timer(
+            0.2, producer.set, args=("key", "fresh"), kwargs={"timeout": 60}
+        )
+        timer.start()
+        self.addCleanup(timer.cancel)
+        compute = mock.Mock(return_value="recomputed")
+
+        value = self.cache.get_or_set("key", compute, timeout=60)
+
+        self.assertEqual(value, "fresh")
+        compute.assert_not_called()
+
+    def test_get_or_set_computes_after_lock_wait(self) -> None:
+        """Test that a stale lock does not block callers forever."""
+        cache = self._make_cache(lock_wait=0.1)
+        cache.backend.add(cache._lock_key("key"), 1, 30)
+
+        value = cache.get_or_set("key", lambda: "computed", timeout=60)
+
+        self.assertEqual(value, "computed")
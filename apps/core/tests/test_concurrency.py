@@ -0,0 +1,112 @@
+"""Tests for the query pool."""
+
+import threading
+from unittest import mock
+
+from django.db import connections
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+
+from apps.core.concurrency import run_concurrently
+from apps.core.middleware import RequestMetrics, _current_metrics
+from apps.users.models import Organization
+
+
+class RunConcurrentlyTest(SimpleTestCase):
+    """Test cases for tasks run outside of a transaction."""
+
+    def test_tasks_run_in_parallel(self) -> None:
+        """Test that tasks waiting on each other all complete."""
+        barrier = threading.Barrier(3, timeout=5)
+
+        def task(value):
+            return lambda: (barrier.wait(), value)[1]
+
+        results = run_concurrently({name: task(name) for name in "abc"})
+
+        self.assertEqual(results, {"a": "a", "b": "b", "c": "c"})
+
+    def test_errors_are_raised(self) -> None:
+        """Test that a failing task raises in the caller."""
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaisesMessage(ValueError, "boom"):
+            run_concurrently({"ok": lambda: 1, "fail": fail})
+
+    @override_settings(QUERY_POOL_WORKERS=0)
+    def test_disabled_pool_runs_inline(self) -> None:
+        """Test that a pool of 0 workers runs tasks in the caller."""
+        results = run_concurrently(
+            {
+                "a": threading.get_ident,
+                "b": threading.get_ident,
+            }
+        )
+
+        self.assertEqual(set(results.values()), {threading.get_ident()})
+
+
+class RunConcurrentlyTransactionTest(TestCase):
+    """Test cases for tasks run inside a transaction."""
+
+    def test_transaction_runs_inline(self) -> None:
+        """Test that uncommitted rows stay visible to the tasks."""
+        Organization.objects.create(name="Uncommitted")
+
+        results = run_concurrently(
+            {
+                "count": Organization.objects.count,
+                "thread": threading.get_ident,
+            }
+        )
+
+        self.assertEqual(results["count"], 1)
+        self.assertEqual(results["thread"], threading.get_ident())
+
+
+class RunConcurrentlyQueriesTest(TransactionTestCase):
+    """Test cases for queries run in the pool."""
+
+    def test_queries_are_recorded_in_request_metrics(self) -> None:
+        """Test that pool queries count in the current request metrics."""
+        Organization.objects.create(name="Committed")
+        metrics = RequestMetrics()
+        token = _current_metrics.set(metrics)
+        try:
+            results = run_concurrently(
+                {
+                    "count": Organization.objects.count,
+                    "names": lambda: list(
+                        Organization.objects.values_list("name", flat=True)
+                    ),
+                }
+            )
+        finally:
+            _current_metrics.reset(token)
+
+        self.assertEqual(results, {"count": 1, "names": ["Committed"]})
+        self.assertEqual(metrics.query_count, 2)
+
+    def test_pool_threads_keep_their_connections(self) -> None:
+        """Test that healthy connections are not closed between tasks."""
+        wrapper = type(connections["default"])
+        tasks = {
+            "a": Organization.objects.count,
+            "b": Organization.objects.count,
+        }
+
+        with mock.patch.object(wrapper, "close", autospec=True) as close:
+            run_concurrently(tasks)
+            run_concurrently(tasks)
+        self.assertFalse(close.called)
+
+        with override_settings(QUERY_POOL_CONN_MAX_AGE=0):
+            with mock.patch.object(wrapper, "close", autospec=True) as close:
+                run_concurrently(tasks)
+        self.assertTrue(close.called)
@@ -0,0 +1,104 @@
+"""
+Tests for the request instrumentation middleware.
+
+Test cases for query counting, duplicated query detection, cache
+accounting, Server-Timing headers and slow request logging.
+"""
+
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.core.middleware import (
+    RequestInstrumentationMiddleware,
+    fingerprint_sql,
+    get_current_metrics,
+    record_cache_access,
+)
+from apps.users.models import User
+
+
+def duplicated_queries_view(request):
+    """View issuing the same query several times, like an N+1 loop."""
+    for _ in range(3):
+        User.objects.filter(email="nobody@example.com").exists()
+    record_cache_access(hit=True)
+    record_cache_access(hit=False)
+    return HttpResponse("ok")
+
+
+class FingerprintSQLTestCase(TestCase):
+    """Test cases for SQL fingerprinting."""
+
+    def test_whitespace_normalized(self) -> None:
+        """Test that whitespace differences share a fingerprint."""
+        self.assertEqual(
+            fingerprint_sql("SELECT  *\n FROM t"),
+            fingerprint_sql("SELECT * FROM t"),
+        )
+
+    def test_in_clause_collapsed(self) -> None:
+        """Test that IN lists of different lengths share a fingerprint."""
+        self.assertEqual(
+            fingerprint_sql("SELECT * FROM t WHERE id IN (%s, %s)"),
+            fingerprint_sql("SELECT * FROM t WHERE id IN (%s, %s, %s)"),
+        )
+
+
+@override_settings(
+    INSTRUMENTATION_ENABLED=True,
+    INSTRUMENTATION_SERVER_TIMING=True,
+    INSTRUMENTATION_SAMPLE_RATE=0.0,
+    INSTRUMENTATION_SLOW_REQUEST_MS=60000,
+)
+class RequestInstrumentationMiddlewareTestCase(TestCase):
+    """Test cases for RequestInstrumentationMiddleware."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.factory = RequestFactory()
+
+    def test_server_timing_header(self) -> None:
+        """Test that query and cache metrics are exposed as Server-Timing."""
+        middleware = RequestInstrumentationMiddleware(duplicated_queries_view)
+
+        response = middleware(self.factory.get("/"))
+
+        header = response["Server-Timing"]
+        self.assertIn('desc="3 queries"', header)
+        self.assertIn('dup;desc="1 duplicated"', header)
+        self.assertIn("hits=1 misses=1", header)
+        self.assertIn("total;dur=", header)
+
+    def test_metrics_scoped_to_request(self) -> None:
+        """Test that metrics are only available during the request."""
+        middleware = RequestInstrumentationMiddleware(duplicated_queries_view)
+        middleware(self.factory.get("/"))
+
+        self.assertIsNone(get_current_metrics())
+
+    def test_sampled_out_requests_not_logged(self) -> None:
+        """Test that fast requests are skipped when sampled out."""
+        middleware = RequestInstrumentationMiddleware(duplicated_queries_view)
+
+        with self.assertNoLogs("apps.core.middleware", level="INFO"):
+            middleware(self.factory.get("/"))
+
+    @override_settings(INSTRUMENTATION_SLOW_REQUEST_MS=0)
+    def test_slow_requests_always_logged(self) -> None:
+        """Test that slow requests are logged regardless of sampling."""
+        middleware = RequestInstrumentationMiddleware(duplicated_queries_view)
+
+        with self.assertLogs("apps.core.middleware", level="WARNING") as logs:
+            middleware(self.factory.get("/"))
+
+        self.assertIn('"db_queries": 3', logs.output[0])
+        self.assertIn('"slow": true', logs.output[0])
+
+    @override_settings(INSTRUMENTATION_ENABLED=False)
+    def test_disabled(self) -> None:
+        """Test that no header is emitted when disabled."""
+        middleware = RequestInstrumentationMiddleware(duplicated_queries_view)
+
+        response = middleware(self.factory.get("/"))
+
+        self.assertNotIn("Server-Timing", response)
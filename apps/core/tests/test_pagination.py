@@ -0,0 +1,31 @@
+"""Tests for the core paginators."""
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.core.pagination import EstimatedCountPaginator
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    """Test cases for EstimatedCountPaginator."""
+
+    def test_exact_count_on_other_backends(self) -> None:
+        """Test that non-PostgreSQL databases use an exact count."""
+        user_model = get_user_model()
+        for i in range(3):
+            user_model.objects.create_user(
+                email=f"user{i}@example.com", password=None
+            )
+
+        paginator = EstimatedCountPaginator(
+            user_model.objects.order_by("pk"), 2
+        )
+
+        self.assertEqual(paginator.count, 3)
+        self.assertEqual(paginator.num_pages, 2)
+
+    def test_lists_are_counted(self) -> None:
+        """Test that plain sequences are supported."""
+        paginator = EstimatedCountPaginator(list(range(5)), 2)
+
+        self.assertEqual(paginator.count, 5)
@@ -0,0 +1,183 @@
+"""
+Tests for the read-replica routing.
+
+The test settings declare a second SQLite database ("replica") that the
+router only uses when REPLICA_DATABASE_ALIAS is enabled, so reads can be
+told apart by the rows each database holds.
+"""
+
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from apps.core.cache import TieredCache
+from apps.core.routers import (
+    ReplicaStickinessMiddleware,
+    pin_to_primary,
+    read_from_replica,
+)
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.users.models import Organization
+
+
+def organization_names() -> list:
+    return list(Organization.objects.values_list("name", flat=True))
+
+
+@override_settings(REPLICA_DATABASE_ALIAS="replica")
+class ReplicaRouterTest(TestCase):
+    """Test cases for ReplicaRouter."""
+
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        Organization.objects.using("default").create(name="Primary")
+        Organization.objects.using("replica").create(name="Replica")
+
+    def test_replica_reads(self) -> None:
+        """Test that only the annotated reads go to the replica."""
+        with read_from_replica():
+            self.assertEqual(organization_names(), ["Replica"])
+            with pin_to_primary():
+                self.assertEqual(organization_names(), ["Primary"])
+        self.assertEqual(organization_names(), ["Primary"])
+
+    def test_writes_go_to_primary(self) -> None:
+        """Test that objects read from the replica are saved to default."""
+        with read_from_replica():
+            organization = Organization.objects.get()
+            organization.description = "Saved"
+            organization.save()
+
+        self.assertEqual(
+            list(
+                Organization.objects.using("default").values_list(
+                    "name", "description"
+                )
+            ),
+            [("Replica", "Saved")],
+        )
+
+    @override_settings(REPLICA_DATABASE_ALIAS=None)
+    def test_no_replica_configured(self) -> None:
+        """Test that every read uses default without a replica."""
+        with read_from_replica():
+            self.assertEqual(organization_names(), ["Primary"])
+
+
+@override_settings(REPLICA_DATABASE_ALIAS="replica")
+class ReplicaCacheTest(TestCase):
+    """Test cases for cached values computed from replica reads."""
+
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        Organization.objects.using("default").create(name="Primary")
+        Organization.objects.using("replica").create(name="Replica")
+        self.cache = TieredCache(prefix="replica-test", l1_ttl=0)
+        self.cache.backend.clear()
+
+    def test_recent_invalidation_reads_primary(self) -> None:
+        """Test that a lagging replica is not cached after a write."""
+        self.cache.invalidate_tags("org:1")
+
+        with read_from_replica():
+            names = self.cache.get_or_set(
+                "names", organization_names, tags=["org:1"]
+            )
+
+        self.assertEqual(names, ["Primary"])
+
+    def test_older_invalidation_reads_replica(self) -> None:
+        """Test that recomputes read the replica once it caught up."""
+        self.cache.invalidate_tags("org:1")
+        self.cache.replica_lag = 0
+
+        with read_from_replica():
+            names = self.cache.get_or_set(
+                "names", organization_names, tags=["org:1"]
+            )
+
+        self.assertEqual(names, ["Replica"])
+
+
+@override_settings(REPLICA_DATABASE_ALIAS="replica")
+class ReplicaStickinessMiddlewareTest(TestCase):
+    """Test cases for the read-your-writes stickiness."""
+
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        Organization.objects.using("default").create(name="Primary")
+        Organization.objects.using("replica").create(name="Replica")
+
+    def test_writes_pin_the_user(self) -> None:
+        """Test the cookie after a write, and reads after it."""
+        seen = []
+
+        def write(request):
+            Organization.objects.create(name="New")
+            with read_from_replica():
+                seen.append(sorted(organization_names()))
+            return HttpResponse()
+
+        def read(request):
+            with read_from_replica():
+                seen.append(organization_names())
+            return HttpResponse()
+
+        written = ReplicaStickinessMiddleware(write)(self.factory.get("/"))
+        pinned_request = self.factory.get("/")
+        pinned_request.COOKIES["db_primary"] = "1"
+        ReplicaStickinessMiddleware(read)(pinned_request)
+        unpinned = ReplicaStickinessMiddleware(read)(self.factory.get("/"))
+
+        self.assertEqual(written.cookies["db_primary"]["max-age"], 10)
+        self.assertNotIn("db_primary", unpinned.cookies)
+        self.assertEqual(
+            seen, [["New", "Primary"], ["New", "Primary"], ["Replica"]]
+        )
+
+    def test_unsafe_methods_pin_the_user(self) -> None:
+        """Test that POST requests set the cookie without ORM writes."""
+        response = ReplicaStickinessMiddleware(lambda r: HttpResponse())(
+            self.factory.post("/")
+        )
+
+        self.assertIn("db_primary", response.cookies)
+
+
+@override_settings(REPLICA_DATABASE_ALIAS="replica")
+class DashboardReplicaTest(TestCase):
+    """Test cases for the dashboard views reading from the replica."""
+
+    databases = {"default", "replica"}
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        FleetSeedingService(
+            organizations=1,
+            machines_per_org=1,
+            components_per_machine=1,
+            samples_per_component=3,
+            seed=50,
+            prefix="RPL",
+        ).seed()
+        cls.user = get_user_model().objects.create_user(
+            email="replica@example.com", password="password", is_staff=True
+        )
+
+    def test_dashboard_data_reads_replica(self) -> None:
+        """Test that the dashboard aggregates come from the replica."""
+        self.client.force_login(self.user)
+        url = reverse("apps.dashboard:data_api")
+
+        replica = self.client.get(url).json()
+        self.client.cookies["db_primary"] = "1"
+        primary = self.client.get(url).json()
+
+        # The replica database of the tests holds no reports
+        self.assertEqual(replica["total_reports"], 0)
+        self.assertEqual(primary["total_reports"], 3)
@@ -0,0 +1,304 @@
+"""
+Latency benchmark harness for dashboard endpoints.
+
+Seeds a synthetic fleet with bulk inserts, drives every dashboard JSON/export
+endpoint through the Django test client and reports p50/p95 latency and query
+counts per endpoint. Runs against whatever database ``default`` points to
+(SQLite locally, PostgreSQL when ``DATABASE_URL`` is set) and rolls back all
+seeded data when finished.
+"""
+
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth.models import Permission
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.users import models as users_models
+
+logger = logging.getLogger(__name__)
+
+# Default budgets applied when no per-endpoint override is configured.
+DEFAULT_BUDGET_MS = 500
+DEFAULT_MAX_QUERIES = 25
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Return the nearest-rank percentile of a list of values.
+
+    Args:
+        values: Sample values.
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        Percentile value, or 0.0 for an empty sample.
+    """
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+@dataclass
+class EndpointResult:
+    """Latency and query statistics collected for one endpoint."""
+
+    name: str
+    timings_ms: List[float] = field(default_factory=list)
+    query_counts: List[int] = field(default_factory=list)
+    status_codes: List[int] = field(default_factory=list)
+    budget_ms: float = DEFAULT_BUDGET_MS
+    max_queries: int = DEFAULT_MAX_QUERIES
+
+    @property
+    def p50_ms(self) -> float:
+        return percentile(self.timings_ms, 50)
+
+    @property
+    def p95_ms(self) -> float:
+        return percentile(self.timings_ms, 95)
+
+    @property
+    def queries(self) -> int:
+        """Worst query count observed across iterations."""
+        return max(self.query_counts) if self.query_counts else 0
+
+    @property
+    def violations(self) -> List[str]:
+        """Return human readable budget violations for this endpoint."""
+        errors = []
+        if self.p95_ms > self.budget_ms:
+            errors.append(
+                f"{self.name}: p95 {self.p95_ms:.1f}ms > "
+                f"budget {self.budget_ms:.0f}ms"
+            )
+        if self.queries > self.max_queries:
+            errors.append(
+                f"{self.name}: {self.queries} queries > "
+                f"budget {self.max_queries}"
+            )
+        failed = [code for code in self.status_codes if code >= 400]
+        if failed:
+            errors.append(f"{self.name}: HTTP {failed[0]} responses")
+        return errors
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "endpoint": self.name,
+            "p50_ms": round(self.p50_ms, 2),
+            "p95_ms": round(self.p95_ms, 2),
+            "queries": self.queries,
+            "budget_ms": self.budget_ms,
+            "max_queries": self.max_queries,
+        }
+
+
+class DashboardBenchmark:
+    """
+    Benchmark dashboard endpoints against a seeded dataset.
+
+    Budgets can be tuned per endpoint through the ``budgets`` argument or the
+    ``DASHBOARD_BENCHMARK_BUDGETS`` setting, e.g.::
+
+        DASHBOARD_BENCHMARK_BUDGETS = {
+            "export_download": {"budget_ms": 2000, "max_queries": 10},
+        }
+    """
+
+    COMPONENT_TYPES = ("MOTOR", "TRANSMISION", "SISTEMA HIDRAULICO")
+
+    def __init__(
+        self,
+        organizations: int = 2,
+        machines: int = 5,
+        reports: int = 20,
+        iterations: int = 10,
+        warmup: int = 1,
+        budget_ms: float = DEFAULT_BUDGET_MS,
+        max_queries: int = DEFAULT_MAX_QUERIES,
+        budgets: Optional[Dict[str, Dict[str, float]]] = None,
+        seed: int = 42,
+    ) -> None:
+        """
+        Initialize benchmark configuration.
+
+        Args:
+            organizations: Number of organizations to seed.
+            machines: Machines per organization.
+            reports: Reports (with analysis) per machine.
+            iterations: Timed requests per endpoint.
+            warmup: Untimed requests per endpoint before measuring.
+            budget_ms: Default p95 latency budget in milliseconds.
+            max_queries: Default maximum queries per request.
+            budgets: Per-endpoint overrides keyed by endpoint name.
+            seed: Random seed for reproducible datasets.
+        """
+        self.organizations = organizations
+        self.machines = machines
+        self.reports = reports
+        self.iterations = iterations
+        self.warmup = warmup
+        self.budget_ms = budget_ms
+        self.max_queries = max_queries
+        self.budgets = {
+            **getattr(settings, "DASHBOARD_BENCHMARK_BUDGETS", {}),
+            **(budgets or {}),
+        }
+        self.seed_value = seed
+
+        self.staff_user = None
+        self.org_user = None
+        self.component = None
+
+    # ------------------------------------------------------------------
+    # Seeding
+    # ------------------------------------------------------------------
+
+    def seed(self) -> None:
+        """Create the benchmark users and a seeded fleet."""
+        suffix = f"{int(time.time() * 1000)}"
+
+        self.staff_user = users_models.User.objects.create_user(
+            email=f"bench-staff-{suffix}@example.com",
+            password=None,
+            is_staff=True,
+        )
+        self.org_user = users_models.User.objects.create_user(
+            email=f"bench-org-{suffix}@example.com", password=None
+        )
+        self.org_user.user_permissions.add(
+            *Permission.objects.filter(
+                content_type__app_label="dashboard",
+                codename__in=[
+                    "view_component_analysis",
+                    "export_component_analysis",
+                ],
+            )
+        )
+
+        fleet = FleetSeedingService(
+            organizations=self.organizations,
+            machines_per_org=self.machines,
+            components_per_machine=len(self.COMPONENT_TYPES),
+            samples_per_component=math.ceil(
+                self.reports / len(self.COMPONENT_TYPES)
+            ),
+            cadence_days=max(
+                1, 180 * len(self.COMPONENT_TYPES) // self.reports
+            ),
+            seed=self.seed_value,
+            prefix=f"BENCH-{suffix}",
+            component_types=list(self.COMPONENT_TYPES),
+        ).seed()
+
+        users_models.Account.objects.create(
+            user=self.org_user, organization=fleet.organizations[0]
+        )
+        self.component = fleet.components[0]
+
+    # ------------------------------------------------------------------
+    # Measurement
+    # ------------------------------------------------------------------
+
+    def get_endpoints(self) -> List[Dict[str, Any]]:
+        """Return the endpoints to benchmark with their request context."""
+        return [
+            {
+                "name": "data_api",
+                "url": reverse("apps.dashboard:data_api"),
+                "user": self.staff_user,
+                "params": {},
+            },
+            {
+                "name": "org_overview_api",
+                "url": reverse("apps.dashboard:org_overview_api"),
+                "user": self.org_user,
+                "params": {},
+            },
+            {
+                "name": "analysis_data_api",
+                "url": reverse("apps.dashboard:analysis_data_api"),
+                "user": self.org_user,
+                "params": {"component": self.component.id},
+            },
+            {
+                "name": "comparison_data_api",
+                "url": reverse("apps.dashboard:comparison_data_api"),
+                "user": self.org_user,
+                "params": {},
+            },
+            {
+                "name": "export_preview",
+                "url": reverse("apps.dashboard:export_preview"),
+                "user": self.org_user,
+                "params": {},
+            },
+            {
+                "name": "export_download",
+                "url": reverse("apps.dashboard:export_download"),
+                "user": self.org_user,
+                "params": {},
+            },
+        ]
+
+    def measure(self, endpoint: Dict[str, Any]) -> EndpointResult:
+        """
+        Measure latency and query counts for a single endpoint.
+
+        Args:
+            endpoint: Endpoint definition from ``get_endpoints``.
+
+        Returns:
+            Collected endpoint statistics.
+        """
+        overrides = self.budgets.get(endpoint["name"], {})
+        result = EndpointResult(
+            name=endpoint["name"],
+            budget_ms=overrides.get("budget_ms", self.budget_ms),
+            max_queries=overrides.get("max_queries", self.max_queries),
+        )
+
+        client = Client()
+        client.force_login(endpoint["user"])
+
+        for _ in range(self.warmup):
+            client.get(endpoint["url"], endpoint["params"])
+
+        for _ in range(self.iterations):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = client.get(endpoint["url"], endpoint["params"])
+                elapsed = (time.perf_counter() - started) * 1000
+
+            result.timings_ms.append(elapsed)
+            result.query_counts.append(len(queries))
+            result.status_codes.append(response.status_code)
+
+        logger.debug(f"Benchmark {endpoint['name']}: {result.as_dict()}")
+        return result
+
+    def run(self) -> List[EndpointResult]:
+        """
+        Seed the dataset, measure every endpoint and roll everything back.
+
+        Returns:
+            List of endpoint results.
+        """
+        results = []
+        with transaction.atomic():
+            self.seed()
+            for endpoint in self.get_endpoints():
+                results.append(self.measure(endpoint))
+            transaction.set_rollback(True)
+        return results
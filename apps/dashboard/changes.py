@@ -0,0 +1,136 @@
+"""
+Change checks of the dashboards.
+
+An open dashboard polls one cheap endpoint instead of refetching its
+APIs. The endpoint reads the L2 versions of the cache tags the dashboard
+depends on, which every invalidation bumps (e.g. when the ETL or a bulk
+upload commits reports), and returns their fingerprint as the ``ETag``.
+A page sends back the ``ETag`` of its last response in ``If-None-Match``:
+
+- unchanged versions answer ``304 Not Modified`` at once, after a single
+  cache read and without touching the database;
+- otherwise the KPIs are read again through the shared cache and sent as
+  JSON ``{"event": ..., "data": ...}``, so the database load does not
+  grow with the number of open tabs.
+
+Events:
+
+- ``snapshot``: every KPI, sent when the client has no KPIs to update.
+- ``delta``: the KPIs that changed since the ``ETag`` of the client.
+- ``change``: without a snapshot callable, only that the data changed,
+  for pages that refetch their (uncached) data themselves.
+- ``version``: without a snapshot callable, the first answer, which only
+  carries the ``ETag`` to send back.
+
+No request waits for a change, so each check holds a (sync) worker only
+for the time of one cache read; pages poll every
+``DASHBOARD_CHANGES_POLL_MS``. The KPIs sent with an ``ETag`` are kept in
+the cache, so the next check sends only what changed since.
+"""
+
+import hashlib
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags, quote_etag
+
+from apps.core.cache import tiered_cache
+from apps.dashboard.payloads import dumps
+
+
+def kpi_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict:
+    """Return the keys of ``current`` whose value changed."""
+    return {
+        key: value
+        for key, value in current.items()
+        if key not in previous or previous[key] != value
+    }
+
+
+def versions_id(versions: Dict[str, Optional[int]]) -> str:
+    """Return the ``ETag`` (a digest) of a set of tag versions."""
+    fingerprint = ":".join(
+        f"{tag}={versions[tag]}" for tag in sorted(versions)
+    )
+    return hashlib.md5(fingerprint.encode()).hexdigest()
+
+
+class ChangeCheck:
+    """
+    Conditional response telling a dashboard what changed.
+
+    Attributes:
+        tags: Cache tags the KPIs depend on.
+        snapshot: Callable returning the current KPIs, expected to read
+            them through the tiered cache; None for ``change`` events.
+        key: Cache key identifying the KPIs of this check (e.g. the
+            organization and filters), under which the KPIs sent are
+            kept for the deltas of the next check.
+        if_none_match: ``If-None-Match`` header sent by the client.
+    """
+
+    def __init__(
+        self,
+        tags: Sequence[str],
+        snapshot: Optional[Callable[[], Dict[str, Any]]] = None,
+        key: Optional[str] = None,
+        if_none_match: Optional[str] = None,
+    ) -> None:
+        """
+        Initialize the check.
+
+        Args:
+            tags: Cache tags the KPIs depend on.
+            snapshot: Callable returning the current KPIs, if any.
+            key: Cache key identifying the KPIs of this check.
+            if_none_match: ``If-None-Match`` header of the request.
+        """
+        self.tags = list(tags)
+        self.snapshot = snapshot
+        self.key = key
+        etags = parse_etags(if_none_match or "")
+        # The page sends back the one ETag it last received
+        self.last_id = (
+            etags[0].removeprefix("W/").strip('"') if etags else None
+        )
+
+    def _sent_key(self, event_id: str) -> str:
+        return f"dashboard-changes:{self.key}:{event_id}"
+
+    def _event(self, event_id: str) -> Dict[str, Any]:
+        """Return the event bringing the client up to ``event_id``."""
+        if not self.snapshot:
+            event = "change" if self.last_id else "version"
+            return {"event": event, "data": {}}
+
+        current = self.snapshot()
+        previous = None
+        if self.key is not None:
+            tiered_cache.set(
+                self._sent_key(event_id),
+                current,
+                timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+            )
+            if self.last_id:
+                previous = tiered_cache.get(self._sent_key(self.last_id))
+        if previous is None:
+            return {"event": "snapshot", "data": current}
+        return {"event": "delta", "data": kpi_delta(previous, current)}
+
+    def response(self) -> HttpResponse:
+        """Return a 304 when nothing changed, else the event as JSON."""
+        event_id = versions_id(tiered_cache.current_versions(*self.tags))
+        if event_id == self.last_id:
+            response = HttpResponseNotModified()
+        else:
+            if self.last_id:
+                # Invalidations made by other processes leave L1 entries
+                # of this one in place until they expire
+                tiered_cache.local.delete_tagged(self.tags)
+            response = HttpResponse(
+                dumps(self._event(event_id)), content_type="application/json"
+            )
+        response["ETag"] = quote_etag(event_id)
+        response["Cache-Control"] = "no-cache, private"
+        return response
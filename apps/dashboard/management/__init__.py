@@ -0,0 +1 @@
+"""Dashboard management module."""
@@ -0,0 +1,111 @@
+"""Dashboard management commands."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.dashboard.benchmarks import (
+    DEFAULT_BUDGET_MS,
+    DEFAULT_MAX_QUERIES,
+    DashboardBenchmark,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Benchmark dashboard API endpoints against a seeded dataset."""
+
+    help = (
+        "Seed a synthetic fleet, measure p50/p95 latency and query counts "
+        "of the dashboard endpoints and fail when a budget is exceeded. "
+        "All seeded data is rolled back."
+    )
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-line arguments.
+
+        Args:
+            parser: Argument parser instance.
+        """
+        parser.add_argument(
+            "--organizations",
+            type=int,
+            default=2,
+            help="Number of organizations to seed (default: 2)",
+        )
+        parser.add_argument(
+            "--machines",
+            type=int,
+            default=5,
+            help="Machines per organization (default: 5)",
+        )
+        parser.add_argument(
+            "--reports",
+            type=int,
+            default=20,
+            help="Reports with analysis per machine (default: 20)",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=10,
+            help="Timed requests per endpoint (default: 10)",
+        )
+        parser.add_argument(
+            "--budget-ms",
+            type=float,
+            default=DEFAULT_BUDGET_MS,
+            help=f"p95 latency budget in ms (default: {DEFAULT_BUDGET_MS})",
+        )
+        parser.add_argument(
+            "--max-queries",
+            type=int,
+            default=DEFAULT_MAX_QUERIES,
+            help=f"Maximum queries per request (default: {DEFAULT_MAX_QUERIES})",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Execute the command.
+
+        Raises:
+            CommandError: If any endpoint exceeds its budget.
+        """
+        benchmark = DashboardBenchmark(
+            organizations=options["organizations"],
+            machines=options["machines"],
+            reports=options["reports"],
+            iterations=options["iterations"],
+            budget_ms=options["budget_ms"],
+            max_queries=options["max_queries"],
+        )
+
+        self.stdout.write(
+            f"Running dashboard benchmark on {connection.vendor} "
+            f"({options['organizations']} orgs x {options['machines']} "
+            f"machines x {options['reports']} reports)..."
+        )
+
+        results = benchmark.run()
+
+        self.stdout.write(
+            f"\n{'Endpoint':<22}{'p50 (ms)':>10}{'p95 (ms)':>10}"
+            f"{'Queries':>9}{'Budget':>9}"
+        )
+        violations = []
+        for result in results:
+            self.stdout.write(
+                f"{result.name:<22}{result.p50_ms:>10.1f}{result.p95_ms:>10.1f}"
+                f"{result.queries:>9}{result.budget_ms:>9.0f}"
+            )
+            violations.extend(result.violations)
+
+        if violations:
+            for violation in violations:
+                logger.warning(f"Benchmark budget exceeded - {violation}")
+            raise CommandError("Budget exceeded:\n" + "\n".join(violations))
+
+        self.stdout.write(self.style.SUCCESS("\nAll endpoints within budget"))
@@ -0,0 +1,312 @@
+"""
+Response formats of the dashboard chart APIs.
+
+The default format is the plain JSON built by the views. Clients can ask
+for a compact format with ``?format=`` or the ``Accept`` header:
+
+- ``columnar`` (``application/vnd.lubeai.columnar+json``): the ``dates``
+  arrays of every chart are replaced by an index into shared ``axes``
+  (the first epoch day and the day steps between dates), series ``data``
+  are base64 little-endian typed arrays of the narrowest exact dtype
+  (``uint8``, ``int16`` or ``int32`` with a ``null`` sentinel, else
+  ``float32`` with NaN for missing values) and the record lists named by
+  the endpoint become one list per field, whatever their length.
+  Encoded with orjson; most lab values are small integers, so a point
+  takes about 1.3 characters instead of 6.
+- ``arrow`` (``application/vnd.apache.arrow.stream``): the chart points
+  only, as an Arrow IPC stream with one row per point (``section``,
+  ``series``, ``day``, ``value``), for clients that load them into
+  dataframes. Written by polars, no pyarrow needed.
+"""
+
+import base64
+import io
+import math
+import sys
+from array import array
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+import polars as pl
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+
+JSON_FORMAT = "json"
+COLUMNAR_FORMAT = "columnar"
+ARROW_FORMAT = "arrow"
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.lubeai.columnar+json"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+MEDIA_TYPES = {
+    COLUMNAR_MEDIA_TYPE: COLUMNAR_FORMAT,
+    ARROW_MEDIA_TYPE: ARROW_FORMAT,
+}
+
+_EPOCH = date(1970, 1, 1).toordinal()
+
+
+def dumps(data: Any) -> bytes:
+    """Encode JSON with orjson, falling back to DjangoJSONEncoder types."""
+    return orjson.dumps(data, default=DjangoJSONEncoder().default)
+
+
+def negotiate_format(request) -> str:
+    """Return the format asked by the ``format`` parameter or ``Accept``."""
+    requested = request.GET.get("format")
+    if requested in (JSON_FORMAT, COLUMNAR_FORMAT, ARROW_FORMAT):
+        return requested
+    accept = request.headers.get("Accept", "")
+    for media_type, payload_format in MEDIA_TYPES.items():
+        if media_type in accept:
+            return payload_format
+    return JSON_FORMAT
+
+
+def epoch_day(value: str) -> int:
+    """Convert a ``%Y-%m-%d`` date to days since 1970-01-01."""
+    return date.fromisoformat(value).toordinal() - _EPOCH
+
+
+# Integer dtypes of typed arrays: name, array typecode, value range and
+# the sentinel written for missing values
+_INTEGER_DTYPES = (
+    ("uint8", "B", 0, 254, 255),
+    ("int16", "h", -32767, 32767, -32768),
+    ("int32", "i", -(2**31) + 1, 2**31 - 1, -(2**31)),
+)
+
+
+def _pack(dtype: str, packed: array, null: Any) -> Dict[str, Any]:
+    if sys.byteorder == "big":
+        packed.byteswap()
+    typed = {
+        "dtype": dtype,
+        "length": len(packed),
+        "buffer": base64.b64encode(packed.tobytes()).decode(),
+    }
+    if null is not None:
+        typed["null"] = null
+    return typed
+
+
+def typed_array(values: List[Optional[float]]) -> Dict[str, Any]:
+    """
+    Encode numbers as a base64 little-endian array of the narrowest dtype.
+
+    Whole numbers use the smallest integer dtype holding them, missing
+    values being written as its ``null`` sentinel; anything else is
+    float32 with NaN for missing values.
+    """
+    present = [value for value in values if value is not None]
+    if all(math.isfinite(value) and value == int(value) for value in present):
+        for dtype, typecode, low, high, null in _INTEGER_DTYPES:
+            if all(low <= value <= high for value in present):
+                packed = array(
+                    typecode,
+                    [
+                        null if value is None else int(value)
+                        for value in values
+                    ],
+                )
+                return _pack(dtype, packed, null)
+    packed = array(
+        "f", [math.nan if value is None else value for value in values]
+    )
+    return _pack("float32", packed, None)
+
+
+def _is_dates(value: Any) -> bool:
+    """Whether a value is a list of ``%Y-%m-%d`` strings."""
+    return (
+        isinstance(value, list)
+        and all(isinstance(item, str) and len(item) == 10 for item in value)
+        and all(item[4] == "-" and item[7] == "-" for item in value)
+    )
+
+
+def _is_numbers(value: Any) -> bool:
+    """Whether a value is a list of numbers and nulls."""
+    return isinstance(value, list) and all(
+        item is None
+        or (isinstance(item, (int, float)) and not isinstance(item, bool))
+        for item in value
+    )
+
+
+class _ColumnarEncoder:
+    """Rewrites a JSON payload into the columnar format."""
+
+    def __init__(self) -> None:
+        self.axes: List[Dict[str, Any]] = []
+        self._axis_index: Dict[Tuple[str, ...], int] = {}
+
+    def axis(self, dates: List[str]) -> int:
+        """Return the index of a date axis, adding it when new."""
+        key = tuple(dates)
+        if key not in self._axis_index:
+            days = [epoch_day(value) for value in dates]
+            self._axis_index[key] = len(self.axes)
+            # Day n is start + the sum of the first n + 1 steps
+            self.axes.append(
+                {
+                    "start": days[0] if days else 0,
+                    "steps": typed_array(
+                        [0] + [b - a for a, b in zip(days, days[1:])]
+                        if days
+                        else []
+                    ),
+                }
+            )
+        return self._axis_index[key]
+
+    def records(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Rewrite a list of records as one list per field."""
+        fields = list(rows[0]) if rows else []
+        return {
+            "columns": {
+                field: [self.encode(row.get(field)) for row in rows]
+                for field in fields
+            },
+            "length": len(rows),
+        }
+
+    def encode(self, node: Any) -> Any:
+        if isinstance(node, dict):
+            encoded = {}
+            for key, value in node.items():
+                # Empty charts are encoded too, so the shape never varies
+                if key == "dates" and _is_dates(value):
+                    encoded["axis"] = self.axis(value)
+                elif key == "data" and _is_numbers(value):
+                    encoded[key] = typed_array(value)
+                else:
+                    encoded[key] = self.encode(value)
+            return encoded
+        if isinstance(node, list):
+            return [self.encode(item) for item in node]
+        return node
+
+
+def to_columnar(
+    data: Dict[str, Any], records: Iterable[str] = ()
+) -> Dict[str, Any]:
+    """
+    Rewrite a chart payload into the columnar format.
+
+    Args:
+        data: Payload of the default JSON format.
+        records: Keys of ``data`` holding lists of records, written as
+            ``{"columns": {field: values}, "length": n}``.
+
+    Returns:
+        The payload with ``format``, the shared ``axes`` (``start`` epoch
+        day and typed ``steps``) and every ``dates`` array replaced by its
+        ``axis`` index.
+    """
+    encoder = _ColumnarEncoder()
+    records = set(records)
+    encoded = {
+        key: encoder.records(value)
+        if key in records
+        else encoder.encode(value)
+        for key, value in data.items()
+    }
+    return {"format": COLUMNAR_FORMAT, "axes": encoder.axes, **encoded}
+
+
+def _chart_points(
+    node: Any,
+    path: Tuple[str, ...],
+    dates: Optional[List[str]],
+    rows: List[Tuple[str, str, List[str], List[Optional[float]]]],
+) -> None:
+    """Collect every series aligned on a ``dates`` array."""
+    if isinstance(node, dict):
+        if _is_dates(node.get("dates")):
+            dates = node["dates"]
+        values = node.get("data")
+        if dates and _is_numbers(values) and len(values) == len(dates):
+            name = node.get("name", node.get("component_id", ""))
+            rows.append(("/".join(path), str(name), dates, values))
+            return
+        for key, value in node.items():
+            if key != "series":
+                _chart_points(value, (*path, key), dates, rows)
+            else:
+                _chart_points(value, path, dates, rows)
+    elif isinstance(node, list):
+        for item in node:
+            _chart_points(item, path, dates, rows)
+
+
+def to_arrow(data: Dict[str, Any]) -> bytes:
+    """
+    Write the chart points of a payload as an Arrow IPC stream.
+
+    Args:
+        data: Payload of the default JSON format.
+
+    Returns:
+        Stream with one row per non-null point: ``section`` (path of the
+        chart in the payload), ``series`` (series name), ``day`` and
+        ``value`` (float32).
+    """
+    rows: List[Tuple[str, str, List[str], List[Optional[float]]]] = []
+    _chart_points(data, (), None, rows)
+    schema = {
+        "section": pl.Categorical,
+        "series": pl.Categorical,
+        "day": pl.Utf8,
+        "value": pl.Float32,
+    }
+    points = pl.concat(
+        [
+            pl.DataFrame(
+                {
+                    "section": [section] * len(dates),
+                    "series": [series] * len(dates),
+                    "day": dates,
+                    "value": values,
+                },
+                schema=schema,
+            )
+            for section, series, dates, values in rows
+        ]
+        or [pl.DataFrame(schema=schema)]
+    )
+    buffer = io.BytesIO()
+    points.filter(pl.col("value").is_not_null()).with_columns(
+        pl.col("day").str.to_date("%Y-%m-%d")
+    ).write_ipc_stream(buffer)
+    return buffer.getvalue()
+
+
+def render_payload(
+    request, data: Dict[str, Any], records: Iterable[str] = ()
+) -> HttpResponse:
+    """
+    Return a chart payload in the format negotiated by the request.
+
+    Args:
+        request: Request with the optional ``format`` or ``Accept``.
+        data: Payload of the default JSON format.
+        records: Keys of ``data`` holding lists of records (columnar).
+
+    Returns:
+        JsonResponse for the default format, otherwise the compact body.
+    """
+    payload_format = negotiate_format(request)
+    if payload_format == COLUMNAR_FORMAT:
+        response = HttpResponse(
+            dumps(to_columnar(data, records)),
+            content_type=COLUMNAR_MEDIA_TYPE,
+        )
+    elif payload_format == ARROW_FORMAT:
+        response = HttpResponse(to_arrow(data), content_type=ARROW_MEDIA_TYPE)
+    else:
+        response = JsonResponse(data, safe=False)
+    patch_vary_headers(response, ["Accept"])
+    return response
@@ -1,5 +1,8 @@
 """Component Analysis Service package."""
 
 from apps.dashboard.services.component_analysis import ComponentAnalysisService
+from apps.dashboard.services.component_comparison import (
+    ComponentComparisonService,
+)
 
-__all__ = ["ComponentAnalysisService"]
+__all__ = ["ComponentAnalysisService", "ComponentComparisonService"]
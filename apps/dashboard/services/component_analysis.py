@@ -1,8 +1,19 @@
 import logging
-from typing import Any, Dict
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
 
+import polars as pl
+from django.utils.functional import cached_property
+
+from apps.dashboard.services.downsampling import minmax_indices
 from apps.equipment.models import Component
 from apps.reports.models import Report
+from apps.reports.services.thresholds import (
+    DEFAULT_THRESHOLDS,
+    Thresholds,
+    thresholds_for,
+)
+from apps.reports.services.wear_forecast import forecasts_by_parameter
 
 logger = logging.getLogger(__name__)
 
@@ -10,44 +21,31 @@ logger = logging.getLogger(__name__)
 class ComponentAnalysisService:
     """Service for handling component analysis data and calculations."""
 
-    # Threshold constants (in ppm for metals, other units as specified)
-    THRESHOLDS = {
-        "wear_metals": {
-            "iron_fe": {"warning": 75, "critical": 100, "unit": "ppm"},
-            "copper_cu": {"warning": 20, "critical": 30, "unit": "ppm"},
-            "aluminum_al": {"warning": 15, "critical": 25, "unit": "ppm"},
-        },
-        "contamination": {
-            "silicon_si": {"warning": 15, "critical": 20, "unit": "ppm"},
-            "sodium_na": {"warning": 30, "critical": 50, "unit": "ppm"},
-            "potassium_k": {"warning": 10, "critical": 15, "unit": "ppm"},
-        },
-        "oil_health": {
-            "silicon_si": {"warning": 15, "critical": 20, "unit": "ppm"},
-            "sodium_na": {"warning": 30, "critical": 50, "unit": "ppm"},
-            "potassium_k": {"warning": 10, "critical": 15, "unit": "ppm"},
-            "viscosity_100c": {
-                "warning_low": None,  # Will be calculated dynamically
-                "warning_high": None,
-                "unit": "cSt",
-            },
-        },
-        "additives": {
-            "zinc_zn": {"warning": 800, "critical": 600, "unit": "ppm"},
-            "phosphorus_p": {"warning": 900, "critical": 700, "unit": "ppm"},
-            "magnesium_mg": {"warning": 1800, "critical": 1500, "unit": "ppm"},
-            "calcium_ca": {"warning": 2000, "critical": 1500, "unit": "ppm"},
-        },
-    }
-
-    def __init__(self, component_id: int):
+    # Fleet-wide defaults; per component thresholds come from profiles
+    THRESHOLDS = DEFAULT_THRESHOLDS
+
+    def __init__(
+        self,
+        component_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        max_points: Optional[int] = None,
+    ):
         """
         Initialize service with component context.
 
         Args:
             component_id: ID of the component to analyze
+            start_date: Only analyze samples from this date (zoom window)
+            end_date: Only analyze samples up to this date (zoom window)
+            max_points: Point budget of each chart; longer histories are
+                downsampled keeping the extremes of every series. None
+                returns every sample.
         """
         self.component_id = component_id
+        self.start_date = start_date
+        self.end_date = end_date
+        self.max_points = max_points
         self.component = None
         self.reports_qs = None
         self._load_component()
@@ -69,11 +67,62 @@ class ComponentAnalysisService:
                 .select_related("analysis")
                 .order_by("sample_date")
             )
+            if self.start_date:
+                self.reports_qs = self.reports_qs.filter(
+                    sample_date__gte=self.start_date
+                )
+            if self.end_date:
+                self.reports_qs = self.reports_qs.filter(
+                    sample_date__lte=self.end_date
+                )
 
         except Component.DoesNotExist:
-            logger.error(f"Component {self.component_id} not found or inactive")
+            logger.error(
+                f"Component {self.component_id} not found or inactive"
+            )
             raise ValueError(f"Component {self.component_id} not found")
 
+    @cached_property
+    def thresholds(self) -> Thresholds:
+        """
+        Return the thresholds of the component type and current lubricant.
+
+        The lubricant is taken from the latest report; the thresholds come
+        from the in-memory profile table.
+        """
+        lubricant = self.reports_qs.values_list("lubricant", flat=True).last()
+        return thresholds_for(self.component.type_id, lubricant)
+
+    @cached_property
+    def analysis_reports(self) -> List[Report]:
+        """Reports with analysis data, shared by every chart (one query)."""
+        return list(self.reports_qs.filter(analysis__isnull=False))
+
+    def _chart_reports(self, parameters: Sequence[str]) -> List[Report]:
+        """
+        Return the reports drawn in a chart of some analysis parameters.
+
+        With a point budget, long histories are reduced to the reports
+        holding the minimum and maximum of each parameter per bucket.
+        """
+        reports = self.analysis_reports
+        if not self.max_points or len(reports) <= self.max_points:
+            return reports
+
+        values = pl.DataFrame(
+            {
+                parameter: [
+                    getattr(report.analysis, parameter) for report in reports
+                ]
+                for parameter in parameters
+            },
+            schema={parameter: pl.Float64 for parameter in parameters},
+        )
+        return [
+            reports[index]
+            for index in minmax_indices(values, parameters, self.max_points)
+        ]
+
     def get_component_summary(self) -> Dict[str, Any]:
         """
         Get summary information about the component.
@@ -122,9 +171,9 @@ class ComponentAnalysisService:
         Get wear metal trends data (Fe, Cu, Al).
 
         Returns:
-            Dictionary with series data and thresholds
+            Dictionary with series data, thresholds and wear forecasts
         """
-        reports = self.reports_qs.filter(analysis__isnull=False)
+        reports = self._chart_reports(("iron_fe", "copper_cu", "aluminum_al"))
 
         data_series = {
             "iron_fe": [],
@@ -156,6 +205,7 @@ class ComponentAnalysisService:
 
         return {
             "dates": dates,
+            "total_points": len(self.analysis_reports),
             "series": [
                 {
                     "name": "Hierro (Fe)",
@@ -173,7 +223,8 @@ class ComponentAnalysisService:
                     "color": "#009EF7",
                 },
             ],
-            "thresholds": self.THRESHOLDS["wear_metals"],
+            "thresholds": self.thresholds["wear_metals"],
+            "forecasts": forecasts_by_parameter(self.component_id),
         }
 
     def get_contamination_alerts(self) -> Dict[str, Any]:
@@ -183,7 +234,9 @@ class ComponentAnalysisService:
         Returns:
             Dictionary with series data and thresholds
         """
-        reports = self.reports_qs.filter(analysis__isnull=False)
+        reports = self._chart_reports(
+            ("silicon_si", "sodium_na", "potassium_k")
+        )
 
         data_series = {
             "silicon_si": [],
@@ -215,6 +268,7 @@ class ComponentAnalysisService:
 
         return {
             "dates": dates,
+            "total_points": len(self.analysis_reports),
             "series": [
                 {
                     "name": "Silicio (Si) - Polvo",
@@ -232,7 +286,7 @@ class ComponentAnalysisService:
                     "color": "#50CD89",
                 },
             ],
-            "thresholds": self.THRESHOLDS["contamination"],
+            "thresholds": self.thresholds["contamination"],
         }
 
     def get_oil_health(self) -> Dict[str, Any]:
@@ -242,7 +296,9 @@ class ComponentAnalysisService:
         Returns:
             Dictionary with series data, thresholds, and lubricant usage data
         """
-        reports = self.reports_qs.filter(analysis__isnull=False)
+        reports = self._chart_reports(
+            ("silicon_si", "sodium_na", "potassium_k", "viscosity_100c")
+        )
         measurement_unit = self.detect_measurement_unit()
 
         data_series = {
@@ -301,6 +357,7 @@ class ComponentAnalysisService:
 
         return {
             "dates": dates,
+            "total_points": len(self.analysis_reports),
             "measurement_unit": measurement_unit,
             "unit_label": unit_label,
             "series": [
@@ -335,7 +392,7 @@ class ComponentAnalysisService:
                     "type": "line",
                 },
             ],
-            "thresholds": self.THRESHOLDS["oil_health"],
+            "thresholds": self.thresholds["oil_health"],
         }
 
     def get_additives_trend(self) -> Dict[str, Any]:
@@ -345,7 +402,9 @@ class ComponentAnalysisService:
         Returns:
             Dictionary with series data and thresholds
         """
-        reports = self.reports_qs.filter(analysis__isnull=False)
+        reports = self._chart_reports(
+            ("zinc_zn", "phosphorus_p", "magnesium_mg", "calcium_ca")
+        )
 
         data_series = {
             "zinc_zn": [],
@@ -383,6 +442,7 @@ class ComponentAnalysisService:
 
         return {
             "dates": dates,
+            "total_points": len(self.analysis_reports),
             "series": [
                 {
                     "name": "Zinc (Zn)",
@@ -405,7 +465,7 @@ class ComponentAnalysisService:
                     "color": "#FFC700",
                 },
             ],
-            "thresholds": self.THRESHOLDS["additives"],
+            "thresholds": self.thresholds["additives"],
         }
 
     def get_all_analysis_data(self) -> Dict[str, Any]:
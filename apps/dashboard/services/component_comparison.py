@@ -0,0 +1,191 @@
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+import polars as pl
+
+from apps.equipment.models import Component
+from apps.reports.models import Report
+from apps.reports.services.anomaly_scan import ANOMALY_PARAMETERS
+from apps.reports.services.latest_state import MEASUREMENTS
+from apps.reports.services.thresholds import Thresholds, thresholds_for
+
+logger = logging.getLogger(__name__)
+
+# LabAnalysis fields that can be compared
+COMPARISON_PARAMETERS = tuple(
+    dict.fromkeys((*ANOMALY_PARAMETERS, *MEASUREMENTS))
+)
+
+DEFAULT_COMPARISON_PARAMETERS = (
+    "iron_fe",
+    "copper_cu",
+    "aluminum_al",
+    "silicon_si",
+)
+
+
+def parameter_limits(
+    thresholds: Thresholds, parameter: str
+) -> Optional[Dict[str, Any]]:
+    """Return the limits of a parameter from its first threshold group."""
+    for parameters in thresholds.values():
+        if parameter in parameters:
+            return dict(parameters[parameter])
+    return None
+
+
+class ComponentComparisonService:
+    """
+    Service for comparing the analysis series of several components.
+
+    The reports of every component are read in one query and aligned on
+    the union of their sample dates, so each parameter can be drawn as an
+    overlay chart or as small multiples sharing the same axis.
+    """
+
+    MAX_COMPONENTS = 50
+
+    def __init__(
+        self,
+        components: Sequence[Component],
+        parameters: Sequence[str] = DEFAULT_COMPARISON_PARAMETERS,
+    ):
+        """
+        Initialize service with the components to compare.
+
+        Args:
+            components: Components already checked for access, with their
+                machine and type selected.
+            parameters: LabAnalysis fields of the series.
+        """
+        self.components = list(components)
+        self.parameters = list(parameters)
+
+    def load(self) -> pl.DataFrame:
+        """
+        Read the reports of every component in one query.
+
+        Returns:
+            One row per active dated report with analysis, ordered by
+            component and sample date.
+        """
+        rows = (
+            Report.objects.filter(
+                component_id__in=[
+                    component.pk for component in self.components
+                ],
+                is_active=True,
+                sample_date__isnull=False,
+                analysis__isnull=False,
+            )
+            .order_by("component_id", "sample_date", "pk")
+            .values_list(
+                "component_id",
+                "sample_date",
+                "lubricant",
+                *[f"analysis__{parameter}" for parameter in self.parameters],
+            )
+        )
+        return pl.DataFrame(
+            list(rows),
+            schema={
+                "component_id": pl.Int64,
+                "sample_date": pl.Date,
+                "lubricant": pl.Utf8,
+                **{parameter: pl.Float64 for parameter in self.parameters},
+            },
+            orient="row",
+        )
+
+    def get_comparison_data(self) -> Dict[str, Any]:
+        """
+        Get the aligned series of every component and parameter.
+
+        Returns:
+            Dictionary with the shared ``dates``, one summary per component
+            (with the thresholds of its type and current lubricant) and,
+            per parameter, one series per component aligned on ``dates``
+            (None where the component was not sampled)
+        """
+        df = self.load()
+        dates: List[date] = df["sample_date"].unique().sort().to_list()
+        summaries = {
+            row["component_id"]: row
+            for row in df.group_by("component_id")
+            .agg(
+                pl.len().alias("total_reports"),
+                pl.col("sample_date").last().alias("latest_sample_date"),
+                pl.col("lubricant").drop_nulls().last(),
+            )
+            .iter_rows(named=True)
+        }
+
+        series = {}
+        for parameter in self.parameters:
+            # One row per date of any component, one column per component;
+            # same-day reports keep the last one
+            aligned = (
+                df.pivot(
+                    on="component_id",
+                    index="sample_date",
+                    values=parameter,
+                    aggregate_function="last",
+                ).sort("sample_date")
+                if dates
+                else pl.DataFrame()
+            )
+            series[parameter] = [
+                {
+                    "component_id": component.pk,
+                    "name": self._series_name(component),
+                    "data": (
+                        aligned[str(component.pk)].to_list()
+                        if str(component.pk) in aligned.columns
+                        else [None] * len(dates)
+                    ),
+                }
+                for component in self.components
+            ]
+
+        components = []
+        for component in self.components:
+            summary = summaries.get(component.pk, {})
+            thresholds = thresholds_for(
+                component.type_id, summary.get("lubricant")
+            )
+            latest_sample_date = summary.get("latest_sample_date")
+            components.append(
+                {
+                    "component_id": component.pk,
+                    "component_type": (
+                        component.type.name if component.type else "N/A"
+                    ),
+                    "machine_id": component.machine_id,
+                    "machine_name": component.machine.name,
+                    "total_reports": summary.get("total_reports", 0),
+                    "latest_sample_date": (
+                        latest_sample_date.strftime("%Y-%m-%d")
+                        if latest_sample_date
+                        else None
+                    ),
+                    "thresholds": {
+                        parameter: parameter_limits(thresholds, parameter)
+                        for parameter in self.parameters
+                    },
+                }
+            )
+
+        return {
+            "dates": [
+                sample_date.strftime("%Y-%m-%d") for sample_date in dates
+            ],
+            "parameters": self.parameters,
+            "components": components,
+            "series": series,
+        }
+
+    def _series_name(self, component: Component) -> str:
+        """Return the legend of a component's series."""
+        component_type = component.type.name if component.type else "N/A"
+        return f"{component.machine.name} - {component_type}"
@@ -0,0 +1,57 @@
+from typing import List, Sequence
+
+import polars as pl
+
+
+def minmax_indices(
+    df: pl.DataFrame, columns: Sequence[str], max_points: int
+) -> List[int]:
+    """
+    Select the rows of a multi-series chart within a point budget.
+
+    The rows are split into equal buckets and, in every bucket, the rows
+    holding the minimum and maximum of each column are kept, along with
+    the first and last rows. Unlike averaging, spikes (e.g. a critical
+    reading between normal ones) survive, and every series keeps the same
+    shared x axis.
+
+    Args:
+        df: One row per chart point, in x order.
+        columns: Numeric columns drawn as series (nulls allowed).
+        max_points: Point budget; at least one bucket is always kept.
+
+    Returns:
+        Sorted row indices, every row when within the budget.
+    """
+    rows = df.height
+    if rows <= max_points:
+        return list(range(rows))
+
+    per_bucket = 2 * max(len(columns), 1)
+    buckets = max((max_points - 2) // per_bucket, 1)
+    index = pl.col("index")
+    kept = (
+        df.lazy()
+        .with_row_index("index")
+        .group_by((index * buckets // rows).alias("bucket"))
+        .agg(
+            *[
+                index.sort_by(pl.col(column), nulls_last=True)
+                .first()
+                .alias(f"min_{column}")
+                for column in columns
+            ],
+            *[
+                index.sort_by(pl.col(column), descending=True, nulls_last=True)
+                .first()
+                .alias(f"max_{column}")
+                for column in columns
+            ],
+        )
+        .drop("bucket")
+        .unpivot()
+        .select(pl.col("value").cast(pl.Int64))
+        .collect()
+        .to_series()
+    )
+    return sorted({0, rows - 1, *kept.to_list()})
@@ -0,0 +1,57 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.core.cache import component_tag, org_tag, tiered_cache
+from apps.equipment.models import Component, Machine
+from apps.reports.models import LabAnalysis, Report
+
+
+def invalidate_report_caches(reports) -> None:
+    """
+    Invalidate cached dashboard payloads affected by reports.
+
+    Args:
+        reports: Iterable of reports (or objects with ``organization_id``
+            and ``component_id``) that were created, changed or deleted.
+    """
+    tags = set()
+    for report in reports:
+        if report.organization_id:
+            tags.add(org_tag(report.organization_id))
+        if report.component_id:
+            tags.add(component_tag(report.component_id))
+    tiered_cache.invalidate_tags(*tags)
+
+
+@receiver([post_save, post_delete], sender=Report)
+def invalidate_report(sender, instance, **kwargs):
+    """Invalidate dashboard caches when a report changes."""
+    invalidate_report_caches([instance])
+
+
+@receiver([post_save, post_delete], sender=LabAnalysis)
+def invalidate_lab_analysis(sender, instance, **kwargs):
+    """Invalidate dashboard caches when lab results change."""
+    report = Report.objects.filter(pk=instance.report_id).only(
+        "organization_id", "component_id"
+    )
+    invalidate_report_caches(report)
+
+
+@receiver([post_save, post_delete], sender=Machine)
+def invalidate_machine(sender, instance, **kwargs):
+    """Invalidate organization caches when a machine changes."""
+    tiered_cache.invalidate_tags(org_tag(instance.organization_id))
+
+
+@receiver([post_save, post_delete], sender=Component)
+def invalidate_component(sender, instance, **kwargs):
+    """Invalidate component and organization caches when a component changes."""
+    organization_id = (
+        Machine.objects.filter(pk=instance.machine_id)
+        .values_list("organization_id", flat=True)
+        .first()
+    )
+    tiered_cache.invalidate_tags(
+        component_tag(instance.pk), org_tag(organization_id)
+    )
@@ -0,0 +1 @@
+"""Dashboard tests module."""
@@ -0,0 +1,88 @@
+"""
+Tests for the dashboard latency benchmark.
+
+Runs the benchmark on a small seeded dataset so query-count regressions
+(such as N+1 patterns in the export) fail the suite.
+"""
+
+from django.test import TestCase
+
+from apps.dashboard.benchmarks import (
+    DashboardBenchmark,
+    EndpointResult,
+    percentile,
+)
+from apps.reports.models import Report
+
+
+class PercentileTestCase(TestCase):
+    """Test cases for the nearest-rank percentile helper."""
+
+    def test_percentile_empty(self) -> None:
+        """Test that an empty sample returns zero."""
+        self.assertEqual(percentile([], 95), 0.0)
+
+    def test_percentile_nearest_rank(self) -> None:
+        """Test nearest-rank percentile values."""
+        values = [float(v) for v in range(1, 21)]
+        self.assertEqual(percentile(values, 50), 10.0)
+        self.assertEqual(percentile(values, 95), 19.0)
+        self.assertEqual(percentile(values, 100), 20.0)
+
+
+class EndpointResultTestCase(TestCase):
+    """Test cases for budget evaluation."""
+
+    def test_violations_reported(self) -> None:
+        """Test that latency, query and status violations are reported."""
+        result = EndpointResult(
+            name="data_api",
+            timings_ms=[10.0, 900.0],
+            query_counts=[5, 40],
+            status_codes=[200, 500],
+            budget_ms=100,
+            max_queries=10,
+        )
+
+        self.assertEqual(len(result.violations), 3)
+
+    def test_within_budget(self) -> None:
+        """Test that a fast endpoint has no violations."""
+        result = EndpointResult(
+            name="data_api",
+            timings_ms=[10.0, 12.0],
+            query_counts=[5, 5],
+            status_codes=[200, 200],
+        )
+
+        self.assertEqual(result.violations, [])
+
+
+class DashboardBenchmarkTestCase(TestCase):
+    """Run the benchmark end to end on a small dataset."""
+
+    def test_endpoints_within_query_budget(self) -> None:
+        """Test that every dashboard endpoint stays within its budgets."""
+        benchmark = DashboardBenchmark(
+            organizations=2,
+            machines=3,
+            reports=10,
+            iterations=3,
+            budget_ms=5000,
+        )
+
+        results = benchmark.run()
+
+        self.assertEqual(len(results), 6)
+        violations = [v for result in results for v in result.violations]
+        self.assertEqual(violations, [])
+
+    def test_seeded_data_rolled_back(self) -> None:
+        """Test that the benchmark leaves no seeded reports behind."""
+        DashboardBenchmark(
+            organizations=1, machines=1, reports=5, iterations=1
+        ).run()
+
+        self.assertFalse(
+            Report.objects.filter(lab_number__startswith="BENCH-").exists()
+        )
@@ -0,0 +1,72 @@
+"""
+Tests for dashboard payload caching.
+
+Checks that cached payloads are reused and invalidated by report and
+equipment changes.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.cache import tiered_cache
+from apps.reports import choices
+from apps.reports.models import Report
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.users.models import Account
+
+
+class DashboardCacheTest(TestCase):
+    """Test cases for cached dashboard endpoints."""
+
+    def setUp(self) -> None:
+        tiered_cache.clear_local()
+        self.fleet = FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=2,
+            samples_per_component=3,
+            cadence_days=10,
+            seed=5,
+        ).seed()
+        self.organization = self.fleet.organizations[0]
+        self.user = get_user_model().objects.create_user(
+            email="viewer@example.com", password="password"
+        )
+        Account.objects.create(user=self.user, organization=self.organization)
+        self.client.force_login(self.user)
+        self.url = reverse("apps.dashboard:org_overview_api")
+
+    def test_overview_is_cached(self) -> None:
+        """Test that a repeated request does not recompute the overview."""
+        first = self.client.get(self.url).json()
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(self.url).json()
+
+        self.assertEqual(first, second)
+        self.assertFalse(
+            any("reports_report" in query["sql"] for query in queries)
+        )
+
+    def test_report_changes_invalidate_overview(self) -> None:
+        """Test that saving a report invalidates its organization's cache."""
+        before = self.client.get(self.url).json()
+
+        Report.objects.create(
+            lab_number="NEW-0001",
+            organization=self.organization,
+            machine=self.fleet.machines[0],
+            component=self.fleet.components[0],
+            sample_date=timezone.now().date(),
+            condition=choices.ReportCondition.CRITICAL,
+        )
+
+        after = self.client.get(self.url).json()
+        self.assertEqual(after["total_reports"], before["total_reports"] + 1)
+        self.assertEqual(
+            after["critical_alerts"], before["critical_alerts"] + 1
+        )
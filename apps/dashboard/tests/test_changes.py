@@ -0,0 +1,175 @@
+"""
+Tests for the change checks of the dashboards.
+
+Checks that a check sends a snapshot then only the changed KPIs when the
+watched cache tags are invalidated, and that up-to-date clients get a
+304 at once, without recomputing anything or holding a worker.
+"""
+
+import json
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.core.cache import org_tag, tiered_cache
+from apps.dashboard.changes import ChangeCheck
+from apps.reports.choices import ReportCondition
+from apps.reports.models import Report
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.users.models import Account
+
+
+class ChangeCheckTest(TestCase):
+    """Test cases for the change check of a set of tags."""
+
+    def setUp(self) -> None:
+        tiered_cache.clear_local()
+        self.tag = f"changes-{uuid.uuid4().hex}"
+        self.kpis = {"reports": 1, "alerts": 0}
+        self.snapshots = 0
+
+    def snapshot(self) -> dict:
+        self.snapshots += 1
+        return dict(self.kpis)
+
+    def check(self, etag=None):
+        return ChangeCheck(
+            [self.tag], self.snapshot, key="kpis", if_none_match=etag
+        ).response()
+
+    def test_snapshot_then_deltas(self) -> None:
+        """Test the first snapshot and the delta of an invalidation."""
+        first = self.check()
+        self.kpis["alerts"] = 2
+        tiered_cache.invalidate_tags(self.tag)
+        second = self.check(first["ETag"])
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(
+            json.loads(first.content),
+            {"event": "snapshot", "data": {"reports": 1, "alerts": 0}},
+        )
+        self.assertEqual(
+            json.loads(second.content),
+            {"event": "delta", "data": {"alerts": 2}},
+        )
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertEqual(self.snapshots, 2)
+
+    def test_current_etag_is_not_modified(self) -> None:
+        """Test that an up-to-date client gets a 304 without KPIs."""
+        etag = self.check()["ETag"]
+
+        response = self.check(etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.snapshots, 1)
+
+    def test_unknown_etag_gets_snapshot(self) -> None:
+        """Test that KPIs no longer cached are sent whole."""
+        response = self.check('"expired"')
+
+        self.assertEqual(json.loads(response.content)["event"], "snapshot")
+
+    def test_change_events_without_snapshot(self) -> None:
+        """Test the change notifications of checks without KPIs."""
+        first = ChangeCheck([self.tag]).response()
+        unchanged = ChangeCheck(
+            [self.tag], if_none_match=first["ETag"]
+        ).response()
+        tiered_cache.invalidate_tags(self.tag)
+        changed = ChangeCheck(
+            [self.tag], if_none_match=first["ETag"]
+        ).response()
+
+        self.assertEqual(json.loads(first.content)["event"], "version")
+        self.assertEqual(unchanged.status_code, 304)
+        self.assertEqual(json.loads(changed.content)["event"], "change")
+        self.assertEqual(self.snapshots, 0)
+
+
+class OrganizationDashboardChangesTest(TestCase):
+    """Test cases for the organization dashboard change check."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.fleet = FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=1,
+            samples_per_component=6,
+            seed=48,
+            prefix="CHG",
+        ).seed()
+        cls.organization = cls.fleet.organizations[0]
+        cls.user = get_user_model().objects.create_user(
+            email="changes@example.com", password="password"
+        )
+        Account.objects.create(user=cls.user, organization=cls.organization)
+
+    def setUp(self) -> None:
+        tiered_cache.clear_local()
+        self.client.force_login(self.user)
+        self.url = reverse("apps.dashboard:org_changes_api")
+        self.params = {"start_date": "2000-01-01", "end_date": "2100-01-01"}
+
+    def test_new_critical_report_sends_delta(self) -> None:
+        """Test that a report change sends the changed KPIs only."""
+        overview = self.client.get(
+            reverse("apps.dashboard:org_overview_api"), self.params
+        ).json()
+        response = self.client.get(self.url, self.params)
+
+        report = (
+            Report.objects.filter(
+                organization=self.organization, is_active=True
+            )
+            .exclude(condition=ReportCondition.CRITICAL)
+            .order_by("sample_date")
+            .first()
+        )
+        report.condition = ReportCondition.CRITICAL
+        report.save()
+        changed = self.client.get(
+            self.url, self.params, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        delta = changed.json()
+
+        self.assertEqual(response.json()["data"], overview)
+        self.assertEqual(delta["event"], "delta")
+        self.assertEqual(
+            delta["data"]["critical_alerts"], overview["critical_alerts"] + 1
+        )
+        self.assertNotIn("total_reports", delta["data"])
+
+    def test_unchanged_check_returns_at_once(self) -> None:
+        """Test that an unchanged dashboard costs no KPI query nor wait."""
+        etag = self.client.get(self.url, self.params)["ETag"]
+
+        started = time.monotonic()
+        response = self.client.get(
+            self.url, self.params, HTTP_IF_NONE_MATCH=etag
+        )
+        elapsed = time.monotonic() - started
+        with CaptureQueriesContext(connection) as queries:
+            check = ChangeCheck(
+                [org_tag(self.organization.pk)], if_none_match=etag
+            ).response()
+
+        self.assertEqual(response.status_code, 304)
+        self.assertLess(elapsed, 1)
+        self.assertEqual(check.status_code, 304)
+        self.assertEqual(len(queries), 0)
+
+    def test_admin_changes_require_staff(self) -> None:
+        """Test that the admin check is refused to organization users."""
+        response = self.client.get(reverse("apps.dashboard:changes_api"))
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,142 @@
+"""
+Tests for the multi-component comparison endpoint.
+
+Checks the bulk access checks, the single report query and the alignment
+of the series on the shared sample dates.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.core.cache import tiered_cache
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.users.models import Account
+
+
+class ComponentComparisonTest(TestCase):
+    """Test cases for the comparison data endpoint."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.fleet = FleetSeedingService(
+            organizations=2,
+            machines_per_org=2,
+            components_per_machine=2,
+            samples_per_component=4,
+            seed=31,
+            prefix="CMP",
+        ).seed()
+        cls.organization = cls.fleet.organizations[0]
+        cls.components = [
+            component
+            for component in cls.fleet.components
+            if component.machine.organization_id == cls.organization.pk
+        ]
+        cls.user = get_user_model().objects.create_user(
+            email="compare@example.com", password="password"
+        )
+        cls.user.user_permissions.add(
+            *Permission.objects.filter(
+                content_type__app_label="dashboard",
+                codename="view_component_analysis",
+            )
+        )
+        Account.objects.create(user=cls.user, organization=cls.organization)
+
+    def setUp(self) -> None:
+        tiered_cache.clear_local()
+        self.client.force_login(self.user)
+        self.url = reverse("apps.dashboard:comparison_data_api")
+
+    def test_organization_fleet_in_one_report_query(self) -> None:
+        """Test the default scope and the aligned series."""
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(self.url).json()
+
+        reads = [q["sql"] for q in queries if "reports_report" in q["sql"]]
+        self.assertEqual(len(reads), 1)
+        self.assertCountEqual(
+            [entry["component_id"] for entry in data["components"]],
+            [component.pk for component in self.components],
+        )
+        self.assertEqual(
+            data["parameters"],
+            ["iron_fe", "copper_cu", "aluminum_al", "silicon_si"],
+        )
+        iron = data["series"]["iron_fe"]
+        self.assertEqual(len(iron), len(self.components))
+        for entry in iron:
+            self.assertEqual(len(entry["data"]), len(data["dates"]))
+
+        component = self.components[0]
+        reports = component.reports.filter(
+            is_active=True, analysis__isnull=False
+        ).order_by("sample_date")
+        entry = next(e for e in iron if e["component_id"] == component.pk)
+        points = {
+            sample_date: value
+            for sample_date, value in zip(data["dates"], entry["data"])
+            if value is not None
+        }
+        self.assertEqual(
+            points,
+            {
+                report.sample_date.strftime("%Y-%m-%d"): float(
+                    report.analysis.iron_fe
+                )
+                for report in reports
+                if report.analysis.iron_fe is not None
+            },
+        )
+        summary = next(
+            e for e in data["components"] if e["component_id"] == component.pk
+        )
+        self.assertEqual(summary["total_reports"], reports.count())
+        self.assertIn("warning", summary["thresholds"]["iron_fe"])
+
+    def test_components_and_machine_scopes(self) -> None:
+        """Test explicit component lists and machine scope."""
+        selected = self.components[:2]
+
+        data = self.client.get(
+            self.url,
+            {
+                "components": ",".join(str(c.pk) for c in selected),
+                "parameters": "iron_fe,tbn",
+            },
+        ).json()
+        machine = self.components[0].machine
+        by_machine = self.client.get(self.url, {"machine": machine.pk}).json()
+
+        self.assertEqual(list(data["series"]), ["iron_fe", "tbn"])
+        self.assertCountEqual(
+            [entry["component_id"] for entry in data["components"]],
+            [component.pk for component in selected],
+        )
+        self.assertCountEqual(
+            [entry["component_id"] for entry in by_machine["components"]],
+            [c.pk for c in self.components if c.machine_id == machine.pk],
+        )
+
+    def test_access_and_validation(self) -> None:
+        """Test other organizations' components and invalid parameters."""
+        other = next(
+            component
+            for component in self.fleet.components
+            if component not in self.components
+        )
+
+        denied = self.client.get(
+            self.url, {"components": f"{self.components[0].pk},{other.pk}"}
+        )
+        unknown = self.client.get(self.url, {"parameters": "iron_fe,lab"})
+        invalid = self.client.get(self.url, {"components": "1,x"})
+
+        self.assertEqual(denied.status_code, 404)
+        self.assertEqual(denied.json()["components"], [other.pk])
+        self.assertEqual(unknown.status_code, 400)
+        self.assertEqual(invalid.status_code, 400)
@@ -0,0 +1,108 @@
+"""
+Tests for the downsampling of the component analysis charts.
+
+Checks the min/max bucketing, the point budget of the analysis service
+and the full-resolution zoom windows of the analysis endpoint.
+"""
+
+import polars as pl
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.core.cache import tiered_cache
+from apps.dashboard.services import ComponentAnalysisService
+from apps.dashboard.services.downsampling import minmax_indices
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.users.models import Account
+
+
+class MinMaxIndicesTest(TestCase):
+    """Test cases for the min/max bucketing."""
+
+    def test_spikes_and_ends_are_kept(self) -> None:
+        """Test the budget, the extremes and the first and last rows."""
+        values = [float(i % 7) for i in range(1000)]
+        values[501] = 100.0
+        values[733] = -100.0
+        df = pl.DataFrame(
+            {"a": values, "b": [None if i % 2 else 1.0 for i in range(1000)]}
+        )
+
+        indices = minmax_indices(df, ["a", "b"], 50)
+
+        self.assertLessEqual(len(indices), 50)
+        self.assertEqual(indices, sorted(set(indices)))
+        self.assertIn(501, indices)
+        self.assertIn(733, indices)
+        self.assertEqual((indices[0], indices[-1]), (0, 999))
+
+    def test_short_series_are_unchanged(self) -> None:
+        """Test that series within the budget keep every row."""
+        df = pl.DataFrame({"a": [1.0, 2.0, 3.0]})
+
+        self.assertEqual(minmax_indices(df, ["a"], 3), [0, 1, 2])
+
+
+class AnalysisDownsamplingTest(TestCase):
+    """Test cases for the point budget of the analysis charts."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.fleet = FleetSeedingService(
+            organizations=1,
+            machines_per_org=1,
+            components_per_machine=1,
+            samples_per_component=40,
+            cadence_days=5,
+            seed=37,
+            prefix="DWN",
+        ).seed()
+        cls.component = cls.fleet.components[0]
+        cls.user = get_user_model().objects.create_user(
+            email="downsample@example.com", password="password"
+        )
+        Account.objects.create(
+            user=cls.user, organization=cls.fleet.organizations[0]
+        )
+
+    def setUp(self) -> None:
+        tiered_cache.clear_local()
+
+    def test_service_point_budget(self) -> None:
+        """Test that every chart keeps the budget and the peak sample."""
+        full = ComponentAnalysisService(self.component.pk).get_wear_trends()
+        reduced = ComponentAnalysisService(
+            self.component.pk, max_points=14
+        ).get_wear_trends()
+
+        self.assertEqual(len(full["dates"]), 40)
+        self.assertLessEqual(len(reduced["dates"]), 14)
+        self.assertEqual(reduced["total_points"], 40)
+        iron = full["series"][0]["data"]
+        peak = full["dates"][iron.index(max(v for v in iron if v is not None))]
+        self.assertIn(peak, reduced["dates"])
+
+    def test_zoom_window_has_full_resolution(self) -> None:
+        """Test the analysis endpoint with a date window."""
+        self.client.force_login(self.user)
+        url = reverse("apps.dashboard:analysis_data_api")
+        full = ComponentAnalysisService(self.component.pk).get_wear_trends()
+        start, end = full["dates"][10], full["dates"][19]
+
+        overview = self.client.get(
+            url, {"component": self.component.pk, "max_points": 14}
+        ).json()
+        zoom = self.client.get(
+            url,
+            {
+                "component": self.component.pk,
+                "max_points": 14,
+                "start_date": start,
+                "end_date": end,
+            },
+        ).json()
+
+        self.assertLessEqual(len(overview["wear_trends"]["dates"]), 14)
+        self.assertEqual(zoom["wear_trends"]["dates"], full["dates"][10:20])
+        self.assertEqual(zoom["wear_trends"]["total_points"], 10)
@@ -0,0 +1,212 @@
+"""
+Tests for the response formats of the dashboard chart APIs.
+
+Checks the format negotiation, the shared axes and typed arrays of the
+columnar format and the Arrow IPC stream of the chart points.
+"""
+
+import base64
+import io
+import json
+from array import array
+
+import polars as pl
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.core.cache import tiered_cache
+from apps.dashboard.payloads import (
+    ARROW_MEDIA_TYPE,
+    COLUMNAR_MEDIA_TYPE,
+    epoch_day,
+    to_columnar,
+    typed_array,
+)
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.users.models import Account
+
+
+TYPECODES = {"uint8": "B", "int16": "h", "int32": "i", "float32": "f"}
+
+
+def decode(typed: dict) -> list:
+    """Decode a typed array of the columnar format."""
+    values = array(
+        TYPECODES[typed["dtype"]], base64.b64decode(typed["buffer"])
+    )
+    null = typed.get("null")
+    return [
+        None if value != value or value == null else value for value in values
+    ]
+
+
+def decode_axis(axis: dict) -> list:
+    """Decode a date axis of the columnar format into epoch days."""
+    days, day = [], axis["start"]
+    for step in decode(axis["steps"]):
+        day += step
+        days.append(day)
+    return days
+
+
+class ColumnarEncodingTest(TestCase):
+    """Test cases for the columnar rewrite of a payload."""
+
+    def test_axes_series_and_records(self) -> None:
+        """Test shared axes, typed series and records as columns."""
+        data = {
+            "a": {
+                "dates": ["2024-01-01", "2024-01-03"],
+                "series": [{"name": "Fe", "data": [1.5, None]}],
+            },
+            "b": {"dates": ["2024-01-01", "2024-01-03"], "data": [2, 3]},
+            "rows": [{"id": 1, "x": "p"}, {"id": 2, "x": "q"}],
+        }
+
+        columnar = to_columnar(data, records=("rows",))
+
+        self.assertEqual(len(columnar["axes"]), 1)
+        self.assertEqual(
+            decode_axis(columnar["axes"][0]),
+            [epoch_day("2024-01-01"), epoch_day("2024-01-03")],
+        )
+        self.assertEqual(columnar["a"]["axis"], 0)
+        self.assertEqual(columnar["b"]["axis"], 0)
+        self.assertEqual(
+            decode(columnar["a"]["series"][0]["data"]), [1.5, None]
+        )
+        self.assertEqual(
+            columnar["rows"],
+            {"columns": {"id": [1, 2], "x": ["p", "q"]}, "length": 2},
+        )
+
+    def test_narrowest_dtype(self) -> None:
+        """Test that whole numbers use the smallest integer dtype."""
+        cases = [
+            ([0, 254, None], "uint8"),
+            ([-1, 300.0, None], "int16"),
+            ([70000, None], "int32"),
+            ([0.5, None], "float32"),
+            ([2**40], "float32"),
+        ]
+
+        for values, dtype in cases:
+            typed = typed_array(values)
+            self.assertEqual(typed["dtype"], dtype)
+            self.assertEqual(decode(typed), values)
+
+    def test_shape_does_not_depend_on_length(self) -> None:
+        """Test single and empty record lists and empty charts."""
+        data = {
+            "one": [{"id": 1}],
+            "none": [],
+            "other": [{"id": 1}, {"id": 2}],
+            "chart": {"dates": [], "data": []},
+        }
+
+        columnar = to_columnar(data, records=("one", "none"))
+
+        self.assertEqual(
+            columnar["one"], {"columns": {"id": [1]}, "length": 1}
+        )
+        self.assertEqual(columnar["none"], {"columns": {}, "length": 0})
+        # Lists not named as records are left as they are
+        self.assertEqual(columnar["other"], [{"id": 1}, {"id": 2}])
+        self.assertEqual(len(columnar["axes"]), 1)
+        self.assertEqual(decode_axis(columnar["axes"][0]), [])
+        self.assertEqual(columnar["chart"]["axis"], 0)
+        self.assertEqual(decode(columnar["chart"]["data"]), [])
+
+
+class PayloadFormatTest(TestCase):
+    """Test cases for the formats of the analysis endpoint."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.fleet = FleetSeedingService(
+            organizations=1,
+            machines_per_org=1,
+            components_per_machine=1,
+            samples_per_component=300,
+            cadence_days=2,
+            seed=47,
+            prefix="PAY",
+        ).seed()
+        cls.component = cls.fleet.components[0]
+        cls.user = get_user_model().objects.create_user(
+            email="payload@example.com", password="password"
+        )
+        Account.objects.create(
+            user=cls.user, organization=cls.fleet.organizations[0]
+        )
+
+    def setUp(self) -> None:
+        tiered_cache.clear_local()
+        self.client.force_login(self.user)
+        self.url = reverse("apps.dashboard:analysis_data_api")
+
+    def test_default_format_is_json(self) -> None:
+        """Test that requests without a format keep the plain JSON."""
+        response = self.client.get(self.url, {"component": self.component.pk})
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertIn("Accept", response["Vary"])
+        self.assertEqual(len(response.json()["wear_trends"]["dates"]), 300)
+
+    def test_columnar_format(self) -> None:
+        """Test the columnar format by parameter and by Accept header."""
+        plain = self.client.get(self.url, {"component": self.component.pk})
+        by_parameter = self.client.get(
+            self.url, {"component": self.component.pk, "format": "columnar"}
+        )
+        by_header = self.client.get(
+            self.url,
+            {"component": self.component.pk},
+            HTTP_ACCEPT=COLUMNAR_MEDIA_TYPE,
+        )
+
+        self.assertEqual(by_parameter["Content-Type"], COLUMNAR_MEDIA_TYPE)
+        self.assertEqual(by_header.content, by_parameter.content)
+        expected = plain.json()["wear_trends"]
+        columnar = json.loads(by_parameter.content)
+        trends = columnar["wear_trends"]
+        self.assertEqual(
+            decode_axis(columnar["axes"][trends["axis"]]),
+            [epoch_day(value) for value in expected["dates"]],
+        )
+        # Every chart of the component shares the same axis
+        self.assertEqual(len(columnar["axes"]), 1)
+        for series, typed in zip(expected["series"], trends["series"]):
+            for value, decoded in zip(series["data"], decode(typed["data"])):
+                if value is None:
+                    self.assertIsNone(decoded)
+                else:
+                    self.assertAlmostEqual(value, decoded, places=3)
+        self.assertLess(len(by_parameter.content), len(plain.content) * 0.4)
+
+    def test_arrow_format(self) -> None:
+        """Test that the Arrow stream holds one row per chart point."""
+        plain = self.client.get(
+            self.url, {"component": self.component.pk}
+        ).json()
+        response = self.client.get(
+            self.url,
+            {"component": self.component.pk},
+            HTTP_ACCEPT=ARROW_MEDIA_TYPE,
+        )
+
+        self.assertEqual(response["Content-Type"], ARROW_MEDIA_TYPE)
+        points = pl.read_ipc_stream(io.BytesIO(response.content))
+        self.assertEqual(points.columns, ["section", "series", "day", "value"])
+        self.assertEqual(points.schema["day"], pl.Date)
+        iron = points.filter(
+            (pl.col("section") == "wear_trends")
+            & (pl.col("series") == plain["wear_trends"]["series"][0]["name"])
+        )
+        expected = [
+            value
+            for value in plain["wear_trends"]["series"][0]["data"]
+            if value is not None
+        ]
+        self.assertEqual(iron.height, len(expected))
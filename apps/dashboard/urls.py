@@ -8,6 +8,11 @@ urlpatterns = [
     path("", views.DashboardView.as_view(), name="index"),
     # Admin API endpoints
     path("api/data/", views.DashboardDataAPIView.as_view(), name="data_api"),
+    path(
+        "api/changes/",
+        views.DashboardChangesView.as_view(),
+        name="changes_api",
+    ),
     path(
         "api/machines/",
         views.MachinesByOrganizationAPIView.as_view(),
@@ -19,6 +24,26 @@ urlpatterns = [
         views.OrganizationDashboardOverviewAPIView.as_view(),
         name="org_overview_api",
     ),
+    path(
+        "api/org/changes/",
+        views.OrganizationDashboardChangesView.as_view(),
+        name="org_changes_api",
+    ),
+    path(
+        "api/org/fleet-status/",
+        views.OrganizationFleetStatusAPIView.as_view(),
+        name="org_fleet_status_api",
+    ),
+    path(
+        "api/org/anomalies/",
+        views.OrganizationTopAnomaliesAPIView.as_view(),
+        name="org_top_anomalies_api",
+    ),
+    path(
+        "api/org/similar-components/",
+        views.OrganizationSimilarComponentsAPIView.as_view(),
+        name="org_similar_components_api",
+    ),
     # Component Analysis
     path(
         "analysis/",
@@ -30,6 +55,11 @@ urlpatterns = [
         views.ComponentAnalysisDataAPIView.as_view(),
         name="analysis_data_api",
     ),
+    path(
+        "api/analysis/compare/",
+        views.ComponentComparisonDataAPIView.as_view(),
+        name="comparison_data_api",
+    ),
     path(
         "api/components/",
         views.ComponentsByMachineAPIView.as_view(),
@@ -1,3 +1,6 @@
+import hashlib
+
+from django.conf import settings
 from django.contrib.auth.mixins import (
     LoginRequiredMixin,
     PermissionRequiredMixin,
@@ -16,16 +19,45 @@ from openpyxl import Workbook
 from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 
+from apps.core.cache import component_tag, org_tag, tiered_cache
+from apps.core.concurrency import run_concurrently
+from apps.core.mixins import ReplicaReadMixin
 from apps.dashboard.filtersets import ComponentAnalysisFilter, ReportFilter
-from apps.dashboard.services import ComponentAnalysisService
+from apps.dashboard.payloads import render_payload
+from apps.dashboard.services import (
+    ComponentAnalysisService,
+    ComponentComparisonService,
+)
+from apps.dashboard.services.component_comparison import (
+    COMPARISON_PARAMETERS,
+    DEFAULT_COMPARISON_PARAMETERS,
+)
+from apps.dashboard.changes import ChangeCheck
 from apps.equipment.models import Component, Machine
 from apps.reports.choices import ReportCondition, ReportStatus
-from apps.reports.models import Report
+from apps.reports.models import ComponentAnomaly, ComponentLatestState, Report
+from apps.reports.services.latest_state import (
+    MEASUREMENTS as LATEST_STATE_MEASUREMENTS,
+)
+from apps.reports.services.similarity import (
+    ComponentSimilarityService,
+    similarity_index,
+)
+from apps.reports.services.thresholds import THRESHOLD_PROFILES_TAG
 from apps.users.mixins import OrganizationRequiredMixin
 from apps.users.models import Organization
 
 
-class DashboardView(LoginRequiredMixin, TemplateView):
+def _positive_int_param(request, name: str, default: int) -> int:
+    """Read a positive integer query parameter, or ``default``."""
+    try:
+        value = int(request.GET.get(name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+class DashboardView(LoginRequiredMixin, ReplicaReadMixin, TemplateView):
     template_name = "dashboard/index.html"
 
     def is_admin_user(self):
@@ -68,7 +100,9 @@ class DashboardView(LoginRequiredMixin, TemplateView):
             status_stats = {}
             for choice, _ in ReportStatus.choices:
                 translated_label = str(dict(ReportStatus.choices)[choice])
-                status_stats[translated_label] = status_stats_raw.get(choice, 0)
+                status_stats[translated_label] = status_stats_raw.get(
+                    choice, 0
+                )
 
             # Historical data by month (all time)
             monthly_data = (
@@ -147,13 +181,14 @@ class DashboardView(LoginRequiredMixin, TemplateView):
         context.update(
             {
                 "last_updated": today,
+                "changes_poll_ms": settings.DASHBOARD_CHANGES_POLL_MS,
             }
         )
 
         return context
 
 
-class DashboardDataAPIView(LoginRequiredMixin, View):
+class DashboardDataAPIView(LoginRequiredMixin, ReplicaReadMixin, View):
     """
     AJAX endpoint to get filtered dashboard data for charts and tables.
     Only accessible by staff/superuser.
@@ -184,37 +219,41 @@ class DashboardDataAPIView(LoginRequiredMixin, View):
         filterset = ReportFilter(filter_data, queryset=reports_qs)
         reports_qs = filterset.qs
 
-        # Get updated statistics
-        total_reports = reports_qs.count()
-
-        # Count by condition
-        condition_data = list(
-            reports_qs.values("condition")
-            .annotate(count=Count("id"))
-            .order_by("condition")
-        )
-
-        # Count by status
-        status_data = list(
-            reports_qs.values("status")
-            .annotate(count=Count("id"))
-            .order_by("status")
-        )
-
-        # Historical data by month
-        monthly_data = list(
-            reports_qs.filter(sample_date__isnull=False)
-            .annotate(month=TruncMonth("sample_date"))
-            .values("month")
-            .annotate(count=Count("id"))
-            .order_by("month")
+        # Independent aggregates, run concurrently
+        results = run_concurrently(
+            {
+                "total_reports": reports_qs.count,
+                # Count by condition
+                "condition_data": lambda: list(
+                    reports_qs.values("condition")
+                    .annotate(count=Count("id"))
+                    .order_by("condition")
+                ),
+                # Count by status
+                "status_data": lambda: list(
+                    reports_qs.values("status")
+                    .annotate(count=Count("id"))
+                    .order_by("status")
+                ),
+                # Historical data by month
+                "monthly_data": lambda: list(
+                    reports_qs.filter(sample_date__isnull=False)
+                    .annotate(month=TruncMonth("sample_date"))
+                    .values("month")
+                    .annotate(count=Count("id"))
+                    .order_by("month")
+                ),
+                # Latest reports (limited for performance)
+                "latest_reports": lambda: list(
+                    reports_qs.select_related("machine").order_by(
+                        "-sample_date", "-created"
+                    )[:10]
+                ),
+            }
         )
 
-        # Latest reports (limited for performance)
         latest_reports_data = []
-        latest_reports = reports_qs.order_by("-sample_date", "-created")[:10]
-
-        for report in latest_reports:
+        for report in results["latest_reports"]:
             latest_reports_data.append(
                 {
                     "id": report.id,
@@ -234,14 +273,21 @@ class DashboardDataAPIView(LoginRequiredMixin, View):
                 }
             )
 
-        return JsonResponse(
+        return render_payload(
+            request,
             {
-                "total_reports": total_reports,
-                "condition_data": condition_data,
-                "status_data": status_data,
-                "monthly_data": monthly_data,
+                "total_reports": results["total_reports"],
+                "condition_data": results["condition_data"],
+                "status_data": results["status_data"],
+                "monthly_data": results["monthly_data"],
                 "latest_reports": latest_reports_data,
-            }
+            },
+            records=(
+                "condition_data",
+                "status_data",
+                "monthly_data",
+                "latest_reports",
+            ),
         )
 
     def _get_condition_class(self, condition):
@@ -264,7 +310,33 @@ class DashboardDataAPIView(LoginRequiredMixin, View):
         return status_classes.get(status, "secondary")
 
 
-class MachinesByOrganizationAPIView(LoginRequiredMixin, View):
+class DashboardChangesView(LoginRequiredMixin, View):
+    """
+    Change check of the admin dashboard.
+
+    Answers ``304 Not Modified`` until reports of the selected organization
+    (or of any organization) change, then a ``change`` event, so the page
+    refetches its data only then. Only accessible by staff/superuser.
+    """
+
+    def get(self, request, *args, **kwargs):
+        if not (request.user.is_staff or request.user.is_superuser):
+            return JsonResponse({"error": "Admin access required"}, status=403)
+
+        organizations = Organization.objects.all()
+        if request.GET.get("organization_id", "").isdigit():
+            organizations = organizations.filter(
+                pk=request.GET["organization_id"]
+            )
+        return ChangeCheck(
+            [org_tag(pk) for pk in organizations.values_list("pk", flat=True)],
+            if_none_match=request.headers.get("If-None-Match"),
+        ).response()
+
+
+class MachinesByOrganizationAPIView(
+    LoginRequiredMixin, ReplicaReadMixin, View
+):
     """
     AJAX endpoint to get machines by organization for dynamic filtering.
     Only accessible by staff/superuser.
@@ -294,7 +366,10 @@ class MachinesByOrganizationAPIView(LoginRequiredMixin, View):
 
 
 class ExportPageView(
-    LoginRequiredMixin, OrganizationRequiredMixin, TemplateView
+    LoginRequiredMixin,
+    OrganizationRequiredMixin,
+    ReplicaReadMixin,
+    TemplateView,
 ):
     """
     Page for exporting dashboard data with filters and preview.
@@ -325,7 +400,9 @@ class ExportPageView(
         return context
 
 
-class ExportPreviewAPIView(LoginRequiredMixin, OrganizationRequiredMixin, View):
+class ExportPreviewAPIView(
+    LoginRequiredMixin, OrganizationRequiredMixin, ReplicaReadMixin, View
+):
     """
     AJAX endpoint to preview how many records will be exported.
     """
@@ -370,7 +447,9 @@ class ExportPreviewAPIView(LoginRequiredMixin, OrganizationRequiredMixin, View):
         )
 
 
-class DashboardExportView(LoginRequiredMixin, OrganizationRequiredMixin, View):
+class DashboardExportView(
+    LoginRequiredMixin, OrganizationRequiredMixin, ReplicaReadMixin, View
+):
     """
     Export filtered dashboard data to Excel format.
     Limited to 10,000 records for performance.
@@ -404,7 +483,9 @@ class DashboardExportView(LoginRequiredMixin, OrganizationRequiredMixin, View):
         reports_qs = filterset.qs
 
         # Apply limit for performance and ordering
-        reports_qs = reports_qs.order_by("-sample_date", "-created")[:10000]
+        reports_qs = reports_qs.select_related(
+            "machine", "component__type"
+        ).order_by("-sample_date", "-created")[:10000]
 
         # Create Excel workbook
         workbook = Workbook()
@@ -522,7 +603,7 @@ class DashboardExportView(LoginRequiredMixin, OrganizationRequiredMixin, View):
 
 
 class OrganizationDashboardOverviewAPIView(
-    LoginRequiredMixin, OrganizationRequiredMixin, View
+    LoginRequiredMixin, OrganizationRequiredMixin, ReplicaReadMixin, View
 ):
     """
     API endpoint for organization dashboard overview.
@@ -545,6 +626,14 @@ class OrganizationDashboardOverviewAPIView(
             return JsonResponse({"error": "Organization required"}, status=403)
 
         organization = self.get_user_organization()
+        filter_start_date, filter_end_date = self._get_date_range(request)
+        data = self._get_cached_overview(
+            organization, filter_start_date, filter_end_date
+        )
+        return render_payload(request, data)
+
+    def _get_date_range(self, request):
+        """Return the filter dates, the last 3 months by default."""
         filter_end_date = timezone.now()
         # Set filter_start_date to 3 months ago from filter_end_date
         filter_start_date = (
@@ -569,74 +658,97 @@ class OrganizationDashboardOverviewAPIView(
             except ValueError:
                 pass
 
+        return filter_start_date, filter_end_date
+
+    def _get_cached_overview(
+        self, organization, filter_start_date, filter_end_date
+    ) -> dict:
+        """Return the overview KPIs through the organization's cache."""
+        return tiered_cache.get_or_set(
+            f"dashboard:org_overview:{organization.pk}:"
+            f"{filter_start_date:%Y-%m-%d}:{filter_end_date:%Y-%m-%d}",
+            lambda: self._get_overview_data(
+                organization, filter_start_date, filter_end_date
+            ),
+            timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+            tags=[org_tag(organization.pk)],
+        )
+
+    def _get_overview_data(
+        self, organization, filter_start_date, filter_end_date
+    ) -> dict:
+        """Compute the overview KPIs of an organization for a date range."""
         # Get all active reports for organization
         reports_qs = Report.objects.filter(
             organization=organization,
             is_active=True,
             sample_date__gte=filter_start_date,
             sample_date__lte=filter_end_date,
-        ).select_related("machine", "component", "component__type")
-
-        # Reports this month
-        reports_this_month = reports_qs.count()
+        )
 
-        # Total unique machines
-        total_machines = Machine.objects.filter(
-            id__in=reports_qs.values_list("machine_id", flat=True).distinct()
-        ).count()
+        # Independent queries, run concurrently
+        results = run_concurrently(
+            {
+                # Report counts by condition, in one pass
+                "counts": lambda: reports_qs.aggregate(
+                    total=Count("id"),
+                    normal=Count(
+                        "id", filter=Q(condition=ReportCondition.NORMAL)
+                    ),
+                    caution=Count(
+                        "id", filter=Q(condition=ReportCondition.CAUTION)
+                    ),
+                    critical=Count(
+                        "id", filter=Q(condition=ReportCondition.CRITICAL)
+                    ),
+                ),
+                # Total unique machines
+                "total_machines": Machine.objects.filter(
+                    id__in=reports_qs.values_list("machine_id", flat=True)
+                ).count,
+                # Get recent critical/caution reports (last 10)
+                "recent_alerts": lambda: list(
+                    reports_qs.filter(
+                        Q(condition=ReportCondition.CRITICAL)
+                        | Q(condition=ReportCondition.CAUTION)
+                    )
+                    .order_by("-sample_date")[:10]
+                    .values(
+                        "id",
+                        "lab_number",
+                        "machine__name",
+                        "condition",
+                        "sample_date",
+                        "component__type__name",
+                    )
+                ),
+            }
+        )
+        counts = results["counts"]
+        total_machines = results["total_machines"]
+        recent_alerts = results["recent_alerts"]
 
         # Critical and caution alerts (based on condition)
-        critical_alerts = reports_qs.filter(
-            condition=ReportCondition.CRITICAL
-        ).count()
-        caution_alerts = reports_qs.filter(
-            condition=ReportCondition.CAUTION
-        ).count()
+        critical_alerts = counts["critical"]
+        caution_alerts = counts["caution"]
         total_alerts = critical_alerts + caution_alerts
+        total_reports = reports_this_month = counts["total"]
 
         # Calculate average fleet health score (0-100)
         # Based on condition distribution
-        total_reports = reports_qs.count()
         if total_reports > 0:
-            normal_count = reports_qs.filter(
-                condition=ReportCondition.NORMAL
-            ).count()
-            caution_count = reports_qs.filter(
-                condition=ReportCondition.CAUTION
-            ).count()
-            critical_count = reports_qs.filter(
-                condition=ReportCondition.CRITICAL
-            ).count()
-
             # Score calculation: Normal=100, Caution=50, Critical=0
             avg_health_score = int(
                 (
-                    (normal_count * 100)
-                    + (caution_count * 50)
-                    + (critical_count * 0)
+                    (counts["normal"] * 100)
+                    + (caution_alerts * 50)
+                    + (critical_alerts * 0)
                 )
                 / total_reports
             )
         else:
             avg_health_score = 0
 
-        # Get recent critical/caution reports (last 10)
-        recent_alerts = (
-            reports_qs.filter(
-                Q(condition=ReportCondition.CRITICAL)
-                | Q(condition=ReportCondition.CAUTION)
-            )
-            .order_by("-sample_date")[:10]
-            .values(
-                "id",
-                "lab_number",
-                "machine__name",
-                "condition",
-                "sample_date",
-                "component__type__name",
-            )
-        )
-
         # Format recent alerts
         recent_alerts_data = [
             {
@@ -657,20 +769,161 @@ class OrganizationDashboardOverviewAPIView(
             for alert in recent_alerts
         ]
 
-        return JsonResponse(
-            {
-                "total_machines": total_machines,
-                "critical_alerts": critical_alerts,
-                "caution_alerts": caution_alerts,
-                "total_alerts": total_alerts,
-                "reports_this_month": reports_this_month,
-                "avg_health_score": avg_health_score,
-                "recent_alerts": recent_alerts_data,
-                "total_reports": total_reports,
-                "filter_start_date": filter_start_date.strftime("%Y-%m-%d"),
-                "filter_end_date": filter_end_date.strftime("%Y-%m-%d"),
+        return {
+            "total_machines": total_machines,
+            "critical_alerts": critical_alerts,
+            "caution_alerts": caution_alerts,
+            "total_alerts": total_alerts,
+            "reports_this_month": reports_this_month,
+            "avg_health_score": avg_health_score,
+            "recent_alerts": recent_alerts_data,
+            "total_reports": total_reports,
+            "filter_start_date": filter_start_date.strftime("%Y-%m-%d"),
+            "filter_end_date": filter_end_date.strftime("%Y-%m-%d"),
+        }
+
+    def _get_condition_class(self, condition: str) -> str:
+        """Get CSS class for condition display."""
+        condition_classes = {
+            ReportCondition.NORMAL: "success",
+            ReportCondition.CAUTION: "warning",
+            ReportCondition.CRITICAL: "danger",
+        }
+        return condition_classes.get(condition, "secondary")
+
+
+class OrganizationDashboardChangesView(OrganizationDashboardOverviewAPIView):
+    """
+    Change check of the organization dashboard.
+
+    Sends the overview KPIs (same filters as the overview API), then
+    ``304 Not Modified`` until the organization's data is invalidated and
+    only the KPIs that changed after that.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """
+        Check the overview KPIs of the organization for changes.
+
+        Returns:
+            HttpResponse: 304, or a ``snapshot`` or ``delta`` event
+        """
+        if not self.has_organization_access():
+            return JsonResponse({"error": "Organization required"}, status=403)
+
+        organization = self.get_user_organization()
+        filter_start_date, filter_end_date = self._get_date_range(request)
+        return ChangeCheck(
+            [org_tag(organization.pk)],
+            lambda: self._get_cached_overview(
+                organization, filter_start_date, filter_end_date
+            ),
+            key=(
+                f"{organization.pk}:{filter_start_date.isoformat()}"
+                f":{filter_end_date.isoformat()}"
+            ),
+            if_none_match=request.headers.get("If-None-Match"),
+        ).response()
+
+
+class OrganizationFleetStatusAPIView(
+    LoginRequiredMixin, OrganizationRequiredMixin, ReplicaReadMixin, View
+):
+    """
+    API endpoint for the current condition of an organization's fleet.
+
+    Returns the latest report of every active component, read from the
+    ComponentLatestState snapshot (one row per component), and the
+    component counts per condition. Optional ``condition`` filter.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """
+        Get the fleet status of the user's organization.
+
+        Returns:
+            JsonResponse: Condition counts and one entry per component
+        """
+        if not self.has_organization_access():
+            return JsonResponse({"error": "Organization required"}, status=403)
+
+        organization = self.get_user_organization()
+        data = tiered_cache.get_or_set(
+            f"dashboard:fleet_status:{organization.pk}",
+            lambda: self._get_fleet_status(organization),
+            timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+            tags=[org_tag(organization.pk)],
+        )
+
+        condition = request.GET.get("condition")
+        if condition:
+            data = {
+                **data,
+                "components": [
+                    component
+                    for component in data["components"]
+                    if component["condition"] == condition
+                ],
             }
+        return render_payload(request, data, records=("components",))
+
+    def _get_fleet_status(self, organization) -> dict:
+        """Read the latest state of every active component."""
+        states = (
+            ComponentLatestState.objects.filter(
+                organization=organization,
+                component__is_active=True,
+                machine__is_active=True,
+            )
+            .select_related("machine", "component__type")
+            .order_by("machine__name", "component__type__name")
         )
+        conditions = dict.fromkeys(ReportCondition.values, 0)
+        components = []
+        for state in states:
+            conditions[state.condition] = (
+                conditions.get(state.condition, 0) + 1
+            )
+            measurements = {
+                name: getattr(state, name)
+                for name in LATEST_STATE_MEASUREMENTS
+            }
+            components.append(
+                {
+                    "component_id": state.component_id,
+                    "component": (
+                        state.component.type.name
+                        if state.component.type
+                        else "N/A"
+                    ),
+                    "machine_id": state.machine_id,
+                    "machine_name": state.machine.name,
+                    "report_id": state.report_id,
+                    "lab_number": state.lab_number,
+                    "sample_date": state.sample_date.strftime("%Y-%m-%d"),
+                    "condition": state.condition,
+                    "condition_display": state.get_condition_display(),
+                    "condition_class": self._get_condition_class(
+                        state.condition
+                    ),
+                    "computed_condition": state.computed_condition,
+                    "lubricant": state.lubricant,
+                    "lubricant_hours": state.lubricant_hours,
+                    "lubricant_kms": state.lubricant_kms,
+                    "machine_hours": state.machine_hours,
+                    "machine_kms": state.machine_kms,
+                    "measurements": {
+                        name: float(value) if value is not None else None
+                        for name, value in measurements.items()
+                    },
+                }
+            )
+
+        return {
+            "total_components": len(components),
+            "conditions": conditions,
+            "components": components,
+        }
 
     def _get_condition_class(self, condition: str) -> str:
         """Get CSS class for condition display."""
@@ -682,10 +935,202 @@ class OrganizationDashboardOverviewAPIView(
         return condition_classes.get(condition, "secondary")
 
 
+class OrganizationTopAnomaliesAPIView(
+    LoginRequiredMixin, OrganizationRequiredMixin, ReplicaReadMixin, View
+):
+    """
+    API endpoint for the strongest anomalies of an organization's fleet.
+
+    Returns the ComponentAnomaly rows found by the fleet scan, ranked by
+    absolute z-score. Optional ``days`` (sample age, default 90) and
+    ``limit`` (default 20, at most 100) parameters.
+    """
+
+    default_days = 90
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request, *args, **kwargs):
+        """
+        Get the top anomalies of the user's organization.
+
+        Returns:
+            JsonResponse: One entry per anomaly, strongest first
+        """
+        if not self.has_organization_access():
+            return JsonResponse({"error": "Organization required"}, status=403)
+
+        organization = self.get_user_organization()
+        days = _positive_int_param(request, "days", self.default_days)
+        limit = min(
+            _positive_int_param(request, "limit", self.default_limit),
+            self.max_limit,
+        )
+        data = tiered_cache.get_or_set(
+            f"dashboard:top_anomalies:{organization.pk}:{days}:{limit}",
+            lambda: self._get_top_anomalies(organization, days, limit),
+            timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+            tags=[org_tag(organization.pk)],
+        )
+        return render_payload(request, data, records=("anomalies",))
+
+    def _get_top_anomalies(self, organization, days: int, limit: int) -> dict:
+        """Read the strongest recent anomalies of active components."""
+        since = timezone.now().date() - timezone.timedelta(days=days)
+        anomalies = (
+            ComponentAnomaly.objects.filter(
+                organization=organization,
+                sample_date__gte=since,
+                component__is_active=True,
+                report__is_active=True,
+            )
+            .select_related(
+                "report",
+                "component__type",
+                "component__machine",
+                "component__latest_state",
+            )
+            .order_by("-score", "-sample_date")[:limit]
+        )
+        entries = []
+        for anomaly in anomalies:
+            component = anomaly.component
+            latest = getattr(component, "latest_state", None)
+            entries.append(
+                {
+                    "component_id": component.pk,
+                    "component": (
+                        component.type.name if component.type else "N/A"
+                    ),
+                    "machine_id": component.machine_id,
+                    "machine_name": component.machine.name,
+                    "report_id": anomaly.report_id,
+                    "lab_number": anomaly.report.lab_number,
+                    "sample_date": anomaly.sample_date.strftime("%Y-%m-%d"),
+                    "is_latest": (
+                        latest is not None
+                        and latest.report_id == anomaly.report_id
+                    ),
+                    "parameter": anomaly.parameter,
+                    "value": anomaly.value,
+                    "ewma": round(anomaly.ewma, 2),
+                    "rolling_std": round(anomaly.rolling_std, 2),
+                    "z_score": round(anomaly.z_score, 2),
+                }
+            )
+
+        return {"days": days, "anomalies": entries}
+
+
+class OrganizationSimilarComponentsAPIView(
+    LoginRequiredMixin, OrganizationRequiredMixin, ReplicaReadMixin, View
+):
+    """
+    API endpoint for the components whose wear profile is closest to one.
+
+    Ranks the organization's components by distance between their feature
+    vectors (recent levels and trends of wear metals, contaminants and
+    additives) and the component's vector. With ``report``, the component
+    is described as it was at that report, e.g. before a failure.
+    Optional ``k`` parameter (default 10, at most 50).
+    """
+
+    default_k = 10
+    max_k = 50
+
+    def get(self, request, *args, **kwargs):
+        """
+        Get the nearest neighbours of a component of the organization.
+
+        Returns:
+            JsonResponse: The neighbours, closest first
+        """
+        if not self.has_organization_access():
+            return JsonResponse({"error": "Organization required"}, status=403)
+
+        component_id = request.GET.get("component")
+        if not component_id:
+            return JsonResponse(
+                {"error": "Component ID is required"}, status=400
+            )
+
+        organization = self.get_user_organization()
+        try:
+            component = Component.objects.get(
+                id=component_id, machine__organization=organization
+            )
+        except (Component.DoesNotExist, ValueError):
+            return JsonResponse(
+                {"error": "Component not found or access denied"}, status=404
+            )
+
+        report = None
+        if request.GET.get("report"):
+            try:
+                report = Report.objects.get(
+                    id=request.GET["report"],
+                    component=component,
+                    sample_date__isnull=False,
+                )
+            except (Report.DoesNotExist, ValueError):
+                return JsonResponse({"error": "Report not found"}, status=404)
+
+        k = min(_positive_int_param(request, "k", self.default_k), self.max_k)
+        index = similarity_index(organization.pk)
+        vector = None if report else index.vector_of(component.pk)
+        if vector is None:
+            features = ComponentSimilarityService().vector_for(
+                component.pk, until=report and report.sample_date
+            )
+            if features is None:
+                return JsonResponse(
+                    {"error": "Component has no samples"}, status=404
+                )
+            vector = index.standardize(features)
+
+        neighbours = index.nearest(vector, k=k, exclude=[component.pk])
+        states = ComponentLatestState.objects.select_related(
+            "machine", "component__type"
+        ).in_bulk([component_id for component_id, _ in neighbours])
+
+        results = []
+        for neighbour_id, distance in neighbours:
+            state = states.get(neighbour_id)
+            if state is None:
+                continue
+            results.append(
+                {
+                    "component_id": neighbour_id,
+                    "component": (
+                        state.component.type.name
+                        if state.component.type
+                        else "N/A"
+                    ),
+                    "machine_id": state.machine_id,
+                    "machine_name": state.machine.name,
+                    "distance": round(distance, 4),
+                    "report_id": state.report_id,
+                    "lab_number": state.lab_number,
+                    "sample_date": state.sample_date.strftime("%Y-%m-%d"),
+                    "condition": state.condition,
+                }
+            )
+
+        return JsonResponse(
+            {
+                "component_id": component.pk,
+                "report_id": report and report.pk,
+                "indexed_components": len(index),
+                "neighbours": results,
+            }
+        )
+
+
 class ComponentAnalysisView(
     PermissionRequiredMixin,
     OrganizationRequiredMixin,
     LoginRequiredMixin,
+    ReplicaReadMixin,
     TemplateView,
 ):
     """View for component analysis page."""
@@ -720,6 +1165,7 @@ class ComponentAnalysisDataAPIView(
     PermissionRequiredMixin,
     OrganizationRequiredMixin,
     LoginRequiredMixin,
+    ReplicaReadMixin,
     View,
 ):
     """API endpoint for component analysis data."""
@@ -740,8 +1186,10 @@ class ComponentAnalysisDataAPIView(
         if is_admin:
             # Admin can access all machines
             try:
-                Component.objects.get(id=component_id, is_active=True)
-            except Component.DoesNotExist:
+                component = Component.objects.select_related("machine").get(
+                    id=component_id, is_active=True
+                )
+            except (Component.DoesNotExist, ValueError):
                 return JsonResponse(
                     {"error": "Component not found"}, status=404
                 )
@@ -749,30 +1197,166 @@ class ComponentAnalysisDataAPIView(
             # Verify component belongs to user's organization
             organization = self.get_user_organization()
             try:
-                Component.objects.get(
+                component = Component.objects.select_related("machine").get(
                     id=component_id,
                     machine__organization=organization,
                     is_active=True,
                 )
-            except Component.DoesNotExist:
+            except (Component.DoesNotExist, ValueError):
                 return JsonResponse(
                     {"error": "Component not found or access denied"},
                     status=404,
                 )
 
+        # Optional zoom window and point budget of the charts
+        window = {}
+        for name in ("start_date", "end_date"):
+            if request.GET.get(name):
+                try:
+                    window[name] = timezone.datetime.strptime(
+                        request.GET.get(name), "%Y-%m-%d"
+                    ).date()
+                except ValueError:
+                    pass
+        max_points = _positive_int_param(request, "max_points", 0) or None
+
         # Use service to get analysis data
         try:
-            service = ComponentAnalysisService(component_id=component_id)
-            data = service.get_all_analysis_data()
-            return JsonResponse(data, safe=False)
+            data = tiered_cache.get_or_set(
+                f"dashboard:analysis:{component.pk}:"
+                f"{window.get('start_date')}:{window.get('end_date')}:"
+                f"{max_points}",
+                lambda: ComponentAnalysisService(
+                    component_id=component.pk,
+                    max_points=max_points,
+                    **window,
+                ).get_all_analysis_data(),
+                timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+                tags=[
+                    component_tag(component.pk),
+                    org_tag(component.machine.organization_id),
+                    THRESHOLD_PROFILES_TAG,
+                ],
+            )
+            return render_payload(request, data)
         except Exception as e:
             return JsonResponse({"error": str(e)}, status=500)
 
 
+class ComponentComparisonDataAPIView(
+    PermissionRequiredMixin,
+    OrganizationRequiredMixin,
+    LoginRequiredMixin,
+    ReplicaReadMixin,
+    View,
+):
+    """
+    API endpoint for the aligned analysis series of several components.
+
+    Components are given as a comma-separated ``components`` list, or by
+    ``machine`` (its active components), or default to the active fleet
+    of the user's organization. Access is checked for all of them in one
+    query and their reports are read in one query. Optional
+    ``parameters`` (comma-separated LabAnalysis fields).
+    """
+
+    permission_required = "dashboard.view_component_analysis"
+
+    def get(self, request, *args, **kwargs):
+        """Return the comparison data as JSON."""
+        try:
+            component_ids = [
+                int(pk)
+                for pk in request.GET.get("components", "").split(",")
+                if pk.strip()
+            ]
+            machine_id = int(request.GET.get("machine") or 0)
+        except ValueError:
+            return JsonResponse({"error": "Invalid component ID"}, status=400)
+
+        parameters = [
+            parameter.strip()
+            for parameter in request.GET.get("parameters", "").split(",")
+            if parameter.strip()
+        ] or list(DEFAULT_COMPARISON_PARAMETERS)
+        unknown = sorted(set(parameters) - set(COMPARISON_PARAMETERS))
+        if unknown:
+            return JsonResponse(
+                {"error": f"Unknown parameters: {', '.join(unknown)}"},
+                status=400,
+            )
+
+        components = Component.objects.filter(
+            is_active=True, machine__is_active=True
+        ).select_related("machine", "type")
+        organization = self.get_user_organization()
+        is_admin = request.user.is_staff or request.user.is_superuser
+        if not is_admin:
+            components = components.filter(machine__organization=organization)
+        if component_ids:
+            components = components.filter(pk__in=component_ids)
+        elif machine_id:
+            components = components.filter(machine_id=machine_id)
+        elif organization:
+            components = components.filter(machine__organization=organization)
+        else:
+            return JsonResponse(
+                {"error": "Components or machine are required"}, status=400
+            )
+
+        components = list(
+            components.order_by("machine__name", "type__name", "pk")[
+                : ComponentComparisonService.MAX_COMPONENTS + 1
+            ]
+        )
+        if len(components) > ComponentComparisonService.MAX_COMPONENTS:
+            return JsonResponse(
+                {
+                    "error": "At most "
+                    f"{ComponentComparisonService.MAX_COMPONENTS} "
+                    "components can be compared"
+                },
+                status=400,
+            )
+        missing = sorted(
+            set(component_ids) - {component.pk for component in components}
+        )
+        if missing:
+            return JsonResponse(
+                {
+                    "error": "Components not found or access denied",
+                    "components": missing,
+                },
+                status=404,
+            )
+
+        scope = ",".join(str(component.pk) for component in components)
+        digest = hashlib.md5(
+            f"{scope}:{','.join(parameters)}".encode()
+        ).hexdigest()
+        data = tiered_cache.get_or_set(
+            f"dashboard:comparison:{digest}",
+            lambda: ComponentComparisonService(
+                components, parameters
+            ).get_comparison_data(),
+            timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+            tags=[
+                *[component_tag(component.pk) for component in components],
+                *{
+                    org_tag(component.machine.organization_id)
+                    for component in components
+                },
+                THRESHOLD_PROFILES_TAG,
+            ],
+        )
+        return render_payload(request, data, records=("components",))
+
+
 class ComponentsByMachineAPIView(
     PermissionRequiredMixin,
     OrganizationRequiredMixin,
     LoginRequiredMixin,
+    ReplicaReadMixin,
     View,
 ):
     """API endpoint to get components for a specific machine."""
@@ -784,7 +1368,9 @@ class ComponentsByMachineAPIView(
         machine_id = request.GET.get("machine_id")
 
         if not machine_id:
-            return JsonResponse({"error": "Machine ID is required"}, status=400)
+            return JsonResponse(
+                {"error": "Machine ID is required"}, status=400
+            )
 
         # Check if user is admin (staff/superuser)
         is_admin = request.user.is_staff or request.user.is_superuser
@@ -807,12 +1393,22 @@ class ComponentsByMachineAPIView(
                 error_message = "Machine not found or access denied"
                 return JsonResponse({"error": error_message}, status=404)
 
-        # Get components for this machine
+        components_data = tiered_cache.get_or_set(
+            f"dashboard:machine_components:{machine.pk}",
+            lambda: self._get_components_data(machine),
+            timeout=settings.DASHBOARD_CACHE_TIMEOUT,
+            tags=[org_tag(machine.organization_id)],
+        )
+
+        return JsonResponse({"components": components_data}, safe=False)
+
+    def _get_components_data(self, machine) -> list:
+        """Return the active components of a machine."""
         components = Component.objects.filter(
             machine=machine, is_active=True
         ).select_related("type")
 
-        components_data = [
+        return [
             {
                 "id": component.id,
                 "name": (
@@ -821,5 +1417,3 @@ class ComponentsByMachineAPIView(
             }
             for component in components
         ]
-
-        return JsonResponse({"components": components_data}, safe=False)
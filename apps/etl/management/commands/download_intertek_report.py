@@ -87,9 +87,6 @@ class Command(BaseCommand):
             file_size = file_path.stat().st_size
             self.stdout.write(f"File size: {file_size:,} bytes")
 
-            # Close client connection
-            client.close()
-
         except exceptions.ETLException as e:
             logger.error(f"ETL error: {e}")
             raise CommandError(f"ETL operation failed: {str(e)}") from e
@@ -0,0 +1,144 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.etl.services.fake_intertek import (
+    FakeIntertekConfig,
+    FakeIntertekServer,
+    database_catalog,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Run a local fake Intertek OILCM API."""
+
+    help = (
+        "Serve a fake Intertek API (login and paginated 57-column exports) "
+        "with configurable latency and fault injection for ETL testing"
+    )
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-line arguments.
+
+        Args:
+            parser: Argument parser instance.
+        """
+        parser.add_argument(
+            "--host",
+            type=str,
+            default="127.0.0.1",
+            help="Interface to bind (default: 127.0.0.1)",
+        )
+        parser.add_argument(
+            "--port",
+            type=int,
+            default=8765,
+            help="Port to bind (default: 8765)",
+        )
+        parser.add_argument(
+            "--rows",
+            type=int,
+            default=10000,
+            help="Rows in the synthetic export (default: 10000)",
+        )
+        parser.add_argument(
+            "--samples-per-day",
+            type=int,
+            default=50,
+            help="Rows per sample date (default: 50)",
+        )
+        parser.add_argument(
+            "--from-database",
+            action="store_true",
+            help="Use active components from the database as equipment",
+        )
+        parser.add_argument(
+            "--organization-prefix",
+            type=str,
+            default="",
+            help="With --from-database, only organizations with this prefix",
+        )
+        parser.add_argument(
+            "--token-ttl",
+            type=int,
+            default=3600,
+            help="Token lifetime in seconds (default: 3600)",
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.0,
+            help="Delay added to every response in seconds (default: 0)",
+        )
+        parser.add_argument(
+            "--jitter",
+            type=float,
+            default=0.0,
+            help="Random extra delay up to this many seconds (default: 0)",
+        )
+        parser.add_argument(
+            "--fault-rate",
+            type=float,
+            default=0.0,
+            help="Probability of a 429/500/503 response (default: 0)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Random seed for the export and faults (default: 0)",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Execute the command.
+
+        Args:
+            *args: Positional arguments.
+            **options: Command options.
+
+        Raises:
+            CommandError: If the configuration is invalid.
+        """
+        if options["rows"] < 1:
+            raise CommandError("--rows must be at least 1")
+        if not 0 <= options["fault_rate"] <= 1:
+            raise CommandError("--fault-rate must be between 0 and 1")
+
+        catalog = []
+        if options["from_database"]:
+            catalog = database_catalog(options["organization_prefix"])
+            if not catalog:
+                raise CommandError(
+                    "No active components found (run seed_fleet first)"
+                )
+
+        config = FakeIntertekConfig(
+            rows=options["rows"],
+            catalog=catalog,
+            samples_per_day=options["samples_per_day"],
+            token_ttl=options["token_ttl"],
+            latency=options["latency"],
+            jitter=options["jitter"],
+            fault_rate=options["fault_rate"],
+            seed=options["seed"],
+        )
+        server = FakeIntertekServer(
+            config, host=options["host"], port=options["port"]
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Fake Intertek API with {config.rows} rows on {server.url}\n"
+                f"Set INTERTEK_API_BASE_URL={server.url} to use it."
+            )
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            self.stdout.write("\nStopping fake Intertek API...")
+        finally:
+            server.stop()
@@ -1,5 +1,6 @@
 """ETL services module."""
 
+from apps.etl.services.concurrency import AdaptiveConcurrencyLimiter
 from apps.etl.services.intertek_client import IntertekAPIClient
 
-__all__ = ["IntertekAPIClient"]
+__all__ = ["AdaptiveConcurrencyLimiter", "IntertekAPIClient"]
@@ -0,0 +1,121 @@
+"""
+Adaptive concurrency limiting for Intertek API calls.
+
+Implements additive-increase/multiplicative-decrease (AIMD): every
+successful, fast request raises the limit by ``1 / limit`` (about one
+slot per window of requests), while slow responses, throttling (429) and
+server errors cut it by ``decrease_factor``. Parallel page fetches
+therefore back off when the API slows down and ramp up again once it
+recovers.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Thread-safe AIMD limit on concurrent in-flight requests.
+
+    Attributes:
+        limit: Current (fractional) concurrency limit.
+        min_limit: Lower bound of the limit.
+        max_limit: Upper bound of the limit.
+        latency_threshold: Seconds above which a response counts as slow.
+        decrease_factor: Multiplier applied to the limit on congestion.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 2,
+        min_limit: int = 1,
+        max_limit: int = 8,
+        latency_threshold: float = 5.0,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            initial_limit: Starting concurrency limit.
+            min_limit: Lower bound of the limit.
+            max_limit: Upper bound of the limit.
+            latency_threshold: Seconds above which a response is slow.
+            decrease_factor: Multiplier applied on congestion (0 < f < 1).
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(
+            min(max(initial_limit, self.min_limit), self.max_limit)
+        )
+        self.latency_threshold = latency_threshold
+        self.decrease_factor = decrease_factor
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of requests currently holding a slot."""
+        with self._condition:
+            return self._in_flight
+
+    def acquire(self) -> None:
+        """Block until a slot is free under the current limit."""
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, congested: bool = False) -> None:
+        """
+        Free a slot and adapt the limit to the observed request.
+
+        Args:
+            latency: Request duration in seconds.
+            congested: Whether the API signalled overload (429/5xx/timeout).
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if congested or latency > self.latency_threshold:
+                new_limit = max(
+                    float(self.min_limit), self.limit * self.decrease_factor
+                )
+                if int(new_limit) < int(self.limit):
+                    logger.info(
+                        f"Intertek API slowing down (latency {latency:.2f}s), "
+                        f"concurrency limit {int(self.limit)} -> "
+                        f"{int(new_limit)}"
+                    )
+                self.limit = new_limit
+            else:
+                self.limit = min(
+                    float(self.max_limit), self.limit + 1 / self.limit
+                )
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self) -> Iterator["_SlotResult"]:
+        """
+        Hold a slot for the duration of a request.
+
+        Mark the yielded object as congested when the API signals
+        overload; the request latency is measured automatically.
+        """
+        self.acquire()
+        result = _SlotResult()
+        started = time.monotonic()
+        try:
+            yield result
+        finally:
+            self.release(time.monotonic() - started, result.congested)
+
+
+class _SlotResult:
+    """Outcome of a request made under a limiter slot."""
+
+    congested = False
@@ -0,0 +1,583 @@
+"""
+Local stand-in for the Intertek OILCM API.
+
+Serves ``Security/Login`` and ``Report/InspectionDetailExport`` from a
+stdlib ``ThreadingHTTPServer`` so the download, retry, incremental-load
+and parallel page download (``pages`` of download_intertek_report_task,
+whose peak concurrency the server records) paths of the ETL can be
+exercised end to end without network access. Exports use the same 57-column layout as the real API
+(title row, header row, data rows) and are generated deterministically
+from a seed.
+"""
+
+import csv
+import io
+import json
+import logging
+import random
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from openpyxl import Workbook
+
+logger = logging.getLogger(__name__)
+
+EXPORT_TITLE = "REPORTE DE INSPECCIÓN - DETALLE"
+
+EXPORT_HEADERS = [
+    "N°",
+    "No. Lab",
+    "Cliente",
+    "Equipo",
+    "Componente",
+    "Cód/Núm Serie",
+    "Lubricante",
+    "Fecha Muestra",
+    "Equipo Horas/Kms",
+    "Lubricante Horas/Kms",
+    "Fecha de Recepción",
+    "Fecha de Reporte",
+    "Cambio de Filtro",
+    "Cambio de Aceite",
+    "No.Per",
+    "Otros",
+    "Condición",
+    "Comentario",
+    "Agua (Crackle)",
+    "Agua por destilación",
+    "Viscosidad a 40°C",
+    "Viscosidad a 100°C",
+    "Compatibilidad",
+    "TBN",
+    "TAN",
+    "Oxidación",
+    "Hollín",
+    "Nitración",
+    "Sulfatación",
+    "Glicol",
+    "Dilución",
+    "Agua FTIR",
+    "PQ Index",
+    "Conteo de Partículas",
+    "Hierro (Fe)",
+    "Cromo (Cr)",
+    "Plomo (Pb)",
+    "Cobre (Cu)",
+    "Estaño (Sn)",
+    "Aluminio (Al)",
+    "Níquel (Ni)",
+    "Plata (Ag)",
+    "Silicio (Si)",
+    "Boro (B)",
+    "Sodio (Na)",
+    "Magnesio (Mg)",
+    "Molibdeno (Mo)",
+    "Titanio (Ti)",
+    "Vanadio (V)",
+    "Manganeso (Mn)",
+    "Potasio (K)",
+    "Fósforo (P)",
+    "Zinc (Zn)",
+    "Calcio (Ca)",
+    "Bario (Ba)",
+    "Cadmio (Cd)",
+    "Apariencia - Visual",
+]
+
+# (organization, machine, serial number, component type)
+CatalogEntry = Tuple[str, str, str, str]
+
+_CONDITIONS = ("NORMAL", "NORMAL", "NORMAL", "PRECAUCION", "CRITICO")
+_SORT_FIELDS = {"Id": 0, "LabNumber": 1, "SampleDate": 7}
+
+
+@dataclass
+class FakeIntertekConfig:
+    """
+    Behaviour of the fake server.
+
+    Attributes:
+        rows: Number of rows in the synthetic export.
+        catalog: Equipment the rows refer to; synthetic when empty.
+        start_date: Sample date of the first row.
+        samples_per_day: Rows per sample date (controls the date span).
+        token_ttl: Lifetime of issued tokens in seconds.
+        latency: Base delay added to every response, in seconds.
+        jitter: Random extra delay up to this many seconds.
+        fault_rate: Probability of answering with an injected fault.
+        fault_statuses: Status codes used for injected faults.
+        seed: Random seed for the export and the fault sequence.
+        username: Accepted username (any when empty).
+        password: Accepted password (any when empty).
+    """
+
+    rows: int = 1000
+    catalog: List[CatalogEntry] = field(default_factory=list)
+    start_date: Optional[date] = None
+    samples_per_day: int = 50
+    token_ttl: int = 3600
+    latency: float = 0.0
+    jitter: float = 0.0
+    fault_rate: float = 0.0
+    fault_statuses: Sequence[int] = (429, 500, 503)
+    seed: int = 0
+    username: str = ""
+    password: str = ""
+
+
+def synthetic_catalog(
+    organizations: int = 2, machines: int = 5, components: int = 3
+) -> List[CatalogEntry]:
+    """Return equipment names that do not depend on the database."""
+    types = ["MOTOR", "TRANSMISION", "HIDRAULICO", "DIFERENCIAL"]
+    return [
+        (
+            f"FAKE Org {org + 1}",
+            f"EQ-{org + 1:03d}-{machine + 1:04d}",
+            f"SN-{org + 1:03d}-{machine + 1:04d}",
+            types[component % len(types)],
+        )
+        for org in range(organizations)
+        for machine in range(machines)
+        for component in range(components)
+    ]
+
+
+def database_catalog(prefix: str = "") -> List[CatalogEntry]:
+    """
+    Return active components of the database as catalog entries.
+
+    Exports built from this catalog load cleanly, because every row
+    resolves to an existing organization, machine and component.
+
+    Args:
+        prefix: Only include organizations whose name starts with it.
+    """
+    from apps.equipment.models import Component
+
+    components = Component.objects.filter(
+        is_active=True,
+        machine__is_active=True,
+        machine__organization__is_active=True,
+        type__isnull=False,
+    )
+    if prefix:
+        components = components.filter(
+            machine__organization__name__startswith=prefix
+        )
+    return list(
+        components.order_by("pk").values_list(
+            "machine__organization__name",
+            "machine__name",
+            "machine__serial_number",
+            "type__name",
+        )
+    )
+
+
+def generate_export_rows(config: FakeIntertekConfig) -> List[List[Any]]:
+    """
+    Generate the data rows of the synthetic export.
+
+    Rows are ordered by ``Id`` and sample date, so newer rows always get
+    higher IDs and lab numbers, like the real export.
+
+    Args:
+        config: Server configuration.
+
+    Returns:
+        List of 57-value rows.
+    """
+    rng = random.Random(config.seed)
+    catalog = config.catalog or synthetic_catalog()
+    per_day = max(1, config.samples_per_day)
+    start = config.start_date or (
+        date.today() - timedelta(days=config.rows // per_day)
+    )
+    hours: Dict[CatalogEntry, int] = {}
+
+    rows = []
+    for index in range(config.rows):
+        key = catalog[index % len(catalog)]
+        organization, machine, serial, component = key
+        hours[key] = hours.get(key, rng.randint(1000, 20000)) + rng.randint(
+            100, 300
+        )
+        oil_hours = rng.randint(50, 500)
+        sample_date = start + timedelta(days=index // per_day)
+        wear = 1 + oil_hours / 100
+
+        rows.append(
+            [
+                index + 1,
+                f"FK-{index + 1:08d}",
+                organization,
+                machine,
+                component,
+                serial,
+                "15W40",
+                sample_date.strftime("%d/%m/%Y"),
+                hours[key],
+                oil_hours,
+                (sample_date + timedelta(days=2)).strftime("%d/%m/%Y"),
+                (sample_date + timedelta(days=4)).strftime("%d/%m/%Y"),
+                rng.choice(("SI", "NO")),
+                rng.choice(("SI", "NO", "NO")),
+                f"PER-{index + 1:07d}",
+                "",
+                rng.choice(_CONDITIONS),
+                "Muestra sintética",
+                "NEGATIVO",
+                round(rng.uniform(0, 0.2), 2),
+                round(rng.uniform(90, 150), 1),
+                round(rng.uniform(12, 16), 1),
+                "OK",
+                round(rng.uniform(5, 12), 2),
+                round(rng.uniform(0.5, 3), 2),
+                round(rng.uniform(5, 25), 1),
+                round(rng.uniform(0, 2), 2),
+                round(rng.uniform(3, 15), 1),
+                round(rng.uniform(10, 25), 1),
+                0,
+                round(rng.uniform(0, 2), 2),
+                round(rng.uniform(0, 0.1), 3),
+                rng.randint(0, 40),
+                "/".join(str(rng.randint(9, 21)) for _ in range(3)),
+                int(rng.uniform(5, 40) * wear),
+                int(rng.uniform(0, 5) * wear),
+                rng.randint(0, 5),
+                int(rng.uniform(1, 20) * wear),
+                rng.randint(0, 3),
+                int(rng.uniform(1, 10) * wear),
+                rng.randint(0, 2),
+                0,
+                rng.randint(2, 25),
+                rng.randint(0, 80),
+                rng.randint(0, 20),
+                rng.randint(5, 900),
+                rng.randint(0, 100),
+                0,
+                0,
+                rng.randint(0, 2),
+                rng.randint(0, 10),
+                rng.randint(600, 1200),
+                rng.randint(700, 1400),
+                rng.randint(1000, 3500),
+                0,
+                0,
+                "NORMAL",
+            ]
+        )
+    return rows
+
+
+def render_export(rows: Sequence[Sequence[Any]], file_type: int) -> bytes:
+    """
+    Render rows in the export layout.
+
+    Args:
+        rows: Data rows.
+        file_type: 1 for CSV, anything else for Excel.
+
+    Returns:
+        File content.
+    """
+    if file_type == 1:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([EXPORT_TITLE] + [""] * (len(EXPORT_HEADERS) - 1))
+        writer.writerow(EXPORT_HEADERS)
+        writer.writerows(rows)
+        return buffer.getvalue().encode("utf-8")
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Reporte")
+    sheet.append([EXPORT_TITLE])
+    sheet.append(EXPORT_HEADERS)
+    for row in rows:
+        sheet.append(list(row))
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+class FakeIntertekServer:
+    """
+    Fake Intertek OILCM API running in a background thread.
+
+    Usable as a context manager; ``url`` is the API base URL to pass to
+    IntertekAPIClient (or to set as ``INTERTEK_API_BASE_URL``). ``stats``
+    counts logins, exports, injected faults, rejected tokens and the peak
+    number of requests served at once.
+    """
+
+    def __init__(
+        self,
+        config: Optional[FakeIntertekConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """
+        Initialize the server without starting it.
+
+        Args:
+            config: Server behaviour (defaults when None).
+            host: Interface to bind.
+            port: Port to bind (0 picks a free port).
+        """
+        self.config = config or FakeIntertekConfig()
+        self.rows = generate_export_rows(self.config)
+        self.tokens: Dict[str, float] = {}
+        self.stats = {
+            "logins": 0,
+            "exports": 0,
+            "faults": 0,
+            "rejected": 0,
+            "peak_in_flight": 0,
+        }
+        self._in_flight = 0
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Return the base URL of the fake API."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/oilcm/api"
+
+    def start(self) -> "FakeIntertekServer":
+        """Serve requests in a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            name="fake-intertek",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(f"Fake Intertek API listening on {self.url}")
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests in the calling thread until interrupted."""
+        self._httpd.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and release the socket."""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeIntertekServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def expire_tokens(self) -> None:
+        """Invalidate every issued token (the next request gets a 401)."""
+        with self._lock:
+            self.tokens.clear()
+
+    # ------------------------------------------------------------------
+    # Request handling
+    # ------------------------------------------------------------------
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:
+                server._handle(self, "POST")
+
+            def do_GET(self) -> None:
+                server._handle(self, "GET")
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug(f"Fake Intertek: {format % args}")
+
+        return Handler
+
+    def _handle(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        with self._lock:
+            self._in_flight += 1
+            self.stats["peak_in_flight"] = max(
+                self.stats["peak_in_flight"], self._in_flight
+            )
+        try:
+            self._respond(handler, method)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _respond(self, handler: BaseHTTPRequestHandler, method: str) -> None:
+        config = self.config
+        with self._lock:
+            delay = config.latency + self._rng.uniform(0, config.jitter)
+            fault = (
+                self._rng.choice(list(config.fault_statuses))
+                if self._rng.random() < config.fault_rate
+                else None
+            )
+        if delay:
+            time.sleep(delay)
+
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+
+        if fault:
+            with self._lock:
+                self.stats["faults"] += 1
+            headers = {"Retry-After": "1"} if fault == 429 else {}
+            self._send_json(
+                handler, fault, {"message": "Injected fault"}, headers
+            )
+            return
+
+        path = urlparse(handler.path)
+        if method == "POST" and path.path.endswith("/Security/Login"):
+            self._login(handler, body)
+        elif method == "GET" and path.path.endswith(
+            "/Report/InspectionDetailExport"
+        ):
+            self._export(handler, parse_qs(path.query))
+        else:
+            self._send_json(handler, 404, {"message": "Not found"})
+
+    def _login(self, handler: BaseHTTPRequestHandler, body: bytes) -> None:
+        try:
+            payload = json.loads(body or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(handler, 400, {"message": "Invalid JSON"})
+            return
+
+        config = self.config
+        if (
+            config.username and payload.get("userName") != config.username
+        ) or (config.password and payload.get("password") != config.password):
+            self._send_json(
+                handler, 200, {"message": "Usuario o contraseña incorrectos"}
+            )
+            return
+
+        token = uuid.uuid4().hex
+        with self._lock:
+            self.tokens[token] = time.monotonic() + config.token_ttl
+            self.stats["logins"] += 1
+        self._send_json(
+            handler,
+            200,
+            {
+                "success": True,
+                "message": None,
+                "data": {"accessToken": token, "expiresIn": config.token_ttl},
+            },
+        )
+
+    def _export(
+        self, handler: BaseHTTPRequestHandler, query: Dict[str, List[str]]
+    ) -> None:
+        auth = handler.headers.get("Authorization", "")
+        token = auth.removeprefix("Bearer ").strip()
+        with self._lock:
+            expiry = self.tokens.get(token)
+            valid = expiry is not None and expiry > time.monotonic()
+            if not valid:
+                self.stats["rejected"] += 1
+        if not valid:
+            self._send_json(handler, 401, {"message": "Unauthorized"})
+            return
+
+        def param(name: str, default: str = "") -> str:
+            return query.get(name, [default])[0]
+
+        rows = self.rows
+        search = param("searchText").strip().upper()
+        if search:
+            rows = [
+                row
+                for row in rows
+                if any(search in str(value).upper() for value in row[1:6])
+            ]
+        lab_number = param("labNumber").strip()
+        if lab_number:
+            rows = [row for row in rows if row[1] == lab_number]
+
+        column = _SORT_FIELDS.get(param("sortField", "Id"), 0)
+        descending = param("sortType", "1") == "0"
+        if column == 7:
+            rows = sorted(
+                rows,
+                key=lambda row: row[7].split("/")[::-1],
+                reverse=descending,
+            )
+        elif column or descending:
+            rows = sorted(
+                rows, key=lambda row: row[column], reverse=descending
+            )
+
+        page_size = max(1, int(param("pageSize", "50") or 50))
+        page_number = max(0, int(param("pageNumber", "0") or 0))
+        page = rows[page_number * page_size : (page_number + 1) * page_size]
+
+        file_type = int(param("fileType", "3") or 3)
+        content = render_export(page, file_type)
+        with self._lock:
+            self.stats["exports"] += 1
+
+        content_type = (
+            "text/csv"
+            if file_type == 1
+            else (
+                "application/vnd.openxmlformats-officedocument."
+                "spreadsheetml.sheet"
+            )
+        )
+        self._send(
+            handler,
+            200,
+            content,
+            content_type,
+            {"X-Total-Count": str(len(rows))},
+        )
+
+    def _send_json(
+        self,
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        payload: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        self._send(
+            handler,
+            status,
+            json.dumps(payload).encode("utf-8"),
+            "application/json",
+            headers,
+        )
+
+    @staticmethod
+    def _send(
+        handler: BaseHTTPRequestHandler,
+        status: int,
+        content: bytes,
+        content_type: str,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        handler.end_headers()
+        handler.wfile.write(content)
@@ -1,18 +1,31 @@
 import json
 import logging
 import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 import requests
+from django.conf import settings
 from django.core.cache import cache
 from django.utils import timezone
+from openpyxl import Workbook, load_workbook
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from apps.etl import exceptions
+from apps.etl.services.concurrency import AdaptiveConcurrencyLimiter
 
 logger = logging.getLogger(__name__)
 
+# Serializes refreshes of threads in this process before they compete for
+# the shared cache lock (cache.add() is not atomic on every backend)
+_local_refresh_lock = threading.Lock()
+
 
 class IntertekAPIClient:
     """
@@ -23,7 +36,7 @@ class IntertekAPIClient:
 
     Attributes:
         login_url: URL for authentication endpoint.
-        api_base_url: Base URL for API endpoints.
+        api_base_url: Base URL for API endpoints (INTERTEK_API_BASE_URL).
         username: Username for authentication.
         password: Password for authentication.
         token_cache_key: Cache key for storing JWT token.
@@ -31,9 +44,6 @@ class IntertekAPIClient:
     """
 
     # API URLs
-    LOGIN_URL = (
-        "https://servicesintertek.sigcomt.com:2012/oilcm/api/Security/Login"
-    )
     API_BASE_URL = "https://servicesintertek.sigcomt.com:2012/oilcm/api"
     REFERER_URL = "https://oilcmintertek.sigcomt.com:2015/"
 
@@ -44,18 +54,81 @@ class IntertekAPIClient:
     # Token expiry buffer in seconds (renew 5 minutes before actual expiry)
     TOKEN_EXPIRY_BUFFER = 300
 
-    def __init__(self, username: str, password: str) -> None:
+    # Seconds before the expiry buffer in which a background refresh starts
+    TOKEN_REFRESH_AHEAD = 600
+
+    # Single-flight refresh: only the lock holder logs in, others wait
+    REFRESH_LOCK_CACHE_KEY = "intertek_api_token_refresh_lock"
+    REFRESH_LOCK_TIMEOUT = 60
+    REFRESH_WAIT_TIMEOUT = 45
+    REFRESH_POLL_INTERVAL = 0.25
+
+    # Responses retried with backoff and treated as API congestion
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+    # Title and header rows at the top of every export page
+    EXPORT_HEADER_ROWS = 2
+
+    # Export file extension by file type
+    FILE_EXTENSIONS = {1: ".csv", 2: ".pdf", 3: ".xlsx"}
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        api_base_url: Optional[str] = None,
+    ) -> None:
         """
         Initialize the Intertek API client.
 
         Args:
             username: Username for API authentication.
             password: Password for API authentication.
+            limiter: Concurrency limiter shared by the parallel page
+                downloads of download_inspection_pages.
+            api_base_url: API base URL (defaults to the
+                ``INTERTEK_API_BASE_URL`` setting).
         """
         self.username = username
         self.password = password
+        self.api_base_url = (
+            api_base_url
+            or getattr(settings, "INTERTEK_API_BASE_URL", None)
+            or self.API_BASE_URL
+        ).rstrip("/")
+        self.login_url = f"{self.api_base_url}/Security/Login"
+        self.timeout = (
+            getattr(settings, "INTERTEK_CONNECT_TIMEOUT", 10),
+            getattr(settings, "INTERTEK_READ_TIMEOUT", 60),
+        )
+        self.limiter = limiter or AdaptiveConcurrencyLimiter(
+            max_limit=getattr(settings, "INTERTEK_MAX_CONCURRENCY", 8),
+            latency_threshold=getattr(
+                settings, "INTERTEK_SLOW_RESPONSE_SECONDS", 10
+            ),
+        )
         self._session = requests.Session()
         self._setup_session_headers()
+        self._mount_adapter()
+
+    def _mount_adapter(self) -> None:
+        """Mount a pooled adapter retrying throttled and failed requests."""
+        pool_size = getattr(settings, "INTERTEK_POOL_MAXSIZE", 10)
+        retry = Retry(
+            total=getattr(settings, "INTERTEK_MAX_RETRIES", 3),
+            backoff_factor=getattr(settings, "INTERTEK_RETRY_BACKOFF", 1.0),
+            status_forcelist=self.RETRY_STATUS_CODES,
+            # Never the login POST, which is not idempotent
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=2, pool_maxsize=pool_size, max_retries=retry
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
     def _setup_session_headers(self) -> None:
         """Configure default headers for all requests."""
@@ -95,6 +168,133 @@ class IntertekAPIClient:
         logger.debug("Using cached authentication token")
         return token
 
+    def _peek_token(self, stale_token: Optional[str] = None) -> Optional[str]:
+        """
+        Return a valid cached token other than ``stale_token``.
+
+        Args:
+            stale_token: Token known to be rejected by the API.
+
+        Returns:
+            Valid cached token, or None.
+        """
+        token = cache.get(self.TOKEN_CACHE_KEY)
+        expiry = cache.get(self.TOKEN_EXPIRY_CACHE_KEY)
+        if not token or not expiry or token == stale_token:
+            return None
+        if timezone.now() >= expiry - timedelta(
+            seconds=self.TOKEN_EXPIRY_BUFFER
+        ):
+            return None
+        return token
+
+    def _acquire_refresh_lock(self) -> Optional[str]:
+        """
+        Try to acquire the cross-process refresh lock.
+
+        Returns:
+            Lock owner id when acquired, None otherwise.
+        """
+        owner = uuid.uuid4().hex
+        if cache.add(
+            self.REFRESH_LOCK_CACHE_KEY, owner, self.REFRESH_LOCK_TIMEOUT
+        ):
+            return owner
+        return None
+
+    def _release_refresh_lock(self, owner: str) -> None:
+        """Release the refresh lock if it is still held by ``owner``."""
+        if cache.get(self.REFRESH_LOCK_CACHE_KEY) == owner:
+            cache.delete(self.REFRESH_LOCK_CACHE_KEY)
+
+    def _refresh_token(self, stale_token: Optional[str] = None) -> str:
+        """
+        Obtain a new token with a single login across all workers.
+
+        The worker that acquires the refresh lock authenticates; the others
+        poll the shared cache until the new token appears.
+
+        Args:
+            stale_token: Token known to be rejected by the API.
+
+        Returns:
+            Valid JWT authentication token.
+
+        Raises:
+            AuthenticationError: If authentication fails or the wait for
+                another worker's refresh times out.
+        """
+        deadline = time.monotonic() + self.REFRESH_WAIT_TIMEOUT
+        if not _local_refresh_lock.acquire(timeout=self.REFRESH_WAIT_TIMEOUT):
+            raise exceptions.AuthenticationError(
+                "Timed out waiting for token refresh"
+            )
+        try:
+            while True:
+                owner = self._acquire_refresh_lock()
+                if owner:
+                    try:
+                        # Another worker may have refreshed while we waited
+                        token = self._peek_token(stale_token)
+                        if token:
+                            return token
+                        return self._authenticate()
+                    finally:
+                        self._release_refresh_lock(owner)
+
+                token = self._peek_token(stale_token)
+                if token:
+                    logger.debug("Using token refreshed by another worker")
+                    return token
+
+                if time.monotonic() >= deadline:
+                    raise exceptions.AuthenticationError(
+                        "Timed out waiting for token refresh"
+                    )
+                time.sleep(self.REFRESH_POLL_INTERVAL)
+        finally:
+            _local_refresh_lock.release()
+
+    def _refresh_in_background_if_due(self) -> None:
+        """
+        Start a background refresh when the cached token is about to expire.
+
+        Only the worker that acquires the refresh lock refreshes; requests
+        keep using the current token in the meantime.
+        """
+        expiry = cache.get(self.TOKEN_EXPIRY_CACHE_KEY)
+        if not expiry:
+            return
+
+        refresh_at = expiry - timedelta(
+            seconds=self.TOKEN_EXPIRY_BUFFER + self.TOKEN_REFRESH_AHEAD
+        )
+        if timezone.now() < refresh_at:
+            return
+
+        owner = self._acquire_refresh_lock()
+        if not owner:
+            return
+
+        def refresh() -> None:
+            try:
+                self._authenticate()
+            except exceptions.AuthenticationError as e:
+                logger.warning(f"Background token refresh failed: {e}")
+            finally:
+                self._release_refresh_lock(owner)
+
+        logger.info("Refreshing authentication token in background")
+        threading.Thread(
+            target=refresh, name="intertek-token-refresh", daemon=True
+        ).start()
+
+    def _invalidate_token(self, token: str) -> None:
+        """Remove ``token`` from the cache unless it was already replaced."""
+        if cache.get(self.TOKEN_CACHE_KEY) == token:
+            cache.delete(self.TOKEN_CACHE_KEY)
+            cache.delete(self.TOKEN_EXPIRY_CACHE_KEY)
+
     def _cache_token(self, token: str, expires_in: int) -> None:
         """
         Cache authentication token with expiry time.
@@ -128,7 +328,7 @@ class IntertekAPIClient:
 
         try:
             response = self._session.post(
-                self.LOGIN_URL, json=payload, timeout=30
+                self.login_url, json=payload, timeout=self.timeout
             )
             response.raise_for_status()
 
@@ -178,10 +378,30 @@ class IntertekAPIClient:
         # Try to get cached token first
         token = self._get_cached_token()
         if token:
+            self._refresh_in_background_if_due()
             return token
 
-        # Authenticate to get new token
-        return self._authenticate()
+        # Authenticate to get new token (one worker at a time)
+        return self._refresh_token()
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the adaptive concurrency limiter.
+
+        Throttling, server errors and network failures reduce the number
+        of concurrent requests; fast successful responses increase it.
+        """
+        with self.limiter.slot() as slot:
+            try:
+                response = self._session.request(method, url, **kwargs)
+            except (
+                requests.exceptions.Timeout,
+                requests.exceptions.ConnectionError,
+            ):
+                slot.congested = True
+                raise
+            slot.congested = response.status_code in self.RETRY_STATUS_CODES
+            return response
 
     def _make_authenticated_request(
         self,
@@ -210,9 +430,10 @@ class IntertekAPIClient:
         headers = kwargs.get("headers", {})
         headers["Authorization"] = f"Bearer {token}"
         kwargs["headers"] = headers
+        kwargs.setdefault("timeout", self.timeout)
 
         try:
-            response = self._session.request(method, url, **kwargs)
+            response = self._send(method, url, **kwargs)
             response.raise_for_status()
             return response
 
@@ -220,15 +441,16 @@ class IntertekAPIClient:
             # Check if it's a 401 Unauthorized (token expired)
             if e.response.status_code == 401:
                 logger.warning("Token expired, attempting to refresh")
-                # Clear cache and try once more with fresh token
-                cache.delete(self.TOKEN_CACHE_KEY)
-                cache.delete(self.TOKEN_EXPIRY_CACHE_KEY)
+                # Drop the rejected token (unless another worker already
+                # replaced it) and try once more with a fresh token, from
+                # the single-flight refresh
+                self._invalidate_token(token)
 
-                token = self.get_token()
+                token = self._refresh_token(stale_token=token)
                 kwargs["headers"]["Authorization"] = f"Bearer {token}"
 
                 try:
-                    response = self._session.request(method, url, **kwargs)
+                    response = self._send(method, url, **kwargs)
                     response.raise_for_status()
                     return response
                 except requests.exceptions.RequestException as retry_error:
@@ -242,7 +464,9 @@ class IntertekAPIClient:
 
         except requests.exceptions.RequestException as e:
             logger.error(f"API request failed: {e}")
-            raise exceptions.APIRequestError(f"Request failed: {str(e)}") from e
+            raise exceptions.APIRequestError(
+                f"Request failed: {str(e)}"
+            ) from e
 
     def download_inspection_report(
         self,
@@ -274,7 +498,7 @@ class IntertekAPIClient:
         """
         logger.info("Downloading inspection detail report")
 
-        url = f"{self.API_BASE_URL}/Report/InspectionDetailExport"
+        url = f"{self.api_base_url}/Report/InspectionDetailExport"
 
         params = {
             "searchText": search_text,
@@ -289,24 +513,11 @@ class IntertekAPIClient:
 
         try:
             response = self._make_authenticated_request(
-                "GET", url, params=params, timeout=60
+                "GET", url, params=params
             )
 
-            # Determine file extension based on file_type
-            file_extensions = {
-                1: ".csv",
-                2: ".pdf",
-                3: ".xlsx",
-            }
-            extension = file_extensions.get(file_type, ".xlsx")
-
             # Create temporary file with appropriate extension
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            temp_file = tempfile.NamedTemporaryFile(
-                delete=False,
-                suffix=f"_intertek_report_{timestamp}{extension}",
-                prefix="etl_",
-            )
+            temp_file = self._temporary_file(file_type)
 
             # Write content to file
             temp_file.write(response.content)
@@ -328,6 +539,110 @@ class IntertekAPIClient:
                 f"Unexpected error: {str(e)}"
             ) from e
 
+    def download_inspection_pages(
+        self,
+        pages: int,
+        page_size: int = 50,
+        file_type: int = 3,
+        **kwargs,
+    ) -> Path:
+        """
+        Download the first ``pages`` export pages in parallel as one file.
+
+        Every page request goes through the client's concurrency limiter,
+        so fewer pages are fetched at once while the API responds slowly
+        or throttles, and more once it recovers.
+
+        Args:
+            pages: Number of pages to download.
+            page_size: Number of records per page.
+            file_type: Export file type (1 for CSV, 3 for Excel).
+            **kwargs: Other arguments of download_inspection_report.
+
+        Returns:
+            Path to the merged export (title, header and every page's
+            rows, in page order).
+
+        Raises:
+            FileDownloadError: If a page download fails, or for PDF
+                exports, which cannot be merged.
+        """
+        if file_type not in (1, 3):
+            raise exceptions.FileDownloadError(
+                f"Cannot merge pages of file type {file_type}"
+            )
+
+        logger.info(f"Downloading {pages} inspection report pages")
+        paths: List[Path] = []
+        try:
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(pages, self.limiter.max_limit)),
+                thread_name_prefix="intertek-page",
+            ) as executor:
+                futures = [
+                    executor.submit(
+                        self.download_inspection_report,
+                        page_number=page,
+                        page_size=page_size,
+                        file_type=file_type,
+                        **kwargs,
+                    )
+                    for page in range(pages)
+                ]
+            # Every page finished; keep the downloaded ones for cleanup
+            paths = [
+                future.result()
+                for future in futures
+                if future.exception() is None
+            ]
+            for future in futures:
+                if future.exception() is not None:
+                    raise future.exception()
+            return self._merge_pages(paths, file_type)
+        finally:
+            for path in paths:
+                path.unlink(missing_ok=True)
+
+    def _merge_pages(self, paths: List[Path], file_type: int) -> Path:
+        """Merge export pages into one file, keeping the first headers."""
+        temp_file = self._temporary_file(file_type)
+        if file_type == 1:
+            for index, path in enumerate(paths):
+                with path.open("rb") as page:
+                    lines = page.readlines()
+                if index:
+                    lines = lines[self.EXPORT_HEADER_ROWS :]
+                if lines and not lines[-1].endswith(b"\n"):
+                    lines[-1] += b"\n"
+                temp_file.writelines(lines)
+            temp_file.close()
+            return Path(temp_file.name)
+
+        temp_file.close()
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet()
+        for index, path in enumerate(paths):
+            page = load_workbook(path, read_only=True)
+            rows = page.active.iter_rows(
+                min_row=1 if index == 0 else self.EXPORT_HEADER_ROWS + 1,
+                values_only=True,
+            )
+            for row in rows:
+                sheet.append(row)
+            page.close()
+        workbook.save(temp_file.name)
+        return Path(temp_file.name)
+
+    def _temporary_file(self, file_type: int):
+        """Create the temporary file of an export."""
+        extension = self.FILE_EXTENSIONS.get(file_type, ".xlsx")
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return tempfile.NamedTemporaryFile(
+            delete=False,
+            suffix=f"_intertek_report_{timestamp}{extension}",
+            prefix="etl_",
+        )
+
     def close(self) -> None:
         """Close the HTTP session and cleanup resources."""
         self._session.close()
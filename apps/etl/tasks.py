@@ -1,6 +1,7 @@
 import logging
+from datetime import date
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 import polars as pl
 from celery import shared_task
@@ -23,17 +24,22 @@ def download_intertek_report_task(
     search_text: str = "",
     lab_number: str = "",
     page_size: int = 50,
-    file_type: int = 3,
+    file_type: int = 1,
+    pages: int = 1,
 ) -> Dict[str, str]:
     """
     Celery task to download Intertek inspection report.
 
+    Several pages are downloaded in parallel, as fast as the API allows
+    (see IntertekAPIClient.download_inspection_pages), into one file.
+
     Args:
         self: Task instance (bound task).
         search_text: Text to search for in reports.
         lab_number: Laboratory number to filter by.
         page_size: Number of records per page.
-        file_type: Export file type (1=CSV, 2=PDF, 3=Excel).
+        file_type: Export file type (1=CSV, default; 2=PDF; 3=Excel).
+        pages: Number of pages to download.
 
     Returns:
         Dictionary with download status and file path.
@@ -45,19 +51,26 @@ def download_intertek_report_task(
         f"Starting Intertek report download task (task_id: {self.request.id})"
     )
 
-    client = None
-
     try:
-        # Get configured API client
+        # Per-process client, reused across tasks (not closed here)
         client = utils.get_intertek_client()
 
         # Download report
-        file_path = client.download_inspection_report(
-            search_text=search_text,
-            lab_number=lab_number,
-            page_size=page_size,
-            file_type=file_type,
-        )
+        if pages > 1:
+            file_path = client.download_inspection_pages(
+                pages,
+                search_text=search_text,
+                lab_number=lab_number,
+                page_size=page_size,
+                file_type=file_type,
+            )
+        else:
+            file_path = client.download_inspection_report(
+                search_text=search_text,
+                lab_number=lab_number,
+                page_size=page_size,
+                file_type=file_type,
+            )
 
         logger.info(f"Report downloaded successfully: {file_path}")
 
@@ -84,10 +97,6 @@ def download_intertek_report_task(
         logger.error(f"Unexpected error in download task: {e}")
         raise self.retry(exc=e)
 
-    finally:
-        if client:
-            client.close()
-
 
 @shared_task
 def process_report_task(file_path: str) -> Dict[str, str]:
@@ -97,9 +106,11 @@ def process_report_task(file_path: str) -> Dict[str, str]:
     Implements incremental loading based on sample_date filtering. Only processes
     records with sample_date > last existing report in database. Uses polars for
     high-performance data filtering and bulk_create() for batch operations.
+    CSV exports are scanned lazily, so the watermark filter runs before the
+    rows are materialized.
 
     Args:
-        file_path: Path to the downloaded report file.
+        file_path: Path to the downloaded report file (.csv or .xlsx).
 
     Returns:
         Dictionary with processing status and results.
@@ -127,23 +138,6 @@ def process_report_task(file_path: str) -> Dict[str, str]:
         if created:
             logger.info("Created system user for ETL operations")
 
-        # Load DataFrame with polars
-        logger.info(f"Loading Excel file with polars: {path}")
-        df = pl.read_excel(path)
-
-        # Skip title and header row (rows 0-1)
-        df = df.slice(1)
-
-        # Select only the first 57 columns (0-56) to exclude blank columns
-        if df.width > 57:
-            extra_cols = df.width - 57
-            df = df.select(df.columns[:57])
-            logger.debug(
-                f"Selected first 57 columns, excluded {extra_cols} blank columns"
-            )
-
-        logger.info(f"Loaded {len(df)} rows from Excel file")
-
         # Get last sample_date from database
         last_report = (
             report_models.Report.objects.filter(sample_date__isnull=False)
@@ -151,50 +145,32 @@ def process_report_task(file_path: str) -> Dict[str, str]:
             .only("sample_date")
             .first()
         )
-
-        # Filter incremental data
-        total_rows = len(df)
-
         if last_report:
             logger.info(
                 f"Last sample_date in database: {last_report.sample_date}"
             )
-
-            # Rename columns for easier access
-            df = df.rename(
-                {col: f"column_{i}" for i, col in enumerate(df.columns)}
+        else:
+            logger.info(
+                "First load - no existing reports, processing all records"
             )
 
-            # Parse sample_date column (column_7) and filter
-            df = df.with_columns(
-                [
-                    pl.col("column_7")
-                    .map_elements(
-                        lambda x: utils.parse_polars_date(x),
-                        return_dtype=pl.Date,
-                    )
-                    .alias("parsed_sample_date")
-                ]
-            )
+        service = bulk_upload.ReportBulkUploadService(user=system_user)
 
-            # Filter records where sample_date > last_sample_date
-            df = df.filter(
-                pl.col("parsed_sample_date") > last_report.sample_date
+        if path.suffix.lower() == ".csv":
+            df, total_rows = _load_csv_report(
+                service, path, last_report.sample_date if last_report else None
             )
+        else:
+            df, total_rows = _load_excel_report(
+                service, path, last_report.sample_date if last_report else None
+            )
+        filtered_rows = len(df)
 
-            # Drop the temporary parsed_sample_date column
-            df = df.drop("parsed_sample_date")
-
-            filtered_rows = len(df)
+        if last_report:
             logger.info(
                 f"Incremental filter: {filtered_rows}/{total_rows} rows "
                 f"(sample_date > {last_report.sample_date})"
             )
-        else:
-            logger.info(
-                "First load - no existing reports, processing all records"
-            )
-            filtered_rows = total_rows
 
         if len(df) == 0:
             logger.info("No new records to process after filtering")
@@ -204,6 +180,7 @@ def process_report_task(file_path: str) -> Dict[str, str]:
                     "created": 0,
                     "updated": 0,
                     "skipped": 0,
+                    "quarantined": 0,
                     "errors": [],
                 },
                 "total_rows": total_rows,
@@ -212,12 +189,13 @@ def process_report_task(file_path: str) -> Dict[str, str]:
 
         # Process with bulk upload service
         logger.info("Processing DataFrame with ReportBulkUploadService")
-        service = bulk_upload.ReportBulkUploadService(user=system_user)
         results = service.process_dataframe(df)
 
         logger.info(
             f"ETL completed: {results['created']} created, "
-            f"{results['skipped']} skipped, {len(results['errors'])} errors"
+            f"{results['skipped']} skipped, "
+            f"{results['quarantined']} quarantined, "
+            f"{len(results['errors'])} errors"
         )
 
         # Determine status
@@ -251,12 +229,75 @@ def process_report_task(file_path: str) -> Dict[str, str]:
                 logger.error(f"Failed to clean up temp file: {e}")
 
 
+def _load_csv_report(
+    service: bulk_upload.ReportBulkUploadService,
+    path: Path,
+    watermark: Optional[date],
+) -> Tuple[pl.DataFrame, int]:
+    """
+    Load a CSV export, applying the watermark during the lazy scan.
+
+    Args:
+        service: Bulk upload service used to scan the file.
+        path: Path to the CSV export.
+        watermark: Last sample date already loaded.
+
+    Returns:
+        Tuple of (rows newer than the watermark, total data rows).
+    """
+    logger.info(f"Scanning CSV file with polars: {path}")
+    lf = service.scan_csv(path)
+    if watermark:
+        # Both plans share one scan of the file (common subplan elimination)
+        totals, df = pl.collect_all(
+            [
+                lf.select(pl.len()),
+                lf.filter(service.sample_date_expr() > watermark),
+            ]
+        )
+        total_rows = totals.item()
+    else:
+        df = lf.collect()
+        total_rows = len(df)
+    logger.info(f"Loaded {total_rows} rows from CSV file")
+    return df, total_rows
+
+
+def _load_excel_report(
+    service: bulk_upload.ReportBulkUploadService,
+    path: Path,
+    watermark: Optional[date],
+) -> Tuple[pl.DataFrame, int]:
+    """
+    Load an Excel export and filter rows newer than the watermark.
+
+    Args:
+        service: Bulk upload service used to read the file.
+        path: Path to the Excel export.
+        watermark: Last sample date already loaded.
+
+    Returns:
+        Tuple of (rows newer than the watermark, total data rows).
+    """
+    logger.info(f"Loading Excel file with polars: {path}")
+    df = service.read_excel(str(path))
+
+    logger.info(f"Loaded {len(df)} rows from Excel file")
+    total_rows = len(df)
+
+    if watermark:
+        df = df.filter(service.sample_date_expr() > watermark)
+
+    return df, total_rows
+
+
 @shared_task
 def download_and_process_report_task(
     search_text: str = "",
     lab_number: str = "",
     page_size: int = 50,
-    file_type: int = 3,
+    file_type: int = 1,
+    pages: int = 1,
 ) -> Dict[str, str]:
     """
     Celery task to download and process Intertek report in one workflow.
@@ -267,7 +308,8 @@ def download_and_process_report_task(
         search_text: Text to search for in reports.
         lab_number: Laboratory number to filter by.
         page_size: Number of records per page.
-        file_type: Export file type (1=CSV, 2=PDF, 3=Excel).
+        file_type: Export file type (1=CSV, default; 2=PDF; 3=Excel).
+        pages: Number of pages to download in parallel.
 
     Returns:
         Dictionary with workflow status.
@@ -280,6 +322,7 @@ def download_and_process_report_task(
         lab_number=lab_number,
         page_size=page_size,
         file_type=file_type,
+        pages=pages,
     )
 
     if download_result.get("status") != "success":
@@ -0,0 +1,66 @@
+"""
+Tests for the adaptive concurrency limiter.
+
+Test cases for the AIMD limit used by parallel Intertek API requests.
+"""
+
+import threading
+
+from django.test import SimpleTestCase
+
+from apps.etl.services import AdaptiveConcurrencyLimiter
+
+
+class AdaptiveConcurrencyLimiterTestCase(SimpleTestCase):
+    """Test cases for AdaptiveConcurrencyLimiter."""
+
+    def test_fast_responses_increase_limit(self) -> None:
+        """Test that successful fast requests raise the limit additively."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=4)
+
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(latency=0.1)
+
+        self.assertEqual(limiter.limit, 4)
+
+    def test_congestion_halves_limit(self) -> None:
+        """Test that throttling cuts the limit multiplicatively."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=8, max_limit=8)
+
+        limiter.acquire()
+        limiter.release(latency=0.1, congested=True)
+
+        self.assertEqual(limiter.limit, 4)
+
+    def test_slow_responses_decrease_limit_to_minimum(self) -> None:
+        """Test that slow responses never push the limit below minimum."""
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=4, latency_threshold=1.0
+        )
+
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(latency=2.0)
+
+        self.assertEqual(limiter.limit, 1)
+
+    def test_slot_blocks_above_limit(self) -> None:
+        """Test that callers wait while every slot is taken."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        acquired = threading.Event()
+        limiter.acquire()
+
+        def worker() -> None:
+            with limiter.slot():
+                acquired.set()
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        self.assertFalse(acquired.wait(0.1))
+
+        limiter.release(latency=0.1)
+        thread.join(timeout=5)
+
+        self.assertTrue(acquired.is_set())
+        self.assertEqual(limiter.in_flight, 0)
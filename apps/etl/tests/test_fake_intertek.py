@@ -0,0 +1,262 @@
+"""
+Tests for the fake Intertek OILCM server.
+
+Exercise the real client, download and load path against the local
+stand-in API instead of mocked requests.
+"""
+
+from datetime import timedelta
+from pathlib import Path
+
+import polars as pl
+from constance.test import override_config
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.etl import exceptions, tasks, utils
+from apps.etl.services import IntertekAPIClient
+from apps.etl.services.fake_intertek import (
+    EXPORT_HEADERS,
+    FakeIntertekConfig,
+    FakeIntertekServer,
+    database_catalog,
+)
+from apps.reports import models as report_models
+from apps.reports.services.fleet_seeding import FleetSeedingService
+
+
+@override_settings(INTERTEK_RETRY_BACKOFF=0)
+class FakeIntertekServerTestCase(TestCase):
+    """Test cases for the fake server through IntertekAPIClient."""
+
+    def setUp(self) -> None:
+        """Clear cached tokens between tests."""
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _start(self, **kwargs) -> IntertekAPIClient:
+        """Start a server with ``kwargs`` config and return a client."""
+        options = {"rows": 120, "seed": 1}
+        options.update(kwargs)
+        self.server = FakeIntertekServer(FakeIntertekConfig(**options))
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+        client = IntertekAPIClient(
+            "user", "pass", api_base_url=self.server.url
+        )
+        self.addCleanup(client.close)
+        return client
+
+    def _read(self, path: Path) -> pl.DataFrame:
+        """Read a downloaded export, dropping the title row."""
+        self.addCleanup(path.unlink, missing_ok=True)
+        return pl.read_excel(path).slice(1)
+
+    def test_export_layout_and_pagination(self) -> None:
+        """Test that pages follow the 57-column export layout."""
+        client = self._start()
+
+        pages = [
+            self._read(
+                client.download_inspection_report(
+                    page_number=page, page_size=50
+                )
+            )
+            for page in range(3)
+        ]
+
+        self.assertEqual([len(page) for page in pages], [50, 50, 20])
+        self.assertEqual(pages[0].width, len(EXPORT_HEADERS))
+        self.assertEqual(pages[1].row(0)[1], "FK-00000051")
+        self.assertEqual(self.server.stats["logins"], 1)
+
+    def test_sorting_and_lab_number_filter(self) -> None:
+        """Test descending sort and the lab number filter."""
+        client = self._start()
+
+        newest = self._read(client.download_inspection_report(sort_type=0))
+        single = self._read(
+            client.download_inspection_report(lab_number="FK-00000007")
+        )
+
+        self.assertEqual(newest.row(0)[1], "FK-00000120")
+        self.assertEqual(single.row(0)[1], "FK-00000007")
+        self.assertEqual(len(single), 1)
+
+    def test_csv_export(self) -> None:
+        """Test that file type 1 returns the export as CSV."""
+        client = self._start()
+
+        path = client.download_inspection_report(page_size=5, file_type=1)
+        self.addCleanup(path.unlink)
+        lines = path.read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual(len(lines), 7)
+        self.assertTrue(lines[1].startswith("N°,No. Lab"))
+
+    def test_expired_token_is_refreshed(self) -> None:
+        """Test that a 401 after token expiry triggers a new login."""
+        client = self._start()
+        self._read(client.download_inspection_report())
+
+        self.server.expire_tokens()
+        self._read(client.download_inspection_report())
+
+        self.assertEqual(self.server.stats["logins"], 2)
+        self.assertEqual(self.server.stats["rejected"], 1)
+
+    def test_injected_faults_are_retried(self) -> None:
+        """Test that 5xx faults are retried by the pooled adapter."""
+        client = self._start(fault_rate=0.5, fault_statuses=(503,), seed=3)
+
+        for page in range(4):
+            self._read(client.download_inspection_report(page_number=page))
+
+        self.assertGreater(self.server.stats["faults"], 0)
+        self.assertEqual(self.server.stats["exports"], 4)
+
+    def test_parallel_pages_are_merged(self) -> None:
+        """Test that pages downloaded in parallel form one export."""
+        client = self._start(latency=0.05)
+
+        excel = self._read(client.download_inspection_pages(3, page_size=50))
+        path = client.download_inspection_pages(3, page_size=50, file_type=1)
+        self.addCleanup(path.unlink)
+        lines = path.read_text(encoding="utf-8").splitlines()
+
+        self.assertEqual(len(excel), 120)
+        self.assertEqual(excel.row(50)[1], "FK-00000051")
+        self.assertEqual(len(lines), 122)
+        self.assertEqual(self.server.stats["exports"], 6)
+        self.assertGreater(self.server.stats["peak_in_flight"], 1)
+
+    @override_settings(INTERTEK_MAX_RETRIES=0)
+    def test_persistent_faults_fail_download(self) -> None:
+        """Test that faults surface as download errors without retries."""
+        client = self._start(fault_rate=1.0, fault_statuses=(500,))
+
+        with self.assertRaises(exceptions.ETLException):
+            client.download_inspection_report()
+
+
+class FakeIntertekLoadTestCase(TestCase):
+    """End-to-end download and incremental load against the fake server."""
+
+    def setUp(self) -> None:
+        """Seed equipment and serve exports that reference it."""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=2,
+            samples_per_component=1,
+            seed=5,
+            prefix="FAKE",
+        ).seed()
+        config = FakeIntertekConfig(
+            rows=30,
+            catalog=database_catalog(),
+            start_date=timezone.now().date() + timedelta(days=1),
+            samples_per_day=10,
+        )
+        self.server = FakeIntertekServer(config).start()
+        self.addCleanup(self.server.stop)
+        self.client = IntertekAPIClient(
+            "user", "pass", api_base_url=self.server.url
+        )
+        self.addCleanup(self.client.close)
+
+    def test_download_and_incremental_load(self) -> None:
+        """Test that only rows newer than the watermark are loaded."""
+        first = tasks.process_report_task(
+            str(self.client.download_inspection_report(page_size=20))
+        )
+        second = tasks.process_report_task(
+            str(self.client.download_inspection_report(page_size=30))
+        )
+
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(first["results"]["created"], 20)
+        self.assertEqual(second["filtered_rows"], 10)
+        self.assertEqual(second["results"]["created"], 10)
+        self.assertEqual(
+            report_models.Report.objects.filter(
+                lab_number__startswith="FK-"
+            ).count(),
+            30,
+        )
+
+    def test_csv_download_and_incremental_load(self) -> None:
+        """Test the lazy CSV ingest path with the watermark applied."""
+        first = tasks.process_report_task(
+            str(
+                self.client.download_inspection_report(
+                    page_size=15, file_type=1
+                )
+            )
+        )
+        second = tasks.process_report_task(
+            str(
+                self.client.download_inspection_report(
+                    page_size=30, file_type=1
+                )
+            )
+        )
+
+        self.assertEqual(first["results"]["created"], 15)
+        self.assertEqual(second["total_rows"], 30)
+        self.assertEqual(second["filtered_rows"], 10)
+        self.assertEqual(second["results"]["created"], 10)
+
+
+@override_config(
+    INTERTEK_API_ENABLED=True,
+    INTERTEK_API_USERNAME="user",
+    INTERTEK_API_PASSWORD="pass",
+)
+class FakeIntertekDownloadTaskTestCase(TestCase):
+    """Test cases for the parallel page downloads of the download task."""
+
+    def setUp(self) -> None:
+        """Use a fresh process client between tests."""
+        cache.clear()
+        utils.reset_intertek_client()
+        self.addCleanup(cache.clear)
+        self.addCleanup(utils.reset_intertek_client)
+
+    def _download(self, latency: float, slow_after: float) -> dict:
+        """
+        Download 6 pages of 20 rows from a server with ``latency``,
+        counting responses slower than ``slow_after`` seconds as slow.
+        """
+        server = FakeIntertekServer(
+            FakeIntertekConfig(rows=120, latency=latency)
+        ).start()
+        self.addCleanup(server.stop)
+        with override_settings(
+            INTERTEK_API_BASE_URL=server.url,
+            INTERTEK_SLOW_RESPONSE_SECONDS=slow_after,
+        ):
+            result = tasks.download_intertek_report_task(page_size=20, pages=6)
+        self.addCleanup(Path(result["file_path"]).unlink)
+        self.assertEqual(server.stats["exports"], 6)
+        self.assertGreater(server.stats["peak_in_flight"], 1)
+        return result
+
+    def test_pages_are_downloaded_into_one_file(self) -> None:
+        """Test that the task merges the pages and ramps up when fast."""
+        result = self._download(latency=0.05, slow_after=2)
+        lines = Path(result["file_path"]).read_text("utf-8").splitlines()
+
+        self.assertEqual(result["status"], "success")
+        self.assertEqual(len(lines), 122)
+        self.assertGreater(utils.get_intertek_client().limiter.limit, 2)
+
+    def test_slow_api_reduces_concurrency(self) -> None:
+        """Test that slow page responses make the task back off."""
+        self._download(latency=0.2, slow_after=0.1)
+
+        self.assertEqual(utils.get_intertek_client().limiter.limit, 1)
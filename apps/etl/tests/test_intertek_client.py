@@ -5,10 +5,15 @@ Test cases for authentication, token management, and file download
 operations with the Intertek OILCM API.
 """
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import requests
+
 from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
@@ -44,7 +49,9 @@ class IntertekAPIClientTestCase(TestCase):
     def test_session_headers_setup(self) -> None:
         """Test that default session headers are configured correctly."""
         headers = self.client._session.headers
-        self.assertEqual(headers["Accept"], "application/json, text/plain, */*")
+        self.assertEqual(
+            headers["Accept"], "application/json, text/plain, */*"
+        )
         self.assertEqual(headers["Content-Type"], "application/json")
         self.assertIn("User-Agent", headers)
         self.assertIn("Referer", headers)
@@ -208,10 +215,11 @@ class IntertekAPIClientTestCase(TestCase):
             call_kwargs["headers"]["Authorization"], "Bearer valid_token"
         )
 
+    @patch.object(IntertekAPIClient, "_refresh_token")
     @patch.object(IntertekAPIClient, "get_token")
     @patch("apps.etl.services.intertek_client.requests.Session.request")
     def test_make_authenticated_request_token_expired_retry(
-        self, mock_request: Mock, mock_get_token: Mock
+        self, mock_request: Mock, mock_get_token: Mock, mock_refresh: Mock
     ) -> None:
         """Test that 401 error triggers token refresh and retry."""
         import requests
@@ -230,15 +238,20 @@ class IntertekAPIClientTestCase(TestCase):
         mock_response_200.raise_for_status.return_value = None
 
         mock_request.side_effect = [http_error, mock_response_200]
-        mock_get_token.side_effect = ["expired_token", "new_token"]
+        mock_get_token.return_value = "expired_token"
+        mock_refresh.return_value = "new_token"
 
         response = self.client._make_authenticated_request(
             "GET", "https://example.com/api"
         )
 
         self.assertEqual(response, mock_response_200)
-        self.assertEqual(mock_get_token.call_count, 2)
+        mock_refresh.assert_called_once_with(stale_token="expired_token")
         self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(
+            mock_request.call_args[1]["headers"]["Authorization"],
+            "Bearer new_token",
+        )
 
     @patch.object(IntertekAPIClient, "get_token")
     @patch("apps.etl.services.intertek_client.requests.Session.request")
@@ -288,7 +301,9 @@ class IntertekAPIClientTestCase(TestCase):
         self, mock_request: Mock
     ) -> None:
         """Test report download handles errors."""
-        mock_request.side_effect = exceptions.APIRequestError("Download failed")
+        mock_request.side_effect = exceptions.APIRequestError(
+            "Download failed"
+        )
 
         with self.assertRaises(exceptions.FileDownloadError) as context:
             self.client.download_inspection_report()
@@ -327,3 +342,177 @@ class IntertekAPIClientTestCase(TestCase):
         with patch.object(self.client._session, "close") as mock_close:
             self.client.close()
             mock_close.assert_called_once()
+
+
+class IntertekTokenRefreshTestCase(TestCase):
+    """Test cases for the single-flight token refresh."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.client = IntertekAPIClient(username="user", password="pass")
+        cache.clear()
+
+    def tearDown(self) -> None:
+        """Clean up after tests."""
+        self.client.close()
+        cache.clear()
+
+    def _cache_token(self, token: str, expires_in: int) -> None:
+        """Store a token as another worker would."""
+        self.client._cache_token(token, expires_in)
+
+    def _join_refresh_threads(self) -> None:
+        """Wait for background refresh threads to finish."""
+        for thread in threading.enumerate():
+            if thread.name == "intertek-token-refresh":
+                thread.join(timeout=5)
+
+    @patch.object(IntertekAPIClient, "_authenticate")
+    def test_waits_for_refresh_in_progress(self, mock_auth: Mock) -> None:
+        """Test that a worker waits for the lock holder's new token."""
+        cache.add(IntertekAPIClient.REFRESH_LOCK_CACHE_KEY, "other", 60)
+        timer = threading.Timer(0.2, self._cache_token, args=("fresh", 3600))
+        timer.start()
+        self.addCleanup(timer.cancel)
+
+        token = self.client.get_token()
+
+        self.assertEqual(token, "fresh")
+        mock_auth.assert_not_called()
+
+    @patch.object(IntertekAPIClient, "REFRESH_WAIT_TIMEOUT", 0.1)
+    @patch.object(IntertekAPIClient, "_authenticate")
+    def test_wait_for_refresh_times_out(self, mock_auth: Mock) -> None:
+        """Test that waiting on a stuck refresh raises an error."""
+        cache.add(IntertekAPIClient.REFRESH_LOCK_CACHE_KEY, "other", 60)
+
+        with self.assertRaises(exceptions.AuthenticationError):
+            self.client.get_token()
+
+        mock_auth.assert_not_called()
+
+    @patch.object(IntertekAPIClient, "_authenticate")
+    def test_lock_holder_authenticates_and_releases_lock(
+        self, mock_auth: Mock
+    ) -> None:
+        """Test that the lock holder logs in once and frees the lock."""
+        mock_auth.return_value = "new_token"
+
+        token = self.client.get_token()
+
+        self.assertEqual(token, "new_token")
+        mock_auth.assert_called_once()
+        self.assertIsNone(cache.get(IntertekAPIClient.REFRESH_LOCK_CACHE_KEY))
+
+    @patch.object(IntertekAPIClient, "_authenticate")
+    def test_parallel_threads_log_in_once(self, mock_auth: Mock) -> None:
+        """Test that threads of one process share a single refresh."""
+
+        def authenticate():
+            time.sleep(0.1)
+            self._cache_token("new_token", 3600)
+            return "new_token"
+
+        mock_auth.side_effect = authenticate
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            tokens = list(
+                executor.map(lambda _: self.client.get_token(), range(4))
+            )
+
+        self.assertEqual(tokens, ["new_token"] * 4)
+        mock_auth.assert_called_once()
+
+    def test_rejected_token_keeps_replacement(self) -> None:
+        """Test that a 401 does not drop a token refreshed by another worker."""
+        self._cache_token("replacement", 3600)
+
+        self.client._invalidate_token("rejected")
+
+        self.assertEqual(self.client._get_cached_token(), "replacement")
+
+    @patch.object(IntertekAPIClient, "_authenticate")
+    def test_background_refresh_before_expiry_buffer(
+        self, mock_auth: Mock
+    ) -> None:
+        """Test that a token close to the buffer is refreshed in background."""
+        self._cache_token(
+            "current", IntertekAPIClient.TOKEN_EXPIRY_BUFFER + 60
+        )
+
+        token = self.client.get_token()
+        self._join_refresh_threads()
+
+        self.assertEqual(token, "current")
+        mock_auth.assert_called_once()
+        self.assertIsNone(cache.get(IntertekAPIClient.REFRESH_LOCK_CACHE_KEY))
+
+    @patch.object(IntertekAPIClient, "_authenticate")
+    def test_no_background_refresh_for_fresh_token(
+        self, mock_auth: Mock
+    ) -> None:
+        """Test that fresh tokens are not refreshed."""
+        self._cache_token("current", 3600)
+
+        self.assertEqual(self.client.get_token(), "current")
+        self._join_refresh_threads()
+
+        mock_auth.assert_not_called()
+
+
+class IntertekConnectionPoolTestCase(TestCase):
+    """Test cases for the pooled session and concurrency limiting."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.client = IntertekAPIClient(username="user", password="pass")
+
+    def tearDown(self) -> None:
+        """Clean up after tests."""
+        self.client.close()
+
+    def test_adapter_retries_throttled_requests(self) -> None:
+        """Test that the mounted adapter retries 429 and 5xx responses."""
+        adapter = self.client._session.get_adapter(
+            IntertekAPIClient.API_BASE_URL
+        )
+
+        self.assertIn(429, adapter.max_retries.status_forcelist)
+        self.assertIn(503, adapter.max_retries.status_forcelist)
+        self.assertGreater(adapter.max_retries.total, 0)
+        self.assertNotIn("POST", adapter.max_retries.allowed_methods)
+
+    @patch.object(IntertekAPIClient, "get_token", return_value="token")
+    @patch("apps.etl.services.intertek_client.requests.Session.request")
+    def test_requests_use_default_timeout(
+        self, mock_request: Mock, mock_get_token: Mock
+    ) -> None:
+        """Test that requests get connect and read timeouts."""
+        mock_request.return_value = Mock(status_code=200)
+
+        self.client._make_authenticated_request("GET", "https://example.com")
+
+        self.assertEqual(
+            mock_request.call_args[1]["timeout"], self.client.timeout
+        )
+
+    @patch.object(IntertekAPIClient, "get_token", return_value="token")
+    @patch("apps.etl.services.intertek_client.requests.Session.request")
+    def test_throttled_response_reduces_concurrency(
+        self, mock_request: Mock, mock_get_token: Mock
+    ) -> None:
+        """Test that a 429 response lowers the concurrency limit."""
+        throttled = Mock(status_code=429)
+        throttled.raise_for_status.side_effect = requests.exceptions.HTTPError(
+            response=throttled
+        )
+        mock_request.return_value = throttled
+        limit = self.client.limiter.limit
+
+        with self.assertRaises(exceptions.APIRequestError):
+            self.client._make_authenticated_request(
+                "GET", "https://example.com"
+            )
+
+        self.assertLess(self.client.limiter.limit, limit)
+        self.assertEqual(self.client.limiter.in_flight, 0)
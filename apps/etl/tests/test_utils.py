@@ -17,6 +17,11 @@ from apps.etl.services import IntertekAPIClient
 class GetIntertekClientTestCase(TestCase):
     """Test cases for get_intertek_client utility function."""
 
+    def setUp(self) -> None:
+        """Start every test without a cached client."""
+        utils.reset_intertek_client()
+        self.addCleanup(utils.reset_intertek_client)
+
     @override_config(
         INTERTEK_API_ENABLED=True,
         INTERTEK_API_USERNAME="testuser",
@@ -61,3 +66,51 @@ class GetIntertekClientTestCase(TestCase):
             utils.get_intertek_client()
 
         self.assertIn("not configured", str(context.exception))
+
+    @override_config(
+        INTERTEK_API_ENABLED=True,
+        INTERTEK_API_USERNAME="testuser",
+        INTERTEK_API_PASSWORD="testpass",
+    )
+    def test_client_is_reused(self) -> None:
+        """Test that the same pooled client is returned across calls."""
+        self.assertIs(utils.get_intertek_client(), utils.get_intertek_client())
+
+    def test_client_rebuilt_when_credentials_change(self) -> None:
+        """Test that new credentials close the old client and build anew."""
+        with override_config(
+            INTERTEK_API_ENABLED=True,
+            INTERTEK_API_USERNAME="testuser",
+            INTERTEK_API_PASSWORD="testpass",
+        ):
+            first = utils.get_intertek_client()
+
+        with (
+            patch.object(first, "close") as mock_close,
+            override_config(
+                INTERTEK_API_ENABLED=True,
+                INTERTEK_API_USERNAME="testuser",
+                INTERTEK_API_PASSWORD="rotated",
+            ),
+        ):
+            second = utils.get_intertek_client()
+
+        self.assertIsNot(first, second)
+        self.assertEqual(second.password, "rotated")
+        mock_close.assert_called_once()
+
+    @override_config(
+        INTERTEK_API_ENABLED=True,
+        INTERTEK_API_USERNAME="testuser",
+        INTERTEK_API_PASSWORD="testpass",
+    )
+    def test_client_forgotten_after_fork(self) -> None:
+        """Test that a forked worker does not reuse the parent's client."""
+        parent = utils.get_intertek_client()
+
+        with patch.object(parent, "close") as mock_close:
+            utils._reset_client_after_fork()
+            child = utils.get_intertek_client()
+
+        self.assertIsNot(parent, child)
+        mock_close.assert_not_called()
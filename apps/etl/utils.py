@@ -1,4 +1,8 @@
+import logging
+import os
+import threading
 from datetime import datetime
+from typing import Optional, Tuple
 
 from constance import config
 from django.utils.dateparse import parse_date
@@ -6,13 +10,22 @@ from django.utils.dateparse import parse_date
 from apps.etl import exceptions
 from apps.etl.services import IntertekAPIClient
 
+logger = logging.getLogger(__name__)
+
+# Per-process client, reused across tasks so the pooled connections
+# (and their TLS sessions) survive between runs
+_client: Optional[IntertekAPIClient] = None
+_client_credentials: Optional[Tuple[str, str]] = None
+_client_lock = threading.Lock()
+
 
 def get_intertek_client() -> IntertekAPIClient:
     """
     Get configured Intertek API client instance.
 
     Retrieves credentials from django-constance configuration and
-    returns an initialized API client.
+    returns the API client of the current process. The client is built
+    once and rebuilt only when the credentials change.
 
     Returns:
         Configured IntertekAPIClient instance.
@@ -20,6 +33,8 @@ def get_intertek_client() -> IntertekAPIClient:
     Raises:
         ETLException: If API integration is disabled or credentials are missing.
     """
+    global _client, _client_credentials
+
     if not config.INTERTEK_API_ENABLED:
         raise exceptions.ETLException("Intertek API integration is disabled")
 
@@ -27,9 +42,48 @@ def get_intertek_client() -> IntertekAPIClient:
     password = config.INTERTEK_API_PASSWORD
 
     if not username or not password:
-        raise exceptions.ETLException("Intertek API credentials not configured")
+        raise exceptions.ETLException(
+            "Intertek API credentials not configured"
+        )
+
+    with _client_lock:
+        if _client is None or _client_credentials != (username, password):
+            if _client is not None:
+                logger.info("Intertek credentials changed, rebuilding client")
+                _client.close()
+            _client = IntertekAPIClient(username=username, password=password)
+            _client_credentials = (username, password)
+        return _client
+
+
+def reset_intertek_client(close: bool = True) -> None:
+    """
+    Drop the client of the current process.
+
+    Args:
+        close: Whether to close the client's connections.
+    """
+    global _client, _client_credentials
+
+    with _client_lock:
+        if _client is not None and close:
+            _client.close()
+        _client = None
+        _client_credentials = None
+
+
+def _reset_client_after_fork() -> None:
+    """Forget the parent's client in a forked worker without closing it."""
+    global _client, _client_credentials, _client_lock
+
+    # The lock may have been held by another thread at fork time
+    _client_lock = threading.Lock()
+    _client = None
+    _client_credentials = None
+
 
-    return IntertekAPIClient(username=username, password=password)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_client_after_fork)
 
 
 def parse_polars_date(date_value):
@@ -1,7 +1,89 @@
-from django.contrib import admin
-from django.utils.html import format_html
+from django.contrib import admin, messages
+from django.db import connections
+from django.db.models import Count, Exists, OuterRef, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils.html import format_html, format_html_join
+
+from apps.core.admin import AutocompleteListFilter, ScalableAdminMixin
+from apps.reports import choices, signals
+from apps.reports.models import (
+    ComponentAnomaly,
+    ComponentFeatureVector,
+    ComponentLatestState,
+    LabAnalysis,
+    LubricantBaseline,
+    QuarantinedRow,
+    Report,
+    ThresholdLimit,
+    ThresholdProfile,
+    WearForecast,
+)
+from apps.reports.services.quarantine import QuarantineReviewService
+from apps.reports.services.status_transition import (
+    ReportStatusTransitionService,
+)
+
+WEAR_METAL_FIELDS = (
+    "iron_fe",
+    "chromium_cr",
+    "lead_pb",
+    "copper_cu",
+    "tin_sn",
+    "aluminum_al",
+)
+CONTAMINANT_FIELDS = ("silicon_si", "sodium_na", "potassium_k")
+
+
+def _sum_fields(fields):
+    """Build a SQL expression adding nullable integer fields."""
+    expression = Coalesce(fields[0], Value(0))
+    for field in fields[1:]:
+        expression += Coalesce(field, Value(0))
+    return expression
+
+
+def _search_reports(queryset, search_term, prefix=""):
+    """
+    Filter reports using index-friendly lookups.
+
+    Lab and PER numbers are matched by prefix (``varchar_pattern_ops``
+    indexes) and notes with full text search on PostgreSQL (GIN index
+    created by ``signals.create_notes_search_index``).
+
+    Args:
+        queryset: Report (or related) queryset to filter.
+        search_term: Term entered in the admin search box.
+        prefix: Lookup path to the report, e.g. ``"report__"``.
+
+    Returns:
+        Filtered queryset.
+    """
+    term = search_term.strip()
+    if not term:
+        return queryset
+
+    query = Q(**{f"{prefix}lab_number__startswith": term}) | Q(
+        **{f"{prefix}per_number__startswith": term}
+    )
+    if term.upper() != term:
+        query |= Q(**{f"{prefix}lab_number__startswith": term.upper()})
+
+    if prefix:
+        return queryset.filter(query)
+
+    if connections[queryset.db].vendor == "postgresql":
+        from django.contrib.postgres.search import SearchQuery
+
+        queryset = queryset.alias(
+            notes_search=signals.get_notes_search_vector()
+        )
+        query |= Q(
+            notes_search=SearchQuery(term, config=signals.NOTES_SEARCH_CONFIG)
+        )
+    else:
+        query |= Q(notes__icontains=term)
 
-from apps.reports.models import LabAnalysis, Report
+    return queryset.filter(query)
 
 
 class LabAnalysisInline(admin.StackedInline):
@@ -119,7 +201,7 @@ class LabAnalysisInline(admin.StackedInline):
 
 
 @admin.register(Report)
-class ReportAdmin(admin.ModelAdmin):
+class ReportAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """Admin configuration for Report model."""
 
     list_display = (
@@ -138,32 +220,27 @@ class ReportAdmin(admin.ModelAdmin):
     list_filter = (
         "status",
         "condition",
+        "computed_condition",
         "is_active",
-        "organization",
-        "component__type",
+        AutocompleteListFilter.for_field("organization", "Organización"),
+        AutocompleteListFilter.for_field(
+            "component__type", "Tipo de Componente"
+        ),
         "sample_date",
         "reception_date",
         "report_date",
     )
-    search_fields = (
-        "lab_number",
-        "per_number",
-        "serial_number_code",
-        "lubricant",
-        "organization__name",
-        "machine__name",
-        "machine__serial_number",
-        "component__type__name",
-        "notes",
-    )
+    search_fields = ("lab_number", "per_number", "notes")
+    search_help_text = "Prefijo de No. Lab / No. PER o texto de las notas"
     readonly_fields = (
         "created",
         "modified",
         "created_by",
         "modified_by",
         "component_name_display",
+        "computed_condition",
+        "breached_parameters",
     )
-    date_hierarchy = "sample_date"
     ordering = ("-sample_date", "-created")
     raw_id_fields = ("organization", "machine", "component")
 
@@ -177,7 +254,8 @@ class ReportAdmin(admin.ModelAdmin):
                     "component_name_display",
                     ("lubricant", "serial_number_code"),
                     "status",
-                    "condition",
+                    ("condition", "computed_condition"),
+                    "breached_parameters",
                     "is_active",
                 )
             },
@@ -231,6 +309,31 @@ class ReportAdmin(admin.ModelAdmin):
     )
 
     inlines = [LabAnalysisInline]
+    actions = ("mark_reviewed", "mark_approved", "mark_rejected")
+
+    def _transition(self, request, queryset, new_status):
+        """Transition the selected reports and report the result."""
+        results = ReportStatusTransitionService(request.user).transition(
+            queryset, new_status, note="Cambio masivo desde el admin"
+        )
+        self.message_user(
+            request,
+            f"{results['updated']} reportes actualizados, "
+            f"{results['skipped']} ya estaban en ese estado.",
+            messages.SUCCESS,
+        )
+
+    @admin.action(description="Marcar como revisados", permissions=["change"])
+    def mark_reviewed(self, request, queryset):
+        self._transition(request, queryset, choices.ReportStatus.REVIEWED)
+
+    @admin.action(description="Marcar como aprobados", permissions=["change"])
+    def mark_approved(self, request, queryset):
+        self._transition(request, queryset, choices.ReportStatus.APPROVED)
+
+    @admin.action(description="Marcar como rechazados", permissions=["change"])
+    def mark_rejected(self, request, queryset):
+        self._transition(request, queryset, choices.ReportStatus.REJECTED)
 
     def machine_info(self, obj):
         """Display machine information."""
@@ -281,10 +384,11 @@ class ReportAdmin(admin.ModelAdmin):
 
     def has_analysis(self, obj):
         """Check if report has analysis data."""
-        return hasattr(obj, "analysis") and obj.analysis is not None
+        return obj._has_analysis
 
     has_analysis.boolean = True
     has_analysis.short_description = "Análisis"
+    has_analysis.admin_order_field = "_has_analysis"
 
     def component_name_display(self, obj):
         """Display component name as readonly field."""
@@ -300,12 +404,20 @@ class ReportAdmin(admin.ModelAdmin):
             .select_related(
                 "organization", "machine", "component", "component__type"
             )
-            .prefetch_related("analysis")
+            .annotate(
+                _has_analysis=Exists(
+                    LabAnalysis.objects.filter(report=OuterRef("pk"))
+                )
+            )
         )
 
+    def get_search_results(self, request, queryset, search_term):
+        """Search with prefix and full text lookups instead of icontains."""
+        return _search_reports(queryset, search_term), False
+
 
 @admin.register(LabAnalysis)
-class LabAnalysisAdmin(admin.ModelAdmin):
+class LabAnalysisAdmin(ScalableAdminMixin, admin.ModelAdmin):
     """Admin configuration for LabAnalysis model."""
 
     list_display = (
@@ -319,17 +431,15 @@ class LabAnalysisAdmin(admin.ModelAdmin):
         "created",
     )
     list_filter = (
-        "report__organization",
+        AutocompleteListFilter.for_field(
+            "report__organization", "Organización"
+        ),
         "report__status",
         "report__condition",
         "created",
     )
-    search_fields = (
-        "report__lab_number",
-        "report__organization__name",
-        "report__machine__name",
-        "visual_appearance",
-    )
+    search_fields = ("report__lab_number", "report__per_number")
+    search_help_text = "Prefijo de No. Lab / No. PER"
     readonly_fields = (
         "created",
         "modified",
@@ -483,7 +593,7 @@ class LabAnalysisAdmin(admin.ModelAdmin):
 
     def total_wear_metals_display(self, obj):
         """Display total wear metals."""
-        total = obj.total_wear_metals
+        total = getattr(obj, "_total_wear_metals", obj.total_wear_metals)
         if total > 100:
             color = "#dc3545"  # red
         elif total > 50:
@@ -497,10 +607,11 @@ class LabAnalysisAdmin(admin.ModelAdmin):
         )
 
     total_wear_metals_display.short_description = "Total Metales Desgaste"
+    total_wear_metals_display.admin_order_field = "_total_wear_metals"
 
     def total_contaminants_display(self, obj):
         """Display total contaminants."""
-        total = obj.total_contaminants
+        total = getattr(obj, "_total_contaminants", obj.total_contaminants)
         if total > 50:
             color = "#dc3545"  # red
         elif total > 25:
@@ -514,6 +625,7 @@ class LabAnalysisAdmin(admin.ModelAdmin):
         )
 
     total_contaminants_display.short_description = "Total Contaminantes"
+    total_contaminants_display.admin_order_field = "_total_contaminants"
 
     def additive_depletion_display(self, obj):
         """Display additive depletion percentage."""
@@ -563,5 +675,285 @@ class LabAnalysisAdmin(admin.ModelAdmin):
         return (
             super()
             .get_queryset(request)
-            .select_related("report", "report__organization", "report__machine")
+            .select_related(
+                "report", "report__organization", "report__machine"
+            )
+            .annotate(
+                _total_wear_metals=_sum_fields(WEAR_METAL_FIELDS),
+                _total_contaminants=_sum_fields(CONTAMINANT_FIELDS),
+            )
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        """Search reports by lab/PER number prefix."""
+        return _search_reports(queryset, search_term, prefix="report__"), False
+
+
+@admin.register(QuarantinedRow)
+class QuarantinedRowAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    """Admin configuration for rows held back by the quality checks."""
+
+    list_display = (
+        "lab_number",
+        "source",
+        "row_number",
+        "reasons_summary",
+        "status",
+        "report",
+        "created",
+    )
+    list_filter = ("status", "created")
+    search_fields = ("lab_number", "source")
+    search_help_text = "No. Lab o nombre del archivo"
+    readonly_fields = (
+        "lab_number",
+        "row_number",
+        "source",
+        "data",
+        "reasons_display",
+        "status",
+        "report",
+        "created",
+        "modified",
+        "created_by",
+        "modified_by",
+    )
+    exclude = ("reasons",)
+    ordering = ("-created",)
+    actions = ("release_rows", "discard_rows")
+
+    @admin.action(
+        description="Liberar filas seleccionadas", permissions=["change"]
+    )
+    def release_rows(self, request, queryset):
+        results = QuarantineReviewService(request.user).release(queryset)
+        self.message_user(
+            request,
+            f"{results['released']} filas liberadas, "
+            f"{results['failed']} no se pudieron cargar.",
+            messages.SUCCESS if not results["failed"] else messages.WARNING,
+        )
+        for error in results["errors"][:10]:
+            self.message_user(
+                request,
+                f"{error.get('lab_number') or '-'}: {error.get('error')}",
+                messages.ERROR,
+            )
+
+    @admin.action(
+        description="Descartar filas seleccionadas", permissions=["change"]
+    )
+    def discard_rows(self, request, queryset):
+        discarded = QuarantineReviewService(request.user).discard(queryset)
+        self.message_user(
+            request, f"{discarded} filas descartadas.", messages.SUCCESS
+        )
+
+    def reasons_summary(self, obj):
+        """Display the first failed check and the number of others."""
+        if not obj.reasons:
+            return "-"
+        extra = len(obj.reasons) - 1
+        return obj.reasons[0] + (f" (+{extra})" if extra else "")
+
+    reasons_summary.short_description = "Motivos"
+
+    def reasons_display(self, obj):
+        """Display every failed check on its own line."""
+        return format_html_join(
+            "", "<div>{}</div>", ((reason,) for reason in obj.reasons)
+        )
+
+    reasons_display.short_description = "Motivos"
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_queryset(self, request):
+        """Optimize queries."""
+        return super().get_queryset(request).select_related("report")
+
+
+class ThresholdLimitInline(admin.TabularInline):
+    """Inline admin for the limits of a threshold profile."""
+
+    model = ThresholdLimit
+    extra = 1
+    fields = (
+        "group",
+        "parameter",
+        "warning",
+        "critical",
+        "warning_low",
+        "warning_high",
+        "unit",
+    )
+
+
+@admin.register(ThresholdProfile)
+class ThresholdProfileAdmin(admin.ModelAdmin):
+    """Admin configuration for condition threshold profiles."""
+
+    list_display = (
+        "name",
+        "component_type",
+        "lubricant",
+        "limit_count",
+        "is_active",
+        "modified",
+    )
+    list_filter = ("is_active", "component_type")
+    search_fields = ("name", "lubricant", "component_type__name")
+    autocomplete_fields = ("component_type",)
+    readonly_fields = ("created", "modified", "created_by", "modified_by")
+    inlines = [ThresholdLimitInline]
+
+    def limit_count(self, obj):
+        """Display the number of parameters overridden by the profile."""
+        return obj.limit_total
+
+    limit_count.short_description = "Parámetros"
+
+    def get_queryset(self, request):
+        """Optimize queries."""
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("component_type")
+            .annotate(limit_total=Count("limits"))
         )
+
+
+@admin.register(LubricantBaseline)
+class LubricantBaselineAdmin(admin.ModelAdmin):
+    """Read-only admin for the fleet lubricant baselines."""
+
+    list_display = (
+        "lubricant",
+        "component_type",
+        "parameter",
+        "sample_count",
+        "median",
+        "mad",
+        "warning_low",
+        "warning_high",
+        "modified",
+    )
+    list_filter = ("parameter", "component_type")
+    search_fields = ("lubricant",)
+    list_select_related = ("component_type",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ComponentLatestState)
+class ComponentLatestStateAdmin(admin.ModelAdmin):
+    """Read-only admin for the latest report snapshot per component."""
+
+    list_display = (
+        "component",
+        "machine",
+        "organization",
+        "lab_number",
+        "sample_date",
+        "condition",
+        "computed_condition",
+        "refreshed",
+    )
+    list_filter = ("condition", "computed_condition", "organization")
+    search_fields = ("lab_number", "machine__name")
+    list_select_related = (
+        "component__type",
+        "component__machine",
+        "machine",
+        "organization",
+    )
+    raw_id_fields = ("component", "machine", "report")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WearForecast)
+class WearForecastAdmin(admin.ModelAdmin):
+    """Read-only admin for the wear-rate forecasts."""
+
+    list_display = (
+        "component",
+        "parameter",
+        "wear_rate",
+        "confidence",
+        "level",
+        "warning_date",
+        "critical_date",
+        "modified",
+    )
+    list_filter = ("parameter", "basis")
+    search_fields = ("component__machine__name",)
+    list_select_related = ("component__type", "component__machine")
+    raw_id_fields = ("component",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ComponentAnomaly)
+class ComponentAnomalyAdmin(admin.ModelAdmin):
+    """Read-only admin for the anomalies found by the fleet scan."""
+
+    list_display = (
+        "report",
+        "component",
+        "parameter",
+        "value",
+        "ewma",
+        "z_score",
+        "sample_date",
+    )
+    list_filter = ("parameter",)
+    search_fields = ("report__lab_number", "component__machine__name")
+    list_select_related = ("report", "component__type", "component__machine")
+    raw_id_fields = ("component", "report")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ComponentFeatureVector)
+class ComponentFeatureVectorAdmin(admin.ModelAdmin):
+    """Read-only admin for the similar-component feature vectors."""
+
+    list_display = (
+        "component",
+        "organization",
+        "sample_count",
+        "last_sample_date",
+        "refreshed",
+    )
+    search_fields = ("component__machine__name",)
+    list_select_related = (
+        "component__type",
+        "component__machine",
+        "organization",
+    )
+    raw_id_fields = ("component",)
+    exclude = ("vector",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -17,3 +17,27 @@ class ReportCondition(models.TextChoices):
     NORMAL = "NORMAL", _("Normal")
     CAUTION = "CAUTION", _("Caution")
     CRITICAL = "CRITICAL", _("Critical")
+
+
+class QuarantineStatus(models.TextChoices):
+    """Review status choices for quarantined upload rows."""
+
+    PENDING = "PENDING", _("Pending review")
+    RELEASED = "RELEASED", _("Released")
+    DISCARDED = "DISCARDED", _("Discarded")
+
+
+class ThresholdGroup(models.TextChoices):
+    """Analysis parameter groups of the condition thresholds."""
+
+    WEAR_METALS = "wear_metals", _("Wear metals")
+    CONTAMINATION = "contamination", _("Contamination")
+    OIL_HEALTH = "oil_health", _("Oil health")
+    ADDITIVES = "additives", _("Additives")
+
+
+class UsageBasis(models.TextChoices):
+    """Usage counter a wear rate is measured against."""
+
+    HOURS = "hours", _("Lubricant hours")
+    KMS = "kms", _("Lubricant kilometers")
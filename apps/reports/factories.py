@@ -4,7 +4,11 @@ Test factories for reports app models.
 Provides factory classes for creating test instances of Report and LabAnalysis models.
 """
 
+from datetime import date, timedelta
+from typing import Dict, Optional
+
 import factory
+import polars as pl
 from django.utils import timezone
 
 from apps.equipment.tests import factories as equipment_factories
@@ -231,7 +235,11 @@ class NormalConditionLabAnalysisFactory(LabAnalysisFactory):
     silicon_si = factory.Faker("random_int", min=0, max=25)
     sodium_na = factory.Faker("random_int", min=0, max=40)
     fuel_dilution = factory.Faker(
-        "pydecimal", left_digits=1, right_digits=2, positive=True, max_value=2.5
+        "pydecimal",
+        left_digits=1,
+        right_digits=2,
+        positive=True,
+        max_value=2.5,
     )
 
     # Oil health - good condition
@@ -271,7 +279,12 @@ class CautionConditionLabAnalysisFactory(LabAnalysisFactory):
     silicon_si = factory.Faker("random_int", min=30, max=50)
     sodium_na = factory.Faker("random_int", min=50, max=100)
     fuel_dilution = factory.Faker(
-        "pydecimal", left_digits=1, right_digits=2, positive=True, min_value=3, max_value=5
+        "pydecimal",
+        left_digits=1,
+        right_digits=2,
+        positive=True,
+        min_value=3,
+        max_value=5,
     )
 
     # Oil health - degraded condition
@@ -313,7 +326,12 @@ class CriticalConditionLabAnalysisFactory(LabAnalysisFactory):
     silicon_si = factory.Faker("random_int", min=50, max=150)
     sodium_na = factory.Faker("random_int", min=100, max=250)
     fuel_dilution = factory.Faker(
-        "pydecimal", left_digits=1, right_digits=2, positive=True, min_value=5, max_value=10
+        "pydecimal",
+        left_digits=1,
+        right_digits=2,
+        positive=True,
+        min_value=5,
+        max_value=10,
     )
 
     # Oil health - severely degraded condition
@@ -340,3 +358,49 @@ class CriticalConditionLabAnalysisFactory(LabAnalysisFactory):
         min_value=30,
         max_value=50,
     )
+
+
+def sample_frame(
+    component_id: int = 1,
+    start: date = date(2025, 1, 1),
+    start_pk: int = 1,
+    dtypes: Optional[Dict[str, pl.DataType]] = None,
+    **columns,
+) -> pl.DataFrame:
+    """
+    Build a frame of one component sampled every 10 days.
+
+    Shaped like the report frames loaded by the fleet analysis services
+    (anomaly scan, similarity, wear forecast).
+
+    Args:
+        component_id: Component of every sample.
+        start: Date of the first sample.
+        start_pk: Report ID of the first sample.
+        dtypes: Column types; list columns are Float64 otherwise.
+        **columns: Values per sample (lists), or one for every sample.
+
+    Returns:
+        Frame with ``pk``, ``component_id``, ``sample_date`` and columns.
+    """
+    count = max(
+        len(values) for values in columns.values() if isinstance(values, list)
+    )
+    return pl.DataFrame(
+        {
+            "pk": range(start_pk, start_pk + count),
+            "component_id": component_id,
+            "sample_date": [
+                start + timedelta(days=10 * i) for i in range(count)
+            ],
+            **columns,
+        },
+        schema_overrides={
+            **{
+                name: pl.Float64
+                for name, values in columns.items()
+                if isinstance(values, list)
+            },
+            **(dtypes or {}),
+        },
+    )
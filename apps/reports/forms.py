@@ -4,7 +4,7 @@ from django import forms
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
 
-from apps.reports import models
+from apps.reports import choices, models
 
 
 class ReportForm(forms.ModelForm):
@@ -38,7 +38,9 @@ class ReportForm(forms.ModelForm):
             "lubricant_hours": forms.NumberInput(
                 attrs={"class": "form-control"}
             ),
-            "lubricant_kms": forms.NumberInput(attrs={"class": "form-control"}),
+            "lubricant_kms": forms.NumberInput(
+                attrs={"class": "form-control"}
+            ),
             "serial_number_code": forms.TextInput(
                 attrs={"class": "form-control"}
             ),
@@ -51,7 +53,9 @@ class ReportForm(forms.ModelForm):
             ),
             "status": forms.Select(attrs={"class": "form-select"}),
             "condition": forms.Select(attrs={"class": "form-select"}),
-            "notes": forms.Textarea(attrs={"class": "form-control", "rows": 4}),
+            "notes": forms.Textarea(
+                attrs={"class": "form-control", "rows": 4}
+            ),
             "is_active": forms.CheckboxInput(
                 attrs={"class": "form-check-input"}
             ),
@@ -96,15 +100,16 @@ class ReportForm(forms.ModelForm):
 
 
 class ReportBulkUploadForm(forms.Form):
-    """Form for bulk uploading reports from Excel file."""
+    """Form for bulk uploading reports from Excel or CSV file."""
 
     file = forms.FileField(
-        label=_("Excel File"),
+        label=_("Report File"),
         help_text=_(
-            "Upload an Excel file (.xlsx) with report data. Maximum size: 5MB"
+            "Upload an Excel (.xlsx) or CSV (.csv) file with report data. "
+            "Maximum size: 5MB"
         ),
         widget=forms.FileInput(
-            attrs={"class": "form-control", "accept": ".xlsx,.xls"}
+            attrs={"class": "form-control", "accept": ".xlsx,.xls,.csv"}
         ),
     )
 
@@ -113,9 +118,11 @@ class ReportBulkUploadForm(forms.Form):
         file = self.cleaned_data.get("file")
         if file:
             # Check file extension
-            if not file.name.lower().endswith((".xlsx", ".xls")):
+            if not file.name.lower().endswith((".xlsx", ".xls", ".csv")):
                 raise ValidationError(
-                    _("Only Excel files (.xlsx, .xls) are allowed.")
+                    _(
+                        "Only Excel (.xlsx, .xls) or CSV (.csv) files are allowed."
+                    )
                 )
 
             # Check file size (5MB max)
@@ -123,3 +130,26 @@ class ReportBulkUploadForm(forms.Form):
                 raise ValidationError(_("File size cannot exceed 5MB."))
 
         return file
+
+
+class ReportBulkStatusForm(forms.Form):
+    """Form for changing the status of many reports at once."""
+
+    new_status = forms.ChoiceField(
+        label=_("New Status"),
+        choices=choices.ReportStatus.choices,
+    )
+    note = forms.CharField(label=_("Note"), required=False)
+    ids = forms.CharField(
+        label=_("Reports"),
+        required=False,
+        help_text=_("Comma separated report IDs"),
+    )
+
+    def clean_ids(self):
+        """Parse the comma separated report IDs."""
+        value = self.cleaned_data.get("ids", "")
+        try:
+            return [int(pk) for pk in value.split(",") if pk.strip()]
+        except ValueError:
+            raise ValidationError(_("Report IDs must be integers."))
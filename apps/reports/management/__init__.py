@@ -0,0 +1 @@
+"""Reports management module."""
@@ -0,0 +1,87 @@
+"""Reports management commands."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from apps.reports import models
+from apps.reports.services.condition_classifier import (
+    ConditionClassificationService,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Recompute the threshold-based condition of existing reports."""
+
+    help = (
+        "Classify reports against the analysis thresholds and store the "
+        "computed condition and breached parameters (fleet-wide backfill)"
+    )
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-line arguments.
+
+        Args:
+            parser: Argument parser instance.
+        """
+        parser.add_argument(
+            "--organization",
+            type=int,
+            default=None,
+            help="Only classify reports of this organization ID",
+        )
+        parser.add_argument(
+            "--since",
+            type=str,
+            default=None,
+            help="Only classify reports sampled on or after YYYY-MM-DD",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Reports per classification chunk (default: 5000)",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Execute the command.
+
+        Args:
+            *args: Positional arguments.
+            **options: Command options.
+
+        Raises:
+            CommandError: If the options are invalid.
+        """
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        queryset = models.Report.objects.all()
+        if options["organization"]:
+            queryset = queryset.filter(organization_id=options["organization"])
+        if options["since"]:
+            since = parse_date(options["since"])
+            if since is None:
+                raise CommandError("--since must be a YYYY-MM-DD date")
+            queryset = queryset.filter(sample_date__gte=since)
+
+        service = ConditionClassificationService(
+            batch_size=options["batch_size"]
+        )
+
+        def progress(processed: int, total: int) -> None:
+            self.stdout.write(f"  {processed}/{total} reports")
+
+        result = service.classify_reports(queryset, progress=progress)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Classified {result['processed']} reports, "
+                f"{result['updated']} updated"
+            )
+        )
@@ -0,0 +1,76 @@
+"""Reports management commands."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports.services.baselines import LubricantBaselineService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Recompute the fleet lubricant baselines."""
+
+    help = (
+        "Compute the median/MAD baselines of viscosity and additive levels "
+        "per lubricant and component type from the whole analysis history"
+    )
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-line arguments.
+
+        Args:
+            parser: Argument parser instance.
+        """
+        parser.add_argument(
+            "--lubricant",
+            action="append",
+            default=None,
+            help="Only recompute this lubricant (repeatable)",
+        )
+        parser.add_argument(
+            "--band-width",
+            type=float,
+            default=3.0,
+            help="Warning band half-width in scaled MADs (default: 3)",
+        )
+        parser.add_argument(
+            "--min-samples",
+            type=int,
+            default=20,
+            help="Minimum samples per baseline (default: 20)",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Execute the command.
+
+        Args:
+            *args: Positional arguments.
+            **options: Command options.
+
+        Raises:
+            CommandError: If the options are invalid.
+        """
+        if options["band_width"] <= 0:
+            raise CommandError("--band-width must be positive")
+        if options["min_samples"] < 1:
+            raise CommandError("--min-samples must be at least 1")
+
+        service = LubricantBaselineService(
+            band_width=options["band_width"],
+            min_samples=options["min_samples"],
+        )
+        if options["lubricant"]:
+            result = service.refresh(options["lubricant"])
+        else:
+            result = service.rebuild()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {result['baselines']} baselines from "
+                f"{result['analyses']} analyses"
+            )
+        )
@@ -0,0 +1,86 @@
+"""Reports management commands."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports.services.wear_forecast import WearForecastService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Refit the wear-rate forecasts of the fleet."""
+
+    help = (
+        "Fit the wear-rate trends of every component and project when "
+        "they reach their warning and critical limits"
+    )
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-line arguments.
+
+        Args:
+            parser: Argument parser instance.
+        """
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Refit every component instead of the stale ones",
+        )
+        parser.add_argument(
+            "--component",
+            type=int,
+            action="append",
+            default=None,
+            help="Only refit this component ID (repeatable)",
+        )
+        parser.add_argument(
+            "--window",
+            type=int,
+            default=12,
+            help="Most recent samples per component in the fit (default: 12)",
+        )
+        parser.add_argument(
+            "--horizon-days",
+            type=int,
+            default=365,
+            help="Longest projection in days (default: 365)",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Execute the command.
+
+        Args:
+            *args: Positional arguments.
+            **options: Command options.
+
+        Raises:
+            CommandError: If the options are invalid.
+        """
+        if options["window"] < 3:
+            raise CommandError("--window must be at least 3")
+        if options["horizon_days"] < 1:
+            raise CommandError("--horizon-days must be at least 1")
+        if options["all"] and options["component"]:
+            raise CommandError("--all and --component are exclusive")
+
+        service = WearForecastService(
+            window=options["window"],
+            horizon_days=options["horizon_days"],
+        )
+        if options["component"]:
+            result = service.refresh(options["component"])
+        elif options["all"]:
+            result = service.rebuild()
+        else:
+            result = service.refresh_stale()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {result['forecasts']} forecasts of "
+                f"{result['components']} components"
+            )
+        )
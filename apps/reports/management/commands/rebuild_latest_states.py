@@ -0,0 +1,66 @@
+"""Reports management commands."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports.services.latest_state import ComponentLatestStateService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Backfill the latest report snapshot of every component."""
+
+    help = (
+        "Rebuild the ComponentLatestState table from the newest active "
+        "report of each component"
+    )
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-line arguments.
+
+        Args:
+            parser: Argument parser instance.
+        """
+        parser.add_argument(
+            "--component",
+            type=int,
+            action="append",
+            default=None,
+            help="Only refresh this component ID (repeatable)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Components per refresh chunk (default: 1000)",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Execute the command.
+
+        Args:
+            *args: Positional arguments.
+            **options: Command options.
+
+        Raises:
+            CommandError: If the options are invalid.
+        """
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        service = ComponentLatestStateService(batch_size=options["batch_size"])
+        if options["component"]:
+            result = service.refresh(options["component"])
+        else:
+            result = service.rebuild()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Refreshed {result['components']} components: "
+                f"{result['stored']} stored, {result['removed']} removed"
+            )
+        )
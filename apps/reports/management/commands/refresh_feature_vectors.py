@@ -0,0 +1,75 @@
+"""Reports management commands."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports.services.similarity import ComponentSimilarityService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Recompute the feature vectors of the similar-component search."""
+
+    help = (
+        "Compute the wear-profile feature vectors of the components "
+        "used by the similar-component search"
+    )
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-line arguments.
+
+        Args:
+            parser: Argument parser instance.
+        """
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every component instead of the stale ones",
+        )
+        parser.add_argument(
+            "--component",
+            type=int,
+            action="append",
+            default=None,
+            help="Only recompute this component ID (repeatable)",
+        )
+        parser.add_argument(
+            "--window",
+            type=int,
+            default=6,
+            help="Most recent samples per parameter in the trend (default: 6)",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Execute the command.
+
+        Args:
+            *args: Positional arguments.
+            **options: Command options.
+
+        Raises:
+            CommandError: If the options are invalid.
+        """
+        if options["window"] < 3:
+            raise CommandError("--window must be at least 3")
+        if options["all"] and options["component"]:
+            raise CommandError("--all and --component are exclusive")
+
+        service = ComponentSimilarityService(window=options["window"])
+        if options["component"]:
+            result = service.refresh(options["component"])
+        elif options["all"]:
+            result = service.rebuild()
+        else:
+            result = service.refresh_stale()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Stored {result['vectors']} feature vectors of "
+                f"{result['components']} components"
+            )
+        )
@@ -0,0 +1,72 @@
+"""Reports management commands."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports.services.anomaly_scan import AnomalyScanService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Scan the fleet's sample history for anomalous values."""
+
+    help = (
+        "Score the reports loaded since the last scan against each "
+        "component's history and store the anomalous values"
+    )
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-line arguments.
+
+        Args:
+            parser: Argument parser instance.
+        """
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Drop the stored anomalies and rescan the whole history",
+        )
+        parser.add_argument(
+            "--z-threshold",
+            type=float,
+            default=3.0,
+            help="Minimum absolute z-score of an anomaly (default: 3.0)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Components scored per chunk (default: 2000)",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Execute the command.
+
+        Args:
+            *args: Positional arguments.
+            **options: Command options.
+
+        Raises:
+            CommandError: If the options are invalid.
+        """
+        if options["z_threshold"] <= 0:
+            raise CommandError("--z-threshold must be positive")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        result = AnomalyScanService(
+            z_threshold=options["z_threshold"],
+            batch_size=options["batch_size"],
+        ).scan(full=options["full"])
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Scanned {result['reports']} reports of "
+                f"{result['components']} components: "
+                f"{result['anomalies']} anomalies"
+            )
+        )
@@ -0,0 +1,120 @@
+"""Reports management commands."""
+
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.reports.services.fleet_seeding import FleetSeedingService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Seed a synthetic fleet of machines, components and reports."""
+
+    help = (
+        "Generate organizations, machines, components and drifting lab "
+        "analysis time series with bulk inserts (for load testing)"
+    )
+
+    def add_arguments(self, parser) -> None:
+        """
+        Add command-line arguments.
+
+        Args:
+            parser: Argument parser instance.
+        """
+        parser.add_argument(
+            "--organizations",
+            type=int,
+            default=5,
+            help="Number of organizations (default: 5)",
+        )
+        parser.add_argument(
+            "--machines",
+            type=int,
+            default=20,
+            help="Machines per organization (default: 20)",
+        )
+        parser.add_argument(
+            "--components",
+            type=int,
+            default=3,
+            help="Components per machine (default: 3)",
+        )
+        parser.add_argument(
+            "--samples",
+            type=int,
+            default=24,
+            help="Reports per component (default: 24)",
+        )
+        parser.add_argument(
+            "--cadence-days",
+            type=int,
+            default=15,
+            help="Average days between samples (default: 15)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows per bulk insert batch (default: 5000)",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=None,
+            help="Random seed for reproducible datasets",
+        )
+        parser.add_argument(
+            "--prefix",
+            type=str,
+            default=None,
+            help="Prefix for lab numbers and serial numbers",
+        )
+
+    def handle(self, *args, **options) -> None:
+        """
+        Execute the command.
+
+        Args:
+            *args: Positional arguments.
+            **options: Command options.
+
+        Raises:
+            CommandError: If the configuration is invalid.
+        """
+        for option in ("organizations", "machines", "components", "samples"):
+            if options[option] < 1:
+                raise CommandError(f"--{option} must be at least 1")
+
+        service = FleetSeedingService(
+            organizations=options["organizations"],
+            machines_per_org=options["machines"],
+            components_per_machine=options["components"],
+            samples_per_component=options["samples"],
+            cadence_days=options["cadence_days"],
+            batch_size=options["batch_size"],
+            seed=options["seed"],
+            prefix=options["prefix"],
+        )
+
+        self.stdout.write(
+            f"Seeding {service.total_reports} reports "
+            f"(prefix {service.prefix})..."
+        )
+
+        def progress(created: int, total: int) -> None:
+            self.stdout.write(f"  {created}/{total} reports")
+
+        result = service.seed(progress=progress)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(result.organizations)} organizations, "
+                f"{len(result.machines)} machines, "
+                f"{len(result.components)} components and "
+                f"{result.reports} reports in {result.elapsed:.1f}s "
+                f"({result.reports_per_minute:.0f} reports/min)"
+            )
+        )
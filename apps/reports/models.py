@@ -1,3 +1,4 @@
+from django.core.exceptions import FieldDoesNotExist, ValidationError
 from django.db import models
 from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
@@ -118,6 +119,19 @@ class Report(TimeStampedModel, BaseUserTracked, IsActive):
         default=choices.ReportCondition.NORMAL,
         help_text=_("Equipment condition assessment"),
     )
+    computed_condition = models.CharField(
+        _("Computed Condition"),
+        max_length=20,
+        choices=choices.ReportCondition.choices,
+        blank=True,
+        help_text=_("Condition computed from the analysis thresholds"),
+    )
+    breached_parameters = models.JSONField(
+        _("Breached Parameters"),
+        default=list,
+        blank=True,
+        help_text=_("Analysis parameters over their thresholds"),
+    )
     notes = models.TextField(
         _("Notes"),
         blank=True,
@@ -154,11 +168,25 @@ class Report(TimeStampedModel, BaseUserTracked, IsActive):
         indexes = [
             models.Index(fields=["lab_number"]),
             models.Index(fields=["per_number"]),
+            # Pattern ops let PostgreSQL use the index for prefix searches
+            models.Index(
+                fields=["lab_number"],
+                name="report_lab_number_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
+            models.Index(
+                fields=["per_number"],
+                name="report_per_number_prefix_idx",
+                opclasses=["varchar_pattern_ops"],
+            ),
             models.Index(fields=["sample_date"]),
+            # Latest report of a component (ComponentLatestState refresh)
+            models.Index(fields=["component", "-sample_date", "-created"]),
             models.Index(fields=["organization", "is_active"]),
             models.Index(fields=["machine", "is_active"]),
             models.Index(fields=["status"]),
             models.Index(fields=["condition"]),
+            models.Index(fields=["computed_condition"]),
         ]
 
     def __str__(self) -> str:
@@ -325,11 +353,15 @@ class LabAnalysis(TimeStampedModel, BaseUserTracked):
     # WEAR METALS (ppm) - ASTM D 5185-18
     # ==========================================
     iron_fe = models.IntegerField(_("Iron (Fe)"), null=True, blank=True)
-    chromium_cr = models.IntegerField(_("Chromium (Cr)"), null=True, blank=True)
+    chromium_cr = models.IntegerField(
+        _("Chromium (Cr)"), null=True, blank=True
+    )
     lead_pb = models.IntegerField(_("Lead (Pb)"), null=True, blank=True)
     copper_cu = models.IntegerField(_("Copper (Cu)"), null=True, blank=True)
     tin_sn = models.IntegerField(_("Tin (Sn)"), null=True, blank=True)
-    aluminum_al = models.IntegerField(_("Aluminum (Al)"), null=True, blank=True)
+    aluminum_al = models.IntegerField(
+        _("Aluminum (Al)"), null=True, blank=True
+    )
     nickel_ni = models.IntegerField(_("Nickel (Ni)"), null=True, blank=True)
     silver_ag = models.IntegerField(_("Silver (Ag)"), null=True, blank=True)
 
@@ -342,7 +374,9 @@ class LabAnalysis(TimeStampedModel, BaseUserTracked):
     magnesium_mg = models.IntegerField(
         _("Magnesium (Mg)"), null=True, blank=True
     )
-    potassium_k = models.IntegerField(_("Potassium (K)"), null=True, blank=True)
+    potassium_k = models.IntegerField(
+        _("Potassium (K)"), null=True, blank=True
+    )
 
     # ==========================================
     # ADDITIVES (ppm)
@@ -350,7 +384,9 @@ class LabAnalysis(TimeStampedModel, BaseUserTracked):
     molybdenum_mo = models.IntegerField(
         _("Molybdenum (Mo)"), null=True, blank=True
     )
-    titanium_ti = models.IntegerField(_("Titanium (Ti)"), null=True, blank=True)
+    titanium_ti = models.IntegerField(
+        _("Titanium (Ti)"), null=True, blank=True
+    )
     vanadium_v = models.IntegerField(_("Vanadium (V)"), null=True, blank=True)
     manganese_mn = models.IntegerField(
         _("Manganese (Mn)"), null=True, blank=True
@@ -407,3 +443,577 @@ class LabAnalysis(TimeStampedModel, BaseUserTracked):
         if self.zinc_zn:
             return min(100.0, (self.zinc_zn / 1100) * 100)
         return None
+
+
+class QuarantinedRow(TimeStampedModel, BaseUserTracked):
+    """
+    Upload row held back by the ingest data quality checks.
+
+    Keeps the raw ``column_N`` values of the row and the reasons it was
+    flagged, so it can be reviewed and released (loaded) or discarded.
+    """
+
+    lab_number = models.CharField(
+        _("Lab Number"),
+        max_length=50,
+        blank=True,
+        db_index=True,
+    )
+    row_number = models.PositiveIntegerField(
+        _("Row Number"),
+        null=True,
+        blank=True,
+        help_text=_("Row of the uploaded file"),
+    )
+    source = models.CharField(
+        _("Source"),
+        max_length=255,
+        blank=True,
+        help_text=_("Uploaded file name"),
+    )
+    data = models.JSONField(
+        _("Data"),
+        default=dict,
+        help_text=_("Raw row values by column"),
+    )
+    reasons = models.JSONField(
+        _("Reasons"),
+        default=list,
+        help_text=_("Failed quality checks"),
+    )
+    status = models.CharField(
+        _("Status"),
+        max_length=20,
+        choices=choices.QuarantineStatus.choices,
+        default=choices.QuarantineStatus.PENDING,
+    )
+    report = models.ForeignKey(
+        Report,
+        verbose_name=_("Report"),
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="quarantined_rows",
+        help_text=_("Report created when the row was released"),
+    )
+
+    class Meta:
+        verbose_name = _("Quarantined Row")
+        verbose_name_plural = _("Quarantined Rows")
+        ordering = ("-created",)
+        indexes = [models.Index(fields=["status", "-created"])]
+
+    def __str__(self) -> str:
+        return f"Quarantined {self.lab_number or '-'} ({self.status})"
+
+
+class ThresholdProfile(TimeStampedModel, BaseUserTracked, IsActive):
+    """
+    Condition threshold overrides for a component type and/or lubricant.
+
+    Profiles without a component type apply to every type and profiles
+    without a lubricant to every lubricant. When several profiles match a
+    report, their limits are layered from the least to the most specific
+    one (lubricant only, component type only, both) over the defaults.
+    """
+
+    name = models.CharField(_("Name"), max_length=100)
+    component_type = models.ForeignKey(
+        equipment_models.ComponentType,
+        verbose_name=_("Component Type"),
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="threshold_profiles",
+        help_text=_("Component type the profile applies to (empty: any)"),
+    )
+    lubricant = models.CharField(
+        _("Lubricant"),
+        max_length=200,
+        blank=True,
+        help_text=_(
+            "Lubricant grade as reported by the lab, e.g. 15W40 "
+            "(case-insensitive; empty: any)"
+        ),
+    )
+
+    class Meta:
+        verbose_name = _("Threshold Profile")
+        verbose_name_plural = _("Threshold Profiles")
+        ordering = ("component_type__name", "lubricant")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["component_type", "lubricant"],
+                condition=models.Q(component_type__isnull=False),
+                name="threshold_profile_type_lubricant_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=["lubricant"],
+                condition=models.Q(component_type__isnull=True),
+                name="threshold_profile_lubricant_uniq",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+    @staticmethod
+    def normalize_lubricant(value: str | None) -> str:
+        """Return the matching key of a lubricant (upper case, single spaces)."""
+        return " ".join((value or "").upper().split())
+
+    def save(self, *args, **kwargs) -> None:
+        """Store the lubricant normalized so lookups are exact matches."""
+        self.lubricant = self.normalize_lubricant(self.lubricant)
+        super().save(*args, **kwargs)
+
+
+class ThresholdLimit(TimeStampedModel, BaseUserTracked):
+    """
+    Limits of one analysis parameter within a threshold profile.
+
+    ``warning``/``critical`` are one-sided limits: values at or above them
+    are breached, or at or below them when ``critical`` is lower than
+    ``warning`` (additive depletion). ``warning_low``/``warning_high``
+    bound the acceptable range of two-sided parameters such as viscosity.
+    """
+
+    profile = models.ForeignKey(
+        ThresholdProfile,
+        verbose_name=_("Profile"),
+        on_delete=models.CASCADE,
+        related_name="limits",
+    )
+    group = models.CharField(
+        _("Group"),
+        max_length=20,
+        choices=choices.ThresholdGroup.choices,
+        help_text=_("Group of parameters without default limits"),
+    )
+    parameter = models.CharField(
+        _("Parameter"),
+        max_length=50,
+        help_text=_("Lab analysis field, e.g. iron_fe"),
+    )
+    warning = models.FloatField(_("Warning"), null=True, blank=True)
+    critical = models.FloatField(_("Critical"), null=True, blank=True)
+    warning_low = models.FloatField(_("Warning Low"), null=True, blank=True)
+    warning_high = models.FloatField(_("Warning High"), null=True, blank=True)
+    unit = models.CharField(_("Unit"), max_length=20, blank=True)
+
+    class Meta:
+        verbose_name = _("Threshold Limit")
+        verbose_name_plural = _("Threshold Limits")
+        ordering = ("group", "parameter")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["profile", "parameter"],
+                name="threshold_limit_profile_parameter_uniq",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.profile} - {self.parameter}"
+
+    def clean(self) -> None:
+        """Validate the parameter and that some limit is set."""
+        numeric = (models.IntegerField, models.DecimalField)
+        try:
+            field = LabAnalysis._meta.get_field(self.parameter)
+        except FieldDoesNotExist:
+            field = None
+        if not isinstance(field, numeric):
+            raise ValidationError(
+                {"parameter": _("Must be a numeric lab analysis field.")}
+            )
+        if (self.warning is None) != (self.critical is None):
+            raise ValidationError(
+                _("Warning and critical must be set together.")
+            )
+        if all(
+            value is None
+            for value in (
+                self.warning,
+                self.critical,
+                self.warning_low,
+                self.warning_high,
+            )
+        ):
+            raise ValidationError(_("Set at least one limit."))
+
+
+class LubricantBaseline(TimeStampedModel):
+    """
+    Fleet statistics of one analysis parameter for a lubricant.
+
+    Computed from the whole LabAnalysis history per lubricant and
+    component type (or across every type when ``component_type`` is
+    empty) by ``LubricantBaselineService``; the warning band is the median
+    plus/minus a multiple of the scaled MAD.
+    """
+
+    component_type = models.ForeignKey(
+        equipment_models.ComponentType,
+        verbose_name=_("Component Type"),
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="lubricant_baselines",
+        help_text=_("Component type of the samples (empty: every type)"),
+    )
+    lubricant = models.CharField(
+        _("Lubricant"),
+        max_length=200,
+        help_text=_("Normalized lubricant grade"),
+    )
+    parameter = models.CharField(_("Parameter"), max_length=50)
+    sample_count = models.PositiveIntegerField(_("Samples"))
+    median = models.FloatField(_("Median"))
+    mad = models.FloatField(_("MAD"), help_text=_("Median absolute deviation"))
+    p05 = models.FloatField(_("5th Percentile"))
+    p95 = models.FloatField(_("95th Percentile"))
+    warning_low = models.FloatField(_("Warning Low"))
+    warning_high = models.FloatField(_("Warning High"))
+
+    class Meta:
+        verbose_name = _("Lubricant Baseline")
+        verbose_name_plural = _("Lubricant Baselines")
+        ordering = ("lubricant", "component_type__name", "parameter")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["component_type", "lubricant", "parameter"],
+                condition=models.Q(component_type__isnull=False),
+                name="lubricant_baseline_type_uniq",
+            ),
+            models.UniqueConstraint(
+                fields=["lubricant", "parameter"],
+                condition=models.Q(component_type__isnull=True),
+                name="lubricant_baseline_fleet_uniq",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.lubricant} - {self.parameter}"
+
+
+class ComponentLatestState(models.Model):
+    """
+    Snapshot of the latest report of a component.
+
+    One row per component with its newest active report (by sample date),
+    maintained by ``ComponentLatestStateService`` whenever reports change,
+    so fleet status reads one indexed row per component instead of
+    scanning the report history.
+    """
+
+    component = models.OneToOneField(
+        equipment_models.Component,
+        verbose_name=_("Component"),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="latest_state",
+    )
+    organization = models.ForeignKey(
+        users_models.Organization,
+        verbose_name=_("Organization"),
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+        help_text=_("Organization that owns the component's machine"),
+    )
+    machine = models.ForeignKey(
+        equipment_models.Machine,
+        verbose_name=_("Machine"),
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    report = models.ForeignKey(
+        Report,
+        verbose_name=_("Report"),
+        on_delete=models.CASCADE,
+        related_name="+",
+        help_text=_("Latest active report of the component"),
+    )
+    lab_number = models.CharField(_("Lab Number"), max_length=50)
+    sample_date = models.DateField(_("Sample Date"))
+    condition = models.CharField(
+        _("Condition"),
+        max_length=20,
+        choices=choices.ReportCondition.choices,
+    )
+    computed_condition = models.CharField(
+        _("Computed Condition"),
+        max_length=20,
+        choices=choices.ReportCondition.choices,
+        blank=True,
+    )
+    lubricant = models.CharField(_("Lubricant"), max_length=200, blank=True)
+    lubricant_hours = models.IntegerField(
+        _("Lubricant Hours"), null=True, blank=True
+    )
+    lubricant_kms = models.IntegerField(
+        _("Lubricant Kilometers"), null=True, blank=True
+    )
+    machine_hours = models.IntegerField(
+        _("Machine Hours"), null=True, blank=True
+    )
+    machine_kms = models.IntegerField(
+        _("Machine Kilometers"), null=True, blank=True
+    )
+
+    # Key measurements of the latest analysis
+    iron_fe = models.IntegerField(_("Iron (Fe)"), null=True, blank=True)
+    copper_cu = models.IntegerField(_("Copper (Cu)"), null=True, blank=True)
+    aluminum_al = models.IntegerField(
+        _("Aluminum (Al)"), null=True, blank=True
+    )
+    silicon_si = models.IntegerField(_("Silicon (Si)"), null=True, blank=True)
+    viscosity_100c = models.DecimalField(
+        _("Viscosity @ 100°C (cSt)"),
+        max_digits=8,
+        decimal_places=3,
+        null=True,
+        blank=True,
+    )
+    tbn = models.DecimalField(
+        _("TBN (mgKOH/g)"),
+        max_digits=6,
+        decimal_places=2,
+        null=True,
+        blank=True,
+    )
+    soot = models.DecimalField(
+        _("Soot (%)"),
+        max_digits=6,
+        decimal_places=3,
+        null=True,
+        blank=True,
+    )
+    refreshed = models.DateTimeField(_("Refreshed"), auto_now=True)
+    forecasted = models.DateTimeField(
+        _("Forecasted"),
+        null=True,
+        blank=True,
+        help_text=_("Last wear forecast fit, with or without a result"),
+    )
+
+    class Meta:
+        verbose_name = _("Component Latest State")
+        verbose_name_plural = _("Component Latest States")
+        ordering = ("-sample_date",)
+        indexes = [
+            models.Index(fields=["organization", "condition"]),
+            models.Index(fields=["organization", "computed_condition"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.component_id} - {self.lab_number}"
+
+
+class WearForecast(TimeStampedModel):
+    """
+    Wear-rate trend of one wear metal of a component.
+
+    Fitted by ``WearForecastService`` on the recent samples of the
+    component against lubricant usage, with a separate intercept per oil
+    fill. Projects when the current fill reaches the warning and critical
+    limits of the component's thresholds.
+    """
+
+    component = models.ForeignKey(
+        equipment_models.Component,
+        verbose_name=_("Component"),
+        on_delete=models.CASCADE,
+        related_name="wear_forecasts",
+    )
+    parameter = models.CharField(
+        _("Parameter"),
+        max_length=50,
+        help_text=_("Lab analysis field, e.g. iron_fe"),
+    )
+    basis = models.CharField(
+        _("Basis"),
+        max_length=10,
+        choices=choices.UsageBasis.choices,
+    )
+    sample_count = models.PositiveIntegerField(_("Samples"))
+    wear_rate = models.FloatField(
+        _("Wear Rate"),
+        help_text=_("ppm per 100 lubricant hours or kilometers"),
+    )
+    slope_stderr = models.FloatField(
+        _("Wear Rate Std. Error"),
+        null=True,
+        blank=True,
+        help_text=_("Standard error of the wear rate (ppm per 100)"),
+    )
+    confidence = models.FloatField(
+        _("Confidence"),
+        help_text=_("Share of the within-fill variance explained (R²)"),
+    )
+    level = models.FloatField(
+        _("Level"), help_text=_("Fitted value at the last sample (ppm)")
+    )
+    usage = models.FloatField(
+        _("Usage"), help_text=_("Lubricant usage at the last sample")
+    )
+    usage_per_day = models.FloatField(
+        _("Usage per Day"), null=True, blank=True
+    )
+    last_sample_date = models.DateField(_("Last Sample Date"))
+    warning_limit = models.FloatField(_("Warning"), null=True, blank=True)
+    critical_limit = models.FloatField(_("Critical"), null=True, blank=True)
+    warning_date = models.DateField(
+        _("Projected Warning Date"), null=True, blank=True
+    )
+    critical_date = models.DateField(
+        _("Projected Critical Date"), null=True, blank=True
+    )
+
+    class Meta:
+        verbose_name = _("Wear Forecast")
+        verbose_name_plural = _("Wear Forecasts")
+        ordering = ("component", "parameter")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["component", "parameter"],
+                name="wear_forecast_component_parameter_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["critical_date"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.component_id} - {self.parameter}"
+
+
+class ComponentAnomaly(TimeStampedModel):
+    """
+    Sample value that jumped relative to the component's own history.
+
+    Written by ``AnomalyScanService`` when the z-score of a value against
+    the EWMA and rolling spread of the previous samples of the same
+    component and parameter exceeds the scan threshold.
+    """
+
+    component = models.ForeignKey(
+        equipment_models.Component,
+        verbose_name=_("Component"),
+        on_delete=models.CASCADE,
+        related_name="anomalies",
+    )
+    organization = models.ForeignKey(
+        users_models.Organization,
+        verbose_name=_("Organization"),
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    report = models.ForeignKey(
+        Report,
+        verbose_name=_("Report"),
+        on_delete=models.CASCADE,
+        related_name="anomalies",
+    )
+    parameter = models.CharField(_("Parameter"), max_length=50)
+    sample_date = models.DateField(_("Sample Date"))
+    value = models.FloatField(_("Value"))
+    ewma = models.FloatField(
+        _("EWMA"), help_text=_("Exponentially weighted mean of the history")
+    )
+    rolling_mean = models.FloatField(_("Rolling Mean"))
+    rolling_std = models.FloatField(_("Rolling Std. Dev."))
+    z_score = models.FloatField(_("Z-Score"))
+    score = models.FloatField(_("Score"), help_text=_("Absolute z-score"))
+    history = models.PositiveIntegerField(
+        _("History"), help_text=_("Previous samples of the parameter")
+    )
+
+    class Meta:
+        verbose_name = _("Component Anomaly")
+        verbose_name_plural = _("Component Anomalies")
+        ordering = ("-score",)
+        constraints = [
+            models.UniqueConstraint(
+                fields=["report", "parameter"],
+                name="component_anomaly_report_parameter_uniq",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["organization", "-score"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.report_id} - {self.parameter} ({self.z_score:+.1f})"
+
+
+class AnomalyScan(TimeStampedModel):
+    """
+    Run of the fleet anomaly scan.
+
+    The newest run's ``watermark`` is when it started; the next run only
+    rescores the components of the reports created since (minus the
+    scan's overlap, for reports committed late).
+    """
+
+    watermark = models.DateTimeField(
+        _("Watermark"), help_text=_("Start of the scan")
+    )
+    components = models.PositiveIntegerField(_("Components"), default=0)
+    reports = models.PositiveIntegerField(_("Reports"), default=0)
+    anomalies = models.PositiveIntegerField(_("Anomalies"), default=0)
+
+    class Meta:
+        verbose_name = _("Anomaly Scan")
+        verbose_name_plural = _("Anomaly Scans")
+        ordering = ("-created",)
+
+    def __str__(self) -> str:
+        return f"{self.created:%Y-%m-%d %H:%M} - {self.watermark}"
+
+
+class ComponentFeatureVector(models.Model):
+    """
+    Wear profile of a component for the similar-component search.
+
+    One row per component with the recent levels and trends of its wear
+    metals, contaminants and additives packed as float32 values in the
+    order of ``similarity.FEATURE_NAMES``. Maintained by
+    ``ComponentSimilarityService`` and loaded per organization as a dense
+    matrix for nearest-neighbour queries.
+    """
+
+    component = models.OneToOneField(
+        equipment_models.Component,
+        verbose_name=_("Component"),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="feature_vector",
+    )
+    organization = models.ForeignKey(
+        users_models.Organization,
+        verbose_name=_("Organization"),
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    vector = models.BinaryField(
+        _("Vector"), help_text=_("Packed float32 features (NaN: missing)")
+    )
+    sample_count = models.PositiveIntegerField(_("Sample Count"))
+    last_sample_date = models.DateField(_("Last Sample Date"))
+    refreshed = models.DateTimeField(_("Refreshed"), auto_now=True)
+
+    class Meta:
+        verbose_name = _("Component Feature Vector")
+        verbose_name_plural = _("Component Feature Vectors")
+        indexes = [
+            models.Index(fields=["organization"]),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.component_id} ({self.sample_count} samples)"
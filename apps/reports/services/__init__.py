@@ -3,6 +3,13 @@ Reports services package.
 
 Contains business logic for report operations:
 - Bulk upload processing
+- Ingest data quality checks and quarantine review
+- Condition thresholds per component type and lubricant
+- Fleet lubricant baselines of oil health parameters
+- Latest report snapshot per component
+- Wear-rate trends and remaining-life forecasts
+- Fleet anomaly scan of the sample history
+- Similar-component search over wear-profile feature vectors
 - Report validation
 - Data parsing and transformation
 """
@@ -0,0 +1,317 @@
+"""
+Fleet anomaly scan of the lab analysis time series.
+
+Scores every element of every sample against the component's own history
+with polars window expressions over (component, parameter): the EWMA,
+rolling mean and rolling standard deviation of the previous samples, and
+the z-score of the new value against them. Values that jump beyond the
+threshold in the harmful direction (up for wear metals and contaminants,
+down for additives) are stored as ComponentAnomaly rows.
+
+The scan is incremental: each run records when it started (AnomalyScan)
+and the next run only rescores the components of the reports created
+since, flagging only those reports. Reports are numbered and timestamped
+before their transaction commits, so the window reaches ``overlap`` back
+to include reports committed after the previous scan read; anomalies
+already stored are not flagged again.
+"""
+
+import logging
+from datetime import timedelta
+from typing import Collection, Dict, List, Optional, Sequence, Tuple
+
+import polars as pl
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.cache import org_tag, tiered_cache
+from apps.reports import models
+from apps.reports.services.thresholds import DEFAULT_THRESHOLDS
+
+logger = logging.getLogger(__name__)
+
+# ICP elements (ppm) of LabAnalysis
+ANOMALY_PARAMETERS: Tuple[str, ...] = (
+    "iron_fe",
+    "chromium_cr",
+    "lead_pb",
+    "copper_cu",
+    "tin_sn",
+    "aluminum_al",
+    "nickel_ni",
+    "silver_ag",
+    "silicon_si",
+    "boron_b",
+    "sodium_na",
+    "magnesium_mg",
+    "potassium_k",
+    "molybdenum_mo",
+    "titanium_ti",
+    "vanadium_v",
+    "manganese_mn",
+    "phosphorus_p",
+    "zinc_zn",
+    "calcium_ca",
+    "barium_ba",
+    "cadmium_cd",
+)
+
+# Depletion rather than accumulation is harmful for these
+LOWER_IS_WORSE = frozenset(DEFAULT_THRESHOLDS["additives"])
+
+# Spread floors: relative to the rolling mean, and absolute (ppm)
+MIN_RELATIVE_SPREAD = 0.05
+MIN_SPREAD = 1.0
+
+COMPONENT_COLUMN = "component_id"
+ORGANIZATION_COLUMN = "organization_id"
+
+_ANOMALY_FIELDS = (
+    "parameter",
+    "sample_date",
+    "value",
+    "ewma",
+    "rolling_mean",
+    "rolling_std",
+    "z_score",
+    "score",
+    "history",
+)
+
+
+class AnomalyScanService:
+    """
+    Scores lab analyses against each component's history.
+
+    Attributes:
+        parameters: LabAnalysis fields scanned.
+        window: Previous samples of the rolling mean and deviation.
+        span: Span of the EWMA, in samples.
+        z_threshold: Minimum absolute z-score of an anomaly.
+        min_history: Previous samples required to score a value.
+        overlap: How far the window of a scan reaches before the
+            previous one started.
+        batch_size: Components scored per chunk.
+    """
+
+    def __init__(
+        self,
+        parameters: Sequence[str] = ANOMALY_PARAMETERS,
+        window: int = 8,
+        span: float = 5.0,
+        z_threshold: float = 3.0,
+        min_history: int = 4,
+        overlap: timedelta = timedelta(hours=1),
+        batch_size: int = 2000,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            parameters: LabAnalysis fields scanned.
+            window: Previous samples of the rolling mean and deviation.
+            span: Span of the EWMA, in samples.
+            z_threshold: Minimum absolute z-score of an anomaly.
+            min_history: Previous samples required to score a value.
+            overlap: How far the window of a scan reaches before the
+                previous one started (longest ingest transaction).
+            batch_size: Components scored per chunk.
+        """
+        self.parameters = list(parameters)
+        self.window = window
+        self.span = span
+        self.z_threshold = z_threshold
+        self.min_history = min_history
+        self.overlap = overlap
+        self.batch_size = batch_size
+
+    def score(
+        self, df: pl.DataFrame, reports: Optional[Collection[int]] = None
+    ) -> pl.DataFrame:
+        """
+        Score the samples of a frame and return the anomalies.
+
+        Args:
+            df: One row per report with ``pk``, ``component_id``,
+                ``organization_id``, ``sample_date`` and the parameters.
+            reports: Primary keys of the reports that can be flagged;
+                the others are history. None flags every report.
+
+        Returns:
+            One row per anomalous (report, parameter) with the value, its
+            history statistics and z-score.
+        """
+        series = [COMPONENT_COLUMN, "parameter"]
+        value = pl.col("value")
+        # Statistics of the previous samples only
+        previous = value.shift(1)
+        spread = pl.max_horizontal(
+            pl.col("rolling_std"),
+            pl.col("rolling_mean").abs() * MIN_RELATIVE_SPREAD,
+            pl.lit(MIN_SPREAD),
+        )
+        z_score = pl.col("z_score")
+        harmful = (
+            pl.when(pl.col("parameter").is_in(list(LOWER_IS_WORSE)))
+            .then(z_score <= -self.z_threshold)
+            .otherwise(z_score >= self.z_threshold)
+        )
+        flagged = (
+            pl.lit(True)
+            if reports is None
+            else pl.col("pk").is_in(list(reports))
+        )
+
+        return (
+            df.lazy()
+            .unpivot(
+                index=[
+                    "pk",
+                    COMPONENT_COLUMN,
+                    ORGANIZATION_COLUMN,
+                    "sample_date",
+                ],
+                on=self.parameters,
+                variable_name="parameter",
+                value_name="value",
+            )
+            .with_columns(value.cast(pl.Float64))
+            .filter(value.is_not_null())
+            .sort(COMPONENT_COLUMN, "parameter", "sample_date", "pk")
+            .with_columns(
+                previous.ewm_mean(span=self.span, adjust=False)
+                .over(series)
+                .alias("ewma"),
+                previous.rolling_mean(self.window, min_samples=2)
+                .over(series)
+                .alias("rolling_mean"),
+                previous.rolling_std(self.window, min_samples=2)
+                .over(series)
+                .alias("rolling_std"),
+                pl.int_range(pl.len()).over(series).alias("history"),
+            )
+            .filter(flagged & (pl.col("history") >= self.min_history))
+            .with_columns(((value - pl.col("ewma")) / spread).alias("z_score"))
+            .filter(harmful)
+            .with_columns(z_score.abs().alias("score"))
+            .sort("score", descending=True)
+            .collect()
+        )
+
+    def load(self, component_ids: Sequence[int]) -> pl.DataFrame:
+        """
+        Read the active dated reports of some components.
+
+        Args:
+            component_ids: Components to read.
+
+        Returns:
+            Frame with one row per report, as expected by :meth:`score`.
+        """
+        rows = models.Report.objects.filter(
+            component_id__in=component_ids,
+            is_active=True,
+            sample_date__isnull=False,
+            analysis__isnull=False,
+        ).values_list(
+            "pk",
+            "component_id",
+            "component__machine__organization_id",
+            "sample_date",
+            *[f"analysis__{parameter}" for parameter in self.parameters],
+        )
+        return pl.DataFrame(
+            list(rows),
+            schema={
+                "pk": pl.Int64,
+                COMPONENT_COLUMN: pl.Int64,
+                ORGANIZATION_COLUMN: pl.Int64,
+                "sample_date": pl.Date,
+                **{parameter: pl.Float64 for parameter in self.parameters},
+            },
+            orient="row",
+        )
+
+    def scan(self, full: bool = False) -> Dict[str, int]:
+        """
+        Score the reports loaded since the last scan.
+
+        Args:
+            full: Drop every anomaly and rescan the whole history.
+
+        Returns:
+            Dictionary with the ``components`` rescored, the ``reports``
+            of the window and the ``anomalies`` stored.
+        """
+        started = timezone.now()
+        last = models.AnomalyScan.objects.order_by("-pk").first()
+        incremental = not full and last is not None
+        new_reports = models.Report.objects.all()
+        report_ids = None
+        if incremental:
+            new_reports = new_reports.filter(
+                created__gt=last.watermark - self.overlap
+            )
+            report_ids = set(new_reports.values_list("pk", flat=True))
+        # The whole history is new on a first or full scan
+        reports = (
+            new_reports.count() if report_ids is None else len(report_ids)
+        )
+        if not reports:
+            return {"components": 0, "reports": 0, "anomalies": 0}
+
+        component_ids = sorted(
+            new_reports.filter(component__isnull=False)
+            .order_by()
+            .values_list("component_id", flat=True)
+            .distinct()
+        )
+        if full:
+            models.ComponentAnomaly.objects.all().delete()
+
+        stored = 0
+        for start in range(0, len(component_ids), self.batch_size):
+            chunk = component_ids[start : start + self.batch_size]
+            anomalies = self.score(self.load(chunk), report_ids)
+            stored += self._store(anomalies)
+
+        result = {
+            "components": len(component_ids),
+            "reports": reports,
+            "anomalies": stored,
+        }
+        models.AnomalyScan.objects.create(watermark=started, **result)
+        logger.info(
+            f"Anomaly scan of {result['reports']} reports: "
+            f"{stored} anomalies in {len(component_ids)} components"
+        )
+        return result
+
+    def _store(self, anomalies: pl.DataFrame) -> int:
+        """Bulk create the anomalies of a chunk not stored yet."""
+        # Reports of the overlap may have been flagged by the last scan
+        stored = set(
+            models.ComponentAnomaly.objects.filter(
+                report_id__in=anomalies["pk"].unique().to_list()
+            ).values_list("report_id", "parameter")
+        )
+        objects: List[models.ComponentAnomaly] = [
+            models.ComponentAnomaly(
+                component_id=row[COMPONENT_COLUMN],
+                organization_id=row[ORGANIZATION_COLUMN],
+                report_id=row["pk"],
+                **{name: row[name] for name in _ANOMALY_FIELDS},
+            )
+            for row in anomalies.iter_rows(named=True)
+            if (row["pk"], row["parameter"]) not in stored
+        ]
+        with transaction.atomic():
+            models.ComponentAnomaly.objects.bulk_create(
+                objects, batch_size=1000, ignore_conflicts=True
+            )
+
+        # Top anomalies are cached per organization
+        tiered_cache.invalidate_tags(
+            *{org_tag(obj.organization_id) for obj in objects}
+        )
+        return len(objects)
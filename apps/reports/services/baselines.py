@@ -0,0 +1,277 @@
+"""
+Fleet baselines of oil health parameters per lubricant.
+
+Computes robust statistics (median, MAD and 5th/95th percentiles) of the
+viscosity and additive levels of every LabAnalysis, grouped by lubricant
+and component type and by lubricant alone, with vectorized polars
+group-bys. The results are stored as LubricantBaseline rows, rebuilt in
+full nightly and refreshed per lubricant after each ingest; the warning
+bands reach the dashboard and the classification through the threshold
+lookup table (``apps.reports.services.thresholds``).
+"""
+
+import logging
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import polars as pl
+from django.db import transaction
+from django.db.models import Value
+from django.db.models.functions import Replace, Upper
+
+from apps.reports import models
+from apps.reports.services.thresholds import invalidate_threshold_profiles
+
+logger = logging.getLogger(__name__)
+
+BASELINE_PARAMETERS: Tuple[str, ...] = (
+    "viscosity_40c",
+    "viscosity_100c",
+    "tbn",
+    "zinc_zn",
+    "phosphorus_p",
+    "magnesium_mg",
+    "calcium_ca",
+)
+
+# Scales the MAD to the standard deviation of normally distributed data
+MAD_SCALE = 1.4826
+
+# Minimum band half-width relative to the median (identical samples)
+MIN_RELATIVE_SPREAD = 0.02
+
+TYPE_COLUMN = "component_type_id"
+LUBRICANT_COLUMN = "lubricant"
+
+# Characters collapsed by ThresholdProfile.normalize_lubricant
+WHITESPACE = (" ", "\t", "\n", "\r")
+
+
+def lubricant_key_expr(column: str = LUBRICANT_COLUMN) -> pl.Expr:
+    """Return ``ThresholdProfile.normalize_lubricant`` as an expression."""
+    return (
+        pl.col(column)
+        .fill_null("")
+        .str.strip_chars()
+        .str.to_uppercase()
+        .str.replace_all(r"\s+", " ")
+    )
+
+
+class LubricantBaselineService:
+    """
+    Computes and stores the LubricantBaseline table.
+
+    Attributes:
+        parameters: LabAnalysis fields with baselines.
+        band_width: Band half-width in scaled MADs.
+        min_samples: Minimum samples of a group to store its baseline.
+        batch_size: Analyses read per query.
+    """
+
+    def __init__(
+        self,
+        parameters: Sequence[str] = BASELINE_PARAMETERS,
+        band_width: float = 3.0,
+        min_samples: int = 20,
+        batch_size: int = 50000,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            parameters: LabAnalysis fields with baselines.
+            band_width: Band half-width in scaled MADs.
+            min_samples: Minimum samples of a group to store its baseline.
+            batch_size: Analyses read per query.
+        """
+        self.parameters = list(parameters)
+        self.band_width = band_width
+        self.min_samples = min_samples
+        self.batch_size = batch_size
+
+    def compute(self, df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Compute the baselines of an analysis frame.
+
+        Args:
+            df: Frame with ``component_type_id``, ``lubricant`` and one
+                numeric column per parameter.
+
+        Returns:
+            One row per (component type, lubricant, parameter) and per
+            (lubricant, parameter) with a null component type, with the
+            sample count, median, MAD, percentiles and warning band.
+        """
+        value = pl.col("value")
+        statistics = [
+            value.len().alias("sample_count"),
+            value.median().alias("median"),
+            (value - value.median()).abs().median().alias("mad"),
+            value.quantile(0.05, "linear").alias("p05"),
+            value.quantile(0.95, "linear").alias("p95"),
+        ]
+        # Missing values were historically loaded as 0
+        samples = (
+            df.lazy()
+            .with_columns(lubricant_key_expr())
+            .filter(pl.col(LUBRICANT_COLUMN) != "")
+            .unpivot(
+                index=[TYPE_COLUMN, LUBRICANT_COLUMN],
+                on=self.parameters,
+                variable_name="parameter",
+                value_name="value",
+            )
+            .with_columns(value.cast(pl.Float64))
+            .filter(value > 0)
+        )
+        by_type = (
+            samples.filter(pl.col(TYPE_COLUMN).is_not_null())
+            .group_by(TYPE_COLUMN, LUBRICANT_COLUMN, "parameter")
+            .agg(statistics)
+        )
+        fleet = (
+            samples.group_by(LUBRICANT_COLUMN, "parameter")
+            .agg(statistics)
+            .with_columns(pl.lit(None, dtype=pl.Int64).alias(TYPE_COLUMN))
+        )
+        spread = pl.max_horizontal(
+            pl.col("mad") * MAD_SCALE,
+            pl.col("median") * MIN_RELATIVE_SPREAD,
+        )
+        return (
+            pl.concat(
+                [
+                    by_type.with_columns(pl.col(TYPE_COLUMN).cast(pl.Int64)),
+                    fleet.select(by_type.collect_schema().names()),
+                ]
+            )
+            .filter(pl.col("sample_count") >= self.min_samples)
+            .with_columns(
+                (pl.col("median") - self.band_width * spread)
+                .clip(lower_bound=0)
+                .alias("warning_low"),
+                (pl.col("median") + self.band_width * spread).alias(
+                    "warning_high"
+                ),
+            )
+            .sort(LUBRICANT_COLUMN, TYPE_COLUMN, "parameter", nulls_last=True)
+            .collect()
+        )
+
+    def load(self, lubricants: Optional[Iterable[str]] = None) -> pl.DataFrame:
+        """
+        Read the analyses of ``lubricants`` (default: every analysis).
+
+        Args:
+            lubricants: Normalized lubricant grades to read.
+
+        Returns:
+            Frame with ``component_type_id``, ``lubricant`` and the
+            parameter columns.
+        """
+        queryset = models.LabAnalysis.objects.order_by("pk")
+        if lubricants is not None:
+            lubricants = list(lubricants)
+            # SQL cannot collapse inner whitespace: match the grades with
+            # all of it removed, then keep the exact keys in polars
+            compact = Upper("report__lubricant")
+            for whitespace in WHITESPACE:
+                compact = Replace(compact, Value(whitespace), Value(""))
+            queryset = queryset.annotate(lubricant_compact=compact).filter(
+                lubricant_compact__in={
+                    "".join(lubricant.split()) for lubricant in lubricants
+                }
+            )
+
+        schema = {
+            TYPE_COLUMN: pl.Int64,
+            LUBRICANT_COLUMN: pl.Utf8,
+            **{parameter: pl.Float64 for parameter in self.parameters},
+        }
+        frames = []
+        last_pk = 0
+        while True:
+            rows = list(
+                queryset.filter(pk__gt=last_pk).values_list(
+                    "pk",
+                    "report__component__type_id",
+                    "report__lubricant",
+                    *self.parameters,
+                )[: self.batch_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+            frames.append(
+                pl.DataFrame(
+                    [row[1:] for row in rows], schema=schema, orient="row"
+                )
+            )
+        df = pl.concat(frames) if frames else pl.DataFrame(schema=schema)
+        if lubricants is not None:
+            df = df.filter(lubricant_key_expr().is_in(lubricants))
+        return df
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        Recompute every baseline from the whole analysis history.
+
+        Returns:
+            Dictionary with the ``analyses`` read and ``baselines`` stored.
+        """
+        df = self.load()
+        baselines = self.compute(df)
+        with transaction.atomic():
+            models.LubricantBaseline.objects.all().delete()
+            stored = self._store(baselines)
+        invalidate_threshold_profiles()
+
+        logger.info(
+            f"Rebuilt {stored} lubricant baselines from {len(df)} analyses"
+        )
+        return {"analyses": len(df), "baselines": stored}
+
+    def refresh(self, lubricants: Iterable[str]) -> Dict[str, int]:
+        """
+        Recompute the baselines of the lubricants of new analyses.
+
+        Medians are not decomposable, so every baseline of an affected
+        lubricant is recomputed from its history; the analyses of the
+        other lubricants are not read.
+
+        Args:
+            lubricants: Lubricants of the new reports (any spelling).
+
+        Returns:
+            Dictionary with the ``analyses`` read and ``baselines`` stored.
+        """
+        normalize = models.ThresholdProfile.normalize_lubricant
+        lubricants = sorted(
+            {normalize(lubricant) for lubricant in lubricants} - {""}
+        )
+        if not lubricants:
+            return {"analyses": 0, "baselines": 0}
+
+        df = self.load(lubricants)
+        baselines = self.compute(df)
+        with transaction.atomic():
+            models.LubricantBaseline.objects.filter(
+                lubricant__in=lubricants
+            ).delete()
+            stored = self._store(baselines)
+        invalidate_threshold_profiles()
+
+        logger.info(
+            f"Refreshed {stored} lubricant baselines of "
+            f"{len(lubricants)} lubricants from {len(df)} analyses"
+        )
+        return {"analyses": len(df), "baselines": stored}
+
+    def _store(self, baselines: pl.DataFrame) -> int:
+        """Bulk create LubricantBaseline rows from computed baselines."""
+        objects = [
+            models.LubricantBaseline(**row)
+            for row in baselines.iter_rows(named=True)
+        ]
+        models.LubricantBaseline.objects.bulk_create(objects, batch_size=1000)
+        return len(objects)
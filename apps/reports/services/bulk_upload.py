@@ -1,16 +1,28 @@
 """Service for bulk upload of inspection reports using polars."""
 
+import csv
+import io
+import itertools
 import logging
-from datetime import datetime
+import os
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+import fastexcel
 import polars as pl
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils.dateparse import parse_date
 
+from apps.core.cache import component_tag, org_tag, tiered_cache
 from apps.equipment import models as equipment_models
-from apps.reports import choices, models
+from apps.reports import choices, models, tasks
+from apps.reports.services import (
+    condition_classifier,
+    data_quality,
+    latest_state,
+    sheet_schema,
+)
 from apps.users import models as users_models
 
 logger = logging.getLogger(__name__)
@@ -20,84 +32,34 @@ class ReportBulkUploadService:
     """
     Service for processing bulk upload of inspection reports.
 
-    Uses polars for high-performance Excel processing and bulk_create()
-    for optimal batch performance. Handles entity resolution, data parsing,
-    and creation of Report and LabAnalysis records.
+    Uses polars for high-performance Excel and CSV processing and
+    bulk_create() for optimal batch performance. Handles entity resolution,
+    data parsing, and creation of Report and LabAnalysis records.
     """
 
-    # Column indices for Report fields (from CSV structure)
-    REPORT_COLUMN_INDICES = {
-        "row_number": 0,  # N°
-        "lab_number": 1,  # No. Lab
-        "organization_name": 2,  # Cliente
-        "machine_name": 3,  # Equipo
-        "component_name": 4,  # Componente
-        "serial_number_code": 5,  # Cód/Núm Serie
-        "lubricant": 6,  # Lubricante
-        "sample_date": 7,  # Fecha Muestra
-        "machine_hours_kms": 8,  # Equipo Horas/Kms
-        "lubricant_hours_kms": 9,  # Lubricante Horas/Kms
-        "reception_date": 10,  # Fecha de Recepción
-        "report_date": 11,  # Fecha de Reporte
-        "filter_change": 12,  # Cambio de Filtro
-        "oil_change": 13,  # Cambio de Aceite
-        "per_number": 14,  # No.Per
-        "others": 15,  # Otros
-        "condition": 16,  # Condición
-        "notes": 17,  # Comentario
-    }
-
-    # Column indices for LabAnalysis fields
-    LAB_ANALYSIS_COLUMN_INDICES = {
-        "water_crackle": 18,  # ITS 009/18 - Agua (Crackle test)
-        "water_distillation": 19,  # ASTM D 95-13 - Agua por destilación
-        "viscosity_40c": 20,  # ASTM D 7279-20 - Viscosidad a 40°C
-        "viscosity_100c": 21,  # ASTM D 7279-20 - Viscosidad a 100°C
-        "compatibility": 22,  # ILT-096 - COMPATIBILIDAD
-        "tbn": 23,  # ASTM D 2896-21 - Número Básico (TBN)
-        "tan": 24,  # ASTM D 664-24 - Número Acido (TAN)
-        "oxidation": 25,  # ASTM E 2412-23 - Oxidación
-        "soot": 26,  # ASTM E 2412-23 - Hollín
-        "nitration": 27,  # ASTM E 2412-23 - Nitración
-        "sulfation": 28,  # ASTM E 2412-23 - Sulfatación
-        "glycol": 29,  # ASTM E 2412-23 - Glicol
-        "fuel_dilution": 30,  # ASTM E 2412-23 - Dilución
-        "water_ftir": 31,  # ASTM E 2412-23 - Agua FTIR
-        "pq_index": 32,  # ITS 044/15 - PQ Index
-        "particle_count_iso": 33,  # ISO 4406:2021 - Conteo de Partículas
-        "iron_fe": 34,  # ASTM D 5185-18 - Hierro (Fe)
-        "chromium_cr": 35,  # ASTM D 5185-18 - Cromo (Cr)
-        "lead_pb": 36,  # ASTM D 5185-18 - Plomo (Pb)
-        "copper_cu": 37,  # ASTM D 5185-18 - Cobre (Cu)
-        "tin_sn": 38,  # ASTM D 5185-18 - Estaño (Sn)
-        "aluminum_al": 39,  # ASTM D 5185-18 - Aluminio (Al)
-        "nickel_ni": 40,  # ASTM D 5185-18 - Níquel (Ni)
-        "silver_ag": 41,  # ASTM D 5185-18 - Plata (Ag)
-        "silicon_si": 42,  # ASTM D 5185-18 - Silicio (Si)
-        "boron_b": 43,  # ASTM D 5185-18 - Boro (B)
-        "sodium_na": 44,  # ASTM D 5185-18 - Sodio (Na)
-        "magnesium_mg": 45,  # ASTM D 5185-18 - Magnesio (Mg)
-        "molybdenum_mo": 46,  # ASTM D 5185-18 - Molibdeno (Mo)
-        "titanium_ti": 47,  # ASTM D 5185-18 - Titanio (Ti)
-        "vanadium_v": 48,  # ASTM D 5185-18 - Vanadio (V)
-        "manganese_mn": 49,  # ASTM D 5185-18 - Manganeso (Mn)
-        "potassium_k": 50,  # ASTM D 5185-18 - Potasio (K)
-        "phosphorus_p": 51,  # ASTM D 5185-18 - Fósforo (P)
-        "zinc_zn": 52,  # ASTM D 5185-18 - Zinc (Zn)
-        "calcium_ca": 53,  # ASTM D 5185-18 - Calcio (Ca)
-        "barium_ba": 54,  # ASTM D 5185-18 - Bario (Ba)
-        "cadmium_cd": 55,  # ASTM D 5185-18 - Cadmio (Cd)
-        "visual_appearance": 56,  # Apariencia - Visual
-    }
-
-    def __init__(self, user):
+    # Sample date formats, tried in order (see _parse_date)
+    SAMPLE_DATE_FORMATS = list(sheet_schema.DATE_FORMATS)
+
+    def __init__(
+        self, user, schema: Optional[sheet_schema.SheetSchema] = None
+    ):
         """
         Initialize service with user context and entity caches.
 
         Args:
             user: User performing the upload.
+            schema: Sheet schema of the files (default: Intertek export).
         """
         self.user = user
+        self.schema = schema or sheet_schema.get_schema()
+        self.quality = data_quality.DataQualityService(self.schema)
+        self.classifier = condition_classifier.ConditionClassificationService()
+        self.latest_states = latest_state.ComponentLatestStateService()
+        # Column indices of the Report and LabAnalysis fields
+        self.report_column_indices = self.schema.indices(sheet_schema.REPORT)
+        self.lab_analysis_column_indices = self.schema.indices(
+            sheet_schema.ANALYSIS
+        )
         # Entity resolution caches
         self._org_cache: Dict[str, Optional[users_models.Organization]] = {}
         self._machine_cache: Dict[
@@ -109,15 +71,27 @@ class ReportBulkUploadService:
 
     def process_file(self, excel_file) -> Dict[str, Any]:
         """
-        Process Excel file and create reports with lab analysis using polars.
+        Process Excel or CSV file and create reports with lab analysis.
+
+        Columns are located by header through the sheet schema, so
+        reordered or extra columns are handled. CSV files (``.csv``) are
+        scanned lazily, which is several times faster than decoding the
+        same data as XLSX.
 
         Args:
-            excel_file: Uploaded Excel file (file-like object or path).
+            excel_file: Uploaded Excel or CSV file (file-like object or path).
 
         Returns:
             Dict with processing results: created, updated, errors, skipped.
         """
-        results = {"created": 0, "updated": 0, "errors": [], "skipped": 0}
+        results = {
+            "created": 0,
+            "updated": 0,
+            "errors": [],
+            "skipped": 0,
+            "quarantined": 0,
+            "created_pks": [],
+        }
         user_email = self.user.email
 
         logger.debug(
@@ -126,27 +100,33 @@ class ReportBulkUploadService:
         )
 
         try:
-            # Load Excel with polars
-            df = pl.read_excel(excel_file)
-
-            # Skip title row only (row 0), header filtering done later
-            df = df.slice(1)
-
-            # Select only the first 57 columns (0-56) to exclude blank columns
-            if df.width > 57:
-                df = df.select(df.columns[:57])
-                logger.debug(
-                    "Selected first 57 columns, excluded blank columns"
+            file_name = str(getattr(excel_file, "name", excel_file))
+            if file_name.lower().endswith(".csv"):
+                source = (
+                    excel_file.read()
+                    if hasattr(excel_file, "read")
+                    else excel_file
+                )
+                df = self.scan_csv(source).collect()
+            else:
+                source = (
+                    excel_file.read()
+                    if hasattr(excel_file, "read")
+                    else str(excel_file)
                 )
+                df = self.read_excel(source)
 
             # Process DataFrame
-            results = self.process_dataframe(df)
+            results = self.process_dataframe(
+                df, source=os.path.basename(file_name)
+            )
 
             logger.info(
                 f"Finished processing Excel file - User: {user_email}, "
                 f"File: {getattr(excel_file, 'name', str(excel_file))}, "
                 f"Created: {results['created']}, "
                 f"Skipped: {results['skipped']}, "
+                f"Quarantined: {results['quarantined']}, "
                 f"Errors: {len(results['errors'])}"
             )
 
@@ -160,17 +140,158 @@ class ReportBulkUploadService:
 
         return results
 
-    def process_dataframe(self, df: pl.DataFrame) -> Dict[str, Any]:
+    def read_excel(self, source: Any) -> pl.DataFrame:
+        """
+        Read an Excel export through the sheet schema.
+
+        The first rows are previewed to locate the header; only the
+        schema columns are then decoded, as text, starting below it, and
+        title rows are filtered out as in scan_csv.
+
+        Args:
+            source: Excel path or content.
+
+        Returns:
+            DataFrame with the canonical ``column_N`` columns.
+
+        Raises:
+            ValidationError: If a required column is missing.
+        """
+        reader = fastexcel.read_excel(source)
+        preview = reader.load_sheet(
+            0,
+            header_row=None,
+            n_rows=self.schema.header_search_rows,
+            dtypes="string",
+        ).to_polars()
+        layout = self._detect_layout(preview.rows())
+        if not layout.used_columns:
+            return pl.DataFrame(
+                schema={spec.column: pl.Utf8 for spec in self.schema.columns}
+            )
+
+        df = reader.load_sheet(
+            0,
+            header_row=None,
+            skip_rows=layout.data_start,
+            use_columns=layout.used_columns,
+            dtypes="string",
+        ).to_polars()
+        names = dict(zip(layout.used_columns, df.columns))
+        df = df.select(self.schema.select_exprs(layout, names))
+        return self._filter_header_rows(df)
+
+    def scan_csv(
+        self, source: Any, watermark: Optional[date] = None
+    ) -> pl.LazyFrame:
+        """
+        Lazily scan a CSV export.
+
+        The header is located through the sheet schema and every column
+        is read as text (no schema inference) under the ``column_N`` names
+        used by process_dataframe; columns outside the schema are
+        projected away before parsing. Title rows and, with
+        ``watermark``, rows sampled on or before it are filtered before
+        anything is materialized.
+
+        Args:
+            source: CSV path or content.
+            watermark: Only keep rows with a later sample date.
+
+        Returns:
+            LazyFrame with the canonical ``column_N`` columns.
+
+        Raises:
+            ValidationError: If a required column is missing.
+        """
+        layout = self._detect_layout(self._preview_csv(source))
+
+        options = {
+            "has_header": False,
+            "infer_schema_length": 0,
+            "truncate_ragged_lines": True,
+            "encoding": "utf8-lossy",
+        }
+        # No type inference: every column is text, parsed per field later
+        lf = pl.scan_csv(source, skip_rows=layout.data_start, **options)
+        # Projection pushdown: columns outside the schema are never parsed
+        lf = lf.select(
+            [
+                (
+                    pl.nth(layout.sources[spec.position])
+                    if spec.position in layout.sources
+                    else pl.lit(None, dtype=pl.Utf8)
+                ).alias(spec.column)
+                for spec in self.schema.columns
+            ]
+        )
+        lf = self._filter_header_rows(lf)
+
+        if watermark:
+            lf = lf.filter(self.sample_date_expr() > watermark)
+
+        return lf
+
+    def _preview_csv(self, source: Any) -> List[List[str]]:
+        """Return the first rows of a CSV file, before any type handling."""
+        limit = self.schema.header_search_rows
+        if isinstance(source, bytes):
+            stream = io.TextIOWrapper(
+                io.BytesIO(source), encoding="utf-8", errors="replace"
+            )
+            return list(itertools.islice(csv.reader(stream), limit))
+        with open(source, newline="", encoding="utf-8", errors="replace") as f:
+            return list(itertools.islice(csv.reader(f), limit))
+
+    def _detect_layout(self, rows: List[Tuple]) -> sheet_schema.SheetLayout:
+        """
+        Locate the schema columns in the first rows of a file.
+
+        Raises:
+            ValidationError: If a required column is missing.
+        """
+        layout = self.schema.detect_layout(rows)
+        missing = self.schema.missing_required(layout)
+        if missing:
+            raise ValidationError(
+                f"Required columns not found in header: {', '.join(missing)}"
+            )
+        return layout
+
+    @classmethod
+    def sample_date_expr(cls) -> pl.Expr:
+        """Return a vectorized parse of the sample date text column."""
+        return sheet_schema.date_expr("column_7")
+
+    def process_dataframe(
+        self,
+        df: pl.DataFrame,
+        check_quality: bool = True,
+        source: str = "",
+    ) -> Dict[str, Any]:
         """
         Process polars DataFrame directly (for ETL use).
 
+        Rows failing the data quality checks are stored as QuarantinedRow
+        records instead of being loaded.
+
         Args:
             df: Polars DataFrame with report data (already sliced to skip headers).
+            check_quality: Run the data quality checks.
+            source: File name recorded on quarantined rows.
 
         Returns:
-            Dict with processing results: created, updated, errors, skipped.
+            Dict with processing results: created, updated, errors, skipped,
+            quarantined, and the pks of the reports created (created_pks).
         """
-        results = {"created": 0, "updated": 0, "errors": [], "skipped": 0}
+        results = {
+            "created": 0,
+            "updated": 0,
+            "errors": [],
+            "skipped": 0,
+            "quarantined": 0,
+            "created_pks": [],
+        }
 
         # Filter out empty rows
         df = df.filter(pl.any_horizontal(pl.all().is_not_null()))
@@ -182,7 +303,9 @@ class ReportBulkUploadService:
             return results
 
         # Rename columns to column_0, column_1, etc. for easier access
-        df = df.rename({col: f"column_{i}" for i, col in enumerate(df.columns)})
+        df = df.rename(
+            {col: f"column_{i}" for i, col in enumerate(df.columns)}
+        )
 
         # Filter out title/header rows
         df = self._filter_header_rows(df)
@@ -208,6 +331,17 @@ class ReportBulkUploadService:
             logger.info("All records are duplicates, nothing to create")
             return results
 
+        if check_quality:
+            df = df.with_row_index(data_quality.ROW_COLUMN, offset=3)
+            df, flagged = self.quality.check(df)
+            quarantined = self.quality.quarantine(flagged, self.user, source)
+            results["quarantined"] = len(quarantined)
+            df = df.drop(data_quality.ROW_COLUMN)
+
+            if len(df) == 0:
+                logger.info("All records were quarantined, nothing to create")
+                return results
+
         # Process all rows and collect data
         report_data_list = []
         lab_analysis_data_list = []
@@ -272,6 +406,23 @@ class ReportBulkUploadService:
                     f"Unexpected error processing row {row_num}: {e}"
                 )
 
+        # Classify against the analysis thresholds, all rows at once
+        classified = self.classifier.classify_records(
+            lab_analysis_data_list,
+            profiles=[
+                (
+                    data["component"].type_id if data["component"] else None,
+                    data["lubricant"],
+                )
+                for data in report_data_list
+            ],
+        )
+        for report_data, (condition, breached) in zip(
+            report_data_list, classified
+        ):
+            report_data["computed_condition"] = condition
+            report_data["breached_parameters"] = breached
+
         # Bulk create reports and lab analyses
         if report_data_list:
             try:
@@ -282,11 +433,19 @@ class ReportBulkUploadService:
                     self._bulk_create_lab_analyses(
                         created_reports, lab_analysis_data_list
                     )
+                    self.latest_states.refresh(
+                        report.component_id for report in created_reports
+                    )
                     results["created"] = len(created_reports)
+                    results["created_pks"] = [
+                        report.pk for report in created_reports
+                    ]
 
                 logger.info(
                     f"Bulk created {len(created_reports)} reports with analyses"
                 )
+                self._invalidate_caches(created_reports)
+                self._schedule_ingest_refresh(created_reports)
 
             except Exception as e:
                 logger.exception(f"Error during bulk creation: {e}")
@@ -299,15 +458,47 @@ class ReportBulkUploadService:
                     }
                 )
                 results["created"] = 0
+                results["created_pks"] = []
 
         return results
 
+    def _invalidate_caches(self, reports: List[models.Report]) -> None:
+        """Invalidate cached dashboard data of the affected entities."""
+        tags = set()
+        for report in reports:
+            if report.organization_id:
+                tags.add(org_tag(report.organization_id))
+            if report.component_id:
+                tags.add(component_tag(report.component_id))
+        tiered_cache.invalidate_tags(*tags)
+
+    def _schedule_ingest_refresh(self, reports: List[models.Report]) -> None:
+        """
+        Refresh the data derived from the new reports after commit.
+
+        One task fans out to the lubricant baselines, wear forecasts and
+        similarity vectors of the reports' lubricants and components.
+        """
+        lubricants = sorted(
+            {report.lubricant for report in reports if report.lubricant}
+        )
+        component_ids = sorted(
+            {report.component_id for report in reports if report.component_id}
+        )
+        if lubricants or component_ids:
+            transaction.on_commit(
+                lambda: tasks.refresh_ingested_task.delay(
+                    lubricants, component_ids
+                ),
+                robust=True,
+            )
+
     def _filter_header_rows(self, df: pl.DataFrame) -> pl.DataFrame:
         """
         Filter out title and header rows from DataFrame.
 
         Args:
-            df: Input DataFrame.
+            df: Input DataFrame (or LazyFrame).
 
         Returns:
             Filtered DataFrame without header rows.
@@ -328,9 +519,9 @@ class ReportBulkUploadService:
         for pattern in title_patterns:
             df = df.filter(
                 ~pl.col("column_0")
-                .cast(pl.Utf8)
                 .str.to_uppercase()
                 .str.contains(pattern)
+                .fill_null(False)
             )
 
         return df
@@ -345,13 +536,7 @@ class ReportBulkUploadService:
         Returns:
             List of lab numbers.
         """
-        lab_numbers = (
-            df.select("column_1")
-            .to_series()
-            .cast(pl.Utf8)
-            .drop_nulls()
-            .to_list()
-        )
+        lab_numbers = df.select("column_1").to_series().drop_nulls().to_list()
         return [ln for ln in lab_numbers if ln and str(ln).strip()]
 
     def _get_existing_lab_numbers(self, lab_numbers: List[str]) -> Set[str]:
@@ -362,7 +547,7 @@ class ReportBulkUploadService:
             lab_numbers: List of lab numbers to check.
 
         Returns:
-            Set of existing lab numbers.
+            Set of lab numbers already loaded or awaiting review.
         """
         if not lab_numbers:
             return set()
@@ -370,8 +555,13 @@ class ReportBulkUploadService:
         existing = models.Report.objects.filter(
             lab_number__in=lab_numbers
         ).values_list("lab_number", flat=True)
+        # Rows awaiting review are not quarantined again on re-upload
+        pending = models.QuarantinedRow.objects.filter(
+            lab_number__in=lab_numbers,
+            status=choices.QuarantineStatus.PENDING,
+        ).values_list("lab_number", flat=True)
 
-        return set(existing)
+        return set(existing) | set(pending)
 
     def _extract_row_data(
         self, row: Dict[str, Any], row_num: int
@@ -386,7 +576,7 @@ class ReportBulkUploadService:
         Returns:
             Tuple of (report_data, lab_analysis_data).
         """
-        indices = self.REPORT_COLUMN_INDICES
+        indices = self.report_column_indices
 
         # Extract machine name to determine transport type
         machine_name = self._safe_get_value(row, indices["machine_name"])
@@ -437,7 +627,9 @@ class ReportBulkUploadService:
             "report_date": self._parse_date(
                 self._safe_get_value(row, indices["report_date"])
             ),
-            "filter_change": self._safe_get_value(row, indices["filter_change"])
+            "filter_change": self._safe_get_value(
+                row, indices["filter_change"]
+            )
             or "",
             "oil_change": self._safe_get_value(row, indices["oil_change"])
             or "",
@@ -454,7 +646,9 @@ class ReportBulkUploadService:
 
         return report_data, lab_analysis_data
 
-    def _extract_lab_analysis_data(self, row: Dict[str, Any]) -> Dict[str, Any]:
+    def _extract_lab_analysis_data(
+        self, row: Dict[str, Any]
+    ) -> Dict[str, Any]:
         """
         Extract LabAnalysis data from DataFrame row.
 
@@ -464,40 +658,21 @@ class ReportBulkUploadService:
         Returns:
             Dictionary with lab analysis data.
         """
-        indices = self.LAB_ANALYSIS_COLUMN_INDICES
+        indices = self.lab_analysis_column_indices
         data = {}
 
         for field_name, col_index in indices.items():
             raw_value = self._safe_get_value(row, col_index)
 
-            # Parse based on field type
-            if field_name in [
-                "water_crackle",
-                "compatibility",
-                "particle_count_iso",
-                "visual_appearance",
-            ]:
-                # String fields
-                data[field_name] = str(raw_value) if raw_value else ""
-            elif field_name in [
-                "water_distillation",
-                "viscosity_40c",
-                "viscosity_100c",
-                "tbn",
-                "tan",
-                "oxidation",
-                "soot",
-                "nitration",
-                "sulfation",
-                "glycol",
-                "fuel_dilution",
-                "water_ftir",
-            ]:
-                # Decimal fields
+            # Parse based on the schema column type
+            dtype = self.schema.spec(field_name).dtype
+            if dtype == sheet_schema.DECIMAL:
                 data[field_name] = self._parse_decimal(raw_value)
-            else:
-                # Integer fields (metals, particles, etc.)
+            elif dtype == sheet_schema.INTEGER:
+                # Metals, particles, etc.
                 data[field_name] = self._parse_integer(raw_value)
+            else:
+                data[field_name] = str(raw_value) if raw_value else ""
 
         return data
 
@@ -549,6 +724,8 @@ class ReportBulkUploadService:
                 oil_change=report_data["oil_change"],
                 others=report_data["others"],
                 condition=report_data["condition"],
+                computed_condition=report_data.get("computed_condition", ""),
+                breached_parameters=report_data.get("breached_parameters", []),
                 notes=report_data["notes"],
                 is_active=True,
                 created_by=self.user,
@@ -822,6 +999,7 @@ class ReportBulkUploadService:
             "%d-%m-%Y",  # 18-12-2025
             "%Y-%m-%d",  # 2025-12-18 (ISO format)
             "%m/%d/%Y",  # 12/18/2025 (US format)
+            "%Y-%m-%d %H:%M:%S",  # 2025-12-18 00:00:00 (Excel date cell)
         ]
 
         for date_format in date_formats:
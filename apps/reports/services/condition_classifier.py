@@ -0,0 +1,562 @@
+"""
+Condition classification of lab analyses from the analysis thresholds.
+
+Evaluates the thresholds (wear metals, contamination, oil health and
+additives) resolved for each report's component type and lubricant over
+whole batches of analyses with polars expressions, and stores the
+resulting severity and breached parameters on the reports, independently
+of the condition label written by the lab.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import polars as pl
+from django.db.models import QuerySet
+
+from apps.reports import choices, models
+from apps.reports.services import latest_state
+from apps.reports.services import thresholds as threshold_profiles
+
+logger = logging.getLogger(__name__)
+
+# Severity levels, ordered
+LEVELS = (
+    choices.ReportCondition.NORMAL,
+    choices.ReportCondition.CAUTION,
+    choices.ReportCondition.CRITICAL,
+)
+
+# Optional columns selecting the threshold profile of each row
+TYPE_COLUMN = "component_type_id"
+LUBRICANT_COLUMN = "lubricant"
+PROFILE_COLUMN = "_profile"
+
+
+@dataclass(frozen=True)
+class ParameterLimit:
+    """
+    Limits of one analysis parameter.
+
+    Attributes:
+        parameter: LabAnalysis field.
+        group: Threshold group (wear_metals, additives, ...).
+        warning: Caution limit (None: no one-sided limit).
+        critical: Critical limit (None: no one-sided limit).
+        unit: Display unit.
+        warning_low: Caution below this value (two-sided parameters).
+        warning_high: Caution above this value (two-sided parameters).
+    """
+
+    parameter: str
+    group: str
+    warning: Optional[float]
+    critical: Optional[float]
+    unit: str = ""
+    warning_low: Optional[float] = None
+    warning_high: Optional[float] = None
+
+    @property
+    def lower_is_worse(self) -> bool:
+        """Return whether low values are the problem (additives)."""
+        return (
+            self.critical is not None
+            and self.warning is not None
+            and self.critical < self.warning
+        )
+
+
+@dataclass(frozen=True)
+class ParameterRule:
+    """
+    Limits of one analysis parameter across the profiles of a batch.
+
+    Attributes:
+        parameter: LabAnalysis field.
+        group: Threshold group (wear_metals, additives, ...).
+        limits: Limits of each profile, indexed by the ``_profile`` column
+            (None: the parameter is not checked for that profile).
+    """
+
+    parameter: str
+    group: str
+    limits: Tuple[Optional[ParameterLimit], ...]
+
+    def bound(self, name: str) -> pl.Expr:
+        """Return the ``name`` limit (warning, critical, ...) of each row."""
+        values = [getattr(limit, name, None) for limit in self.limits]
+        values = [None if value is None else float(value) for value in values]
+        if len(set(values)) == 1:
+            return pl.lit(values[0], dtype=pl.Float64)
+        return pl.col(PROFILE_COLUMN).replace_strict(
+            list(range(len(values))), values, return_dtype=pl.Float64
+        )
+
+    def _has(self, name: str) -> bool:
+        """Return whether any profile sets the ``name`` limit."""
+        return any(
+            limit is not None and getattr(limit, name) is not None
+            for limit in self.limits
+        )
+
+    def _conditions(self) -> Tuple[pl.Expr, pl.Expr, pl.Expr, pl.Expr]:
+        """Return the critical, warning, below and above range conditions."""
+        value = pl.col(self.parameter)
+        # Missing additives and viscosities were historically loaded as 0
+        positive = pl.when(value > 0).then(value)
+        never = pl.lit(False)
+
+        critical = warning = never
+        if self._has("critical"):
+            bounds = self.bound("critical"), self.bound("warning")
+            directions = {
+                limit.lower_is_worse
+                for limit in self.limits
+                if limit is not None and limit.critical is not None
+            }
+            if directions == {True}:
+                critical, warning = (positive <= bound for bound in bounds)
+            elif directions == {False}:
+                critical, warning = (value >= bound for bound in bounds)
+            else:
+                lower_is_worse = bounds[0] < bounds[1]
+                critical, warning = (
+                    pl.when(lower_is_worse)
+                    .then(positive <= bound)
+                    .otherwise(value >= bound)
+                    for bound in bounds
+                )
+        below = (
+            positive < self.bound("warning_low")
+            if self._has("warning_low")
+            else never
+        )
+        above = (
+            positive > self.bound("warning_high")
+            if self._has("warning_high")
+            else never
+        )
+        return critical, warning, below, above
+
+    def level_expr(self) -> pl.Expr:
+        """Return the severity level (0-2) of the parameter column."""
+        critical, warning, below, above = self._conditions()
+        return (
+            pl.when(critical)
+            .then(pl.lit(2, dtype=pl.Int8))
+            .when(warning | below | above)
+            .then(pl.lit(1, dtype=pl.Int8))
+            .otherwise(pl.lit(0, dtype=pl.Int8))
+        )
+
+    def limit_expr(self, level: pl.Expr) -> pl.Expr:
+        """Return the limit breached at ``level`` (for breached rows)."""
+        _, warning, below, _ = self._conditions()
+        return (
+            pl.when(level == 2)
+            .then(self.bound("critical"))
+            .when(warning)
+            .then(self.bound("warning"))
+            .when(below)
+            .then(self.bound("warning_low"))
+            .otherwise(self.bound("warning_high"))
+        )
+
+
+def rules_from_limits(
+    profiles: List[List[ParameterLimit]],
+) -> List[ParameterRule]:
+    """Combine the limits of several profiles into per-parameter rules."""
+    by_parameter: Dict[str, List[Optional[ParameterLimit]]] = {}
+    for index, limits in enumerate(profiles):
+        for limit in limits:
+            by_parameter.setdefault(limit.parameter, [None] * len(profiles))[
+                index
+            ] = limit
+    return [
+        ParameterRule(
+            parameter,
+            next(limit.group for limit in limits if limit),
+            tuple(limits),
+        )
+        for parameter, limits in by_parameter.items()
+    ]
+
+
+def limits_from_thresholds(
+    thresholds: Mapping[str, Mapping[str, Mapping[str, Any]]],
+) -> List[ParameterLimit]:
+    """
+    Flatten threshold groups into limits.
+
+    Parameters listed in several groups keep their first group, and
+    parameters without warning/critical values or an acceptable range
+    are skipped.
+    """
+    limits: Dict[str, ParameterLimit] = {}
+    for group, parameters in thresholds.items():
+        for parameter, limit in parameters.items():
+            warning, critical = limit.get("warning"), limit.get("critical")
+            low, high = limit.get("warning_low"), limit.get("warning_high")
+            one_sided = warning is not None and critical is not None
+            if parameter in limits or not (
+                one_sided or low is not None or high is not None
+            ):
+                continue
+            limits[parameter] = ParameterLimit(
+                parameter,
+                group,
+                warning if one_sided else None,
+                critical if one_sided else None,
+                limit.get("unit", ""),
+                low,
+                high,
+            )
+    return list(limits.values())
+
+
+class ConditionClassificationService:
+    """
+    Vectorized severity classification of lab analyses.
+
+    Attributes:
+        thresholds: Threshold groups applied to every analysis, or None
+            to use the profile of each analysis' component type and
+            lubricant (see ``apps.reports.services.thresholds``).
+        batch_size: Reports per chunk when classifying querysets.
+    """
+
+    def __init__(
+        self,
+        thresholds: Optional[Mapping[str, Any]] = None,
+        batch_size: int = 5000,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            thresholds: Fixed threshold groups (default: threshold profiles).
+            batch_size: Reports per chunk when classifying querysets.
+        """
+        self.thresholds = thresholds
+        self.batch_size = batch_size
+        self._fixed_limits = (
+            limits_from_thresholds(thresholds) if thresholds else None
+        )
+
+    @property
+    def parameters(self) -> List[str]:
+        """Return the LabAnalysis fields the classification reads."""
+        if self._fixed_limits is not None:
+            return [limit.parameter for limit in self._fixed_limits]
+        return threshold_profiles.compiled_thresholds().parameters
+
+    def limits_for(
+        self, component_type_id: Optional[int] = None, lubricant: str = ""
+    ) -> List[ParameterLimit]:
+        """Return the limits of a component type and lubricant."""
+        if self._fixed_limits is not None:
+            return self._fixed_limits
+        return limits_from_thresholds(
+            threshold_profiles.thresholds_for(component_type_id, lubricant)
+        )
+
+    def classify(self, df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Add ``computed_condition`` and ``breached_parameters`` columns.
+
+        When ``df`` has ``component_type_id`` and ``lubricant`` columns,
+        each row is judged against the thresholds of its profile; the
+        profile limits are looked up per row inside the same vectorized
+        pass.
+
+        Args:
+            df: Frame with one numeric column per parameter.
+
+        Returns:
+            ``df`` with the condition (ReportCondition value) and the list
+            of breached parameters of each row.
+        """
+        columns = [TYPE_COLUMN, LUBRICANT_COLUMN]
+        if self._fixed_limits is not None or not set(columns) <= set(
+            df.columns
+        ):
+            return self._classify(df, rules_from_limits([self.limits_for()]))
+
+        compiled = threshold_profiles.compiled_thresholds()
+        pairs = df.select(columns).unique()
+        keys = [compiled.match(*pair) for pair in pairs.iter_rows()]
+        profiles = list(dict.fromkeys(keys))
+        rules = rules_from_limits(
+            [
+                limits_from_thresholds(compiled.resolve_key(key))
+                for key in profiles
+            ]
+        )
+        if len(profiles) == 1:
+            return self._classify(df, rules)
+
+        frame = df.join(
+            pairs.with_columns(
+                pl.Series(
+                    PROFILE_COLUMN,
+                    [profiles.index(key) for key in keys],
+                    dtype=pl.UInt32,
+                )
+            ),
+            on=columns,
+            how="left",
+            nulls_equal=True,
+            maintain_order="left",
+        )
+        return self._classify(frame, rules).drop(PROFILE_COLUMN)
+
+    def _classify(
+        self, df: pl.DataFrame, rules: List[ParameterRule]
+    ) -> pl.DataFrame:
+        """Classify every row of ``df`` with ``rules``."""
+        parameters = [rule.parameter for rule in rules]
+        level_columns = [f"_level_{p}" for p in parameters]
+        frame = (
+            df.with_columns(pl.col(p).cast(pl.Float64) for p in parameters)
+            .with_columns(
+                rule.level_expr().alias(f"_level_{rule.parameter}")
+                for rule in rules
+            )
+            .with_columns(
+                pl.max_horizontal(level_columns)
+                .fill_null(0)
+                .alias("_severity"),
+            )
+            .with_row_index("_row")
+        )
+        breached = self._breached_parameters(
+            frame.filter(pl.col("_severity") > 0), rules
+        )
+        return (
+            frame.join(breached, on="_row", how="left", maintain_order="left")
+            .with_columns(
+                pl.col("_severity")
+                .replace_strict([0, 1, 2], [str(level) for level in LEVELS])
+                .alias("computed_condition"),
+                pl.col("breached_parameters").fill_null(
+                    pl.lit([], dtype=breached.schema["breached_parameters"])
+                ),
+            )
+            .drop("_row", "_severity", *level_columns)
+        )
+
+    def _breached_parameters(
+        self, flagged: pl.DataFrame, rules: List[ParameterRule]
+    ) -> pl.DataFrame:
+        """
+        Return the breached parameters of flagged rows.
+
+        Works in long format (one row per row/parameter pair), so only
+        actual breaches are materialized.
+
+        Args:
+            flagged: Rows with ``_row``, parameter and ``_level_*`` columns.
+            rules: Rules the rows were classified with.
+
+        Returns:
+            Frame with ``_row`` and the ``breached_parameters`` list.
+        """
+        parameters = [rule.parameter for rule in rules]
+        level_columns = [f"_level_{p}" for p in parameters]
+        limit_columns = [f"_limit_{p}" for p in parameters]
+        flagged = flagged.with_columns(
+            rule.limit_expr(pl.col(f"_level_{rule.parameter}")).alias(
+                f"_limit_{rule.parameter}"
+            )
+            for rule in rules
+        )
+        # The unpivots list the parameters in the same order
+        long = flagged.unpivot(
+            index="_row",
+            on=level_columns,
+            variable_name="parameter",
+            value_name="level",
+        ).with_columns(
+            flagged.unpivot(on=parameters, value_name="value")["value"],
+            flagged.unpivot(on=limit_columns, value_name="limit")["limit"],
+        )
+
+        def mapped(values: List[Any]) -> pl.Expr:
+            return pl.col("parameter").replace_strict(level_columns, values)
+
+        return (
+            long.filter(pl.col("level") > 0)
+            .select(
+                "_row",
+                pl.struct(
+                    mapped(parameters).alias("parameter"),
+                    mapped([rule.group for rule in rules]).alias("group"),
+                    pl.col("value"),
+                    pl.col("limit"),
+                    pl.col("level")
+                    .replace_strict(
+                        [1, 2], [str(level) for level in LEVELS[1:]]
+                    )
+                    .alias("level"),
+                ).alias("breached_parameter"),
+            )
+            .group_by("_row")
+            .agg(pl.col("breached_parameter").alias("breached_parameters"))
+        )
+
+    def classify_records(
+        self,
+        records: List[Mapping[str, Any]],
+        profiles: Optional[List[Tuple[Optional[int], str]]] = None,
+    ) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Classify lab analysis dictionaries (as built at ingest).
+
+        Args:
+            records: Lab analysis values by field.
+            profiles: ``(component_type_id, lubricant)`` of each record.
+
+        Returns:
+            One ``(computed_condition, breached_parameters)`` per record.
+        """
+        if not records:
+            return []
+        parameters = self.parameters
+        df = pl.DataFrame(
+            {
+                parameter: [record.get(parameter) for record in records]
+                for parameter in parameters
+            },
+            schema={parameter: pl.Float64 for parameter in parameters},
+        )
+        if profiles is not None:
+            type_ids, lubricants = zip(*profiles)
+            df = df.with_columns(
+                pl.Series(TYPE_COLUMN, type_ids, dtype=pl.Int64),
+                pl.Series(LUBRICANT_COLUMN, lubricants, dtype=pl.Utf8),
+            )
+        result = self.classify(df)
+        return list(
+            zip(
+                result["computed_condition"].to_list(),
+                result["breached_parameters"].to_list(),
+            )
+        )
+
+    def classify_reports(
+        self,
+        queryset: QuerySet,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, int]:
+        """
+        Recompute the condition of every report in ``queryset``.
+
+        Reports are processed in primary key chunks; each chunk is read
+        with one query, classified in a single vectorized pass and only
+        the reports whose result changed are written, along with the
+        latest state of their components.
+
+        Args:
+            queryset: Reports to classify.
+            progress: Optional callback receiving (processed, total).
+
+        Returns:
+            Dictionary with ``processed`` and ``updated`` counts.
+        """
+        queryset = queryset.filter(analysis__isnull=False).order_by("pk")
+        total = queryset.count()
+        processed = updated = 0
+        last_pk = 0
+        parameters = self.parameters
+        fields = [f"analysis__{parameter}" for parameter in parameters]
+
+        while True:
+            rows = list(
+                queryset.filter(pk__gt=last_pk).values_list(
+                    "pk",
+                    "computed_condition",
+                    "breached_parameters",
+                    "component_id",
+                    "component__type_id",
+                    "lubricant",
+                    *fields,
+                )[: self.batch_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1][0]
+
+            current = {row[0]: (row[1], row[2]) for row in rows}
+            components = {row[0]: row[3] for row in rows}
+            df = pl.DataFrame(
+                [(row[0], *row[4:]) for row in rows],
+                schema={
+                    "pk": pl.Int64,
+                    TYPE_COLUMN: pl.Int64,
+                    LUBRICANT_COLUMN: pl.Utf8,
+                    **{p: pl.Float64 for p in parameters},
+                },
+                orient="row",
+            )
+            changed = self._save(self.classify(df), current)
+            latest_state.ComponentLatestStateService().refresh(
+                components[pk] for pk in changed
+            )
+            updated += len(changed)
+            processed += len(rows)
+            if progress:
+                progress(processed, total)
+
+        logger.info(
+            f"Classified {processed} reports, {updated} condition changes"
+        )
+        return {"processed": processed, "updated": updated}
+
+    def _save(
+        self, df: pl.DataFrame, current: Mapping[int, Tuple[str, Any]]
+    ) -> List[int]:
+        """
+        Write the changed classifications of a chunk.
+
+        Args:
+            df: Classified chunk.
+            current: Stored ``(condition, breached)`` by report pk.
+
+        Returns:
+            Primary keys of the reports updated.
+        """
+        normal = str(choices.ReportCondition.NORMAL)
+        has_breach = pl.col("breached_parameters").list.len() > 0
+
+        # Rows without breaches share the same values: one UPDATE
+        normal_pks = [
+            pk
+            for pk in df.filter(~has_breach)["pk"].to_list()
+            if current[pk] != (normal, [])
+        ]
+        if normal_pks:
+            models.Report.objects.filter(pk__in=normal_pks).update(
+                computed_condition=normal, breached_parameters=[]
+            )
+
+        changed = [
+            models.Report(
+                pk=row["pk"],
+                computed_condition=row["computed_condition"],
+                breached_parameters=row["breached_parameters"],
+            )
+            for row in df.filter(has_breach)
+            .select("pk", "computed_condition", "breached_parameters")
+            .iter_rows(named=True)
+            if current[row["pk"]]
+            != (row["computed_condition"], row["breached_parameters"])
+        ]
+        if changed:
+            models.Report.objects.bulk_update(
+                changed,
+                ["computed_condition", "breached_parameters"],
+                batch_size=1000,
+            )
+        return normal_pks + [report.pk for report in changed]
@@ -0,0 +1,460 @@
+"""
+Ingest-time data quality checks for lab analysis values.
+
+Runs vectorized range, unit, cross-field and history checks over the
+parsed ``column_N`` frame of an upload before any Report/LabAnalysis is
+created. Rows that fail are split off with their reasons and stored as
+QuarantinedRow records for review instead of being loaded.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import polars as pl
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber, Upper
+
+from apps.reports import models
+from apps.reports.services import sheet_schema
+from apps.reports.services.sheet_schema import SheetSchema
+
+logger = logging.getLogger(__name__)
+
+REASONS_COLUMN = "quality_reasons"
+ROW_COLUMN = "quality_row"
+
+# (condition, pl.format arguments of the reason)
+Check = Tuple[pl.Expr, Tuple[Any, ...]]
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    """
+    Quality rule of one numeric lab analysis field.
+
+    Attributes:
+        field: LabAnalysis field.
+        minimum: Lowest plausible value (None: unbounded).
+        maximum: Highest plausible value (None: unbounded).
+        ppm: Whether the field is reported in whole ppm; fractions below
+            1 then suggest a value reported in % instead.
+        history_ratio: Flag values this many times above or below the
+            component's recent median (None: no history check).
+        history_floor: Minimum median for the history check to apply.
+    """
+
+    field: str
+    minimum: Optional[float] = 0
+    maximum: Optional[float] = None
+    ppm: bool = False
+    history_ratio: Optional[float] = None
+    history_floor: float = 1.0
+
+
+def _ppm(field: str, maximum: float = 10000) -> FieldRule:
+    return FieldRule(field, 0, maximum, ppm=True, history_ratio=100)
+
+
+DEFAULT_RULES: Tuple[FieldRule, ...] = (
+    FieldRule("water_distillation", 0, 100),
+    FieldRule("viscosity_40c", 1, 2000, history_ratio=3),
+    FieldRule("viscosity_100c", 1, 200, history_ratio=3),
+    FieldRule("tbn", 0, 80),
+    FieldRule("tan", 0, 30),
+    FieldRule("oxidation", 0, 300),
+    FieldRule("soot", 0, 100),
+    FieldRule("nitration", 0, 300),
+    FieldRule("sulfation", 0, 300),
+    FieldRule("glycol", 0, 100),
+    FieldRule("fuel_dilution", 0, 100),
+    FieldRule("water_ftir", 0, 100000),
+    FieldRule("pq_index", 0, 100000),
+    _ppm("iron_fe"),
+    _ppm("chromium_cr"),
+    _ppm("lead_pb"),
+    _ppm("copper_cu"),
+    _ppm("tin_sn"),
+    _ppm("aluminum_al"),
+    _ppm("nickel_ni"),
+    _ppm("silver_ag"),
+    _ppm("silicon_si"),
+    _ppm("boron_b"),
+    _ppm("sodium_na"),
+    _ppm("magnesium_mg", 50000),
+    _ppm("molybdenum_mo"),
+    _ppm("titanium_ti"),
+    _ppm("vanadium_v"),
+    _ppm("manganese_mn"),
+    _ppm("potassium_k"),
+    _ppm("phosphorus_p", 50000),
+    _ppm("zinc_zn", 50000),
+    _ppm("calcium_ca", 50000),
+    _ppm("barium_ba"),
+    _ppm("cadmium_cd"),
+)
+
+
+def _number(text: pl.Expr) -> Tuple[pl.Expr, pl.Expr]:
+    """
+    Vectorized equivalent of ReportBulkUploadService._parse_decimal.
+
+    Args:
+        text: Stripped text of the column.
+
+    Returns:
+        Tuple of (parsed value, whether non-blank text failed to parse).
+    """
+    value = text.str.replace_all(",", "", literal=True).cast(
+        pl.Float64, strict=False
+    )
+    invalid = value.is_null() & text.is_not_null() & ~text.is_in(["", "-"])
+    return value, invalid
+
+
+def _value(field: str) -> pl.Expr:
+    """Return the parsed value column of ``field`` (see check())."""
+    return pl.col(f"_value_{field}")
+
+
+def _normalize_key(expr: pl.Expr) -> pl.Expr:
+    return (
+        expr.cast(pl.Utf8)
+        .fill_null("")
+        .str.to_uppercase()
+        .str.replace_all(r"\s+", " ")
+        .str.strip_chars()
+    )
+
+
+def _check(condition: pl.Expr, message: str, *values: Any) -> Check:
+    return condition, (message, *values)
+
+
+class DataQualityService:
+    """
+    Vectorized quality checks for uploaded report frames.
+
+    Attributes:
+        schema: Sheet schema of the frame columns.
+        rules: Numeric field rules.
+        history_size: Recent analyses per component used as history.
+        history_min_samples: Analyses needed for the history check.
+    """
+
+    history_size = 10
+    history_min_samples = 3
+
+    def __init__(
+        self,
+        schema: Optional[SheetSchema] = None,
+        rules: Sequence[FieldRule] = DEFAULT_RULES,
+    ) -> None:
+        self.schema = schema or sheet_schema.get_schema()
+        self.rules = [rule for rule in rules if rule.field in self.schema]
+
+    def _column(self, field: str) -> str:
+        return self.schema.spec(field).column
+
+    def check(self, df: pl.DataFrame) -> Tuple[pl.DataFrame, pl.DataFrame]:
+        """
+        Split a ``column_N`` text frame into clean and flagged rows.
+
+        Args:
+            df: Parsed upload frame (header rows already removed).
+
+        Returns:
+            Tuple of (clean rows, flagged rows). Flagged rows carry a
+            ``quality_reasons`` list column.
+        """
+        if len(df) == 0:
+            return df, df.with_columns(
+                pl.lit([], dtype=pl.List(pl.Utf8)).alias(REASONS_COLUMN)
+            )
+
+        history = self._history_frame(df)
+        frame = df.lazy()
+        if history is not None:
+            frame = frame.with_columns(
+                self._component_key_expr().alias("_quality_key")
+            ).join(history.lazy(), on="_quality_key", how="left")
+
+        # Parse every checked column once; checks reference the results
+        fields = self._numeric_fields()
+        frame = frame.with_columns(
+            pl.col(self._column(field))
+            .cast(pl.Utf8)
+            .str.strip_chars()
+            .alias(f"_text_{field}")
+            for field in fields
+        )
+        parsed = []
+        for field in fields:
+            value, invalid = _number(pl.col(f"_text_{field}"))
+            parsed += [
+                value.alias(f"_value_{field}"),
+                invalid.alias(f"_invalid_{field}"),
+            ]
+        frame = frame.with_columns(parsed)
+
+        checks = []
+        for rule in self.rules:
+            checks.extend(self._rule_checks(rule, history is not None))
+        checks.extend(self._cross_field_checks())
+
+        # Only boolean masks run over every row; messages are formatted
+        # for the flagged rows alone.
+        frame = frame.with_columns(
+            pl.any_horizontal(
+                [condition.fill_null(False) for condition, _ in checks]
+            ).alias("_quality_flagged")
+        ).collect()
+        clean = frame.filter(~pl.col("_quality_flagged")).select(df.columns)
+        flagged = (
+            frame.filter(pl.col("_quality_flagged"))
+            .with_columns(
+                pl.concat_list(
+                    [
+                        pl.when(condition).then(pl.format(*reason))
+                        for condition, reason in checks
+                    ]
+                )
+                .list.drop_nulls()
+                .alias(REASONS_COLUMN)
+            )
+            .select([*df.columns, REASONS_COLUMN])
+        )
+
+        if len(flagged):
+            logger.info(f"Data quality: {len(flagged)}/{len(df)} rows flagged")
+        return clean, flagged
+
+    def _numeric_fields(self) -> List[str]:
+        """Return the fields parsed as numbers by the checks."""
+        fields = [rule.field for rule in self.rules]
+        if "viscosity_40c" in self.schema and "viscosity_100c" in self.schema:
+            fields += ["viscosity_40c", "viscosity_100c"]
+        return list(dict.fromkeys(fields))
+
+    def _rule_checks(self, rule: FieldRule, with_history: bool) -> List[Check]:
+        """Return the checks of one field rule."""
+        column = self._column(rule.field)
+        value = _value(rule.field)
+        checks = [
+            _check(
+                pl.col(f"_invalid_{rule.field}"),
+                "{}: value '{}' is not numeric",
+                pl.lit(rule.field),
+                pl.col(column),
+            )
+        ]
+        if rule.minimum is not None:
+            checks.append(
+                _check(
+                    value < rule.minimum,
+                    "{}: {} below minimum {}",
+                    pl.lit(rule.field),
+                    value,
+                    pl.lit(rule.minimum),
+                )
+            )
+        if rule.maximum is not None:
+            checks.append(
+                _check(
+                    value > rule.maximum,
+                    "{}: {} above maximum {}",
+                    pl.lit(rule.field),
+                    value,
+                    pl.lit(rule.maximum),
+                )
+            )
+        if rule.ppm:
+            checks.append(
+                _check(
+                    (value > 0) & (value < 1),
+                    "{}: {} looks like a % value in a ppm column",
+                    pl.lit(rule.field),
+                    value,
+                )
+            )
+        if with_history and rule.history_ratio:
+            median = pl.col(f"_history_{rule.field}")
+            ratio = rule.history_ratio
+            checks.append(
+                _check(
+                    (median >= rule.history_floor)
+                    & (value > 0)
+                    & ((value > median * ratio) | (value * ratio < median)),
+                    "{}: {} is over {}x away from the component median {}",
+                    pl.lit(rule.field),
+                    value,
+                    pl.lit(ratio),
+                    median.round(2),
+                )
+            )
+        return checks
+
+    def _cross_field_checks(self) -> List[Check]:
+        """Return the checks comparing fields of a row."""
+        checks = []
+        if "viscosity_40c" in self.schema and "viscosity_100c" in self.schema:
+            v40, v100 = _value("viscosity_40c"), _value("viscosity_100c")
+            checks.append(
+                _check(
+                    v100 >= v40,
+                    "viscosity_100c: {} is not below viscosity_40c {} "
+                    "(swapped columns?)",
+                    v100,
+                    v40,
+                )
+            )
+        if "sample_date" in self.schema and "reception_date" in self.schema:
+            sample = sheet_schema.date_expr(self._column("sample_date"))
+            reception = sheet_schema.date_expr(self._column("reception_date"))
+            checks.append(
+                _check(
+                    sample > reception,
+                    "sample_date: {} is after reception_date {}",
+                    sample,
+                    reception,
+                )
+            )
+        return checks
+
+    def _component_key_expr(self) -> pl.Expr:
+        """Return the machine/serial/component key of a frame row."""
+        return pl.concat_str(
+            [
+                _normalize_key(pl.col(self._column(field)))
+                for field in (
+                    "machine_name",
+                    "serial_number_code",
+                    "component_name",
+                )
+            ],
+            separator="|",
+        )
+
+    def _history_frame(self, df: pl.DataFrame) -> Optional[pl.DataFrame]:
+        """
+        Return the recent per-component medians of history-checked fields.
+
+        Only components whose serial numbers appear in ``df`` are read,
+        limited to the last ``history_size`` analyses of each.
+        """
+        fields = [rule.field for rule in self.rules if rule.history_ratio]
+        key_fields = ("machine_name", "serial_number_code", "component_name")
+        if not fields or not all(f in self.schema for f in key_fields):
+            return None
+
+        serials = (
+            df.select(
+                _normalize_key(pl.col(self._column("serial_number_code")))
+            )
+            .to_series()
+            .unique()
+            .to_list()
+        )
+        serials = [serial for serial in serials if serial]
+        if not serials:
+            return None
+
+        rows = list(
+            models.LabAnalysis.objects.annotate(
+                serial=Upper("report__machine__serial_number"),
+                rank=Window(
+                    RowNumber(),
+                    partition_by=F("report__component_id"),
+                    order_by=F("report__sample_date").desc(),
+                ),
+            )
+            .filter(
+                serial__in=serials,
+                report__component__isnull=False,
+                report__is_active=True,
+                rank__lte=self.history_size,
+            )
+            .values_list(
+                "report__machine__name",
+                "report__machine__serial_number",
+                "report__component__type__name",
+                *fields,
+            )
+        )
+        if not rows:
+            return None
+
+        history = pl.DataFrame(
+            rows,
+            schema=["machine", "serial", "component", *fields],
+            orient="row",
+            infer_schema_length=None,
+        )
+        return (
+            history.with_columns(
+                pl.concat_str(
+                    [
+                        _normalize_key(pl.col(name))
+                        for name in ("machine", "serial", "component")
+                    ],
+                    separator="|",
+                ).alias("_quality_key"),
+                *[pl.col(field).cast(pl.Float64) for field in fields],
+            )
+            .group_by("_quality_key")
+            .agg(
+                pl.len().alias("_history_count"),
+                *[
+                    pl.col(field).median().alias(f"_history_{field}")
+                    for field in fields
+                ],
+            )
+            .filter(pl.col("_history_count") >= self.history_min_samples)
+            .drop("_history_count")
+        )
+
+    def quarantine(
+        self,
+        flagged: pl.DataFrame,
+        user: Any = None,
+        source: str = "",
+    ) -> List[models.QuarantinedRow]:
+        """
+        Store flagged rows for review.
+
+        Args:
+            flagged: Flagged rows returned by check().
+            user: User performing the upload.
+            source: Name of the uploaded file.
+
+        Returns:
+            Created QuarantinedRow records.
+        """
+        if len(flagged) == 0:
+            return []
+
+        lab_column = self._column("lab_number")
+        data_columns = [
+            name
+            for name in flagged.columns
+            if name not in (REASONS_COLUMN, ROW_COLUMN)
+        ]
+        rows = []
+        for row in flagged.iter_rows(named=True):
+            data: Dict[str, Any] = {
+                name: row[name]
+                for name in data_columns
+                if row[name] not in (None, "")
+            }
+            rows.append(
+                models.QuarantinedRow(
+                    lab_number=(row.get(lab_column) or "")[:50],
+                    row_number=row.get(ROW_COLUMN),
+                    source=source[:255],
+                    data=data,
+                    reasons=list(row[REASONS_COLUMN]),
+                    created_by=user,
+                    modified_by=user,
+                )
+            )
+        return models.QuarantinedRow.objects.bulk_create(rows, batch_size=500)
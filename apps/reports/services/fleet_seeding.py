@@ -0,0 +1,481 @@
+"""
+Service for seeding large synthetic fleets of reports.
+
+Unlike ``ReportFactory``, which creates a fresh organization, machine,
+component and user for every report through SubFactories, this service
+builds the whole hierarchy up front and writes reports and lab analyses
+with ``bulk_create`` in large batches. Lab analyses follow plausible time
+series per component: wear metals accumulate with lubricant hours and
+reset on oil changes, additives and TBN deplete, and occasional dirt
+ingress or coolant leak episodes raise contaminants.
+"""
+
+import logging
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, List, Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.core.cache import component_tag, org_tag, tiered_cache
+from apps.equipment import models as equipment_models
+from apps.reports import choices, models
+from apps.reports.services.latest_state import ComponentLatestStateService
+from apps.users import models as users_models
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_COMPONENT_TYPES = (
+    "MOTOR",
+    "TRANSMISION",
+    "SISTEMA HIDRAULICO",
+    "MANDO FINAL",
+    "DIFERENCIAL",
+)
+DEFAULT_LUBRICANTS = ("15W40", "10W30", "SAE 30", "SAE 50", "ISO VG 68")
+
+
+@dataclass
+class FleetSeedResult:
+    """Summary of the entities created by a seeding run."""
+
+    organizations: List[users_models.Organization] = field(
+        default_factory=list
+    )
+    machines: List[equipment_models.Machine] = field(default_factory=list)
+    components: List[equipment_models.Component] = field(default_factory=list)
+    reports: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def reports_per_minute(self) -> float:
+        """Report insert throughput of the run."""
+        if not self.elapsed:
+            return 0.0
+        return self.reports * 60 / self.elapsed
+
+
+@dataclass
+class _ComponentState:
+    """Evolving wear profile of a single component."""
+
+    component: equipment_models.Component
+    lubricant: str
+    daily_hours: float
+    oil_change_interval: int
+    iron_rate: float
+    copper_rate: float
+    aluminum_rate: float
+    chromium_rate: float
+    viscosity_100c: float
+    machine_hours: float
+    lubricant_hours: float = 0.0
+    age_factor: float = 1.0
+    dirt_episode: int = 0
+    coolant_episode: int = 0
+
+
+class FleetSeedingService:
+    """
+    Service for generating realistic fleets with bulk inserts.
+
+    Creates ``organizations`` organizations with ``machines_per_org``
+    machines each, ``components_per_machine`` components per machine and
+    ``samples_per_component`` reports per component, taken every
+    ``cadence_days`` days (with jitter) up to today.
+    """
+
+    def __init__(
+        self,
+        organizations: int = 5,
+        machines_per_org: int = 20,
+        components_per_machine: int = 3,
+        samples_per_component: int = 24,
+        cadence_days: int = 15,
+        batch_size: int = 5000,
+        seed: Optional[int] = None,
+        prefix: Optional[str] = None,
+        user: Optional[users_models.User] = None,
+        component_types: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Initialize seeding configuration.
+
+        Args:
+            organizations: Number of organizations to create.
+            machines_per_org: Machines per organization.
+            components_per_machine: Components per machine.
+            samples_per_component: Reports per component.
+            cadence_days: Average days between samples of a component.
+            batch_size: Rows per ``bulk_create`` batch.
+            seed: Random seed for reproducible datasets.
+            prefix: Prefix for generated identifiers, defaults to a
+                timestamp so repeated runs do not collide.
+            user: User recorded as creator of the seeded rows.
+            component_types: Component type names to use, created when
+                missing.
+        """
+        self.organizations = organizations
+        self.machines_per_org = machines_per_org
+        self.components_per_machine = components_per_machine
+        self.samples_per_component = samples_per_component
+        self.cadence_days = max(1, cadence_days)
+        self.batch_size = batch_size
+        self.random = random.Random(seed)
+        self.prefix = prefix or f"SEED-{int(time.time() * 1000)}"
+        self.user = user
+        self.component_type_names = list(
+            component_types or DEFAULT_COMPONENT_TYPES
+        )
+
+    @property
+    def total_reports(self) -> int:
+        """Number of reports the configuration will create."""
+        return (
+            self.organizations
+            * self.machines_per_org
+            * self.components_per_machine
+            * self.samples_per_component
+        )
+
+    def seed(
+        self, progress: Optional[Callable[[int, int], None]] = None
+    ) -> FleetSeedResult:
+        """
+        Create the fleet, its reports and lab analyses.
+
+        Args:
+            progress: Optional callback receiving (created, total) after
+                each batch.
+
+        Returns:
+            Summary of the created entities.
+        """
+        started = time.perf_counter()
+        result = FleetSeedResult()
+
+        with transaction.atomic():
+            result.organizations = self._create_organizations()
+            result.machines = self._create_machines(result.organizations)
+            result.components = self._create_components(result.machines)
+
+        states = [self._initial_state(c) for c in result.components]
+        machines_by_id = {machine.id: machine for machine in result.machines}
+        today = timezone.now().date()
+        start_date = today - timedelta(
+            days=self.cadence_days * self.samples_per_component
+        )
+
+        reports: List[models.Report] = []
+        analyses: List[models.LabAnalysis] = []
+        for state in states:
+            machine = machines_by_id[state.component.machine_id]
+            sample_date = start_date + timedelta(
+                days=self.random.randint(0, self.cadence_days)
+            )
+            gap = self.cadence_days
+            for _ in range(self.samples_per_component):
+                # The jitter must not push samples past today
+                report, analysis = self._build_sample(
+                    state,
+                    machine,
+                    min(sample_date, today),
+                    gap,
+                    result.reports + len(reports),
+                )
+                reports.append(report)
+                analyses.append(analysis)
+
+                gap = max(1, self.cadence_days + self.random.randint(-2, 2))
+                sample_date += timedelta(days=gap)
+
+                if len(reports) >= self.batch_size:
+                    result.reports += self._flush(reports, analyses)
+                    reports, analyses = [], []
+                    if progress:
+                        progress(result.reports, self.total_reports)
+
+        if reports:
+            result.reports += self._flush(reports, analyses)
+            if progress:
+                progress(result.reports, self.total_reports)
+
+        ComponentLatestStateService().refresh(
+            component.pk for component in result.components
+        )
+
+        # Identifiers may be reused (e.g. after a rolled back benchmark)
+        tiered_cache.invalidate_tags(
+            *[org_tag(org.pk) for org in result.organizations],
+            *[component_tag(c.pk) for c in result.components],
+        )
+
+        result.elapsed = time.perf_counter() - started
+        logger.info(
+            f"Seeded {result.reports} reports for "
+            f"{len(result.components)} components in "
+            f"{result.elapsed:.1f}s ({result.reports_per_minute:.0f}/min)"
+        )
+        return result
+
+    # ------------------------------------------------------------------
+    # Fleet hierarchy
+    # ------------------------------------------------------------------
+
+    def _create_organizations(self) -> List[users_models.Organization]:
+        """Create organizations in a single insert."""
+        return users_models.Organization.objects.bulk_create(
+            [
+                users_models.Organization(
+                    name=f"{self.prefix} Org {i + 1}",
+                    created_by=self.user,
+                    modified_by=self.user,
+                )
+                for i in range(self.organizations)
+            ]
+        )
+
+    def _get_component_types(self) -> List[equipment_models.ComponentType]:
+        """Return component types by name, creating missing ones."""
+        existing = {
+            component_type.name: component_type
+            for component_type in equipment_models.ComponentType.objects.filter(
+                name__in=self.component_type_names
+            )
+        }
+        missing = [
+            equipment_models.ComponentType(name=name)
+            for name in self.component_type_names
+            if name not in existing
+        ]
+        for (
+            component_type
+        ) in equipment_models.ComponentType.objects.bulk_create(missing):
+            existing[component_type.name] = component_type
+        return [existing[name] for name in self.component_type_names]
+
+    def _create_machines(
+        self, organizations: List[users_models.Organization]
+    ) -> List[equipment_models.Machine]:
+        """Create every machine of every organization."""
+        return equipment_models.Machine.objects.bulk_create(
+            [
+                equipment_models.Machine(
+                    organization=organization,
+                    name=f"EQ-{org_index + 1:03d}-{i + 1:04d}",
+                    serial_number=(
+                        f"{self.prefix}-{org_index + 1:03d}-{i + 1:04d}"
+                    ),
+                    model=self.random.choice(("793F", "D10T", "994K", "785D")),
+                    created_by=self.user,
+                    modified_by=self.user,
+                )
+                for org_index, organization in enumerate(organizations)
+                for i in range(self.machines_per_org)
+            ],
+            batch_size=self.batch_size,
+        )
+
+    def _create_components(
+        self, machines: List[equipment_models.Machine]
+    ) -> List[equipment_models.Component]:
+        """Create components for every machine, cycling component types."""
+        component_types = self._get_component_types()
+        return equipment_models.Component.objects.bulk_create(
+            [
+                equipment_models.Component(
+                    machine=machine,
+                    type=component_types[i % len(component_types)],
+                    created_by=self.user,
+                    modified_by=self.user,
+                )
+                for machine in machines
+                for i in range(self.components_per_machine)
+            ],
+            batch_size=self.batch_size,
+        )
+
+    # ------------------------------------------------------------------
+    # Time series generation
+    # ------------------------------------------------------------------
+
+    def _initial_state(
+        self, component: equipment_models.Component
+    ) -> _ComponentState:
+        """Draw a random wear profile for a component."""
+        rnd = self.random
+        return _ComponentState(
+            component=component,
+            lubricant=rnd.choice(DEFAULT_LUBRICANTS),
+            daily_hours=rnd.uniform(8, 22),
+            oil_change_interval=rnd.choice((250, 300, 400, 500)),
+            iron_rate=rnd.uniform(0.05, 0.2),
+            copper_rate=rnd.uniform(0.005, 0.04),
+            aluminum_rate=rnd.uniform(0.005, 0.03),
+            chromium_rate=rnd.uniform(0.002, 0.01),
+            viscosity_100c=rnd.uniform(13.5, 15.5),
+            machine_hours=rnd.uniform(1000, 30000),
+        )
+
+    def _advance(self, state: _ComponentState, days: int) -> bool:
+        """
+        Advance a component's operating hours.
+
+        Args:
+            state: Component state to update.
+            days: Days elapsed since the previous sample.
+
+        Returns:
+            True when the oil was changed before this sample.
+        """
+        rnd = self.random
+        hours = days * state.daily_hours * rnd.uniform(0.8, 1.1)
+        state.machine_hours += hours
+        state.lubricant_hours += hours
+        # Slow wear-in of the component raises the wear rate over its life
+        state.age_factor *= 1 + rnd.uniform(0, 0.01)
+
+        if state.dirt_episode:
+            state.dirt_episode -= 1
+        elif rnd.random() < 0.02:
+            state.dirt_episode = rnd.randint(1, 3)
+
+        if state.coolant_episode:
+            state.coolant_episode -= 1
+        elif rnd.random() < 0.005:
+            state.coolant_episode = rnd.randint(1, 2)
+
+        if state.lubricant_hours > state.oil_change_interval:
+            state.lubricant_hours = hours % state.oil_change_interval
+            return True
+        return False
+
+    def _build_sample(
+        self,
+        state: _ComponentState,
+        machine: equipment_models.Machine,
+        sample_date: date,
+        days: int,
+        index: int,
+    ) -> Tuple[models.Report, models.LabAnalysis]:
+        """Build an unsaved report and lab analysis for a component sample."""
+        rnd = self.random
+        oil_changed = self._advance(state, days)
+        lube_hours = state.lubricant_hours
+        wear = lube_hours * state.age_factor
+
+        iron = 3 + state.iron_rate * wear + rnd.gauss(0, 3)
+        copper = 1 + state.copper_rate * wear + rnd.gauss(0, 1)
+        aluminum = 1 + state.aluminum_rate * wear + rnd.gauss(0, 1)
+        chromium = state.chromium_rate * wear + rnd.gauss(0, 0.5)
+        silicon = 4 + lube_hours * 0.01 + rnd.gauss(0, 1.5)
+        sodium = 3 + rnd.gauss(0, 1)
+        potassium = 1 + rnd.gauss(0, 0.5)
+        glycol = 0.0
+
+        if state.dirt_episode:
+            silicon += rnd.uniform(15, 45)
+            aluminum += rnd.uniform(3, 10)
+            iron += rnd.uniform(10, 40)
+        if state.coolant_episode:
+            sodium += rnd.uniform(40, 150)
+            potassium += rnd.uniform(20, 80)
+            glycol = rnd.uniform(0.05, 0.3)
+
+        depletion = min(1.0, lube_hours / (state.oil_change_interval * 1.5))
+        viscosity = state.viscosity_100c * (1 + 0.08 * depletion) + rnd.gauss(
+            0, 0.2
+        )
+
+        if iron > 150 or silicon > 40 or glycol > 0.1:
+            condition = choices.ReportCondition.CRITICAL
+        elif iron > 80 or silicon > 25 or sodium > 40:
+            condition = choices.ReportCondition.CAUTION
+        else:
+            condition = choices.ReportCondition.NORMAL
+
+        reception_date = sample_date + timedelta(days=rnd.randint(1, 4))
+        report = models.Report(
+            organization_id=machine.organization_id,
+            machine=machine,
+            component=state.component,
+            lab_number=f"{self.prefix}-{index + 1:08d}",
+            lubricant=state.lubricant,
+            lubricant_hours=round(lube_hours),
+            machine_hours=round(state.machine_hours),
+            serial_number_code=machine.serial_number,
+            sample_date=sample_date,
+            reception_date=reception_date,
+            report_date=reception_date + timedelta(days=rnd.randint(1, 3)),
+            status=choices.ReportStatus.APPROVED,
+            condition=condition,
+            oil_change="SI" if oil_changed else "NO",
+            filter_change="SI" if oil_changed else "NO",
+            created_by=self.user,
+            modified_by=self.user,
+        )
+        analysis = models.LabAnalysis(
+            report=report,
+            water_crackle="POSITIVO" if state.coolant_episode else "NEGATIVO",
+            viscosity_100c=self._decimal(viscosity, 3),
+            viscosity_40c=self._decimal(viscosity * 7.8, 3),
+            tbn=self._decimal(10.5 - 6 * depletion + rnd.gauss(0, 0.3), 2),
+            oxidation=self._decimal(5 + 15 * depletion + rnd.gauss(0, 1), 3),
+            soot=self._decimal(0.1 + 0.6 * depletion + rnd.gauss(0, 0.05), 3),
+            nitration=self._decimal(4 + 8 * depletion + rnd.gauss(0, 1), 3),
+            sulfation=self._decimal(10 + 10 * depletion + rnd.gauss(0, 1), 3),
+            glycol=self._decimal(glycol, 3),
+            fuel_dilution=self._decimal(rnd.uniform(0, 1.5), 3),
+            pq_index=self._ppm(iron * 0.6 + rnd.gauss(0, 5)),
+            iron_fe=self._ppm(iron),
+            chromium_cr=self._ppm(chromium),
+            lead_pb=self._ppm(rnd.gauss(1, 1)),
+            copper_cu=self._ppm(copper),
+            tin_sn=self._ppm(rnd.gauss(0.5, 0.5)),
+            aluminum_al=self._ppm(aluminum),
+            nickel_ni=self._ppm(rnd.gauss(0.5, 0.5)),
+            silicon_si=self._ppm(silicon),
+            sodium_na=self._ppm(sodium),
+            potassium_k=self._ppm(potassium),
+            boron_b=self._ppm(rnd.gauss(40, 10)),
+            magnesium_mg=self._ppm(rnd.gauss(900, 80)),
+            molybdenum_mo=self._ppm(rnd.gauss(60, 10)),
+            zinc_zn=self._ppm(1250 - 300 * depletion + rnd.gauss(0, 40)),
+            phosphorus_p=self._ppm(1100 - 250 * depletion + rnd.gauss(0, 40)),
+            calcium_ca=self._ppm(2200 + rnd.gauss(0, 120)),
+            created_by=self.user,
+            modified_by=self.user,
+        )
+        return report, analysis
+
+    def _flush(
+        self,
+        reports: List[models.Report],
+        analyses: List[models.LabAnalysis],
+    ) -> int:
+        """Insert a batch of reports and their analyses atomically."""
+        with transaction.atomic():
+            models.Report.objects.bulk_create(
+                reports, batch_size=self.batch_size
+            )
+            # Re-assign so the primary keys set by bulk_create are picked up
+            for analysis, report in zip(analyses, reports):
+                analysis.report = report
+            models.LabAnalysis.objects.bulk_create(
+                analyses, batch_size=self.batch_size
+            )
+        return len(reports)
+
+    @staticmethod
+    def _decimal(value: float, places: int) -> Decimal:
+        """Round a non-negative float to a Decimal with ``places`` digits."""
+        return Decimal(f"{max(0.0, value):.{places}f}")
+
+    @staticmethod
+    def _ppm(value: float) -> int:
+        """Round a concentration to a non-negative integer ppm value."""
+        return max(0, round(value))
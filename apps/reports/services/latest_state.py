@@ -0,0 +1,211 @@
+"""
+Latest report snapshot per component.
+
+ComponentLatestState keeps the newest active report of every component
+(condition, hours/kms and key measurements) so fleet status is one
+indexed read instead of a scan of the report history. Each write path
+refreshes only the components it touched: the bulk upload (and the ETL
+through it), the condition backfill, the fleet seeding and, through
+signals, the report CRUD. ``rebuild`` backfills the whole table.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from apps.core.cache import org_tag, tiered_cache
+from apps.equipment import models as equipment_models
+from apps.reports import models
+
+logger = logging.getLogger(__name__)
+
+REPORT_FIELDS: Tuple[str, ...] = (
+    "lab_number",
+    "sample_date",
+    "condition",
+    "computed_condition",
+    "lubricant",
+    "lubricant_hours",
+    "lubricant_kms",
+    "machine_hours",
+    "machine_kms",
+)
+
+MEASUREMENTS: Tuple[str, ...] = (
+    "iron_fe",
+    "copper_cu",
+    "aluminum_al",
+    "silicon_si",
+    "viscosity_100c",
+    "tbn",
+    "soot",
+)
+
+
+def latest_report_subquery() -> Subquery:
+    """Return the pk of the newest active report of ``OuterRef("pk")``."""
+    return Subquery(
+        models.Report.objects.filter(
+            component=OuterRef("pk"),
+            is_active=True,
+            sample_date__isnull=False,
+        )
+        .order_by("-sample_date", "-created", "-pk")
+        .values("pk")[:1]
+    )
+
+
+class ComponentLatestStateService:
+    """
+    Maintains the ComponentLatestState table.
+
+    Attributes:
+        batch_size: Components refreshed per chunk.
+    """
+
+    def __init__(self, batch_size: int = 1000) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            batch_size: Components refreshed per chunk.
+        """
+        self.batch_size = batch_size
+
+    def refresh(
+        self, component_ids: Iterable[Optional[int]]
+    ) -> Dict[str, int]:
+        """
+        Recompute the snapshot of some components.
+
+        Components without an active dated report lose their snapshot.
+
+        Args:
+            component_ids: Components whose reports changed (None ignored).
+
+        Returns:
+            Dictionary with the ``components`` refreshed and the snapshots
+            ``stored`` and ``removed``.
+        """
+        ids = sorted({pk for pk in component_ids if pk is not None})
+        result = {"components": len(ids), "stored": 0, "removed": 0}
+        for start in range(0, len(ids), self.batch_size):
+            stored, removed = self._refresh_chunk(
+                ids[start : start + self.batch_size]
+            )
+            result["stored"] += stored
+            result["removed"] += removed
+        return result
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        Recompute the snapshot of every component.
+
+        Returns:
+            Dictionary with the ``components`` refreshed and the snapshots
+            ``stored`` and ``removed``.
+        """
+        result = {"components": 0, "stored": 0, "removed": 0}
+        last_pk = 0
+        while True:
+            ids = list(
+                equipment_models.Component.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[: self.batch_size]
+            )
+            if not ids:
+                break
+            last_pk = ids[-1]
+            stored, removed = self._refresh_chunk(ids)
+            result["components"] += len(ids)
+            result["stored"] += stored
+            result["removed"] += removed
+
+        logger.info(
+            f"Rebuilt {result['stored']} component states of "
+            f"{result['components']} components"
+        )
+        return result
+
+    def _refresh_chunk(self, component_ids: List[int]) -> Tuple[int, int]:
+        """Upsert the snapshots of a chunk of components."""
+        components = list(
+            equipment_models.Component.objects.filter(pk__in=component_ids)
+            .annotate(latest_report_id=latest_report_subquery())
+            .filter(latest_report_id__isnull=False)
+            .values_list(
+                "pk",
+                "machine_id",
+                "machine__organization_id",
+                "latest_report_id",
+            )
+        )
+        reports = {
+            row["pk"]: row
+            for row in models.Report.objects.filter(
+                pk__in=[component[3] for component in components]
+            ).values(
+                "pk",
+                *REPORT_FIELDS,
+                *[f"analysis__{name}" for name in MEASUREMENTS],
+            )
+        }
+        states = [
+            models.ComponentLatestState(
+                component_id=component_id,
+                machine_id=machine_id,
+                organization_id=organization_id,
+                report_id=report_id,
+                **{name: reports[report_id][name] for name in REPORT_FIELDS},
+                **{
+                    name: reports[report_id][f"analysis__{name}"]
+                    for name in MEASUREMENTS
+                },
+            )
+            for component_id, machine_id, organization_id, report_id in (
+                components
+            )
+        ]
+
+        stale = models.ComponentLatestState.objects.filter(
+            component_id__in=component_ids
+        ).exclude(component_id__in=[state.component_id for state in states])
+        organization_ids = {state.organization_id for state in states}
+        organization_ids.update(
+            stale.values_list("organization_id", flat=True)
+        )
+        with transaction.atomic():
+            removed, _ = stale.delete()
+            models.ComponentLatestState.objects.bulk_create(
+                states,
+                update_conflicts=True,
+                unique_fields=["component"],
+                update_fields=[
+                    "machine",
+                    "organization",
+                    "report",
+                    *REPORT_FIELDS,
+                    *MEASUREMENTS,
+                    "refreshed",
+                ],
+            )
+
+        # Fleet status payloads are cached per organization
+        tiered_cache.invalidate_tags(
+            *[org_tag(pk) for pk in organization_ids if pk is not None]
+        )
+        return len(states), removed
+
+
+def refresh_latest_states_on_commit(
+    component_ids: Iterable[Optional[int]],
+) -> None:
+    """Refresh the snapshots of some components once the transaction commits."""
+    component_ids = sorted({pk for pk in component_ids if pk is not None})
+    if component_ids:
+        transaction.on_commit(
+            lambda: ComponentLatestStateService().refresh(component_ids),
+            robust=True,
+        )
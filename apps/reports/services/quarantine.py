@@ -0,0 +1,124 @@
+"""Service for reviewing rows quarantined by the ingest quality checks."""
+
+import logging
+from typing import Any, Dict
+
+import polars as pl
+from django.db import transaction
+from django.db.models import QuerySet
+
+from apps.reports import choices, models
+from apps.reports.services.bulk_upload import ReportBulkUploadService
+
+logger = logging.getLogger(__name__)
+
+
+class QuarantineReviewService:
+    """
+    Service for releasing or discarding quarantined upload rows.
+
+    Released rows are loaded through ReportBulkUploadService without the
+    quality checks, exactly as if they had passed them; rows that still
+    cannot be loaded (unknown equipment, duplicates) stay pending.
+    """
+
+    def __init__(self, user) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            user: User reviewing the rows.
+        """
+        self.user = user
+
+    def release(self, queryset: QuerySet) -> Dict[str, Any]:
+        """
+        Load the pending rows of ``queryset`` as reports.
+
+        Args:
+            queryset: QuarantinedRow records to release.
+
+        Returns:
+            Dictionary with ``released`` and ``failed`` counts and the
+            load ``errors``.
+        """
+        service = ReportBulkUploadService(self.user)
+        columns = [spec.column for spec in service.schema.columns]
+
+        with transaction.atomic():
+            rows = list(
+                queryset.order_by()
+                .select_for_update()
+                .filter(status=choices.QuarantineStatus.PENDING)
+            )
+            if not rows:
+                return {"released": 0, "failed": 0, "errors": []}
+
+            df = pl.DataFrame(
+                [
+                    [
+                        None
+                        if row.data.get(name) is None
+                        else str(row.data[name])
+                        for name in columns
+                    ]
+                    for row in rows
+                ],
+                schema={name: pl.Utf8 for name in columns},
+                orient="row",
+            )
+
+            # Released rows must not be skipped as pending duplicates
+            pks = [row.pk for row in rows]
+            models.QuarantinedRow.objects.filter(pk__in=pks).update(
+                status=choices.QuarantineStatus.RELEASED,
+                modified_by=self.user,
+            )
+            results = service.process_dataframe(df, check_quality=False)
+
+            # Only reports of this load, not existing duplicates
+            reports = dict(
+                models.Report.objects.filter(
+                    pk__in=results["created_pks"]
+                ).values_list("lab_number", "pk")
+            )
+            released = []
+            for row in rows:
+                row.report_id = reports.get(row.lab_number)
+                if row.report_id:
+                    released.append(row)
+            models.QuarantinedRow.objects.bulk_update(released, ["report"])
+            failed = len(rows) - len(released)
+            if failed:
+                models.QuarantinedRow.objects.filter(pk__in=pks).exclude(
+                    pk__in=[row.pk for row in released]
+                ).update(status=choices.QuarantineStatus.PENDING)
+
+        logger.info(
+            f"Quarantine release by {self.user}: {len(released)} released, "
+            f"{failed} failed"
+        )
+        return {
+            "released": len(released),
+            "failed": failed,
+            "errors": results["errors"],
+        }
+
+    def discard(self, queryset: QuerySet) -> int:
+        """
+        Mark the pending rows of ``queryset`` as discarded.
+
+        Args:
+            queryset: QuarantinedRow records to discard.
+
+        Returns:
+            Number of discarded rows.
+        """
+        return (
+            queryset.order_by()
+            .filter(status=choices.QuarantineStatus.PENDING)
+            .update(
+                status=choices.QuarantineStatus.DISCARDED,
+                modified_by=self.user,
+            )
+        )
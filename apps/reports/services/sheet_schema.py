@@ -0,0 +1,487 @@
+"""
+Declarative schemas for report spreadsheets.
+
+A SheetSchema lists every column of a lab export: the Report or
+LabAnalysis field it feeds, how its text is parsed and the header aliases
+(Spanish/English names, with or without ASTM/ISO method labels) it may
+appear under. Readers locate columns by header and project them into the
+canonical ``column_N`` layout used by ReportBulkUploadService, so exports
+with reordered, extra or renamed columns load without code changes.
+"""
+
+import logging
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# Column dtypes (how the text value is parsed)
+TEXT = "text"
+INTEGER = "integer"
+DECIMAL = "decimal"
+DATE = "date"
+CONDITION = "condition"
+HOURS_KMS = "hours_kms"
+
+# Column targets
+REPORT = "report"
+ANALYSIS = "analysis"
+
+# Date formats of DATE columns, tried in order
+DATE_FORMATS = (
+    "%d/%m/%Y",
+    "%d-%m-%Y",
+    "%Y-%m-%d",
+    "%m/%d/%Y",
+    "%Y-%m-%d %H:%M:%S",
+)
+
+_METHOD_SEPARATOR = re.compile(r"\s+-\s+")
+_NON_ALPHANUMERIC = re.compile(r"[^A-Z0-9]+")
+
+
+def normalize_header(value: Any) -> str:
+    """
+    Normalize a header for matching.
+
+    Strips accents, upper-cases and collapses punctuation, so
+    ``"Cód/Núm Serie"`` and ``"COD NUM SERIE"`` compare equal.
+    """
+    text = unicodedata.normalize("NFKD", str(value or ""))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return _NON_ALPHANUMERIC.sub(" ", text.upper()).strip()
+
+
+def date_expr(column: str) -> pl.Expr:
+    """Return a vectorized parse of a DATE text column."""
+    text = pl.col(column).str.strip_chars()
+    return pl.coalesce(
+        [
+            text.str.to_date(date_format, strict=False)
+            for date_format in DATE_FORMATS
+        ]
+    )
+
+
+@dataclass(frozen=True)
+class ColumnSpec:
+    """
+    One column of a report spreadsheet.
+
+    Attributes:
+        field: Report/LabAnalysis field (or ``row_number``).
+        position: Canonical position (``column_N`` name after reading).
+        aliases: Header texts the column may appear under.
+        dtype: How the text value is parsed (TEXT, INTEGER, ...).
+        target: REPORT or ANALYSIS.
+    """
+
+    field: str
+    position: int
+    aliases: Sequence[str]
+    dtype: str = TEXT
+    target: str = REPORT
+
+    @property
+    def column(self) -> str:
+        """Return the canonical column name."""
+        return f"column_{self.position}"
+
+
+@dataclass(frozen=True)
+class SheetLayout:
+    """
+    Where the schema columns are in a particular file.
+
+    Attributes:
+        header_row: Index of the header row (None for positional files).
+        sources: Canonical position -> column index in the file.
+        missing: Fields whose header was not found.
+    """
+
+    header_row: Optional[int]
+    sources: Mapping[int, int]
+    missing: Sequence[str] = ()
+
+    @property
+    def data_start(self) -> int:
+        """Return the index of the first data row."""
+        return 0 if self.header_row is None else self.header_row + 1
+
+    @property
+    def used_columns(self) -> List[int]:
+        """Return the file column indices to read, in file order."""
+        return sorted(set(self.sources.values()))
+
+
+class SheetSchema:
+    """
+    Column registry of one spreadsheet layout.
+
+    Attributes:
+        name: Registry name.
+        columns: Column specs ordered by canonical position.
+        required: Fields that must be present in the header.
+        min_header_matches: Matches needed to accept a row as header.
+        header_search_rows: Rows scanned for the header.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        columns: Iterable[ColumnSpec],
+        required: Sequence[str] = ("lab_number",),
+        min_header_matches: int = 5,
+        header_search_rows: int = 10,
+    ) -> None:
+        self.name = name
+        self.columns = sorted(columns, key=lambda spec: spec.position)
+        self.required = tuple(required)
+        self.min_header_matches = min_header_matches
+        self.header_search_rows = header_search_rows
+        self._by_field = {spec.field: spec for spec in self.columns}
+        self._by_alias: Dict[str, ColumnSpec] = {}
+        for spec in self.columns:
+            for alias in (spec.field, *spec.aliases):
+                key = normalize_header(alias)
+                other = self._by_alias.setdefault(key, spec)
+                if other is not spec:
+                    raise ValueError(
+                        f"Header alias '{alias}' of {spec.field} is already "
+                        f"used by {other.field}"
+                    )
+
+    def __contains__(self, field: object) -> bool:
+        """Return whether ``field`` is a column of the schema."""
+        return field in self._by_field
+
+    @property
+    def width(self) -> int:
+        """Return the number of canonical columns."""
+        return len(self.columns)
+
+    def spec(self, field: str) -> ColumnSpec:
+        """Return the spec of ``field``."""
+        return self._by_field[field]
+
+    def indices(self, target: str) -> Dict[str, int]:
+        """Return ``{field: position}`` for the columns of ``target``."""
+        return {
+            spec.field: spec.position
+            for spec in self.columns
+            if spec.target == target
+        }
+
+    def match(self, header: Any) -> Optional[ColumnSpec]:
+        """
+        Return the column a header refers to.
+
+        The full header is tried first, then each part around ``" - "``,
+        so ``"ASTM D 5185-18 - Hierro (Fe)"`` matches ``"Hierro (Fe)"``.
+        """
+        if header is None:
+            return None
+        text = str(header)
+        for candidate in [text, *reversed(_METHOD_SEPARATOR.split(text))]:
+            spec = self._by_alias.get(normalize_header(candidate))
+            if spec:
+                return spec
+        return None
+
+    def detect_layout(self, rows: Sequence[Sequence[Any]]) -> SheetLayout:
+        """
+        Find the header row among the first rows and map its columns.
+
+        Falls back to the canonical positions when no row looks like a
+        header (files without title/header rows).
+
+        Args:
+            rows: First rows of the file, as sequences of cell values.
+
+        Returns:
+            Layout of the file.
+        """
+        best_row, best_sources = None, {}
+        for index, row in enumerate(rows[: self.header_search_rows]):
+            sources: Dict[int, int] = {}
+            for column, header in enumerate(row):
+                spec = self.match(header)
+                if spec and spec.position not in sources:
+                    sources[spec.position] = column
+            if len(sources) > len(best_sources):
+                best_row, best_sources = index, sources
+
+        if len(best_sources) < self.min_header_matches:
+            width = max((len(row) for row in rows), default=0)
+            logger.debug(
+                f"No header row found for schema {self.name}, "
+                "reading columns by position"
+            )
+            return SheetLayout(
+                header_row=None,
+                sources={
+                    spec.position: spec.position
+                    for spec in self.columns
+                    if spec.position < width
+                },
+            )
+
+        missing = tuple(
+            spec.field
+            for spec in self.columns
+            if spec.position not in best_sources
+        )
+        if missing:
+            logger.info(f"Columns not found in header: {', '.join(missing)}")
+        return SheetLayout(best_row, best_sources, missing)
+
+    def missing_required(self, layout: SheetLayout) -> List[str]:
+        """Return required fields absent from ``layout``."""
+        return [field for field in self.required if field in layout.missing]
+
+    def select_exprs(
+        self, layout: SheetLayout, names: Mapping[int, str]
+    ) -> List[pl.Expr]:
+        """
+        Return expressions projecting file columns to canonical columns.
+
+        Args:
+            layout: Layout of the file.
+            names: File column index -> column name in the read frame.
+
+        Returns:
+            One text expression per canonical column; columns missing
+            from the file are null.
+        """
+        return [
+            (
+                pl.col(names[layout.sources[spec.position]])
+                if spec.position in layout.sources
+                else pl.lit(None, dtype=pl.Utf8)
+            ).alias(spec.column)
+            for spec in self.columns
+        ]
+
+
+def _column(
+    field: str,
+    position: int,
+    *aliases: str,
+    dtype: str = TEXT,
+    target: str = REPORT,
+) -> ColumnSpec:
+    return ColumnSpec(field, position, aliases, dtype, target)
+
+
+def _analysis(
+    field: str, position: int, dtype: str, *aliases: str
+) -> ColumnSpec:
+    return ColumnSpec(field, position, aliases, dtype, ANALYSIS)
+
+
+INTERTEK_SCHEMA = SheetSchema(
+    "intertek",
+    [
+        _column("row_number", 0, "N°", "No", "Nro", "Item", dtype=INTEGER),
+        _column("lab_number", 1, "No. Lab", "N° Lab", "Lab Number", "Lab No"),
+        _column("organization_name", 2, "Cliente", "Client", "Customer"),
+        _column("machine_name", 3, "Equipo", "Equipment", "Machine"),
+        _column("component_name", 4, "Componente", "Component"),
+        _column(
+            "serial_number_code",
+            5,
+            "Cód/Núm Serie",
+            "Código Serie",
+            "Serial Number",
+        ),
+        _column("lubricant", 6, "Lubricante", "Lubricant", "Oil"),
+        _column("sample_date", 7, "Fecha Muestra", "Sample Date", dtype=DATE),
+        _column(
+            "machine_hours_kms",
+            8,
+            "Equipo Horas/Kms",
+            "Machine Hours/Kms",
+            "Equipment Hours",
+            dtype=HOURS_KMS,
+        ),
+        _column(
+            "lubricant_hours_kms",
+            9,
+            "Lubricante Horas/Kms",
+            "Lubricant Hours/Kms",
+            "Oil Hours",
+            dtype=HOURS_KMS,
+        ),
+        _column(
+            "reception_date",
+            10,
+            "Fecha de Recepción",
+            "Fecha Recepción",
+            "Reception Date",
+            "Received Date",
+            dtype=DATE,
+        ),
+        _column(
+            "report_date",
+            11,
+            "Fecha de Reporte",
+            "Fecha Reporte",
+            "Report Date",
+            dtype=DATE,
+        ),
+        _column("filter_change", 12, "Cambio de Filtro", "Filter Change"),
+        _column("oil_change", 13, "Cambio de Aceite", "Oil Change"),
+        _column("per_number", 14, "No.Per", "N° Per", "PER Number"),
+        _column("others", 15, "Otros", "Others"),
+        _column("condition", 16, "Condición", "Condition", dtype=CONDITION),
+        _column("notes", 17, "Comentario", "Comentarios", "Comments", "Notes"),
+        _analysis(
+            "water_crackle", 18, TEXT, "Agua (Crackle test)", "Agua (Crackle)"
+        ),
+        _analysis(
+            "water_distillation",
+            19,
+            DECIMAL,
+            "Agua por destilación",
+            "Water by Distillation",
+        ),
+        _analysis(
+            "viscosity_40c",
+            20,
+            DECIMAL,
+            "Viscosidad a 40°C",
+            "Viscosity @ 40°C",
+            "Viscosity 40C",
+        ),
+        _analysis(
+            "viscosity_100c",
+            21,
+            DECIMAL,
+            "Viscosidad a 100°C",
+            "Viscosity @ 100°C",
+            "Viscosity 100C",
+        ),
+        _analysis(
+            "compatibility", 22, TEXT, "Compatibilidad", "Compatibility"
+        ),
+        _analysis("tbn", 23, DECIMAL, "Número Básico (TBN)", "TBN"),
+        _analysis("tan", 24, DECIMAL, "Número Acido (TAN)", "TAN"),
+        _analysis("oxidation", 25, DECIMAL, "Oxidación", "Oxidation"),
+        _analysis("soot", 26, DECIMAL, "Hollín", "Soot"),
+        _analysis("nitration", 27, DECIMAL, "Nitración", "Nitration"),
+        _analysis("sulfation", 28, DECIMAL, "Sulfatación", "Sulfation"),
+        _analysis("glycol", 29, DECIMAL, "Glicol", "Glycol"),
+        _analysis("fuel_dilution", 30, DECIMAL, "Dilución", "Fuel Dilution"),
+        _analysis("water_ftir", 31, DECIMAL, "Agua FTIR", "Water FTIR"),
+        _analysis("pq_index", 32, INTEGER, "PQ Index", "PQ"),
+        _analysis(
+            "particle_count_iso",
+            33,
+            TEXT,
+            "Conteo de Partículas",
+            "Particle Count",
+            "ISO 4406",
+        ),
+        _analysis("iron_fe", 34, INTEGER, "Hierro (Fe)", "Iron (Fe)", "Fe"),
+        _analysis(
+            "chromium_cr", 35, INTEGER, "Cromo (Cr)", "Chromium (Cr)", "Cr"
+        ),
+        _analysis("lead_pb", 36, INTEGER, "Plomo (Pb)", "Lead (Pb)", "Pb"),
+        _analysis("copper_cu", 37, INTEGER, "Cobre (Cu)", "Copper (Cu)", "Cu"),
+        _analysis("tin_sn", 38, INTEGER, "Estaño (Sn)", "Tin (Sn)", "Sn"),
+        _analysis(
+            "aluminum_al", 39, INTEGER, "Aluminio (Al)", "Aluminum (Al)", "Al"
+        ),
+        _analysis(
+            "nickel_ni", 40, INTEGER, "Níquel (Ni)", "Nickel (Ni)", "Ni"
+        ),
+        _analysis("silver_ag", 41, INTEGER, "Plata (Ag)", "Silver (Ag)", "Ag"),
+        _analysis(
+            "silicon_si", 42, INTEGER, "Silicio (Si)", "Silicon (Si)", "Si"
+        ),
+        _analysis("boron_b", 43, INTEGER, "Boro (B)", "Boron (B)", "B"),
+        _analysis("sodium_na", 44, INTEGER, "Sodio (Na)", "Sodium (Na)", "Na"),
+        _analysis(
+            "magnesium_mg",
+            45,
+            INTEGER,
+            "Magnesio (Mg)",
+            "Magnesium (Mg)",
+            "Mg",
+        ),
+        _analysis(
+            "molybdenum_mo",
+            46,
+            INTEGER,
+            "Molibdeno (Mo)",
+            "Molybdenum (Mo)",
+            "Mo",
+        ),
+        _analysis(
+            "titanium_ti", 47, INTEGER, "Titanio (Ti)", "Titanium (Ti)", "Ti"
+        ),
+        _analysis(
+            "vanadium_v", 48, INTEGER, "Vanadio (V)", "Vanadium (V)", "V"
+        ),
+        _analysis(
+            "manganese_mn",
+            49,
+            INTEGER,
+            "Manganeso (Mn)",
+            "Manganese (Mn)",
+            "Mn",
+        ),
+        _analysis(
+            "potassium_k", 50, INTEGER, "Potasio (K)", "Potassium (K)", "K"
+        ),
+        _analysis(
+            "phosphorus_p",
+            51,
+            INTEGER,
+            "Fósforo (P)",
+            "Phosphorus (P)",
+            "P",
+        ),
+        _analysis("zinc_zn", 52, INTEGER, "Zinc (Zn)", "Zn"),
+        _analysis(
+            "calcium_ca", 53, INTEGER, "Calcio (Ca)", "Calcium (Ca)", "Ca"
+        ),
+        _analysis("barium_ba", 54, INTEGER, "Bario (Ba)", "Barium (Ba)", "Ba"),
+        _analysis(
+            "cadmium_cd", 55, INTEGER, "Cadmio (Cd)", "Cadmium (Cd)", "Cd"
+        ),
+        _analysis(
+            "visual_appearance",
+            56,
+            TEXT,
+            "Apariencia - Visual",
+            "Apariencia",
+            "Visual Appearance",
+        ),
+    ],
+)
+
+_SCHEMAS: Dict[str, SheetSchema] = {}
+
+
+def register_schema(schema: SheetSchema) -> SheetSchema:
+    """Register ``schema`` under its name (replacing any previous one)."""
+    _SCHEMAS[schema.name] = schema
+    return schema
+
+
+def get_schema(name: str = "intertek") -> SheetSchema:
+    """
+    Return a registered schema.
+
+    Raises:
+        KeyError: If no schema is registered under ``name``.
+    """
+    return _SCHEMAS[name]
+
+
+register_schema(INTERTEK_SCHEMA)
@@ -0,0 +1,458 @@
+"""
+Similar-component search over wear-profile feature vectors.
+
+Every component is described by the recent level (mean of the last
+samples) and trend (slope per sample over a short window) of its wear
+metals, contaminants and additives, on a log scale so that ppm ranges of
+different elements are comparable. The vectors are computed for the
+whole fleet in one vectorized polars pass, stored per component
+(ComponentFeatureVector) and refreshed after each upload for the
+components that received samples.
+
+Queries load the vectors of one organization into a dense float32
+matrix, standardized per feature, and rank the components by Euclidean
+distance to the query vector; the matrix is cached per organization and
+dropped whenever the organization's data changes.
+"""
+
+import logging
+import math
+from array import array
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import polars as pl
+from django.db import transaction
+from django.db.models import F, Q
+
+from apps.core.cache import org_tag, tiered_cache
+from apps.reports import models
+
+logger = logging.getLogger(__name__)
+
+SIMILARITY_PARAMETERS: Tuple[str, ...] = (
+    # Wear metals
+    "iron_fe",
+    "chromium_cr",
+    "lead_pb",
+    "copper_cu",
+    "tin_sn",
+    "aluminum_al",
+    # Contaminants
+    "silicon_si",
+    "sodium_na",
+    "potassium_k",
+    # Additives
+    "zinc_zn",
+    "phosphorus_p",
+    "calcium_ca",
+    "magnesium_mg",
+)
+
+# Layout of ComponentFeatureVector.vector
+FEATURE_NAMES: Tuple[str, ...] = tuple(
+    f"{feature}_{parameter}"
+    for parameter in SIMILARITY_PARAMETERS
+    for feature in ("level", "trend")
+)
+
+COMPONENT_COLUMN = "component_id"
+ORGANIZATION_COLUMN = "organization_id"
+
+# Bytes of one packed vector
+VECTOR_SIZE = array("f").itemsize * len(FEATURE_NAMES)
+
+
+def pack_vector(values: Sequence[Optional[float]]) -> bytes:
+    """Pack features as float32 bytes, missing values as NaN."""
+    return array(
+        "f", [math.nan if value is None else value for value in values]
+    ).tobytes()
+
+
+def unpack_vector(data: bytes) -> List[float]:
+    """Unpack float32 bytes written by :func:`pack_vector`."""
+    values = array("f")
+    values.frombytes(bytes(data))
+    return values.tolist()
+
+
+class SimilarityIndex:
+    """
+    Dense feature matrix of an organization's components.
+
+    Features are standardized with the mean and standard deviation of
+    the organization's components; missing features sit at the mean.
+
+    Attributes:
+        component_ids: Component ID of every matrix row.
+        matrix: One ``float32`` column per feature, one row per component.
+        mean: Mean of every feature.
+        scale: Standard deviation of every feature (1 when constant).
+    """
+
+    def __init__(self, component_ids: List[int], data: bytes) -> None:
+        """
+        Build the matrix from the concatenated packed vectors.
+
+        Args:
+            component_ids: Component of each vector.
+            data: Packed vectors, in the order of ``component_ids``.
+        """
+        values = array("f")
+        values.frombytes(data)
+        raw = (
+            pl.Series("vector", values, dtype=pl.Float32)
+            .fill_nan(None)
+            .reshape((len(component_ids), len(FEATURE_NAMES)))
+            .arr.to_struct(fields=list(FEATURE_NAMES))
+            .struct.unnest()
+        )
+        stats = raw.select(
+            *[
+                pl.col(name).mean().alias(f"mean_{name}")
+                for name in raw.columns
+            ],
+            *[pl.col(name).std().alias(f"std_{name}") for name in raw.columns],
+        ).row(0, named=True)
+        self.mean = [stats[f"mean_{name}"] or 0.0 for name in FEATURE_NAMES]
+        self.scale = [stats[f"std_{name}"] or 1.0 for name in FEATURE_NAMES]
+        self.component_ids = component_ids
+        self.matrix = raw.select(
+            ((pl.col(name) - mean) / scale).fill_null(0.0).cast(pl.Float32)
+            for name, mean, scale in zip(FEATURE_NAMES, self.mean, self.scale)
+        ).with_columns(pl.Series(COMPONENT_COLUMN, component_ids))
+
+    def __len__(self) -> int:
+        return len(self.component_ids)
+
+    def vector_of(self, component_id: int) -> Optional[List[float]]:
+        """Return the standardized vector of an indexed component."""
+        row = self.matrix.filter(pl.col(COMPONENT_COLUMN) == component_id)
+        if row.is_empty():
+            return None
+        return list(row.drop(COMPONENT_COLUMN).row(0))
+
+    def standardize(self, values: Sequence[Optional[float]]) -> List[float]:
+        """Standardize a raw feature vector like the matrix rows."""
+        return [
+            0.0
+            if value is None or math.isnan(value)
+            else (value - mean) / scale
+            for value, mean, scale in zip(values, self.mean, self.scale)
+        ]
+
+    def nearest(
+        self,
+        vector: Sequence[float],
+        k: int = 10,
+        exclude: Iterable[int] = (),
+    ) -> List[Tuple[int, float]]:
+        """
+        Return the ``k`` components closest to a standardized vector.
+
+        Args:
+            vector: Standardized query vector.
+            k: Number of neighbours.
+            exclude: Components never returned (e.g. the query itself).
+
+        Returns:
+            ``(component_id, distance)`` pairs, closest first.
+        """
+        distance = pl.sum_horizontal(
+            (pl.col(name) - value) ** 2
+            for name, value in zip(FEATURE_NAMES, vector)
+        ).sqrt()
+        return (
+            self.matrix.lazy()
+            .filter(~pl.col(COMPONENT_COLUMN).is_in(list(exclude)))
+            .select(COMPONENT_COLUMN, distance.alias("distance"))
+            .bottom_k(k, by="distance")
+            .sort("distance", COMPONENT_COLUMN)
+            .collect()
+            .rows()
+        )
+
+
+def build_similarity_index(organization_id: int) -> SimilarityIndex:
+    """Load the feature vectors of an organization into an index."""
+    rows = [
+        (component_id, bytes(vector))
+        for component_id, vector in models.ComponentFeatureVector.objects.filter(
+            organization_id=organization_id,
+            component__is_active=True,
+            component__machine__is_active=True,
+        )
+        .order_by("component_id")
+        .values_list("component_id", "vector")
+    ]
+    # Vectors of an older layout are skipped until the next rebuild
+    rows = [row for row in rows if len(row[1]) == VECTOR_SIZE]
+    return SimilarityIndex(
+        [component_id for component_id, _ in rows],
+        b"".join(vector for _, vector in rows),
+    )
+
+
+def similarity_index(organization_id: int) -> SimilarityIndex:
+    """Return the cached index of an organization."""
+    return tiered_cache.get_or_set(
+        f"similarity:index:{organization_id}",
+        lambda: build_similarity_index(organization_id),
+        tags=[org_tag(organization_id)],
+    )
+
+
+class ComponentSimilarityService:
+    """
+    Computes and stores the ComponentFeatureVector table.
+
+    Attributes:
+        parameters: LabAnalysis fields described by the vectors.
+        window: Most recent samples of a parameter in the trend.
+        recent: Most recent samples of a parameter in the level.
+        batch_size: Components computed per chunk.
+    """
+
+    def __init__(
+        self,
+        parameters: Sequence[str] = SIMILARITY_PARAMETERS,
+        window: int = 6,
+        recent: int = 3,
+        batch_size: int = 5000,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            parameters: LabAnalysis fields described by the vectors.
+            window: Most recent samples of a parameter in the trend.
+            recent: Most recent samples of a parameter in the level.
+            batch_size: Components computed per chunk.
+        """
+        self.parameters = list(parameters)
+        self.window = window
+        self.recent = recent
+        self.batch_size = batch_size
+
+    def features(self, df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Compute the feature vector of every component.
+
+        Args:
+            df: One row per report with ``pk``, ``component_id``,
+                ``organization_id``, ``sample_date`` and the parameters.
+
+        Returns:
+            One row per component with its ``organization_id``,
+            ``sample_count``, ``last_sample_date`` and one column per
+            name of FEATURE_NAMES (null when the parameter is missing).
+        """
+        parameters = [pl.col(parameter) for parameter in self.parameters]
+        features = []
+        for column in parameters:
+            values = column.drop_nulls()
+            window = values.tail(self.window)
+            n = window.len().cast(pl.Float64)
+            # Least squares slope against the sample index 0..n-1
+            sxy = (pl.int_range(window.len()) * window).sum() - (
+                n - 1
+            ) / 2 * window.sum()
+            sxx = n * (n**2 - 1) / 12
+            features += [
+                values.tail(self.recent)
+                .mean()
+                .alias(f"level_{column.meta.output_name()}"),
+                pl.when(window.len() >= 3)
+                .then(sxy / sxx)
+                .alias(f"trend_{column.meta.output_name()}"),
+            ]
+
+        return (
+            df.lazy()
+            .filter(pl.col("sample_date").is_not_null())
+            # Log scale: elements measured in tens and thousands of ppm
+            .with_columns(
+                column.cast(pl.Float64).clip(lower_bound=0).log1p()
+                for column in parameters
+            )
+            .sort(COMPONENT_COLUMN, "sample_date", "pk")
+            .group_by(COMPONENT_COLUMN)
+            .agg(
+                pl.col(ORGANIZATION_COLUMN).last(),
+                pl.len().alias("sample_count"),
+                pl.col("sample_date").last().alias("last_sample_date"),
+                *features,
+            )
+            .select(
+                COMPONENT_COLUMN,
+                ORGANIZATION_COLUMN,
+                "sample_count",
+                "last_sample_date",
+                *[
+                    pl.col(name)
+                    if name.split("_", 1)[1] in self.parameters
+                    else pl.lit(None, dtype=pl.Float64).alias(name)
+                    for name in FEATURE_NAMES
+                ],
+            )
+            .sort(COMPONENT_COLUMN)
+            .collect()
+        )
+
+    def load(
+        self, component_ids: Sequence[int], until: Optional[date] = None
+    ) -> pl.DataFrame:
+        """
+        Read the active dated reports of some components.
+
+        Args:
+            component_ids: Components to read.
+            until: Only read the reports sampled on or before this date.
+
+        Returns:
+            Frame with one row per report, as expected by :meth:`features`.
+        """
+        reports = models.Report.objects.filter(
+            component_id__in=component_ids,
+            is_active=True,
+            sample_date__isnull=False,
+            analysis__isnull=False,
+        )
+        if until is not None:
+            reports = reports.filter(sample_date__lte=until)
+        rows = reports.values_list(
+            "pk",
+            "component_id",
+            "component__machine__organization_id",
+            "sample_date",
+            *[f"analysis__{parameter}" for parameter in self.parameters],
+        )
+        return pl.DataFrame(
+            list(rows),
+            schema={
+                "pk": pl.Int64,
+                COMPONENT_COLUMN: pl.Int64,
+                ORGANIZATION_COLUMN: pl.Int64,
+                "sample_date": pl.Date,
+                **{parameter: pl.Float64 for parameter in self.parameters},
+            },
+            orient="row",
+        )
+
+    def vector_for(
+        self, component_id: int, until: Optional[date] = None
+    ) -> Optional[List[Optional[float]]]:
+        """
+        Compute the raw feature vector of one component.
+
+        Args:
+            component_id: Component ID.
+            until: Describe the component as it was on this date.
+
+        Returns:
+            Features in the order of FEATURE_NAMES, or None without samples.
+        """
+        features = self.features(self.load([component_id], until))
+        if features.is_empty():
+            return None
+        return list(features.select(FEATURE_NAMES).row(0))
+
+    def refresh(
+        self, component_ids: Iterable[Optional[int]]
+    ) -> Dict[str, int]:
+        """
+        Recompute the vectors of some components.
+
+        Args:
+            component_ids: Components that received samples (None ignored).
+
+        Returns:
+            Dictionary with the ``components`` refreshed and ``vectors``
+            stored.
+        """
+        ids = sorted({pk for pk in component_ids if pk is not None})
+        stored = 0
+        for start in range(0, len(ids), self.batch_size):
+            chunk = ids[start : start + self.batch_size]
+            stored += self._store(chunk, self.features(self.load(chunk)))
+
+        logger.info(
+            f"Stored {stored} feature vectors of {len(ids)} components"
+        )
+        return {"components": len(ids), "vectors": stored}
+
+    def refresh_stale(self) -> Dict[str, int]:
+        """
+        Recompute the components whose latest state changed since their
+        vector, and drop the vectors of components without reports.
+
+        Returns:
+            Dictionary with the ``components`` refreshed and ``vectors``
+            stored.
+        """
+        self._delete_orphans()
+        stale = models.ComponentLatestState.objects.filter(
+            Q(component__feature_vector__isnull=True)
+            | Q(refreshed__gt=F("component__feature_vector__refreshed"))
+        ).values_list("component_id", flat=True)
+        return self.refresh(stale)
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        Recompute the vectors of every component with reports.
+
+        Returns:
+            Dictionary with the ``components`` refreshed and ``vectors``
+            stored.
+        """
+        self._delete_orphans()
+        return self.refresh(
+            models.ComponentLatestState.objects.values_list(
+                "component_id", flat=True
+            )
+        )
+
+    def _delete_orphans(self) -> None:
+        """Drop the vectors of components without a latest state."""
+        orphans = models.ComponentFeatureVector.objects.filter(
+            component__latest_state__isnull=True
+        )
+        organization_ids = set(
+            orphans.values_list("organization_id", flat=True)
+        )
+        orphans.delete()
+        tiered_cache.invalidate_tags(
+            *[org_tag(pk) for pk in organization_ids if pk is not None]
+        )
+
+    def _store(self, component_ids: List[int], features: pl.DataFrame) -> int:
+        """Replace the vectors of a chunk of components."""
+        objects = [
+            models.ComponentFeatureVector(
+                component_id=row[COMPONENT_COLUMN],
+                organization_id=row[ORGANIZATION_COLUMN],
+                vector=pack_vector([row[name] for name in FEATURE_NAMES]),
+                sample_count=row["sample_count"],
+                last_sample_date=row["last_sample_date"],
+            )
+            for row in features.iter_rows(named=True)
+        ]
+        stale = models.ComponentFeatureVector.objects.filter(
+            component_id__in=component_ids
+        )
+        organization_ids = {obj.organization_id for obj in objects}
+        organization_ids.update(
+            stale.values_list("organization_id", flat=True)
+        )
+        with transaction.atomic():
+            stale.delete()
+            models.ComponentFeatureVector.objects.bulk_create(
+                objects, batch_size=1000
+            )
+
+        # The similarity index is cached per organization
+        tiered_cache.invalidate_tags(
+            *[org_tag(pk) for pk in organization_ids if pk is not None]
+        )
+        return len(objects)
@@ -0,0 +1,105 @@
+"""Service for bulk status transitions of inspection reports."""
+
+import logging
+from typing import Any, Dict
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from apps.core.models import StatusHistory
+from apps.reports import choices, models
+
+logger = logging.getLogger(__name__)
+
+
+class ReportStatusTransitionService:
+    """
+    Service for changing the status of many reports at once.
+
+    Locks the selected reports, updates them with one UPDATE per
+    ``batch_size`` primary keys and writes the matching StatusHistory
+    rows with ``bulk_create``, so reviewers can approve or review whole
+    batches of reports.
+    """
+
+    def __init__(self, user, batch_size: int = 1000) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            user: User performing the transition.
+            batch_size: Rows per UPDATE and per StatusHistory insert
+                batch.
+        """
+        self.user = user
+        self.batch_size = batch_size
+
+    def transition(
+        self, queryset: QuerySet, new_status: str, note: str = ""
+    ) -> Dict[str, Any]:
+        """
+        Move every report in ``queryset`` to ``new_status``.
+
+        Reports already in ``new_status`` are left untouched and reported
+        as skipped.
+
+        Args:
+            queryset: Reports to transition.
+            new_status: Target ReportStatus value.
+            note: Optional note recorded in the status history.
+
+        Returns:
+            Dictionary with ``updated`` and ``skipped`` counts and the
+            target ``new_status``.
+
+        Raises:
+            ValidationError: If ``new_status`` is not a valid status.
+        """
+        if new_status not in choices.ReportStatus.values:
+            raise ValidationError(
+                f"Invalid report status: {new_status}", code="invalid"
+            )
+
+        with transaction.atomic():
+            pending = queryset.order_by().exclude(status=new_status)
+            # Lock the rows so the history matches what the UPDATE changed
+            changes = list(
+                pending.select_for_update(of=("self",)).values_list(
+                    "pk", "status"
+                )
+            )
+            skipped = queryset.order_by().filter(status=new_status).count()
+
+            if changes:
+                # Only the locked rows, which the history describes
+                pks = [pk for pk, _ in changes]
+                modified = timezone.now()
+                for start in range(0, len(pks), self.batch_size):
+                    models.Report.objects.filter(
+                        pk__in=pks[start : start + self.batch_size]
+                    ).update(
+                        status=new_status,
+                        modified_by=self.user,
+                        modified=modified,
+                    )
+                StatusHistory.bulk_create_status_changes(
+                    models.Report,
+                    changes,
+                    new_status,
+                    self.user,
+                    note=note,
+                    batch_size=self.batch_size,
+                )
+
+        logger.info(
+            f"Bulk status transition to {new_status} - "
+            f"User: {getattr(self.user, 'email', None)}, "
+            f"Updated: {len(changes)}, Skipped: {skipped}"
+        )
+        return {
+            "new_status": new_status,
+            "updated": len(changes),
+            "skipped": skipped,
+        }
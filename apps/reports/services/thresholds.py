@@ -0,0 +1,308 @@
+"""
+Condition thresholds per component type and lubricant grade.
+
+DEFAULT_THRESHOLDS holds the fleet-wide limits. ThresholdProfile rows
+override them per component type and/or lubricant, and the unset
+acceptable ranges (viscosity) come from the fleet LubricantBaseline
+statistics or, lacking those, from the SAE grade. Profiles and baselines
+are compiled into one lookup table that lives in the tiered cache, so the
+dashboard and the condition classification resolve thresholds with dict
+lookups instead of queries. Saving or deleting a profile or limit and
+refreshing the baselines invalidate the table in every process.
+"""
+
+import copy
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from apps.core.cache import tiered_cache
+from apps.reports import models
+
+logger = logging.getLogger(__name__)
+
+THRESHOLD_PROFILES_TAG = "thresholds"
+THRESHOLD_PROFILES_KEY = "thresholds:profiles"
+
+# Threshold groups: {group: {parameter: {limit: value}}}
+Thresholds = Dict[str, Dict[str, Dict[str, Any]]]
+
+# Profile key: (component type id or None, normalized lubricant or "")
+ProfileKey = Tuple[Optional[int], str]
+
+# Threshold constants (in ppm for metals, other units as specified)
+DEFAULT_THRESHOLDS: Thresholds = {
+    "wear_metals": {
+        "iron_fe": {"warning": 75, "critical": 100, "unit": "ppm"},
+        "copper_cu": {"warning": 20, "critical": 30, "unit": "ppm"},
+        "aluminum_al": {"warning": 15, "critical": 25, "unit": "ppm"},
+    },
+    "contamination": {
+        "silicon_si": {"warning": 15, "critical": 20, "unit": "ppm"},
+        "sodium_na": {"warning": 30, "critical": 50, "unit": "ppm"},
+        "potassium_k": {"warning": 10, "critical": 15, "unit": "ppm"},
+    },
+    "oil_health": {
+        "silicon_si": {"warning": 15, "critical": 20, "unit": "ppm"},
+        "sodium_na": {"warning": 30, "critical": 50, "unit": "ppm"},
+        "potassium_k": {"warning": 10, "critical": 15, "unit": "ppm"},
+        "viscosity_100c": {
+            # Derived from the SAE grade of the lubricant when not set
+            "warning_low": None,
+            "warning_high": None,
+            "unit": "cSt",
+        },
+    },
+    "additives": {
+        "zinc_zn": {"warning": 800, "critical": 600, "unit": "ppm"},
+        "phosphorus_p": {"warning": 900, "critical": 700, "unit": "ppm"},
+        "magnesium_mg": {"warning": 1800, "critical": 1500, "unit": "ppm"},
+        "calcium_ca": {"warning": 2000, "critical": 1500, "unit": "ppm"},
+    },
+}
+
+# SAE J300 kinematic viscosity ranges at 100 °C (cSt) by grade
+SAE_VISCOSITY_100C: Dict[int, Tuple[float, float]] = {
+    8: (4.0, 6.1),
+    12: (5.0, 7.1),
+    16: (6.1, 8.2),
+    20: (6.9, 9.3),
+    30: (9.3, 12.5),
+    40: (12.5, 16.3),
+    50: (16.3, 21.9),
+    60: (21.9, 26.1),
+}
+
+# "15W40", "15W-40" (multigrade, hot grade) or "SAE 30"
+_SAE_GRADE = re.compile(r"\b\d{1,2}W-?(\d{1,2})\b|\bSAE\s*(\d{1,2})\b")
+
+_LIMIT_FIELDS = ("warning", "critical", "warning_low", "warning_high", "unit")
+_BASELINE_FIELDS = (
+    "sample_count",
+    "median",
+    "mad",
+    "p05",
+    "p95",
+    "warning_low",
+    "warning_high",
+)
+
+
+def viscosity_band(lubricant: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    Return the SAE J300 viscosity range at 100 °C of a lubricant grade.
+
+    Args:
+        lubricant: Lubricant as reported by the lab (e.g. "15W40").
+
+    Returns:
+        ``(low, high)`` in cSt, or None for unknown or ISO VG grades.
+    """
+    match = _SAE_GRADE.search(
+        models.ThresholdProfile.normalize_lubricant(lubricant)
+    )
+    if not match:
+        return None
+    return SAE_VISCOSITY_100C.get(int(match.group(1) or match.group(2)))
+
+
+class CompiledThresholds:
+    """
+    Lookup table of the active threshold profiles and fleet baselines.
+
+    Attributes:
+        profiles: Limit overrides by profile key, as
+            ``{key: {parameter: (group, {limit: value})}}``.
+        baselines: Fleet statistics by profile key, as
+            ``{key: {parameter: {statistic: value}}}``.
+    """
+
+    def __init__(
+        self,
+        profiles: Dict[ProfileKey, Dict[str, Tuple[str, Dict[str, Any]]]],
+        baselines: Optional[
+            Dict[ProfileKey, Dict[str, Dict[str, Any]]]
+        ] = None,
+        defaults: Thresholds = DEFAULT_THRESHOLDS,
+    ) -> None:
+        self.profiles = profiles
+        self.baselines = baselines or {}
+        self.defaults = defaults
+        self._resolved: Dict[Tuple, Thresholds] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Resolved thresholds are rebuilt lazily in each process
+        return {**self.__dict__, "_resolved": {}}
+
+    @property
+    def parameters(self) -> List[str]:
+        """Return every parameter with limits in any profile."""
+        parameters = {
+            parameter
+            for group in self.defaults.values()
+            for parameter in group
+        }
+        for overrides in self.profiles.values():
+            parameters.update(overrides)
+        return sorted(parameters)
+
+    def match(
+        self, component_type_id: Optional[int], lubricant: Optional[str]
+    ) -> Tuple:
+        """
+        Return the resolution key of a component type and lubricant.
+
+        Pairs with equal keys resolve to the same thresholds.
+
+        Returns:
+            The matching profile keys (least specific first), the
+            matching baseline keys (most specific first) and the
+            viscosity band of the lubricant grade.
+        """
+        lubricant = models.ThresholdProfile.normalize_lubricant(lubricant)
+        candidates = [(None, ""), (None, lubricant)]
+        if component_type_id is not None:
+            candidates += [
+                (component_type_id, ""),
+                (component_type_id, lubricant),
+            ]
+        candidates = list(dict.fromkeys(candidates))
+        return (
+            tuple(key for key in candidates if key in self.profiles),
+            tuple(
+                key for key in reversed(candidates) if key in self.baselines
+            ),
+            viscosity_band(lubricant),
+        )
+
+    def resolve(
+        self, component_type_id: Optional[int], lubricant: Optional[str]
+    ) -> Thresholds:
+        """
+        Return the thresholds of a component type and lubricant.
+
+        The result is shared between callers and must not be modified.
+        """
+        return self.resolve_key(self.match(component_type_id, lubricant))
+
+    def resolve_key(self, key: Tuple) -> Thresholds:
+        """Return the thresholds of a :meth:`match` key."""
+        thresholds = self._resolved.get(key)
+        if thresholds is None:
+            thresholds = self._resolved[key] = self._merge(*key)
+        return thresholds
+
+    def _merge(
+        self,
+        profile_keys: Iterable[ProfileKey],
+        baseline_keys: Iterable[ProfileKey],
+        band: Optional[Tuple[float, float]],
+    ) -> Thresholds:
+        thresholds = copy.deepcopy(self.defaults)
+        for profile_key in profile_keys:
+            for parameter, (group, limits) in self.profiles[
+                profile_key
+            ].items():
+                # Parameters listed in several groups share their limits
+                groups = [
+                    name
+                    for name, parameters in thresholds.items()
+                    if parameter in parameters
+                ] or [group]
+                for name in groups:
+                    current = thresholds.setdefault(name, {}).get(
+                        parameter, {}
+                    )
+                    thresholds[name][parameter] = {**current, **limits}
+
+        # Unset ranges come from the most specific fleet baseline
+        baselines = [self.baselines[key] for key in baseline_keys]
+        for parameters in thresholds.values():
+            for parameter, limits in parameters.items():
+                baseline = next(
+                    (b[parameter] for b in baselines if parameter in b), None
+                )
+                if baseline is None:
+                    continue
+                limits["baseline"] = baseline
+                for name in ("warning_low", "warning_high"):
+                    if name in limits and limits[name] is None:
+                        limits[name] = baseline[name]
+
+        viscosity = thresholds.get("oil_health", {}).get("viscosity_100c")
+        if band and viscosity is not None:
+            if viscosity.get("warning_low") is None:
+                viscosity["warning_low"] = band[0]
+            if viscosity.get("warning_high") is None:
+                viscosity["warning_high"] = band[1]
+        return thresholds
+
+
+def compile_threshold_profiles() -> CompiledThresholds:
+    """Build the lookup table from the profiles and baselines (two queries)."""
+    profiles: Dict[ProfileKey, Dict[str, Tuple[str, Dict[str, Any]]]] = {}
+    rows = models.ThresholdLimit.objects.filter(
+        profile__is_active=True
+    ).values_list(
+        "profile__component_type_id",
+        "profile__lubricant",
+        "group",
+        "parameter",
+        *_LIMIT_FIELDS,
+    )
+    for component_type_id, lubricant, group, parameter, *values in rows:
+        limits = {
+            name: value
+            for name, value in zip(_LIMIT_FIELDS, values)
+            if value not in (None, "")
+        }
+        key = (
+            component_type_id,
+            models.ThresholdProfile.normalize_lubricant(lubricant),
+        )
+        profiles.setdefault(key, {})[parameter] = (group, limits)
+
+    baselines: Dict[ProfileKey, Dict[str, Dict[str, Any]]] = {}
+    for baseline in models.LubricantBaseline.objects.values(
+        "component_type_id", "lubricant", "parameter", *_BASELINE_FIELDS
+    ):
+        key = (baseline["component_type_id"], baseline["lubricant"])
+        baselines.setdefault(key, {})[baseline["parameter"]] = {
+            name: baseline[name] for name in _BASELINE_FIELDS
+        }
+
+    logger.info(
+        f"Compiled {len(profiles)} threshold profiles and "
+        f"{len(baselines)} lubricant baselines"
+    )
+    return CompiledThresholds(profiles, baselines)
+
+
+def compiled_thresholds() -> CompiledThresholds:
+    """Return the process-level lookup table, compiling it on a miss."""
+    return tiered_cache.get_or_set(
+        THRESHOLD_PROFILES_KEY,
+        compile_threshold_profiles,
+        tags=[THRESHOLD_PROFILES_TAG],
+    )
+
+
+def thresholds_for(
+    component_type_id: Optional[int] = None, lubricant: Optional[str] = ""
+) -> Thresholds:
+    """
+    Return the thresholds of a component type and lubricant.
+
+    Args:
+        component_type_id: ComponentType ID (None: any type).
+        lubricant: Lubricant as reported by the lab.
+
+    Returns:
+        Threshold groups, shaped like DEFAULT_THRESHOLDS (read-only).
+    """
+    return compiled_thresholds().resolve(component_type_id, lubricant)
+
+
+def invalidate_threshold_profiles() -> None:
+    """Drop the compiled lookup table in every process."""
+    tiered_cache.invalidate_tags(THRESHOLD_PROFILES_TAG)
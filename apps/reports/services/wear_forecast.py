@@ -0,0 +1,446 @@
+"""
+Wear-rate trends and remaining-life forecasts of the whole fleet.
+
+Fits the wear metal levels of every component against lubricant usage
+(hours, or kilometers when hours are not reported) with grouped least
+squares in one vectorized polars pass. Wear metals reset on oil changes,
+so every oil fill gets its own intercept and the wear rate is the pooled
+within-fill slope over the last samples of the component. The current
+fill is projected to the warning and critical limits of the component's
+thresholds, and usage is converted to dates with the component's usage
+per day, fitted the same way.
+
+Forecasts are refreshed per component: after each upload for the
+components that received samples, and nightly for the components whose
+latest state changed since their forecast.
+"""
+
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import polars as pl
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.core.cache import component_tag, tiered_cache
+from apps.reports import choices, models
+from apps.reports.services.thresholds import Thresholds, thresholds_for
+
+logger = logging.getLogger(__name__)
+
+WEAR_PARAMETERS: Tuple[str, ...] = ("iron_fe", "copper_cu", "aluminum_al")
+
+COMPONENT_COLUMN = "component_id"
+TYPE_COLUMN = "component_type_id"
+LUBRICANT_COLUMN = "lubricant"
+
+_FORECAST_FIELDS = (
+    "basis",
+    "sample_count",
+    "wear_rate",
+    "slope_stderr",
+    "confidence",
+    "level",
+    "usage",
+    "usage_per_day",
+    "last_sample_date",
+    "warning_limit",
+    "critical_limit",
+    "warning_date",
+    "critical_date",
+)
+
+
+def wear_limits(
+    thresholds: Thresholds, parameter: str
+) -> Tuple[Optional[float], Optional[float]]:
+    """Return the ``(warning, critical)`` limits of a parameter."""
+    for parameters in thresholds.values():
+        if parameter in parameters:
+            limits = parameters[parameter]
+            return limits.get("warning"), limits.get("critical")
+    return None, None
+
+
+class WearForecastService:
+    """
+    Fits and stores the WearForecast table.
+
+    Attributes:
+        parameters: Wear metal fields to forecast.
+        window: Most recent samples of a component used in the fit.
+        min_samples: Minimum samples of a component and parameter.
+        horizon_days: Crossings projected further out are left empty.
+        batch_size: Components fitted per chunk.
+    """
+
+    def __init__(
+        self,
+        parameters: Sequence[str] = WEAR_PARAMETERS,
+        window: int = 12,
+        min_samples: int = 4,
+        horizon_days: int = 365,
+        batch_size: int = 5000,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            parameters: Wear metal fields to forecast.
+            window: Most recent samples of a component used in the fit.
+            min_samples: Minimum samples of a component and parameter.
+            horizon_days: Crossings projected further out are left empty.
+            batch_size: Components fitted per chunk.
+        """
+        self.parameters = list(parameters)
+        self.window = window
+        self.min_samples = min_samples
+        self.horizon_days = horizon_days
+        self.batch_size = batch_size
+
+    def fit(self, df: pl.DataFrame) -> pl.DataFrame:
+        """
+        Fit the wear rate of every component and parameter.
+
+        Args:
+            df: One row per report with ``component_id``,
+                ``component_type_id``, ``lubricant``, ``sample_date``,
+                ``lubricant_hours``, ``lubricant_kms`` and the parameters.
+
+        Returns:
+            One row per fitted (component, parameter) with the wear rate
+            per 100 units of usage, its standard error, the R² of the fit,
+            the fitted level and usage at the last sample and the usage
+            per day.
+        """
+        component = pl.col(COMPONENT_COLUMN)
+        usage = pl.col("usage")
+        value = pl.col("value")
+        fill = [COMPONENT_COLUMN, "parameter", "fill"]
+        # Deviations from the means of each oil fill
+        dx = usage - usage.mean().over(fill)
+        dy = value - value.mean().over(fill)
+        dd = pl.col("day") - pl.col("day").mean().over(fill)
+        last_fill = pl.col("fill") == pl.col("fill").max()
+
+        samples = (
+            df.lazy()
+            .with_columns(
+                pl.when(pl.col("lubricant_hours").is_not_null())
+                .then(pl.lit(str(choices.UsageBasis.HOURS)))
+                .otherwise(pl.lit(str(choices.UsageBasis.KMS)))
+                .alias("basis"),
+                pl.coalesce("lubricant_hours", "lubricant_kms")
+                .cast(pl.Float64)
+                .alias("usage"),
+                pl.col("sample_date").cast(pl.Int32).alias("day"),
+                pl.col(LUBRICANT_COLUMN).fill_null(""),
+            )
+            .filter(usage.is_not_null() & pl.col("sample_date").is_not_null())
+            .sort(COMPONENT_COLUMN, "sample_date", "pk")
+            # The latest samples measured like the newest one
+            .filter(pl.col("basis") == pl.col("basis").last().over(component))
+            .filter(
+                usage.cum_count(reverse=True).over(component) <= self.window
+            )
+            # Lubricant usage restarts after an oil change
+            .with_columns(
+                (usage < usage.shift(1))
+                .fill_null(False)
+                .cum_sum()
+                .over(component)
+                .alias("fill")
+            )
+            .unpivot(
+                index=[
+                    COMPONENT_COLUMN,
+                    TYPE_COLUMN,
+                    LUBRICANT_COLUMN,
+                    "sample_date",
+                    "basis",
+                    "usage",
+                    "day",
+                    "fill",
+                ],
+                on=self.parameters,
+                variable_name="parameter",
+                value_name="value",
+            )
+            .with_columns(value.cast(pl.Float64))
+            .filter(value.is_not_null())
+            .with_columns(
+                dx.alias("dx"), dy.alias("dy"), dd.cast(pl.Float64).alias("dd")
+            )
+        )
+
+        sums = samples.group_by(COMPONENT_COLUMN, "parameter").agg(
+            pl.len().alias("sample_count"),
+            pl.col("fill").n_unique().alias("fills"),
+            (pl.col("dx") ** 2).sum().alias("sxx"),
+            (pl.col("dx") * pl.col("dy")).sum().alias("sxy"),
+            (pl.col("dy") ** 2).sum().alias("syy"),
+            (pl.col("dd") ** 2).sum().alias("sdd"),
+            (pl.col("dx") * pl.col("dd")).sum().alias("sxd"),
+            pl.col(TYPE_COLUMN, LUBRICANT_COLUMN, "basis")
+            .sort_by("sample_date")
+            .last(),
+            pl.col("usage").sort_by("sample_date").last(),
+            pl.col("sample_date").max().alias("last_sample_date"),
+            value.filter(last_fill).mean().alias("fill_value"),
+            usage.filter(last_fill).mean().alias("fill_usage"),
+        )
+
+        slope = pl.col("sxy") / pl.col("sxx")
+        dof = pl.col("sample_count") - pl.col("fills") - 1
+        residual = (pl.col("syy") - slope * pl.col("sxy")).clip(lower_bound=0)
+        return (
+            sums.filter(
+                (pl.col("sample_count") >= self.min_samples)
+                & (pl.col("sxx") > 0)
+                & (dof >= 1)
+            )
+            .with_columns(
+                (slope * 100).alias("wear_rate"),
+                ((residual / dof / pl.col("sxx")).sqrt() * 100).alias(
+                    "slope_stderr"
+                ),
+                pl.when(pl.col("syy") > 0)
+                .then(pl.col("sxy") ** 2 / (pl.col("sxx") * pl.col("syy")))
+                .otherwise(0.0)
+                .alias("confidence"),
+                (
+                    pl.col("fill_value")
+                    + slope * (pl.col("usage") - pl.col("fill_usage"))
+                ).alias("level"),
+                pl.when(pl.col("sdd") > 0)
+                .then(pl.col("sxd") / pl.col("sdd"))
+                .alias("usage_per_day"),
+            )
+            .drop("fills", "sxx", "sxy", "syy", "sdd", "sxd")
+            .drop("fill_value", "fill_usage")
+            .sort(COMPONENT_COLUMN, "parameter")
+            .collect()
+        )
+
+    def project(self, fits: pl.DataFrame) -> pl.DataFrame:
+        """
+        Project the fitted trends to the threshold limits.
+
+        The limits come from the thresholds of each component type and
+        lubricant; higher values are worse.
+
+        Args:
+            fits: Output of :meth:`fit`.
+
+        Returns:
+            ``fits`` with the ``warning_limit``/``critical_limit`` and the
+            projected ``warning_date``/``critical_date`` (the last sample
+            date when already reached, empty when not rising or beyond
+            the horizon).
+        """
+        rows = []
+        pairs = fits.select(TYPE_COLUMN, LUBRICANT_COLUMN).unique()
+        for type_id, lubricant in pairs.iter_rows():
+            thresholds = thresholds_for(type_id, lubricant)
+            rows += [
+                (
+                    type_id,
+                    lubricant,
+                    parameter,
+                    *wear_limits(thresholds, parameter),
+                )
+                for parameter in self.parameters
+            ]
+        limits = pl.DataFrame(
+            rows,
+            schema={
+                TYPE_COLUMN: pl.Int64,
+                LUBRICANT_COLUMN: pl.Utf8,
+                "parameter": pl.Utf8,
+                "warning_limit": pl.Float64,
+                "critical_limit": pl.Float64,
+            },
+            orient="row",
+        )
+
+        def crossing(limit: str) -> pl.Expr:
+            level = pl.col("level")
+            rate = pl.col("wear_rate") / 100 * pl.col("usage_per_day")
+            days = (
+                pl.when(level >= pl.col(limit))
+                .then(0.0)
+                .when(rate > 0)
+                .then((pl.col(limit) - level) / rate)
+            )
+            return (
+                pl.when(days <= self.horizon_days)
+                .then(
+                    pl.col("last_sample_date")
+                    + pl.duration(days=days.ceil().cast(pl.Int64))
+                )
+                .alias(limit.replace("_limit", "_date"))
+            )
+
+        return fits.join(
+            limits,
+            on=[TYPE_COLUMN, LUBRICANT_COLUMN, "parameter"],
+            how="left",
+            nulls_equal=True,
+        ).with_columns(crossing("warning_limit"), crossing("critical_limit"))
+
+    def load(self, component_ids: Sequence[int]) -> pl.DataFrame:
+        """
+        Read the active dated reports of some components.
+
+        Args:
+            component_ids: Components to read.
+
+        Returns:
+            Frame with one row per report, as expected by :meth:`fit`.
+        """
+        rows = models.Report.objects.filter(
+            component_id__in=component_ids,
+            is_active=True,
+            sample_date__isnull=False,
+            analysis__isnull=False,
+        ).values_list(
+            "pk",
+            "component_id",
+            "component__type_id",
+            "lubricant",
+            "sample_date",
+            "lubricant_hours",
+            "lubricant_kms",
+            *[f"analysis__{parameter}" for parameter in self.parameters],
+        )
+        return pl.DataFrame(
+            list(rows),
+            schema={
+                "pk": pl.Int64,
+                COMPONENT_COLUMN: pl.Int64,
+                TYPE_COLUMN: pl.Int64,
+                LUBRICANT_COLUMN: pl.Utf8,
+                "sample_date": pl.Date,
+                "lubricant_hours": pl.Int64,
+                "lubricant_kms": pl.Int64,
+                **{parameter: pl.Float64 for parameter in self.parameters},
+            },
+            orient="row",
+        )
+
+    def refresh(
+        self, component_ids: Iterable[Optional[int]]
+    ) -> Dict[str, int]:
+        """
+        Refit the forecasts of some components.
+
+        Args:
+            component_ids: Components that received samples (None ignored).
+
+        Returns:
+            Dictionary with the ``components`` refitted and ``forecasts``
+            stored.
+        """
+        ids = sorted({pk for pk in component_ids if pk is not None})
+        stored = 0
+        for start in range(0, len(ids), self.batch_size):
+            chunk = ids[start : start + self.batch_size]
+            # Before the read: reports loaded meanwhile make it stale
+            fitted = timezone.now()
+            forecasts = self.project(self.fit(self.load(chunk)))
+            stored += self._store(chunk, forecasts, fitted)
+
+        logger.info(f"Stored {stored} wear forecasts of {len(ids)} components")
+        return {"components": len(ids), "forecasts": stored}
+
+    def refresh_stale(self) -> Dict[str, int]:
+        """
+        Refit the components whose latest state changed since their
+        forecast, and drop the forecasts of components without reports.
+
+        Returns:
+            Dictionary with the ``components`` refitted and ``forecasts``
+            stored.
+        """
+        models.WearForecast.objects.filter(
+            component__latest_state__isnull=True
+        ).delete()
+        # Components too short to fit have no forecast but a fit time
+        stale = models.ComponentLatestState.objects.filter(
+            Q(forecasted__isnull=True) | Q(refreshed__gt=F("forecasted"))
+        ).values_list("component_id", flat=True)
+        return self.refresh(stale)
+
+    def rebuild(self) -> Dict[str, int]:
+        """
+        Refit the forecasts of every component with reports.
+
+        Returns:
+            Dictionary with the ``components`` refitted and ``forecasts``
+            stored.
+        """
+        models.WearForecast.objects.filter(
+            component__latest_state__isnull=True
+        ).delete()
+        return self.refresh(
+            models.ComponentLatestState.objects.values_list(
+                "component_id", flat=True
+            )
+        )
+
+    def _store(
+        self,
+        component_ids: List[int],
+        forecasts: pl.DataFrame,
+        fitted: datetime,
+    ) -> int:
+        """Replace the forecasts of a chunk of components."""
+        objects = [
+            models.WearForecast(
+                component_id=row[COMPONENT_COLUMN],
+                parameter=row["parameter"],
+                **{name: row[name] for name in _FORECAST_FIELDS},
+            )
+            for row in forecasts.iter_rows(named=True)
+        ]
+        with transaction.atomic():
+            models.WearForecast.objects.filter(
+                component_id__in=component_ids
+            ).delete()
+            models.WearForecast.objects.bulk_create(objects, batch_size=1000)
+            models.ComponentLatestState.objects.filter(
+                component_id__in=component_ids
+            ).update(forecasted=fitted)
+
+        # Forecasts are part of the cached component analysis
+        tiered_cache.invalidate_tags(
+            *[component_tag(pk) for pk in component_ids]
+        )
+        return len(objects)
+
+
+def forecasts_by_parameter(component_id: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Return the stored forecasts of a component for the dashboard.
+
+    Args:
+        component_id: Component ID.
+
+    Returns:
+        ``{parameter: forecast}`` with JSON serializable values.
+    """
+    return {
+        forecast["parameter"]: {
+            **forecast,
+            "last_sample_date": forecast["last_sample_date"].isoformat(),
+            "warning_date": forecast["warning_date"]
+            and forecast["warning_date"].isoformat(),
+            "critical_date": forecast["critical_date"]
+            and forecast["critical_date"].isoformat(),
+        }
+        for forecast in models.WearForecast.objects.filter(
+            component_id=component_id
+        ).values("parameter", *_FORECAST_FIELDS)
+    }
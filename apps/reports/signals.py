@@ -0,0 +1,101 @@
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from apps.equipment.models import Component, Machine
+from apps.reports.models import (
+    ComponentLatestState,
+    LabAnalysis,
+    Report,
+    ThresholdLimit,
+    ThresholdProfile,
+)
+from apps.reports.services.latest_state import refresh_latest_states_on_commit
+from apps.reports.services.thresholds import invalidate_threshold_profiles
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration and index used to search report notes
+NOTES_SEARCH_CONFIG = "spanish"
+NOTES_SEARCH_INDEX = "report_notes_search_idx"
+
+
+def get_notes_search_vector():
+    """Return the expression indexed for full text search on notes."""
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector("notes", config=NOTES_SEARCH_CONFIG)
+
+
+@receiver(post_migrate)
+def create_notes_search_index(sender, using=DEFAULT_DB_ALIAS, **kwargs):
+    """
+    Create the GIN full text index on report notes on PostgreSQL.
+
+    The index is created outside the model ``Meta`` because it depends on
+    ``django.contrib.postgres``, which is not available on SQLite.
+    """
+    if sender.name != "apps.reports":
+        return
+
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return
+
+    from django.contrib.postgres.indexes import GinIndex
+
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(
+            cursor, Report._meta.db_table
+        )
+    if NOTES_SEARCH_INDEX in constraints:
+        return
+
+    index = GinIndex(get_notes_search_vector(), name=NOTES_SEARCH_INDEX)
+    with connection.schema_editor() as schema_editor:
+        schema_editor.add_index(Report, index)
+    logger.info(f"Created full text index {NOTES_SEARCH_INDEX}")
+
+
+@receiver([post_save, post_delete], sender=ThresholdProfile)
+@receiver([post_save, post_delete], sender=ThresholdLimit)
+def invalidate_thresholds(sender, instance, **kwargs):
+    """Recompile the threshold lookup table when a profile changes."""
+    invalidate_threshold_profiles()
+
+
+@receiver([post_save, post_delete], sender=Report)
+def refresh_report_component_state(sender, instance, **kwargs):
+    """Refresh the latest state of the report's component (and its former)."""
+    former = ComponentLatestState.objects.filter(
+        report_id=instance.pk
+    ).values_list("component_id", flat=True)
+    refresh_latest_states_on_commit([instance.component_id, *former])
+
+
+@receiver([post_save, post_delete], sender=LabAnalysis)
+def refresh_analysis_component_state(sender, instance, **kwargs):
+    """Refresh the measurements of the analysis' component."""
+    refresh_latest_states_on_commit(
+        Report.objects.filter(pk=instance.report_id).values_list(
+            "component_id", flat=True
+        )
+    )
+
+
+@receiver(post_save, sender=Component)
+def refresh_component_state(sender, instance, **kwargs):
+    """Refresh the machine and organization of a component's state."""
+    refresh_latest_states_on_commit([instance.pk])
+
+
+@receiver(post_save, sender=Machine)
+def refresh_machine_component_states(sender, instance, **kwargs):
+    """Refresh the organization of the states of a machine's components."""
+    refresh_latest_states_on_commit(
+        ComponentLatestState.objects.filter(machine=instance).values_list(
+            "component_id", flat=True
+        )
+    )
@@ -0,0 +1,105 @@
+import logging
+from typing import Dict, List, Optional
+
+from celery import shared_task
+
+from apps.reports.services.anomaly_scan import AnomalyScanService
+from apps.reports.services.baselines import LubricantBaselineService
+from apps.reports.services.similarity import ComponentSimilarityService
+from apps.reports.services.wear_forecast import WearForecastService
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def refresh_lubricant_baselines_task(
+    lubricants: Optional[List[str]] = None,
+) -> Dict[str, int]:
+    """
+    Celery task to recompute the fleet lubricant baselines.
+
+    Args:
+        lubricants: Lubricants of newly loaded reports, whose baselines
+            are recomputed. None rebuilds every baseline (nightly).
+
+    Returns:
+        Dictionary with the analyses read and baselines stored.
+    """
+    service = LubricantBaselineService()
+    if lubricants is None:
+        return service.rebuild()
+    return service.refresh(lubricants)
+
+
+@shared_task
+def refresh_wear_forecasts_task(
+    component_ids: Optional[List[int]] = None,
+) -> Dict[str, int]:
+    """
+    Celery task to refit the wear forecasts.
+
+    Args:
+        component_ids: Components that received samples. None refits the
+            components whose reports changed since their forecast
+            (nightly).
+
+    Returns:
+        Dictionary with the components refitted and forecasts stored.
+    """
+    service = WearForecastService()
+    if component_ids is None:
+        return service.refresh_stale()
+    return service.refresh(component_ids)
+
+
+@shared_task
+def scan_anomalies_task() -> Dict[str, int]:
+    """
+    Celery task to score the reports loaded since the last anomaly scan.
+
+    Returns:
+        Dictionary with the components rescored, new reports and
+        anomalies stored.
+    """
+    return AnomalyScanService().scan()
+
+
+@shared_task
+def refresh_feature_vectors_task(
+    component_ids: Optional[List[int]] = None,
+) -> Dict[str, int]:
+    """
+    Celery task to recompute the similar-component feature vectors.
+
+    Args:
+        component_ids: Components that received samples. None recomputes
+            the components whose reports changed since their vector
+            (nightly).
+
+    Returns:
+        Dictionary with the components refreshed and vectors stored.
+    """
+    service = ComponentSimilarityService()
+    if component_ids is None:
+        return service.refresh_stale()
+    return service.refresh(component_ids)
+
+
+@shared_task
+def refresh_ingested_task(
+    lubricants: List[str], component_ids: List[int]
+) -> None:
+    """
+    Celery task fanning out the refreshes after an ingest.
+
+    Args:
+        lubricants: Lubricants of the new reports, whose baselines are
+            recomputed.
+        component_ids: Components that received samples, whose wear
+            forecasts and feature vectors are recomputed.
+    """
+    if lubricants:
+        refresh_lubricant_baselines_task.delay(lubricants)
+    if component_ids:
+        refresh_wear_forecasts_task.delay(component_ids)
+        refresh_feature_vectors_task.delay(component_ids)
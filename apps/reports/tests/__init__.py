@@ -0,0 +1 @@
+"""Reports tests module."""
@@ -0,0 +1,124 @@
+"""
+Tests for the reports admin changelists.
+
+Checks that the changelists stay within a fixed number of queries as the
+table grows and that filters and search use the scalable lookups.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.reports import models
+from apps.reports.services.fleet_seeding import FleetSeedingService
+
+
+class ReportAdminTest(TestCase):
+    """Test cases for the scalable Report and LabAnalysis admins."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        cls.fleet = FleetSeedingService(
+            organizations=2,
+            machines_per_org=2,
+            components_per_machine=2,
+            samples_per_component=5,
+            seed=3,
+            prefix="ADM",
+        ).seed()
+        cls.report = models.Report.objects.create(
+            lab_number="XYZ-0001",
+            per_number="PER-777",
+            notes="Contaminación por polvo en el sistema",
+        )
+
+    def setUp(self) -> None:
+        self.client.force_login(self.user)
+        self.url = reverse("admin:reports_report_changelist")
+
+    def test_changelist_query_count_is_constant(self) -> None:
+        """Test that the changelist does not issue per-row queries."""
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.get(self.url, {"p": 1})
+        self.assertEqual(response.status_code, 200)
+
+        FleetSeedingService(
+            organizations=1,
+            machines_per_org=5,
+            components_per_machine=2,
+            samples_per_component=10,
+            seed=4,
+            prefix="MORE",
+        ).seed()
+
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url, {"p": 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(small), len(large))
+
+    def test_has_analysis_is_annotated(self) -> None:
+        """Test that has_analysis comes from the queryset annotation."""
+        response = self.client.get(self.url)
+
+        reports = {
+            report.lab_number: report
+            for report in response.context["cl"].result_list
+        }
+        self.assertFalse(reports["XYZ-0001"]._has_analysis)
+        self.assertTrue(reports["ADM-00000001"]._has_analysis)
+
+    def test_autocomplete_filter_renders_selected_only(self) -> None:
+        """Test that the organization filter renders an autocomplete."""
+        organization = self.fleet.organizations[0]
+
+        response = self.client.get(
+            self.url, {"organization__id__exact": organization.pk}
+        )
+
+        self.assertContains(response, "admin-autocomplete")
+        self.assertContains(response, organization.name)
+        self.assertNotContains(response, self.fleet.organizations[1].name)
+        self.assertEqual(
+            response.context["cl"].result_count,
+            models.Report.objects.filter(organization=organization).count(),
+        )
+
+    def test_search_by_prefix(self) -> None:
+        """Test that lab and PER numbers are matched by prefix."""
+        for term in ("XYZ", "xyz", "PER-77"):
+            response = self.client.get(self.url, {"q": term})
+            self.assertEqual(
+                list(response.context["cl"].result_list), [self.report]
+            )
+
+        response = self.client.get(self.url, {"q": "0001"})
+        self.assertNotIn(self.report, response.context["cl"].result_list)
+
+    def test_search_notes(self) -> None:
+        """Test that notes are searchable."""
+        response = self.client.get(self.url, {"q": "polvo"})
+
+        self.assertEqual(
+            list(response.context["cl"].result_list), [self.report]
+        )
+
+    def test_lab_analysis_totals_are_annotated(self) -> None:
+        """Test that LabAnalysis totals are computed in SQL."""
+        response = self.client.get(
+            reverse("admin:reports_labanalysis_changelist"),
+            {"o": "4"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        for analysis in response.context["cl"].result_list:
+            self.assertEqual(
+                analysis._total_wear_metals, analysis.total_wear_metals
+            )
+            self.assertEqual(
+                analysis._total_contaminants, analysis.total_contaminants
+            )
@@ -0,0 +1,198 @@
+"""
+Tests for the fleet anomaly scan.
+
+Covers scoring samples against their rolling history, the incremental
+watermark of the scan, the scan command and the top anomalies endpoint.
+"""
+
+from datetime import timedelta
+from io import StringIO
+
+import polars as pl
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import Max
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.core.cache import tiered_cache
+from apps.reports import models
+from apps.reports.factories import sample_frame
+from apps.reports.services.anomaly_scan import AnomalyScanService
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.users.models import Account
+
+
+def _samples(iron, zinc, component_id=1):
+    """Build a scan frame of one component."""
+    return sample_frame(
+        component_id, organization_id=1, iron_fe=iron, zinc_zn=zinc
+    )
+
+
+class AnomalyScoreTest(TestCase):
+    """Test cases for scoring samples against their history."""
+
+    def setUp(self) -> None:
+        self.service = AnomalyScanService(parameters=["iron_fe", "zinc_zn"])
+
+    def test_harmful_jumps_are_flagged(self) -> None:
+        """Test a wear metal spike and an additive drop."""
+        df = _samples(
+            [10, 11, 10, 12, 11, 10, 11, 40],
+            [1000, 1010, 990, 1000, 1005, 995, 1000, 600],
+        )
+
+        anomalies = self.service.score(df)
+
+        self.assertEqual(anomalies["pk"].to_list(), [8, 8])
+        iron, zinc = anomalies.to_dicts()
+        self.assertEqual(iron["parameter"], "iron_fe")
+        self.assertGreater(iron["z_score"], 3)
+        self.assertEqual(iron["history"], 7)
+        self.assertEqual(zinc["parameter"], "zinc_zn")
+        self.assertLess(zinc["z_score"], -3)
+
+    def test_harmless_direction_and_short_history(self) -> None:
+        """Test that drops of wear metals and young series are ignored."""
+        falling = _samples([40, 41, 40, 42, 41, 40, 41, 5], [None] * 8)
+        young = _samples([10, 11, 10, 90], [None] * 4, component_id=2)
+
+        anomalies = self.service.score(pl.concat([falling, young]))
+
+        self.assertTrue(anomalies.is_empty())
+
+    def test_only_the_given_reports_are_flagged(self) -> None:
+        """Test that the other reports are history only."""
+        df = _samples([10, 11, 10, 12, 11, 10, 11, 40], [None] * 8)
+
+        self.assertEqual(self.service.score(df, reports={8}).height, 1)
+        self.assertTrue(self.service.score(df, reports={7}).is_empty())
+
+
+class AnomalyScanTest(TestCase):
+    """Test cases for the incremental scan of the fleet."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
+            email="anomaly@example.com", password="password"
+        )
+        cls.fleet = FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=2,
+            samples_per_component=8,
+            seed=23,
+            prefix="ANM",
+        ).seed()
+        cls.component = cls.fleet.components[0]
+        # Loaded long before the scans, outside of their overlap
+        models.Report.objects.update(
+            created=timezone.now() - timedelta(days=1)
+        )
+
+    def setUp(self) -> None:
+        tiered_cache.clear_local()
+
+    def _add_spike(self, **fields) -> models.Report:
+        """Add a newest report of the component with an iron spike."""
+        previous = self.component.reports.order_by("-sample_date").first()
+        with self.captureOnCommitCallbacks(execute=True):
+            report = models.Report.objects.create(
+                **fields,
+                lab_number="ANM-SPIKE-1",
+                organization=self.fleet.organizations[0],
+                machine=self.component.machine,
+                component=self.component,
+                sample_date=previous.sample_date + timedelta(days=1),
+            )
+            models.LabAnalysis.objects.create(
+                report=report, iron_fe=(previous.analysis.iron_fe or 0) + 5000
+            )
+        return report
+
+    def test_scan_is_incremental(self) -> None:
+        """Test that a second scan only scores the new reports."""
+        service = AnomalyScanService()
+
+        first = service.scan()
+        second = service.scan()
+        report = self._add_spike()
+        third = service.scan()
+
+        self.assertEqual(first["components"], len(self.fleet.components))
+        self.assertEqual(first["reports"], models.Report.objects.count() - 1)
+        self.assertEqual(
+            second, {"components": 0, "reports": 0, "anomalies": 0}
+        )
+        self.assertEqual(third["components"], 1)
+        self.assertEqual(third["reports"], 1)
+        self.assertTrue(
+            models.ComponentAnomaly.objects.filter(
+                report=report, parameter="iron_fe"
+            ).exists()
+        )
+        self.assertGreater(
+            models.AnomalyScan.objects.order_by("-pk").first().watermark,
+            report.created,
+        )
+
+    def test_late_commits_are_scored(self) -> None:
+        """Test reports committed after a scan that saw higher IDs."""
+        service = AnomalyScanService()
+        last_pk = models.Report.objects.aggregate(last=Max("pk"))["last"]
+        models.Report.objects.create(
+            pk=last_pk + 2,
+            lab_number="ANM-LATER-1",
+            component=self.fleet.components[1],
+        )
+        service.scan()
+        scanned = models.AnomalyScan.objects.get().watermark
+
+        # Numbered and created before the scan, committed after it
+        report = self._add_spike(pk=last_pk + 1)
+        models.Report.objects.filter(pk=report.pk).update(
+            created=scanned - timedelta(minutes=1)
+        )
+        result = service.scan()
+
+        # The overlap also rescores the report of the first scan
+        self.assertEqual(result["reports"], 2)
+        self.assertTrue(
+            models.ComponentAnomaly.objects.filter(
+                report=report, parameter="iron_fe"
+            ).exists()
+        )
+
+    def test_full_command_rescans_the_history(self) -> None:
+        """Test that --full replaces the stored anomalies."""
+        self._add_spike()
+        call_command("scan_anomalies", stdout=StringIO())
+        stored = models.ComponentAnomaly.objects.count()
+        out = StringIO()
+
+        call_command("scan_anomalies", full=True, stdout=out)
+
+        self.assertIn(f"{stored} anomalies", out.getvalue())
+        self.assertEqual(models.ComponentAnomaly.objects.count(), stored)
+        self.assertEqual(models.AnomalyScan.objects.count(), 2)
+
+    def test_top_anomalies_endpoint(self) -> None:
+        """Test the ranked anomalies of the user's organization."""
+        Account.objects.create(
+            user=self.user, organization=self.fleet.organizations[0]
+        )
+        self.client.force_login(self.user)
+        report = self._add_spike()
+        AnomalyScanService().scan()
+        url = reverse("apps.dashboard:org_top_anomalies_api")
+
+        data = self.client.get(url, {"days": 100000, "limit": 1}).json()
+
+        self.assertEqual(len(data["anomalies"]), 1)
+        entry = data["anomalies"][0]
+        self.assertEqual(entry["report_id"], report.pk)
+        self.assertEqual(entry["parameter"], "iron_fe")
+        self.assertTrue(entry["is_latest"])
@@ -0,0 +1,208 @@
+"""
+Tests for the fleet lubricant baselines.
+
+Covers the vectorized median/MAD statistics, rebuilding and refreshing
+the baseline table, and the warning bands it feeds to the thresholds.
+"""
+
+from datetime import date, timedelta
+from io import StringIO
+
+import polars as pl
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.etl.services.fake_intertek import (
+    FakeIntertekConfig,
+    database_catalog,
+    generate_export_rows,
+    render_export,
+)
+from apps.reports import models
+from apps.reports.services.baselines import LubricantBaselineService
+from apps.reports.services.bulk_upload import ReportBulkUploadService
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.reports.services.thresholds import (
+    invalidate_threshold_profiles,
+    thresholds_for,
+)
+
+_STATISTICS = ("median", "mad", "p05", "p95", "warning_low", "warning_high")
+
+
+class BaselineComputeTest(TestCase):
+    """Test cases for LubricantBaselineService.compute."""
+
+    def test_robust_statistics_per_group(self) -> None:
+        """Test median, MAD, band and the fleet-wide rows."""
+        service = LubricantBaselineService(
+            parameters=["viscosity_100c"], min_samples=3
+        )
+        df = pl.DataFrame(
+            {
+                "component_type_id": [1, 1, 1, 1, 2, 2, 2],
+                "lubricant": ["15W40", "15w40 ", "15W40", "15W40"] + ["x"] * 3,
+                # The outlier barely moves the median and MAD; 0 is missing
+                "viscosity_100c": [14.0, 15.0, 16.0, 90.0, 0.0, 13.0, 13.0],
+            }
+        )
+
+        baselines = service.compute(df)
+
+        by_type = baselines.filter(pl.col("component_type_id") == 1).row(
+            0, named=True
+        )
+        self.assertEqual(by_type["lubricant"], "15W40")
+        self.assertEqual(by_type["sample_count"], 4)
+        self.assertEqual(by_type["median"], 15.5)
+        self.assertEqual(by_type["mad"], 1.0)
+        self.assertAlmostEqual(by_type["warning_low"], 15.5 - 3 * 1.4826)
+        self.assertAlmostEqual(by_type["warning_high"], 15.5 + 3 * 1.4826)
+        # Two valid samples of "X": below min_samples
+        self.assertEqual(
+            baselines.select("component_type_id", "lubricant").rows(),
+            [(1, "15W40"), (None, "15W40")],
+        )
+
+
+class BaselineTableTest(TestCase):
+    """Test cases for storing baselines and reading them back."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
+            email="baselines@example.com", password=None
+        )
+        FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=2,
+            samples_per_component=8,
+            seed=13,
+            prefix="BSL",
+        ).seed()
+
+    def setUp(self) -> None:
+        invalidate_threshold_profiles()
+        self.addCleanup(invalidate_threshold_profiles)
+        self.service = LubricantBaselineService(min_samples=5)
+
+    def test_rebuild_stores_every_group(self) -> None:
+        """Test that a rebuild replaces the table from the history."""
+        result = self.service.rebuild()
+        again = self.service.rebuild()
+
+        self.assertEqual(result["analyses"], 32)
+        self.assertEqual(again, result)
+        self.assertEqual(
+            models.LubricantBaseline.objects.count(), result["baselines"]
+        )
+        self.assertTrue(
+            models.LubricantBaseline.objects.filter(
+                component_type__isnull=True, parameter="viscosity_100c"
+            ).exists()
+        )
+
+    def test_thresholds_use_the_baseline_band(self) -> None:
+        """Test that viscosity bands come from the most specific baseline."""
+        self.service.rebuild()
+        baseline = models.LubricantBaseline.objects.filter(
+            component_type__isnull=False, parameter="viscosity_100c"
+        ).first()
+
+        viscosity = thresholds_for(
+            baseline.component_type_id, baseline.lubricant
+        )["oil_health"]["viscosity_100c"]
+
+        self.assertEqual(viscosity["warning_low"], baseline.warning_low)
+        self.assertEqual(viscosity["warning_high"], baseline.warning_high)
+        self.assertEqual(viscosity["baseline"]["median"], baseline.median)
+
+    def test_refresh_only_reads_the_given_lubricants(self) -> None:
+        """Test the incremental refresh of one lubricant."""
+        self.service.rebuild()
+        lubricant = models.LubricantBaseline.objects.first().lubricant
+        others = models.LubricantBaseline.objects.exclude(lubricant=lubricant)
+        other_ids = set(others.values_list("pk", flat=True))
+
+        result = self.service.refresh([lubricant.lower()])
+
+        self.assertEqual(
+            result["analyses"],
+            models.Report.objects.filter(lubricant=lubricant).count(),
+        )
+        self.assertEqual(set(others.values_list("pk", flat=True)), other_ids)
+
+    def test_refresh_reads_every_spelling(self) -> None:
+        """Test that the refresh reads lubricants stored unnormalized."""
+        report = (
+            models.Report.objects.filter(lubricant__contains=" ")
+            .order_by("pk")
+            .first()
+        )
+        lubricant = report.lubricant
+        models.Report.objects.filter(pk=report.pk).update(
+            lubricant=f" {lubricant.lower()}\t"
+        )
+        models.Report.objects.exclude(pk=report.pk).filter(
+            lubricant=lubricant
+        ).update(lubricant=lubricant.replace(" ", "  "))
+        spaced = models.Report.objects.exclude(pk=report.pk).filter(
+            lubricant__contains="  "
+        )
+
+        result = self.service.refresh([lubricant])
+
+        self.assertTrue(spaced.exists())
+        self.assertEqual(result["analyses"], spaced.count() + 1)
+
+    def test_ingest_refreshes_baselines(self) -> None:
+        """Test that uploads schedule a refresh of their lubricants."""
+        rows = generate_export_rows(
+            FakeIntertekConfig(
+                rows=3,
+                catalog=database_catalog(),
+                start_date=date.today() + timedelta(days=1),
+            )
+        )
+        service = ReportBulkUploadService(self.user)
+        df = service.scan_csv(render_export(rows, file_type=1)).collect()
+        normalize = models.ThresholdProfile.normalize_lubricant
+        lubricants = {
+            normalize(lubricant)
+            for lubricant in models.Report.objects.values_list(
+                "lubricant", flat=True
+            )
+        }
+        # Stale baselines the refresh must replace
+        models.LubricantBaseline.objects.bulk_create(
+            models.LubricantBaseline(
+                lubricant=lubricant,
+                parameter="tbn",
+                sample_count=0,
+                **dict.fromkeys(_STATISTICS, 0.0),
+            )
+            for lubricant in lubricants
+        )
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            results = service.process_dataframe(df)
+
+        self.assertEqual(results["created"], 3)
+        self.assertEqual(len(callbacks), 1)
+        uploaded = {
+            normalize(report.lubricant)
+            for report in models.Report.objects.order_by("-pk")[:3]
+        }
+        stale = models.LubricantBaseline.objects.filter(sample_count=0)
+        self.assertFalse(stale.filter(lubricant__in=uploaded).exists())
+        self.assertEqual(stale.count(), len(lubricants - uploaded))
+
+    def test_command(self) -> None:
+        """Test the compute_baselines command."""
+        out = StringIO()
+
+        call_command("compute_baselines", min_samples=5, stdout=out)
+
+        self.assertIn("from 32 analyses", out.getvalue())
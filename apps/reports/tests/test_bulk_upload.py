@@ -0,0 +1,109 @@
+"""
+Tests for the report bulk upload service.
+
+Covers the lazy CSV ingest path: schema, header filtering, watermark
+filtering and loading CSV files through process_file and the upload form.
+"""
+
+from datetime import date, timedelta
+
+import polars as pl
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from apps.etl.services.fake_intertek import (
+    FakeIntertekConfig,
+    database_catalog,
+    generate_export_rows,
+    render_export,
+)
+from apps.reports import forms, models
+from apps.reports.services.bulk_upload import ReportBulkUploadService
+from apps.reports.services.fleet_seeding import FleetSeedingService
+
+
+class ReportBulkUploadCSVTest(TestCase):
+    """Test cases for CSV ingest in ReportBulkUploadService."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
+            email="uploader@example.com", password=None
+        )
+        FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=1,
+            samples_per_component=1,
+            seed=3,
+            prefix="CSV",
+        ).seed()
+        cls.start = date.today() + timedelta(days=1)
+        cls.content = render_export(
+            generate_export_rows(
+                FakeIntertekConfig(
+                    rows=12,
+                    catalog=database_catalog(),
+                    start_date=cls.start,
+                    samples_per_day=4,
+                )
+            ),
+            file_type=1,
+        )
+
+    def setUp(self) -> None:
+        self.service = ReportBulkUploadService(self.user)
+
+    def test_scan_csv_skips_title_and_header(self) -> None:
+        """Test that the scan yields only data rows as text columns."""
+        df = self.service.scan_csv(self.content).collect()
+
+        self.assertEqual(df.shape, (12, 57))
+        self.assertEqual(df["column_1"][0], "FK-00000001")
+        self.assertEqual(set(df.schema.values()), {pl.Utf8})
+
+    def test_scan_csv_filters_by_watermark(self) -> None:
+        """Test that only rows sampled after the watermark are kept."""
+        df = self.service.scan_csv(
+            self.content, watermark=self.start + timedelta(days=1)
+        ).collect()
+
+        self.assertEqual(df["column_1"].to_list()[0], "FK-00000009")
+        self.assertEqual(len(df), 4)
+
+    def test_scan_csv_drops_extra_columns(self) -> None:
+        """Test that blank trailing columns are not materialized."""
+        lines = self.content.decode("utf-8").splitlines()
+        ragged = "\n".join(line + ",," for line in lines).encode("utf-8")
+
+        df = self.service.scan_csv(ragged).collect()
+
+        self.assertEqual(df.width, 57)
+
+    def test_process_csv_upload(self) -> None:
+        """Test that an uploaded CSV creates reports and analyses."""
+        upload = SimpleUploadedFile(
+            "export.csv", self.content, content_type="text/csv"
+        )
+
+        results = self.service.process_file(upload)
+
+        self.assertEqual(results["created"], 12, results["errors"])
+        report = models.Report.objects.get(lab_number="FK-00000001")
+        self.assertEqual(report.sample_date, self.start)
+        self.assertTrue(
+            models.LabAnalysis.objects.filter(report=report).exists()
+        )
+
+    def test_upload_form_accepts_csv(self) -> None:
+        """Test that the bulk upload form accepts CSV files."""
+        form = forms.ReportBulkUploadForm(
+            files={
+                "file": SimpleUploadedFile(
+                    "export.csv", self.content, content_type="text/csv"
+                )
+            }
+        )
+
+        self.assertTrue(form.is_valid(), form.errors)
@@ -0,0 +1,173 @@
+"""
+Tests for the threshold-based condition classification.
+
+Covers the vectorized classification of analyses, the fleet backfill
+(command and service) and classification at ingest.
+"""
+
+from datetime import date, timedelta
+from io import StringIO
+
+import polars as pl
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.etl.services.fake_intertek import (
+    FakeIntertekConfig,
+    database_catalog,
+    generate_export_rows,
+    render_export,
+)
+from apps.reports import choices, models
+from apps.reports.services.bulk_upload import ReportBulkUploadService
+from apps.reports.services.condition_classifier import (
+    ConditionClassificationService,
+)
+from apps.reports.services.fleet_seeding import FleetSeedingService
+
+
+class ConditionClassificationTest(TestCase):
+    """Test cases for ConditionClassificationService.classify."""
+
+    def setUp(self) -> None:
+        self.service = ConditionClassificationService()
+
+    def _classify(self, **values) -> dict:
+        """Classify one analysis with ``values`` (others missing)."""
+        df = pl.DataFrame(
+            {p: [values.get(p)] for p in self.service.parameters},
+            schema={p: pl.Float64 for p in self.service.parameters},
+        )
+        return self.service.classify(df).row(0, named=True)
+
+    def test_missing_values_are_normal(self) -> None:
+        """Test that an analysis without values is normal."""
+        row = self._classify()
+
+        self.assertEqual(row["computed_condition"], "NORMAL")
+        self.assertEqual(row["breached_parameters"], [])
+
+    def test_highest_level_wins(self) -> None:
+        """Test that the worst breached parameter sets the condition."""
+        row = self._classify(iron_fe=120, silicon_si=16, copper_cu=5)
+
+        self.assertEqual(row["computed_condition"], "CRITICAL")
+        self.assertEqual(
+            row["breached_parameters"],
+            [
+                {
+                    "parameter": "iron_fe",
+                    "group": "wear_metals",
+                    "value": 120.0,
+                    "limit": 100.0,
+                    "level": "CRITICAL",
+                },
+                {
+                    "parameter": "silicon_si",
+                    "group": "contamination",
+                    "value": 16.0,
+                    "limit": 15.0,
+                    "level": "CAUTION",
+                },
+            ],
+        )
+
+    def test_additives_are_breached_when_low(self) -> None:
+        """Test that additive limits apply to depleted (low) values."""
+        self.assertEqual(
+            self._classify(zinc_zn=700)["computed_condition"], "CAUTION"
+        )
+        self.assertEqual(
+            self._classify(zinc_zn=500)["computed_condition"], "CRITICAL"
+        )
+        self.assertEqual(
+            self._classify(zinc_zn=0)["computed_condition"], "NORMAL"
+        )
+
+
+class ConditionBackfillTest(TestCase):
+    """Test cases for classifying stored and ingested reports."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
+            email="classify@example.com", password=None
+        )
+        FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=2,
+            samples_per_component=6,
+            seed=11,
+            prefix="CLS",
+        ).seed()
+
+    def test_backfill_classifies_every_report(self) -> None:
+        """Test that the backfill fills and then keeps the conditions."""
+        service = ConditionClassificationService(batch_size=7)
+
+        first = service.classify_reports(models.Report.objects.all())
+        second = service.classify_reports(models.Report.objects.all())
+
+        self.assertEqual(first["processed"], 24)
+        self.assertEqual(first["updated"], 24)
+        self.assertEqual(second["updated"], 0)
+        self.assertFalse(
+            models.Report.objects.filter(computed_condition="").exists()
+        )
+
+    def test_threshold_changes_are_recomputed(self) -> None:
+        """Test that tightened thresholds reclassify the fleet."""
+        ConditionClassificationService().classify_reports(
+            models.Report.objects.all()
+        )
+        strict = ConditionClassificationService(
+            {"wear_metals": {"iron_fe": {"warning": 0, "critical": 1}}}
+        )
+
+        result = strict.classify_reports(models.Report.objects.all())
+
+        self.assertGreater(result["updated"], 0)
+        report = models.Report.objects.filter(analysis__iron_fe__gte=1).first()
+        self.assertEqual(
+            report.computed_condition, choices.ReportCondition.CRITICAL
+        )
+        self.assertEqual(
+            [p["parameter"] for p in report.breached_parameters], ["iron_fe"]
+        )
+
+    def test_command_filters_reports(self) -> None:
+        """Test the classify_reports command."""
+        out = StringIO()
+        since = date.today() + timedelta(days=3650)
+
+        call_command("classify_reports", since=since.isoformat(), stdout=out)
+        self.assertIn("Classified 0 reports", out.getvalue())
+
+        call_command("classify_reports", stdout=out)
+        self.assertIn("Classified 24 reports, 24 updated", out.getvalue())
+
+    def test_ingest_stores_computed_condition(self) -> None:
+        """Test that uploaded reports are classified at ingest."""
+        rows = generate_export_rows(
+            FakeIntertekConfig(
+                rows=3,
+                catalog=database_catalog(),
+                start_date=date.today() + timedelta(days=1),
+            )
+        )
+        rows[0][34] = 150  # Iron over the critical limit
+        service = ReportBulkUploadService(self.user)
+
+        service.process_dataframe(
+            service.scan_csv(render_export(rows, file_type=1)).collect()
+        )
+
+        report = models.Report.objects.get(lab_number=rows[0][1])
+        self.assertEqual(
+            report.computed_condition, choices.ReportCondition.CRITICAL
+        )
+        self.assertIn(
+            "iron_fe", [p["parameter"] for p in report.breached_parameters]
+        )
@@ -0,0 +1,271 @@
+"""
+Tests for the ingest data quality checks and the quarantine review.
+
+Covers the vectorized range, unit, cross-field and history checks, the
+quarantine of failing rows during uploads and releasing or discarding
+them from the admin.
+"""
+
+from datetime import date, timedelta
+from statistics import median
+
+import polars as pl
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.etl.services.fake_intertek import (
+    FakeIntertekConfig,
+    database_catalog,
+    generate_export_rows,
+    render_export,
+)
+from apps.reports import choices, models
+from apps.reports.services.bulk_upload import ReportBulkUploadService
+from apps.reports.services.data_quality import (
+    REASONS_COLUMN,
+    DataQualityService,
+)
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.reports.services.quarantine import QuarantineReviewService
+
+RECEPTION_DATE = 10
+IRON = 34
+VISCOSITY_40C = 20
+VISCOSITY_100C = 21
+
+
+def _frame(rows) -> pl.DataFrame:
+    """Build a ``column_N`` text frame from export rows."""
+    return pl.DataFrame(
+        [
+            [None if value is None else str(value) for value in row]
+            for row in rows
+        ],
+        schema={f"column_{i}": pl.Utf8 for i in range(57)},
+        orient="row",
+    )
+
+
+class DataQualityTestBase(TestCase):
+    """Shared fleet and export rows for the data quality tests."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_superuser(
+            email="quality@example.com", password="password"
+        )
+        FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=1,
+            samples_per_component=5,
+            seed=7,
+            prefix="DQ",
+        ).seed()
+        cls.rows = generate_export_rows(
+            FakeIntertekConfig(
+                rows=6,
+                catalog=database_catalog(),
+                start_date=date.today() + timedelta(days=1),
+                samples_per_day=3,
+            )
+        )
+
+    def _rows(self, changes):
+        """Return a copy of the rows with ``{row: {position: value}}``."""
+        rows = [list(row) for row in self.rows]
+        for index, values in changes.items():
+            for position, value in values.items():
+                rows[index][position] = value
+        return rows
+
+
+class DataQualityServiceTest(DataQualityTestBase):
+    """Test cases for DataQualityService.check."""
+
+    def setUp(self) -> None:
+        self.service = DataQualityService()
+
+    def test_plausible_rows_pass(self) -> None:
+        """Test that realistic rows are not flagged."""
+        clean, flagged = self.service.check(_frame(self.rows))
+
+        self.assertEqual(len(clean), 6)
+        self.assertEqual(len(flagged), 0)
+
+    def test_flags_unparseable_and_out_of_range_values(self) -> None:
+        """Test the non-numeric, range and ppm/% unit checks."""
+        rows = self._rows(
+            {
+                0: {IRON: "n/d"},
+                1: {IRON: "-5"},
+                2: {IRON: "0.04"},
+                3: {IRON: "-"},
+            }
+        )
+
+        clean, flagged = self.service.check(_frame(rows))
+
+        reasons = dict(
+            zip(flagged["column_1"].to_list(), flagged[REASONS_COLUMN])
+        )
+        self.assertEqual(len(clean), 3)
+        self.assertIn(
+            "iron_fe: value 'n/d' is not numeric", reasons[rows[0][1]]
+        )
+        self.assertIn("iron_fe: -5.0 below minimum 0", reasons[rows[1][1]])
+        self.assertIn("% value in a ppm column", reasons[rows[2][1]][0])
+
+    def test_flags_swapped_viscosity_and_dates(self) -> None:
+        """Test the cross-field checks."""
+        rows = self._rows(
+            {
+                0: {VISCOSITY_40C: "14.1", VISCOSITY_100C: "120.5"},
+                1: {RECEPTION_DATE: "01/01/2000"},
+            }
+        )
+
+        _, flagged = self.service.check(_frame(rows))
+
+        reasons = flagged[REASONS_COLUMN].to_list()
+        self.assertEqual(len(reasons), 2)
+        self.assertIn("swapped columns", " ".join(reasons[0]))
+        self.assertIn("after reception_date", " ".join(reasons[1]))
+
+    def test_flags_values_far_from_component_history(self) -> None:
+        """Test that unit slips are caught against the component history."""
+        serial = self.rows[0][5]
+        history = models.LabAnalysis.objects.filter(
+            report__machine__serial_number=serial,
+            report__component__type__name=self.rows[0][4],
+        ).values_list("iron_fe", flat=True)
+        typical = median(value or 0 for value in history)
+        self.assertGreaterEqual(typical, 1)
+
+        rows = self._rows({0: {IRON: str(int(typical * 150))}})
+        _, flagged = self.service.check(_frame(rows))
+
+        self.assertEqual(flagged["column_1"].to_list(), [rows[0][1]])
+        self.assertIn("component median", " ".join(flagged[REASONS_COLUMN][0]))
+
+    def test_check_is_vectorized_over_large_frames(self) -> None:
+        """Test that 100k rows are checked without per-row Python code."""
+        df = _frame(self.rows * 2)
+        df = pl.concat([df] * 8334).head(100_000)
+
+        clean, flagged = self.service.check(df)
+
+        self.assertEqual(len(clean) + len(flagged), 100_000)
+
+
+class QuarantineTest(DataQualityTestBase):
+    """Test cases for quarantining and reviewing upload rows."""
+
+    def setUp(self) -> None:
+        self.upload = ReportBulkUploadService(self.user)
+        self.rows = self._rows({1: {IRON: "abc"}, 4: {IRON: "0.5"}})
+        self.content = render_export(self.rows, file_type=1)
+
+    def _upload(self):
+        """Upload the export through process_dataframe."""
+        df = self.upload.scan_csv(self.content).collect()
+        return self.upload.process_dataframe(df, source="export.csv")
+
+    def test_failing_rows_are_quarantined(self) -> None:
+        """Test that failing rows are stored instead of loaded."""
+        results = self._upload()
+
+        self.assertEqual(results["created"], 4)
+        self.assertEqual(results["quarantined"], 2)
+        quarantined = models.QuarantinedRow.objects.order_by("row_number")
+        self.assertEqual(
+            [row.lab_number for row in quarantined],
+            [self.rows[1][1], self.rows[4][1]],
+        )
+        self.assertEqual(quarantined[0].source, "export.csv")
+        self.assertEqual(quarantined[0].data["column_34"], "abc")
+        self.assertFalse(
+            models.Report.objects.filter(lab_number=self.rows[1][1]).exists()
+        )
+
+    def test_reupload_does_not_quarantine_twice(self) -> None:
+        """Test that rows pending review are skipped on re-upload."""
+        self._upload()
+        results = self._upload()
+
+        self.assertEqual(results["skipped"], 6)
+        self.assertEqual(models.QuarantinedRow.objects.count(), 2)
+
+    def test_release_loads_rows(self) -> None:
+        """Test that released rows are loaded and linked to the report."""
+        self._upload()
+
+        results = QuarantineReviewService(self.user).release(
+            models.QuarantinedRow.objects.all()
+        )
+
+        self.assertEqual(results["released"], 2)
+        row = models.QuarantinedRow.objects.get(lab_number=self.rows[1][1])
+        self.assertEqual(row.status, choices.QuarantineStatus.RELEASED)
+        self.assertEqual(row.report.lab_number, self.rows[1][1])
+        self.assertEqual(row.report.analysis.iron_fe, 0)
+
+    def test_release_skips_existing_reports(self) -> None:
+        """Test that rows loaded since quarantine are not linked to them."""
+        self._upload()
+        existing = models.Report.objects.get(lab_number=self.rows[0][1])
+        existing.lab_number = self.rows[1][1]
+        existing.save()
+
+        results = QuarantineReviewService(self.user).release(
+            models.QuarantinedRow.objects.all()
+        )
+
+        self.assertEqual((results["released"], results["failed"]), (1, 1))
+        row = models.QuarantinedRow.objects.get(lab_number=self.rows[1][1])
+        self.assertEqual(row.status, choices.QuarantineStatus.PENDING)
+        self.assertIsNone(row.report)
+
+    def test_release_keeps_unloadable_rows_pending(self) -> None:
+        """Test that rows that still fail to load stay pending."""
+        models.QuarantinedRow.objects.create(
+            lab_number="BAD-1",
+            data={"column_1": "BAD-1", "column_2": "Unknown org"},
+            reasons=["iron_fe: value 'x' is not numeric"],
+        )
+
+        results = QuarantineReviewService(self.user).release(
+            models.QuarantinedRow.objects.all()
+        )
+
+        self.assertEqual(results["failed"], 1)
+        self.assertEqual(
+            models.QuarantinedRow.objects.get().status,
+            choices.QuarantineStatus.PENDING,
+        )
+
+    def test_admin_bulk_actions(self) -> None:
+        """Test the release and discard admin actions."""
+        self._upload()
+        first, second = models.QuarantinedRow.objects.order_by("row_number")
+        url = reverse("admin:reports_quarantinedrow_changelist")
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.client.post(
+            url, {"action": "discard_rows", "_selected_action": [first.pk]}
+        )
+        self.client.post(
+            url,
+            {
+                "action": "release_rows",
+                "_selected_action": [first.pk, second.pk],
+            },
+        )
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.status, choices.QuarantineStatus.DISCARDED)
+        self.assertEqual(second.status, choices.QuarantineStatus.RELEASED)
+        self.assertIsNotNone(second.report_id)
@@ -0,0 +1,147 @@
+"""
+Tests for the fleet seeding service.
+
+Covers hierarchy sizes, batching, reproducibility and the plausibility of
+the generated lab analysis time series.
+"""
+
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Max
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.equipment import models as equipment_models
+from apps.reports import models
+from apps.reports.services.fleet_seeding import FleetSeedingService
+
+
+class FleetSeedingServiceTest(TestCase):
+    """Test cases for FleetSeedingService."""
+
+    def _seed(self, **kwargs):
+        options = {
+            "organizations": 2,
+            "machines_per_org": 3,
+            "components_per_machine": 2,
+            "samples_per_component": 10,
+            "batch_size": 25,
+            "seed": 7,
+            "prefix": "TEST",
+        }
+        options.update(kwargs)
+        return FleetSeedingService(**options).seed()
+
+    def test_creates_configured_fleet(self) -> None:
+        """Test that every level of the hierarchy has the requested size."""
+        result = self._seed()
+
+        self.assertEqual(len(result.organizations), 2)
+        self.assertEqual(len(result.machines), 6)
+        self.assertEqual(len(result.components), 12)
+        self.assertEqual(result.reports, 120)
+        self.assertEqual(models.Report.objects.count(), 120)
+        self.assertEqual(models.LabAnalysis.objects.count(), 120)
+        self.assertEqual(
+            models.Report.objects.filter(
+                organization__in=result.organizations
+            ).count(),
+            120,
+        )
+
+    def test_samples_end_today(self) -> None:
+        """Test that the date jitter never creates future samples."""
+        self._seed(samples_per_component=30, cadence_days=1)
+
+        latest = models.Report.objects.aggregate(latest=Max("sample_date"))[
+            "latest"
+        ]
+        self.assertLessEqual(latest, timezone.now().date())
+
+    def test_reports_progress_per_batch(self) -> None:
+        """Test that the progress callback is called after each batch."""
+        calls = []
+        FleetSeedingService(
+            organizations=1,
+            machines_per_org=1,
+            components_per_machine=1,
+            samples_per_component=60,
+            batch_size=25,
+            prefix="TEST",
+        ).seed(progress=lambda created, total: calls.append(created))
+
+        self.assertEqual(calls, [25, 50, 60])
+
+    def test_reuses_existing_component_types(self) -> None:
+        """Test that existing component types are not duplicated."""
+        equipment_models.ComponentType.objects.create(name="MOTOR")
+
+        self._seed(prefix="A")
+        self._seed(prefix="B")
+
+        self.assertEqual(
+            equipment_models.ComponentType.objects.filter(
+                name="MOTOR"
+            ).count(),
+            1,
+        )
+
+    def test_same_seed_is_reproducible(self) -> None:
+        """Test that the same seed generates the same measurements."""
+        self._seed(prefix="A")
+        self._seed(prefix="B")
+
+        def iron_series(prefix):
+            return list(
+                models.LabAnalysis.objects.filter(
+                    report__lab_number__startswith=f"{prefix}-"
+                )
+                .order_by("report__lab_number")
+                .values_list("iron_fe", flat=True)
+            )
+
+        self.assertEqual(iron_series("A"), iron_series("B"))
+
+    def test_time_series_is_ordered_and_plausible(self) -> None:
+        """Test sample dates increase and wear metals stay in range."""
+        result = self._seed(samples_per_component=30)
+        component = result.components[0]
+
+        reports = list(
+            models.Report.objects.filter(component=component)
+            .select_related("analysis")
+            .order_by("sample_date")
+        )
+        dates = [report.sample_date for report in reports]
+        self.assertEqual(dates, sorted(set(dates)))
+
+        for report in reports:
+            self.assertGreaterEqual(report.analysis.iron_fe, 0)
+            self.assertLess(report.analysis.iron_fe, 1000)
+            self.assertGreater(report.analysis.viscosity_100c, 0)
+
+        # Oil changes reset lubricant hours during a long history
+        self.assertTrue(any(report.oil_change == "SI" for report in reports))
+
+
+class SeedFleetCommandTest(TestCase):
+    """Test cases for the seed_fleet management command."""
+
+    def test_command_seeds_fleet(self) -> None:
+        """Test that the command creates the requested reports."""
+        out = StringIO()
+
+        call_command(
+            "seed_fleet",
+            organizations=1,
+            machines=2,
+            components=2,
+            samples=3,
+            seed=1,
+            prefix="CMD",
+            stdout=out,
+        )
+
+        self.assertEqual(models.Report.objects.count(), 12)
+        self.assertIn("Created 1 organizations", out.getvalue())
@@ -0,0 +1,192 @@
+"""
+Tests for the latest report snapshot per component.
+
+Covers keeping ComponentLatestState current on every write path (fleet
+seeding, report CRUD, bulk upload and condition backfill), the rebuild
+command and the fleet status endpoint.
+"""
+
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.core.cache import tiered_cache
+from apps.etl.services.fake_intertek import (
+    FakeIntertekConfig,
+    database_catalog,
+    generate_export_rows,
+    render_export,
+)
+from apps.reports import choices, models
+from apps.reports.services.bulk_upload import ReportBulkUploadService
+from apps.reports.services.condition_classifier import (
+    ConditionClassificationService,
+)
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.users.models import Account
+
+
+class ComponentLatestStateTest(TestCase):
+    """Test cases for maintaining the latest state table."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
+            email="latest@example.com", password="password"
+        )
+        cls.fleet = FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=2,
+            samples_per_component=4,
+            seed=17,
+            prefix="LST",
+        ).seed()
+        cls.component = cls.fleet.components[0]
+
+    def setUp(self) -> None:
+        tiered_cache.clear_local()
+
+    def _newest_report(self, component) -> models.Report:
+        return component.reports.order_by("-sample_date", "-created").first()
+
+    def test_seeding_stores_the_newest_report(self) -> None:
+        """Test one state per component pointing at its newest report."""
+        self.assertEqual(
+            models.ComponentLatestState.objects.count(),
+            len(self.fleet.components),
+        )
+        state = self.component.latest_state
+        report = self._newest_report(self.component)
+        self.assertEqual(state.report, report)
+        self.assertEqual(state.sample_date, report.sample_date)
+        self.assertEqual(state.iron_fe, report.analysis.iron_fe)
+        self.assertEqual(state.organization, self.fleet.organizations[0])
+
+    def test_report_crud_refreshes_the_state(self) -> None:
+        """Test that saving and deleting reports move the snapshot."""
+        previous = self._newest_report(self.component)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            report = models.Report.objects.create(
+                lab_number="LST-NEW-1",
+                organization=self.fleet.organizations[0],
+                machine=self.component.machine,
+                component=self.component,
+                sample_date=previous.sample_date + timedelta(days=1),
+                condition=choices.ReportCondition.CRITICAL,
+                machine_hours=99999,
+            )
+            models.LabAnalysis.objects.create(report=report, iron_fe=321)
+
+        state = models.ComponentLatestState.objects.get(
+            component=self.component
+        )
+        self.assertEqual(state.report, report)
+        self.assertEqual(state.condition, choices.ReportCondition.CRITICAL)
+        self.assertEqual(state.machine_hours, 99999)
+        self.assertEqual(state.iron_fe, 321)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            report.delete()
+
+        state = models.ComponentLatestState.objects.get(
+            component=self.component
+        )
+        self.assertEqual(state.report, previous)
+
+    def test_bulk_upload_refreshes_the_state(self) -> None:
+        """Test that uploaded reports become the latest state."""
+        rows = generate_export_rows(
+            FakeIntertekConfig(
+                rows=3,
+                catalog=database_catalog(),
+                start_date=date.today() + timedelta(days=30),
+            )
+        )
+        service = ReportBulkUploadService(self.user)
+        df = service.scan_csv(render_export(rows, file_type=1)).collect()
+
+        results = service.process_dataframe(df)
+
+        self.assertEqual(results["created"], 3)
+        for report in models.Report.objects.order_by("-pk")[:3]:
+            state = models.ComponentLatestState.objects.get(
+                component_id=report.component_id
+            )
+            self.assertEqual(
+                state.report, self._newest_report(report.component)
+            )
+            self.assertGreater(state.sample_date, date.today())
+
+    def test_classification_updates_the_computed_condition(self) -> None:
+        """Test that the backfill refreshes the snapshot it changes."""
+        models.Report.objects.update(computed_condition="")
+        models.ComponentLatestState.objects.update(computed_condition="")
+
+        ConditionClassificationService().classify_reports(
+            models.Report.objects.all()
+        )
+
+        self.assertFalse(
+            models.ComponentLatestState.objects.filter(
+                computed_condition=""
+            ).exists()
+        )
+
+    def test_rebuild_command(self) -> None:
+        """Test backfilling the table from the report history."""
+        models.ComponentLatestState.objects.all().delete()
+        models.Report.objects.filter(component=self.component).update(
+            is_active=False
+        )
+        out = StringIO()
+
+        call_command("rebuild_latest_states", stdout=out)
+
+        self.assertIn("3 stored, 0 removed", out.getvalue())
+        self.assertFalse(
+            models.ComponentLatestState.objects.filter(
+                component=self.component
+            ).exists()
+        )
+
+    def test_fleet_status_endpoint(self) -> None:
+        """Test the fleet status read of the user's organization."""
+        Account.objects.create(
+            user=self.user, organization=self.fleet.organizations[0]
+        )
+        self.client.force_login(self.user)
+        url = reverse("apps.dashboard:org_fleet_status_api")
+
+        with CaptureQueriesContext(connection) as queries:
+            data = self.client.get(url).json()
+
+        # One read of the snapshot, no scan of the reports
+        reads = [q["sql"] for q in queries if "reports_" in q["sql"]]
+        self.assertEqual(len(reads), 1)
+        self.assertNotIn("reports_report", reads[0])
+
+        self.assertEqual(data["total_components"], len(self.fleet.components))
+        self.assertEqual(
+            sum(data["conditions"].values()), len(self.fleet.components)
+        )
+        entry = next(
+            component
+            for component in data["components"]
+            if component["component_id"] == self.component.pk
+        )
+        self.assertEqual(
+            entry["lab_number"],
+            self._newest_report(self.component).lab_number,
+        )
+        critical = self.client.get(url, {"condition": "CRITICAL"}).json()
+        self.assertEqual(
+            len(critical["components"]), data["conditions"]["CRITICAL"]
+        )
@@ -0,0 +1,176 @@
+"""
+Tests for the report sheet schema registry.
+
+Covers header matching, layout detection and header-aware CSV/Excel
+reads through ReportBulkUploadService.
+"""
+
+import csv
+import io
+from datetime import date, timedelta
+
+import polars as pl
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from apps.etl.services.fake_intertek import (
+    EXPORT_HEADERS,
+    FakeIntertekConfig,
+    database_catalog,
+    generate_export_rows,
+    render_export,
+)
+from apps.reports import models
+from apps.reports.services import sheet_schema
+from apps.reports.services.bulk_upload import ReportBulkUploadService
+from apps.reports.services.fleet_seeding import FleetSeedingService
+
+
+def _to_csv(rows) -> bytes:
+    """Render rows as CSV content."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+class SheetSchemaTest(TestCase):
+    """Test cases for SheetSchema header matching."""
+
+    def setUp(self) -> None:
+        self.schema = sheet_schema.get_schema()
+
+    def test_intertek_schema_matches_legacy_indices(self) -> None:
+        """Test that the registry keeps the historical column positions."""
+        service = ReportBulkUploadService(None, self.schema)
+
+        self.assertEqual(self.schema.width, 57)
+        self.assertEqual(service.report_column_indices["sample_date"], 7)
+        self.assertEqual(service.lab_analysis_column_indices["iron_fe"], 34)
+
+    def test_match_ignores_method_labels_and_accents(self) -> None:
+        """Test that ASTM/ISO labels, accents and case are ignored."""
+        self.assertEqual(
+            self.schema.match("ASTM D 5185-18 - Hierro (Fe)").field, "iron_fe"
+        )
+        self.assertEqual(
+            self.schema.match("cod/num serie").field, "serial_number_code"
+        )
+        self.assertEqual(
+            self.schema.match("Apariencia - Visual").field,
+            "visual_appearance",
+        )
+        self.assertIsNone(self.schema.match("Unrelated column"))
+
+    def test_export_headers_map_to_their_positions(self) -> None:
+        """Test that every Intertek export header is recognised."""
+        layout = self.schema.detect_layout([["Title"], EXPORT_HEADERS])
+
+        self.assertEqual(layout.header_row, 1)
+        self.assertEqual(layout.data_start, 2)
+        self.assertEqual(layout.missing, ())
+        self.assertEqual(
+            dict(layout.sources), {i: i for i in range(self.schema.width)}
+        )
+
+    def test_detect_layout_falls_back_to_positions(self) -> None:
+        """Test that files without a header row are read by position."""
+        layout = self.schema.detect_layout([["1", "LAB-1", "ACME"]])
+
+        self.assertIsNone(layout.header_row)
+        self.assertEqual(dict(layout.sources), {0: 0, 1: 1, 2: 2})
+
+    def test_duplicate_alias_is_rejected(self) -> None:
+        """Test that two columns cannot share a header alias."""
+        with self.assertRaises(ValueError):
+            sheet_schema.SheetSchema(
+                "broken",
+                [
+                    sheet_schema.ColumnSpec("lab_number", 0, ("Lab",)),
+                    sheet_schema.ColumnSpec("notes", 1, ("Lab",)),
+                ],
+            )
+
+
+class SheetSchemaReadTest(TestCase):
+    """Test cases for header-aware reads in ReportBulkUploadService."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
+            email="schema@example.com", password=None
+        )
+        FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=1,
+            samples_per_component=1,
+            seed=5,
+            prefix="SCH",
+        ).seed()
+        cls.start = date.today() + timedelta(days=1)
+        cls.rows = generate_export_rows(
+            FakeIntertekConfig(
+                rows=6,
+                catalog=database_catalog(),
+                start_date=cls.start,
+                samples_per_day=3,
+            )
+        )
+
+    def setUp(self) -> None:
+        self.service = ReportBulkUploadService(self.user)
+
+    def _reordered(self):
+        """Return the export with swapped and extra columns."""
+        order = [1, 0, 7, 34] + list(range(2, 7)) + list(range(8, 34))
+        order += list(range(35, 57))
+        header = ["Extra"] + [EXPORT_HEADERS[i] for i in order]
+        body = [["x"] + [row[i] for i in order] for row in self.rows]
+        return [["Reporte de análisis"], header, *body]
+
+    def test_scan_csv_maps_reordered_columns(self) -> None:
+        """Test that CSV columns are located by header, not position."""
+        df = self.service.scan_csv(_to_csv(self._reordered())).collect()
+
+        self.assertEqual(df.shape, (6, 57))
+        self.assertEqual(df["column_1"][0], "FK-00000001")
+        self.assertEqual(df["column_7"][0], self.rows[0][7])
+        self.assertEqual(df["column_34"][0], str(self.rows[0][34]))
+
+    def test_missing_optional_columns_are_null(self) -> None:
+        """Test that absent optional columns are read as nulls."""
+        rows = [row[:20] for row in self._reordered()]
+
+        df = self.service.scan_csv(_to_csv(rows)).collect()
+
+        self.assertEqual(df.width, 57)
+        self.assertEqual(df["column_1"].to_list()[-1], "FK-00000006")
+        self.assertEqual(df["column_56"].null_count(), 6)
+
+    def test_missing_required_column_is_rejected(self) -> None:
+        """Test that a header without the lab number is rejected."""
+        rows = [row[2:] for row in [EXPORT_HEADERS, *self.rows]]
+
+        with self.assertRaises(ValidationError):
+            self.service.scan_csv(_to_csv(rows))
+
+    def test_read_excel_reads_text_columns(self) -> None:
+        """Test that Excel exports are read as text under the schema."""
+        df = self.service.read_excel(render_export(self.rows, file_type=3))
+
+        self.assertEqual(df.shape, (6, 57))
+        self.assertEqual(set(df.schema.values()), {pl.Utf8})
+        self.assertEqual(df["column_1"][0], "FK-00000001")
+
+    def test_process_excel_file_creates_reports(self) -> None:
+        """Test that an Excel export loads end to end."""
+        upload = io.BytesIO(render_export(self.rows, file_type=3))
+        upload.name = "export.xlsx"
+
+        results = self.service.process_file(upload)
+
+        self.assertEqual(results["errors"], [])
+        self.assertEqual(results["created"], 6)
+        report = models.Report.objects.get(lab_number="FK-00000001")
+        self.assertEqual(report.sample_date, self.start)
@@ -0,0 +1,166 @@
+"""
+Tests for the similar-component search.
+
+Covers the wear-profile features, the nearest-neighbour index, storing
+the vectors of the fleet and the similar components endpoint.
+"""
+
+import math
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.core.cache import tiered_cache
+from apps.reports import models
+from apps.reports.factories import sample_frame
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.reports.services.similarity import (
+    FEATURE_NAMES,
+    ComponentSimilarityService,
+    SimilarityIndex,
+    pack_vector,
+)
+from apps.users.models import Account
+
+
+def _index(vectors):
+    """Build an index of ``{component_id: {feature: value}}``."""
+    return SimilarityIndex(
+        list(vectors),
+        b"".join(
+            pack_vector([features.get(name) for name in FEATURE_NAMES])
+            for features in vectors.values()
+        ),
+    )
+
+
+class SimilarityFeaturesTest(TestCase):
+    """Test cases for the wear-profile features and the index."""
+
+    def test_levels_and_trends(self) -> None:
+        """Test the log-scale level and slope of the recent samples."""
+        service = ComponentSimilarityService(
+            parameters=["iron_fe", "zinc_zn"], window=4, recent=2
+        )
+        # Only the last 4 samples are in the trend: log1p rises by 1
+        iron = [math.expm1(value) for value in (9, 9, 1, 2, 3, 4)]
+
+        features = service.features(
+            sample_frame(
+                1, organization_id=1, iron_fe=iron, zinc_zn=[None] * 6
+            )
+        ).row(0, named=True)
+
+        self.assertEqual(features["sample_count"], 6)
+        self.assertEqual(features["last_sample_date"], date(2025, 2, 20))
+        self.assertAlmostEqual(features["level_iron_fe"], 3.5)
+        self.assertAlmostEqual(features["trend_iron_fe"], 1.0)
+        self.assertIsNone(features["level_zinc_zn"])
+        self.assertIsNone(features["level_copper_cu"])
+
+    def test_nearest_neighbours(self) -> None:
+        """Test the ranking of standardized distances."""
+        index = _index(
+            {
+                1: {"level_iron_fe": 1.0, "trend_iron_fe": 0.0},
+                2: {"level_iron_fe": 1.1, "trend_iron_fe": 0.0},
+                3: {"level_iron_fe": 3.0, "trend_iron_fe": 0.5},
+                4: {"level_iron_fe": 5.0},
+            }
+        )
+
+        neighbours = index.nearest(index.vector_of(1), k=2, exclude=[1])
+
+        self.assertEqual([pk for pk, _ in neighbours], [2, 3])
+        self.assertLess(neighbours[0][1], neighbours[1][1])
+        self.assertEqual(len(index), 4)
+        self.assertEqual(
+            index.standardize([None] * len(FEATURE_NAMES)),
+            [0.0] * len(FEATURE_NAMES),
+        )
+
+
+class SimilarComponentsTest(TestCase):
+    """Test cases for storing the vectors and the endpoint."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
+            email="similar@example.com", password="password"
+        )
+        cls.fleet = FleetSeedingService(
+            organizations=2,
+            machines_per_org=2,
+            components_per_machine=2,
+            samples_per_component=6,
+            seed=29,
+            prefix="SIM",
+        ).seed()
+        cls.organization = cls.fleet.organizations[0]
+        cls.components = [
+            component
+            for component in cls.fleet.components
+            if component.machine.organization_id == cls.organization.pk
+        ]
+        Account.objects.create(user=cls.user, organization=cls.organization)
+
+    def setUp(self) -> None:
+        tiered_cache.clear_local()
+
+    def test_stale_components_are_refreshed_once(self) -> None:
+        """Test that unchanged components are not recomputed."""
+        service = ComponentSimilarityService()
+
+        first = service.refresh_stale()
+        second = service.refresh_stale()
+
+        self.assertEqual(first["components"], len(self.fleet.components))
+        self.assertEqual(first["vectors"], len(self.fleet.components))
+        self.assertEqual(second["components"], 0)
+        vector = models.ComponentFeatureVector.objects.get(
+            component=self.components[0]
+        )
+        self.assertEqual(vector.organization, self.organization)
+        self.assertEqual(vector.sample_count, 6)
+
+    def test_endpoint_ranks_the_organization_components(self) -> None:
+        """Test the neighbours of a component of the user's organization."""
+        call_command("refresh_feature_vectors", all=True, stdout=StringIO())
+        self.client.force_login(self.user)
+        url = reverse("apps.dashboard:org_similar_components_api")
+        component = self.components[0]
+
+        data = self.client.get(url, {"component": component.pk}).json()
+
+        self.assertEqual(data["indexed_components"], len(self.components))
+        neighbours = [entry["component_id"] for entry in data["neighbours"]]
+        self.assertCountEqual(
+            neighbours, [other.pk for other in self.components[1:]]
+        )
+        distances = [entry["distance"] for entry in data["neighbours"]]
+        self.assertEqual(distances, sorted(distances))
+
+        first = component.reports.order_by("sample_date").first()
+        data = self.client.get(
+            url, {"component": component.pk, "report": first.pk, "k": 1}
+        ).json()
+        self.assertEqual(data["report_id"], first.pk)
+        self.assertEqual(len(data["neighbours"]), 1)
+
+    def test_endpoint_is_scoped_to_the_organization(self) -> None:
+        """Test that other organizations' components are not found."""
+        self.client.force_login(self.user)
+        url = reverse("apps.dashboard:org_similar_components_api")
+        other = next(
+            component
+            for component in self.fleet.components
+            if component not in self.components
+        )
+
+        response = self.client.get(url, {"component": other.pk})
+
+        self.assertEqual(response.status_code, 404)
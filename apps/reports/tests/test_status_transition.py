@@ -0,0 +1,221 @@
+"""
+Tests for bulk report status transitions.
+
+Covers the transition service, the batched StatusHistory writes, the
+bulk status API endpoint and the admin actions.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.core.models import StatusHistory
+from apps.reports import choices, models
+from apps.reports.services.status_transition import (
+    ReportStatusTransitionService,
+)
+from apps.users import models as users_models
+
+
+class ReportStatusTransitionTestMixin:
+    """Shared fixtures for status transition tests."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_user(
+            email="reviewer@example.com", password="password"
+        )
+        cls.organization = users_models.Organization.objects.create(
+            name="Mining Co"
+        )
+        cls.other_organization = users_models.Organization.objects.create(
+            name="Other Co"
+        )
+        models.Report.objects.bulk_create(
+            [
+                models.Report(
+                    lab_number=f"LAB-{i:04d}",
+                    organization=(
+                        cls.organization if i < 30 else cls.other_organization
+                    ),
+                    status=(
+                        choices.ReportStatus.APPROVED
+                        if i % 10 == 0
+                        else choices.ReportStatus.PENDING
+                    ),
+                )
+                for i in range(40)
+            ]
+        )
+
+
+class ReportStatusTransitionServiceTest(
+    ReportStatusTransitionTestMixin, TestCase
+):
+    """Test cases for ReportStatusTransitionService."""
+
+    def test_transition_updates_reports_and_history(self) -> None:
+        """Test that reports and history rows are written in batches."""
+        queryset = models.Report.objects.filter(organization=self.organization)
+        service = ReportStatusTransitionService(self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            results = service.transition(
+                queryset, choices.ReportStatus.APPROVED, note="Batch 1"
+            )
+
+        self.assertEqual(results["updated"], 27)
+        self.assertEqual(results["skipped"], 3)
+        self.assertFalse(
+            queryset.exclude(status=choices.ReportStatus.APPROVED).exists()
+        )
+        # Select, count, one UPDATE, one INSERT (+ savepoint handling)
+        self.assertLessEqual(len(queries), 8)
+
+        history = StatusHistory.objects.filter(
+            content_type=ContentType.objects.get_for_model(models.Report)
+        )
+        self.assertEqual(history.count(), 27)
+        entry = history.first()
+        self.assertEqual(entry.previous_status, choices.ReportStatus.PENDING)
+        self.assertEqual(entry.status, choices.ReportStatus.APPROVED)
+        self.assertEqual(entry.note, "Batch 1")
+        self.assertEqual(entry.created_by, self.user)
+
+    def test_other_reports_are_untouched(self) -> None:
+        """Test that reports outside the queryset keep their status."""
+        ReportStatusTransitionService(self.user).transition(
+            models.Report.objects.filter(organization=self.organization),
+            choices.ReportStatus.REVIEWED,
+        )
+
+        self.assertEqual(
+            models.Report.objects.filter(
+                organization=self.other_organization,
+                status=choices.ReportStatus.PENDING,
+            ).count(),
+            9,
+        )
+
+    def test_invalid_status_raises(self) -> None:
+        """Test that unknown statuses are rejected."""
+        with self.assertRaises(ValidationError):
+            ReportStatusTransitionService(self.user).transition(
+                models.Report.objects.all(), "ARCHIVED"
+            )
+
+
+class ReportBulkStatusAPIViewTest(ReportStatusTransitionTestMixin, TestCase):
+    """Test cases for the bulk status API endpoint."""
+
+    def setUp(self) -> None:
+        self.url = reverse("apps.reports:report_bulk_status_api")
+        self.user.user_permissions.add(
+            Permission.objects.get(
+                content_type__app_label="reports", codename="change_report"
+            )
+        )
+        self.client.force_login(self.user)
+
+    def test_transition_by_filters(self) -> None:
+        """Test that reports can be selected with list filters."""
+        response = self.client.post(
+            self.url,
+            {
+                "new_status": choices.ReportStatus.REVIEWED,
+                "organization": self.other_organization.pk,
+                "status": choices.ReportStatus.PENDING,
+            },
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 9)
+        self.assertEqual(response.json()["new_status"], "REVIEWED")
+
+    def test_transition_by_ids(self) -> None:
+        """Test that reports can be selected by ID."""
+        ids = list(
+            models.Report.objects.order_by("pk").values_list("pk", flat=True)
+        )[1:4]
+
+        response = self.client.post(
+            self.url,
+            {
+                "new_status": choices.ReportStatus.REJECTED,
+                "ids": ",".join(str(pk) for pk in ids),
+            },
+        )
+
+        self.assertEqual(response.json()["updated"], 3)
+        self.assertEqual(
+            models.Report.objects.filter(
+                status=choices.ReportStatus.REJECTED
+            ).count(),
+            3,
+        )
+
+    def test_selection_is_required(self) -> None:
+        """Test that a request without IDs or filters is rejected."""
+        response = self.client.post(
+            self.url, {"new_status": choices.ReportStatus.APPROVED}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(StatusHistory.objects.exists())
+
+    def test_invalid_status(self) -> None:
+        """Test that an invalid target status is rejected."""
+        response = self.client.post(
+            self.url, {"new_status": "ARCHIVED", "ids": "1"}
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("new_status", response.json()["errors"])
+
+    def test_permission_required(self) -> None:
+        """Test that users without change permission are denied."""
+        self.user.user_permissions.clear()
+
+        response = self.client.post(
+            self.url,
+            {"new_status": choices.ReportStatus.APPROVED, "ids": "1"},
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+
+class ReportAdminStatusActionTest(ReportStatusTransitionTestMixin, TestCase):
+    """Test cases for the admin status actions."""
+
+    def test_mark_approved_action(self) -> None:
+        """Test that the admin action approves the selected reports."""
+        admin_user = get_user_model().objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        self.client.force_login(admin_user)
+        ids = list(
+            models.Report.objects.filter(
+                organization=self.other_organization
+            ).values_list("pk", flat=True)
+        )
+
+        response = self.client.post(
+            reverse("admin:reports_report_changelist"),
+            {"action": "mark_approved", "_selected_action": ids},
+            follow=True,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            models.Report.objects.filter(
+                organization=self.other_organization,
+                status=choices.ReportStatus.APPROVED,
+            ).count(),
+            10,
+        )
+        self.assertEqual(StatusHistory.objects.count(), 9)
@@ -0,0 +1,249 @@
+"""
+Tests for the threshold profiles per component type and lubricant.
+
+Covers resolving layered profiles from the compiled lookup table, its
+invalidation on save, the per-profile classification and the thresholds
+shown on the component analysis dashboard.
+"""
+
+import polars as pl
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.dashboard.services import ComponentAnalysisService
+from apps.equipment.models import Component, ComponentType
+from apps.reports import models
+from apps.reports.services.condition_classifier import (
+    ConditionClassificationService,
+)
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.reports.services.thresholds import (
+    DEFAULT_THRESHOLDS,
+    invalidate_threshold_profiles,
+    thresholds_for,
+    viscosity_band,
+)
+
+
+class ThresholdProfileTestBase(TestCase):
+    """Fresh lookup table for every test (rollbacks emit no signals)."""
+
+    def setUp(self) -> None:
+        invalidate_threshold_profiles()
+        self.addCleanup(invalidate_threshold_profiles)
+
+    def _profile(self, component_type=None, lubricant="", **limits):
+        """Create a profile with ``{parameter: {limit: value}}`` limits."""
+        profile = models.ThresholdProfile.objects.create(
+            name=f"{component_type} {lubricant}",
+            component_type=component_type,
+            lubricant=lubricant,
+        )
+        for parameter, values in limits.items():
+            models.ThresholdLimit.objects.create(
+                profile=profile,
+                group="wear_metals",
+                parameter=parameter,
+                **values,
+            )
+        return profile
+
+
+class ThresholdLookupTest(ThresholdProfileTestBase):
+    """Test cases for resolving thresholds from the profiles."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.engine = ComponentType.objects.create(name="Motor")
+        cls.hydraulic = ComponentType.objects.create(name="Hidráulico")
+
+    def test_defaults_without_profiles(self) -> None:
+        """Test that unmatched pairs get the default thresholds."""
+        thresholds = thresholds_for(self.engine.pk, "")
+
+        self.assertEqual(
+            thresholds["wear_metals"], DEFAULT_THRESHOLDS["wear_metals"]
+        )
+        self.assertIsNone(
+            thresholds["oil_health"]["viscosity_100c"]["warning_low"]
+        )
+
+    def test_viscosity_band_from_sae_grade(self) -> None:
+        """Test the viscosity range derived from the lubricant grade."""
+        self.assertEqual(viscosity_band("15W-40"), (12.5, 16.3))
+        self.assertEqual(viscosity_band("sae 30"), (9.3, 12.5))
+        self.assertIsNone(viscosity_band("ISO VG 68"))
+
+        viscosity = thresholds_for(None, "15w40")["oil_health"][
+            "viscosity_100c"
+        ]
+        self.assertEqual(
+            (viscosity["warning_low"], viscosity["warning_high"]),
+            (12.5, 16.3),
+        )
+
+    def test_profiles_are_layered_by_specificity(self) -> None:
+        """Test lubricant, type and type+lubricant layering."""
+        self._profile(
+            lubricant=" 15w40 ", iron_fe={"warning": 50, "critical": 60}
+        )
+        self._profile(self.engine, iron_fe={"warning": 40, "critical": 90})
+        self._profile(
+            self.engine,
+            "15W40",
+            silicon_si={"warning": 8, "critical": 12},
+            viscosity_100c={"warning_low": 13, "warning_high": 15},
+        )
+
+        engine = thresholds_for(self.engine.pk, "15W40")
+        hydraulic = thresholds_for(self.hydraulic.pk, "15W40")
+
+        self.assertEqual(engine["wear_metals"]["iron_fe"]["critical"], 90)
+        self.assertEqual(hydraulic["wear_metals"]["iron_fe"]["critical"], 60)
+        # Parameters listed in several groups share their limits
+        self.assertEqual(engine["contamination"]["silicon_si"]["warning"], 8)
+        self.assertEqual(engine["oil_health"]["silicon_si"]["warning"], 8)
+        self.assertEqual(
+            engine["oil_health"]["viscosity_100c"]["warning_low"], 13
+        )
+        self.assertEqual(
+            hydraulic["oil_health"]["viscosity_100c"]["warning_low"], 12.5
+        )
+
+    def test_lookups_are_cached_until_a_profile_changes(self) -> None:
+        """Test that lookups run no queries and saves invalidate them."""
+        profile = self._profile(
+            self.engine, iron_fe={"warning": 40, "critical": 90}
+        )
+        thresholds_for(self.engine.pk, "")
+
+        with self.assertNumQueries(0):
+            thresholds = thresholds_for(self.engine.pk, "10W30")
+        self.assertEqual(thresholds["wear_metals"]["iron_fe"]["warning"], 40)
+
+        profile.limits.update(warning=45)
+        profile.limits.get().save()
+        self.assertEqual(
+            thresholds_for(self.engine.pk, "")["wear_metals"]["iron_fe"][
+                "warning"
+            ],
+            45,
+        )
+
+        profile.is_active = False
+        profile.save()
+        self.assertEqual(
+            thresholds_for(self.engine.pk, "")["wear_metals"]["iron_fe"][
+                "warning"
+            ],
+            75,
+        )
+
+    def test_limit_validation(self) -> None:
+        """Test that limits must target a numeric analysis field."""
+        profile = self._profile(self.engine)
+
+        with self.assertRaises(ValidationError):
+            models.ThresholdLimit(
+                profile=profile, group="wear_metals", parameter="report"
+            ).full_clean()
+        with self.assertRaises(ValidationError):
+            models.ThresholdLimit(
+                profile=profile,
+                group="wear_metals",
+                parameter="iron_fe",
+                warning=40,
+            ).full_clean()
+
+
+class ThresholdClassificationTest(ThresholdProfileTestBase):
+    """Test cases for classifying analyses with their profile."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user = get_user_model().objects.create_superuser(
+            email="thresholds@example.com", password="password"
+        )
+        FleetSeedingService(
+            organizations=1,
+            machines_per_org=1,
+            components_per_machine=2,
+            samples_per_component=4,
+            seed=5,
+            prefix="THR",
+        ).seed()
+        cls.component = Component.objects.select_related("type").first()
+
+    def test_rows_use_the_profile_of_their_type(self) -> None:
+        """Test that each row is judged against its own profile."""
+        self._profile(
+            self.component.type, iron_fe={"warning": 40, "critical": 60}
+        )
+        service = ConditionClassificationService()
+        values = {
+            "iron_fe": [80.0, 80.0, 10.0],
+            "viscosity_100c": [14.0, 14.0, 18.0],
+        }
+        df = pl.DataFrame(
+            {
+                "component_type_id": [None, self.component.type_id, None],
+                "lubricant": ["", "ISO VG 68", "15W40"],
+                **{p: values.get(p, [None] * 3) for p in service.parameters},
+            },
+            schema_overrides={p: pl.Float64 for p in service.parameters},
+        )
+
+        result = service.classify(df)
+
+        self.assertEqual(
+            result["computed_condition"].to_list(),
+            ["CAUTION", "CRITICAL", "CAUTION"],
+        )
+        self.assertEqual(result["iron_fe"].to_list(), [80.0, 80.0, 10.0])
+        viscosity = result["breached_parameters"][2][0]
+        self.assertEqual(viscosity["parameter"], "viscosity_100c")
+        self.assertEqual(viscosity["limit"], 16.3)
+
+    def test_reports_are_reclassified_with_profiles(self) -> None:
+        """Test the fleet backfill with a strict type profile."""
+        self._profile(
+            self.component.type, iron_fe={"warning": 0, "critical": 1}
+        )
+
+        ConditionClassificationService().classify_reports(
+            models.Report.objects.all()
+        )
+
+        report = models.Report.objects.filter(
+            component=self.component, analysis__iron_fe__gte=1
+        ).first()
+        self.assertEqual(report.computed_condition, "CRITICAL")
+
+    def test_dashboard_uses_component_thresholds(self) -> None:
+        """Test that the analysis charts show the component's limits."""
+        self._profile(
+            self.component.type, iron_fe={"warning": 40, "critical": 60}
+        )
+
+        data = ComponentAnalysisService(self.component.pk).get_wear_trends()
+
+        self.assertEqual(data["thresholds"]["iron_fe"]["critical"], 60)
+
+    def test_admin_changelist(self) -> None:
+        """Test the threshold profile admin."""
+        profile = self._profile(
+            self.component.type, iron_fe={"warning": 40, "critical": 60}
+        )
+        self.client.force_login(self.user)
+
+        changelist = self.client.get(
+            reverse("admin:reports_thresholdprofile_changelist")
+        )
+        change = self.client.get(
+            reverse("admin:reports_thresholdprofile_change", args=[profile.pk])
+        )
+
+        self.assertEqual(changelist.status_code, 200)
+        self.assertEqual(change.status_code, 200)
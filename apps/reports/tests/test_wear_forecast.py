@@ -0,0 +1,160 @@
+"""
+Tests for the wear-rate forecasts.
+
+Covers the within-fill least squares fit, the projection to the
+threshold limits, and refitting the stored forecasts of the fleet.
+"""
+
+from datetime import date
+from io import StringIO
+
+import polars as pl
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.dashboard.services import ComponentAnalysisService
+from apps.reports import models
+from apps.reports.factories import sample_frame
+from apps.reports.services.fleet_seeding import FleetSeedingService
+from apps.reports.services.thresholds import invalidate_threshold_profiles
+from apps.reports.services.wear_forecast import WearForecastService
+
+
+def _samples(component_id, hours, iron, kms=None):
+    """Build a fit frame of one component."""
+    missing = [None] * len(hours)
+    return sample_frame(
+        component_id,
+        dtypes={
+            "component_type_id": pl.Int64,
+            "lubricant_hours": pl.Int64,
+            "lubricant_kms": pl.Int64,
+        },
+        component_type_id=None,
+        lubricant="15W40",
+        lubricant_hours=hours,
+        lubricant_kms=kms or missing,
+        iron_fe=iron,
+        copper_cu=missing,
+        aluminum_al=missing,
+    )
+
+
+class WearForecastFitTest(TestCase):
+    """Test cases for fitting and projecting wear trends."""
+
+    def setUp(self) -> None:
+        invalidate_threshold_profiles()
+        self.addCleanup(invalidate_threshold_profiles)
+        self.service = WearForecastService()
+
+    def test_rate_is_pooled_across_oil_fills(self) -> None:
+        """Test one slope with a separate intercept per oil fill."""
+        # 100 h per 10 days, 0.2 ppm/h, oil changed after the third sample
+        hours = [100, 200, 300, 100, 200, 300]
+        iron = [10.0, 30.0, 50.0, 25.0, 45.0, 65.0]
+
+        fit = self.service.fit(_samples(1, hours, iron)).row(0, named=True)
+
+        self.assertEqual(fit["parameter"], "iron_fe")
+        self.assertEqual(fit["basis"], "hours")
+        self.assertEqual(fit["sample_count"], 6)
+        self.assertAlmostEqual(fit["wear_rate"], 20.0)
+        self.assertAlmostEqual(fit["confidence"], 1.0)
+        self.assertAlmostEqual(fit["level"], 65.0)
+        self.assertAlmostEqual(fit["usage_per_day"], 10.0)
+
+    def test_projection_to_the_limits(self) -> None:
+        """Test the crossing dates of the default iron limits."""
+        rising = _samples(1, [100, 200, 300, 400], [35.0, 45.0, 55.0, 65.0])
+        flat = _samples(2, [100, 200, 300, 400], [80.0, 80.0, 80.0, 80.0])
+        sparse = _samples(3, [100, 200, 300], [1.0, 2.0, 3.0])
+
+        forecasts = self.service.project(
+            self.service.fit(pl.concat([rising, flat, sparse]))
+        )
+
+        by_component = {
+            row["component_id"]: row for row in forecasts.to_dicts()
+        }
+        self.assertEqual(set(by_component), {1, 2})
+        rising = by_component[1]
+        # 10 ppm per 100 h at 10 h per day: 1 ppm per day
+        self.assertEqual(rising["last_sample_date"], date(2025, 1, 31))
+        self.assertEqual(rising["warning_limit"], 75)
+        self.assertEqual(rising["warning_date"], date(2025, 2, 10))
+        self.assertEqual(rising["critical_date"], date(2025, 3, 7))
+        flat = by_component[2]
+        self.assertEqual(flat["warning_date"], flat["last_sample_date"])
+        self.assertIsNone(flat["critical_date"])
+
+    def test_kilometers_when_hours_are_missing(self) -> None:
+        """Test the kilometer basis of components without hours."""
+        df = _samples(
+            1,
+            [None] * 4,
+            [10.0, 20.0, 30.0, 40.0],
+            kms=[1000, 2000, 3000, 4000],
+        )
+
+        fit = self.service.fit(df).row(0, named=True)
+
+        self.assertEqual(fit["basis"], "kms")
+        self.assertAlmostEqual(fit["wear_rate"], 1.0)
+
+
+class WearForecastRefreshTest(TestCase):
+    """Test cases for storing the forecasts of the fleet."""
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.fleet = FleetSeedingService(
+            organizations=1,
+            machines_per_org=2,
+            components_per_machine=2,
+            samples_per_component=10,
+            seed=21,
+            prefix="WFC",
+        ).seed()
+
+    def setUp(self) -> None:
+        invalidate_threshold_profiles()
+        self.addCleanup(invalidate_threshold_profiles)
+
+    def test_stale_components_are_refitted_once(self) -> None:
+        """Test that unchanged components are not refitted."""
+        service = WearForecastService()
+
+        first = service.refresh_stale()
+        second = service.refresh_stale()
+
+        self.assertEqual(first["components"], len(self.fleet.components))
+        self.assertEqual(
+            models.WearForecast.objects.count(), first["forecasts"]
+        )
+        self.assertEqual(second["components"], 0)
+
+    def test_components_too_short_to_fit_are_not_refitted(self) -> None:
+        """Test that components without a forecast are fitted only once."""
+        service = WearForecastService(min_samples=20)
+
+        first = service.refresh_stale()
+        second = service.refresh_stale()
+
+        self.assertEqual(first["components"], len(self.fleet.components))
+        self.assertEqual(first["forecasts"], 0)
+        self.assertEqual(second["components"], 0)
+
+    def test_dashboard_shows_the_forecasts(self) -> None:
+        """Test the forecasts of the wear trends chart."""
+        call_command("forecast_wear", all=True, stdout=StringIO())
+        forecast = models.WearForecast.objects.first()
+
+        data = ComponentAnalysisService(
+            forecast.component_id
+        ).get_wear_trends()
+
+        self.assertEqual(
+            data["forecasts"][forecast.parameter]["wear_rate"],
+            forecast.wear_rate,
+        )
@@ -29,6 +29,11 @@ urlpatterns = [
         views.ReportDeleteView.as_view(),
         name="report_delete",
     ),
+    path(
+        "reports/api/bulk-status/",
+        views.ReportBulkStatusAPIView.as_view(),
+        name="report_bulk_status_api",
+    ),
     # Bulk upload URLs
     path(
         "reports/bulk-upload/",
@@ -7,7 +7,7 @@ from django.contrib.auth.mixins import (
     PermissionRequiredMixin,
 )
 from django.contrib.messages.views import SuccessMessageMixin
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
 from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.views.generic import (
@@ -23,6 +23,9 @@ from openpyxl.styles import Font
 from apps.core import mixins as core_mixins
 from apps.reports import filtersets, forms, models
 from apps.reports.services.bulk_upload import ReportBulkUploadService
+from apps.reports.services.status_transition import (
+    ReportStatusTransitionService,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -205,6 +208,16 @@ class ReportBulkUploadView(
                 % {"count": results["skipped"]},
             )
 
+        if results.get("quarantined"):
+            messages.warning(
+                self.request,
+                _(
+                    "Quarantined %(count)d reports that failed data quality "
+                    "checks (pending review in the admin)"
+                )
+                % {"count": results["quarantined"]},
+            )
+
         if results["errors"]:
             for error in results["errors"]:
                 # Handle both string and dict error formats
@@ -353,3 +366,70 @@ class ReportBulkTemplateView(
         workbook.save(response)
         workbook.close()
         return response
+
+
+class ReportBulkStatusAPIView(
+    PermissionRequiredMixin,
+    LoginRequiredMixin,
+    View,
+):
+    """
+    API view to change the status of a batch of reports.
+
+    Reports are selected with a comma separated ``ids`` list and/or the
+    same filters as the report list (``organization``, ``machine``,
+    ``status``, ``condition``, ``lab_number_search``). At least one of them
+    is required so a request cannot transition every report by accident.
+    """
+
+    permission_required = "reports.change_report"
+    http_method_names = ["post"]
+
+    def handle_no_permission(self):
+        return JsonResponse(
+            {
+                "status": "error",
+                "message": _("You do not have permission to change reports."),
+            },
+            status=403,
+        )
+
+    def post(self, request, *args, **kwargs):
+        form = forms.ReportBulkStatusForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse(
+                {"status": "error", "errors": form.errors}, status=400
+            )
+
+        filterset = filtersets.ReportFilter(
+            request.POST, queryset=models.Report.objects.all()
+        )
+        if not filterset.is_valid():
+            return JsonResponse(
+                {"status": "error", "errors": filterset.errors}, status=400
+            )
+
+        ids = form.cleaned_data["ids"]
+        has_filters = any(
+            value not in (None, "")
+            for value in filterset.form.cleaned_data.values()
+        )
+        if not ids and not has_filters:
+            return JsonResponse(
+                {
+                    "status": "error",
+                    "message": _("Select reports by ID or filters."),
+                },
+                status=400,
+            )
+
+        queryset = filterset.qs
+        if ids:
+            queryset = queryset.filter(pk__in=ids)
+
+        results = ReportStatusTransitionService(request.user).transition(
+            queryset,
+            form.cleaned_data["new_status"],
+            note=form.cleaned_data["note"],
+        )
+        return JsonResponse({"status": "success", **results})
@@ -1,3 +1,4 @@
+import tempfile
 from pathlib import Path
 
 from decouple import Csv, config
@@ -61,6 +62,8 @@ LOCAL_APPS = [
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
+    "apps.core.middleware.RequestInstrumentationMiddleware",
+    "apps.core.routers.ReplicaStickinessMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -105,6 +108,45 @@ DATABASES = {
     )  # noqa
 }
 
+# Read replica (apps.core.routers)
+# Dashboard, analysis and export reads go to the replica when configured;
+# users who just wrote read from the primary for REPLICA_STICKY_SECONDS
+
+REPLICA_DATABASE_ALIAS = "replica"
+REPLICA_DATABASE_URL = config("REPLICA_DATABASE_URL", default="")
+if REPLICA_DATABASE_URL:
+    DATABASES[REPLICA_DATABASE_ALIAS] = db_url(REPLICA_DATABASE_URL)
+    DATABASES[REPLICA_DATABASE_ALIAS]["TEST"] = {"MIRROR": "default"}
+
+DATABASE_ROUTERS = ["apps.core.routers.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = config("REPLICA_STICKY_SECONDS", default=10, cast=int)
+REPLICA_STICKY_COOKIE = "db_primary"
+
+# Query pool (apps.core.concurrency)
+# Threads per process running independent dashboard queries concurrently,
+# each keeping its own database connection open for up to
+# QUERY_POOL_CONN_MAX_AGE seconds (regardless of CONN_MAX_AGE); 0 workers
+# runs them inline
+
+QUERY_POOL_WORKERS = config("QUERY_POOL_WORKERS", default=4, cast=int)
+QUERY_POOL_CONN_MAX_AGE = config(
+    "QUERY_POOL_CONN_MAX_AGE", default=600, cast=int
+)
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# File-based locally so every process shares it; Redis in production
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": config(
+            "CACHE_LOCATION",
+            default=str(Path(tempfile.gettempdir()) / "lubeai-cache"),
+        ),
+    }
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -217,3 +259,66 @@ CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = True
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers.DatabaseScheduler"
 CELERY_BROKER_URL = config("REDIS_URL", default="redis://127.0.0.1:6379/")
 CELERY_RESULT_BACKEND = config("REDIS_URL", default="redis://127.0.0.1:6379/")
+
+# Request instrumentation
+# Query counts, DB time, duplicated queries and cache usage per request
+
+INSTRUMENTATION_ENABLED = config(
+    "INSTRUMENTATION_ENABLED", default=True, cast=bool
+)
+INSTRUMENTATION_SAMPLE_RATE = config(
+    "INSTRUMENTATION_SAMPLE_RATE", default=1.0, cast=float
+)
+INSTRUMENTATION_SERVER_TIMING = config(
+    "INSTRUMENTATION_SERVER_TIMING", default=DEBUG, cast=bool
+)
+INSTRUMENTATION_SLOW_REQUEST_MS = config(
+    "INSTRUMENTATION_SLOW_REQUEST_MS", default=1000, cast=int
+)
+INSTRUMENTATION_VIEW_THRESHOLDS = {
+    "apps.dashboard:export_download": 5000,
+}
+
+# Two-tier cache (apps.core.cache)
+# In-process L1 in front of the shared default cache
+
+TIERED_CACHE_ALIAS = "default"
+TIERED_CACHE_L1_TTL = config("TIERED_CACHE_L1_TTL", default=5, cast=float)
+TIERED_CACHE_L1_MAX_ENTRIES = 1000
+TIERED_CACHE_LOCK_TIMEOUT = 30
+TIERED_CACHE_LOCK_WAIT = 5
+DASHBOARD_CACHE_TIMEOUT = config(
+    "DASHBOARD_CACHE_TIMEOUT", default=300, cast=int
+)
+
+# Dashboard change checks (apps.dashboard.changes)
+# Milliseconds between two checks of an open dashboard; an unchanged
+# dashboard gets a 304 after one cache read
+
+DASHBOARD_CHANGES_POLL_MS = config(
+    "DASHBOARD_CHANGES_POLL_MS", default=5000, cast=int
+)
+
+# Intertek API client (apps.etl)
+# One pooled session per worker process, reused across tasks
+
+INTERTEK_POOL_MAXSIZE = config("INTERTEK_POOL_MAXSIZE", default=10, cast=int)
+INTERTEK_MAX_RETRIES = config("INTERTEK_MAX_RETRIES", default=3, cast=int)
+INTERTEK_RETRY_BACKOFF = config(
+    "INTERTEK_RETRY_BACKOFF", default=1.0, cast=float
+)
+INTERTEK_CONNECT_TIMEOUT = config(
+    "INTERTEK_CONNECT_TIMEOUT", default=10, cast=float
+)
+INTERTEK_READ_TIMEOUT = config("INTERTEK_READ_TIMEOUT", default=60, cast=float)
+INTERTEK_MAX_CONCURRENCY = config(
+    "INTERTEK_MAX_CONCURRENCY", default=8, cast=int
+)
+INTERTEK_SLOW_RESPONSE_SECONDS = config(
+    "INTERTEK_SLOW_RESPONSE_SECONDS", default=10, cast=float
+)
+# Point at `manage.py run_fake_intertek` for offline load testing
+INTERTEK_API_BASE_URL = config(
+    "INTERTEK_API_BASE_URL",
+    default="https://servicesintertek.sigcomt.com:2012/oilcm/api",
+)
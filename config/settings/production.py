@@ -69,6 +69,24 @@ LOGGING = {
     },
 }
 
+# Cache shared by every web and Celery process
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config(  # noqa
+            "REDIS_CACHE_URL",
+            default=config("REDIS_URL", default="redis://127.0.0.1:6379/"),  # noqa
+        ),
+    }
+}
+
+# Request instrumentation: log a sample of requests, always log slow ones
+
+INSTRUMENTATION_SAMPLE_RATE = config(  # noqa
+    "INSTRUMENTATION_SAMPLE_RATE", default=0.05, cast=float
+)
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.1/howto/static-files/
 
@@ -120,6 +138,26 @@ CELERY_BEAT_SCHEDULE = {
         "schedule": crontab(hour=22, minute=0),
         "kwargs": {},
     },
+    "rebuild_lubricant_baselines": {
+        "task": "apps.reports.tasks.refresh_lubricant_baselines_task",
+        "schedule": crontab(hour=3, minute=30),
+        "kwargs": {},
+    },
+    "refresh_wear_forecasts": {
+        "task": "apps.reports.tasks.refresh_wear_forecasts_task",
+        "schedule": crontab(hour=4, minute=0),
+        "kwargs": {},
+    },
+    "refresh_feature_vectors": {
+        "task": "apps.reports.tasks.refresh_feature_vectors_task",
+        "schedule": crontab(hour=4, minute=30),
+        "kwargs": {},
+    },
+    "scan_anomalies": {
+        "task": "apps.reports.tasks.scan_anomalies_task",
+        "schedule": crontab(minute=15),
+        "kwargs": {},
+    },
 }
 
 MIDDLEWARE += [  # noqa
@@ -1,3 +1,5 @@
+import tempfile
+
 from config.settings.base import *  # noqa
 from config.settings.tools.django_constance import *  # noqa
 from config.settings.tools.django_easy_audit import *  # noqa
@@ -16,3 +18,22 @@ EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
 
 # Testing settings
 TESTING = True
+
+# Run Celery tasks inline instead of sending them to the broker
+CELERY_TASK_ALWAYS_EAGER = True
+
+# File-backed cache isolated per test run
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": tempfile.mkdtemp(prefix="lubeai-test-cache-"),
+    }
+}
+
+# Second database standing in for a read replica in the router tests;
+# routing to it stays off unless a test enables REPLICA_DATABASE_ALIAS
+DATABASES["replica"] = {  # noqa
+    "ENGINE": "django.db.backends.sqlite3",
+    "NAME": BASE_DIR / "replica.sqlite3",  # noqa
+}
+REPLICA_DATABASE_ALIAS = None